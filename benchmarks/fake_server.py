@@ -0,0 +1,404 @@
+import json
+import time
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from youtube_bulk_upload.quota import API_QUOTA_COSTS
+
+FAKE_CHANNEL_ID: str = "UCfakechannel"
+FAKE_UPLOADS_PLAYLIST_ID: str = "UUfakechannel"
+
+# Quota units charged by the real API for each method, shared with the client so both sides agree on what a run costs
+QUOTA_COSTS: dict[str, int] = API_QUOTA_COSTS
+
+# Status used for injected errors which don't say otherwise, a transient error the real API returns now and then
+DEFAULT_INJECTED_ERROR_STATUS: int = 503
+
+READ_BLOCK_SIZE: int = 64 * 1024
+
+
+def error_response(status: int, reason: str, message: str, domain: str = "global") -> dict[str, Any]:
+    """An error body in the Google API format, which the API client's HttpError parses the reason from."""
+    return {"error": {"code": status, "message": message, "errors": [{"domain": domain, "reason": reason, "message": message}]}}
+
+
+INJECTED_ERROR_REASONS: dict[int, str] = {500: "backendError", 503: "backendError", 429: "rateLimitExceeded", 403: "forbidden"}
+
+
+class BandwidthThrottle:
+    """Token bucket limiting the bytes per second read from request bodies over all connections, like a shared uplink."""
+
+    def __init__(self, bytes_per_second: float) -> None:
+        self.bytes_per_second = bytes_per_second
+        self.next_free_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(self.next_free_at, now)
+            self.next_free_at = start_at + size / self.bytes_per_second
+            wait_seconds = self.next_free_at - now
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+class UploadSession:
+    def __init__(self, session_id: str, metadata: dict[str, Any], total_bytes: Optional[int]) -> None:
+        self.session_id = session_id
+        self.metadata = metadata
+        self.total_bytes = total_bytes
+        self.received_bytes = 0
+
+
+class FakeYouTubeRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests, like the real API
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so without this delayed ACKs add ~40ms to every response
+    disable_nagle_algorithm = True
+
+    server: "FakeYouTubeHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.fake.record_connection()
+        # Stand-in for the TCP and TLS handshake round trips a new connection to the real API costs
+        if self.server.fake.connect_latency_seconds:
+            time.sleep(self.server.fake.connect_latency_seconds)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def send_json(self, status: int, data: dict[str, Any], headers: Optional[dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_empty(self, status: int, headers: dict[str, str]) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def read_body(self) -> bytes:
+        """Read the whole request body, at no more than the server's bandwidth limit."""
+        remaining = int(self.headers.get("Content-Length", 0))
+        throttle = self.server.fake.throttle
+        blocks = []
+        while remaining > 0:
+            block = self.rfile.read(min(remaining, READ_BLOCK_SIZE))
+            if not block:
+                break
+            if throttle is not None:
+                throttle.consume(len(block))
+            blocks.append(block)
+            remaining -= len(block)
+        return b"".join(blocks)
+
+    def handle_api_request(self, http_method: str) -> None:
+        fake = self.server.fake
+        fake.record_request()
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        api_method = fake.api_method_for(http_method, url.path, query)
+
+        # The body is read whatever happens next, so the connection can be kept alive for the next request
+        body = self.read_body()
+        if fake.request_latency_seconds:
+            time.sleep(fake.request_latency_seconds)
+
+        if api_method is None:
+            self.send_json(404, error_response(404, "notFound", f"No fake API method for {http_method} {url.path}"))
+            return
+
+        injected_status = fake.take_injected_error(api_method)
+        if injected_status is not None:
+            reason = INJECTED_ERROR_REASONS.get(injected_status, "backendError")
+            self.send_json(injected_status, error_response(injected_status, reason, f"Injected error for {api_method}"))
+            return
+
+        if api_method == "videos.insert.chunk":
+            self.handle_upload_chunk(query, body)
+            return
+
+        if not fake.charge_quota(api_method):
+            message = "The request cannot be completed because you have exceeded your quota."
+            self.send_json(403, error_response(403, "quotaExceeded", message, domain="youtube.quota"))
+            return
+
+        if api_method == "channels.list":
+            self.send_json(200, fake.channels_list())
+        elif api_method == "search.list":
+            self.send_json(200, fake.search_list(query.get("q", ""), int(query.get("maxResults", 5))))
+        elif api_method == "playlistItems.list":
+            self.send_json(
+                200, fake.playlist_items_list(query.get("playlistId", ""), int(query.get("maxResults", 5)), query.get("pageToken"))
+            )
+        elif api_method == "thumbnails.set":
+            self.send_json(200, fake.set_thumbnail(query.get("videoId", ""), len(body)))
+        elif api_method == "videos.insert":
+            self.start_upload(query, body)
+
+    def start_upload(self, query: dict[str, str], body: bytes) -> None:
+        fake = self.server.fake
+        metadata = json.loads(body) if body else {}
+        if query.get("uploadType") != "resumable":
+            # Simple and multipart uploads carry the whole file in this one request
+            self.send_json(200, fake.add_video(metadata, len(body)))
+            return
+
+        total_bytes = self.headers.get("X-Upload-Content-Length")
+        session = fake.start_upload_session(metadata, int(total_bytes) if total_bytes else None)
+        self.send_json(
+            200, {}, headers={"Location": f"{fake.url}upload/youtube/v3/videos?uploadType=resumable&upload_id={session.session_id}"}
+        )
+
+    def handle_upload_chunk(self, query: dict[str, str], body: bytes) -> None:
+        fake = self.server.fake
+        session = fake.upload_sessions.get(query.get("upload_id", ""))
+        if session is None:
+            self.send_json(404, error_response(404, "notFound", "Upload session not found"))
+            return
+
+        # "bytes 0-5242879/10485760" for a chunk, or "bytes */10485760" when the client asks how much was received
+        content_range = self.headers.get("Content-Range", "")
+        byte_range, _, total = content_range.replace("bytes ", "", 1).partition("/")
+        if total and total != "*":
+            session.total_bytes = int(total)
+        if byte_range and byte_range != "*":
+            start = int(byte_range.split("-")[0])
+            if start != session.received_bytes:
+                self.send_json(400, error_response(400, "badContent", f"Chunk starts at {start}, expected {session.received_bytes}"))
+                return
+            session.received_bytes += len(body)
+            fake.record_upload_chunk(len(body))
+
+        if session.total_bytes is not None and session.received_bytes >= session.total_bytes:
+            self.send_json(200, fake.finish_upload_session(session))
+        elif session.received_bytes:
+            self.send_empty(308, {"Range": f"bytes=0-{session.received_bytes - 1}"})
+        else:
+            self.send_empty(308, {})
+
+    def do_GET(self) -> None:
+        self.handle_api_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_api_request("POST")
+
+    def do_PUT(self) -> None:
+        self.handle_api_request("PUT")
+
+
+class FakeYouTubeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fake: "FakeYouTubeServer", address: tuple[str, int]) -> None:
+        self.fake = fake
+        super().__init__(address, FakeYouTubeRequestHandler)
+
+
+class FakeYouTubeServer:
+    """
+    Local stand-in for the YouTube Data API, for testing and benchmarking the client side (uploads, connection reuse,
+    request overhead, error handling) without network access or quota.
+    Implements the resumable videos.insert protocol, thumbnails.set, search.list, channels.list and playlistItems.list,
+    against one fake channel whose videos are kept in memory, so search finds earlier uploads like the real API would.
+    It can add latency to each new connection and each request, limit upload bandwidth, inject errors, and enforce a daily
+    quota with the real API's costs per method. Counts the connections, requests, API calls and bytes it handles.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_latency_seconds: float = 0,
+        request_latency_seconds: float = 0,
+        bandwidth_bytes_per_second: Optional[float] = None,
+        error_rate: float = 0,
+        error_status: int = DEFAULT_INJECTED_ERROR_STATUS,
+        daily_quota: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.connect_latency_seconds = connect_latency_seconds
+        self.request_latency_seconds = request_latency_seconds
+        self.throttle = BandwidthThrottle(bandwidth_bytes_per_second) if bandwidth_bytes_per_second else None
+        # Fraction of API calls (including upload chunks) which fail with error_status
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.daily_quota = daily_quota
+        self.random = random.Random(seed)
+
+        self.httpd = FakeYouTubeHTTPServer(self, (host, port))
+        self.connections_opened = 0
+        self.requests_handled = 0
+        self.api_calls: Counter[str] = Counter()
+        self.quota_used = 0
+        self.upload_chunks = 0
+        self.bytes_uploaded = 0
+        self.videos: dict[str, dict[str, Any]] = {}
+        self.upload_sessions: dict[str, UploadSession] = {}
+        self.injected_errors: list[tuple[Optional[str], int]] = []
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-youtube-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests_handled += 1
+
+    def record_upload_chunk(self, size: int) -> None:
+        with self._lock:
+            self.upload_chunks += 1
+            self.bytes_uploaded += size
+
+    @staticmethod
+    def api_method_for(http_method: str, path: str, query: dict[str, str]) -> Optional[str]:
+        if http_method == "GET":
+            return {
+                "/youtube/v3/channels": "channels.list",
+                "/youtube/v3/search": "search.list",
+                "/youtube/v3/playlistItems": "playlistItems.list",
+            }.get(path)
+        if path == "/upload/youtube/v3/videos":
+            return "videos.insert.chunk" if "upload_id" in query else "videos.insert"
+        if path == "/upload/youtube/v3/thumbnails/set":
+            return "thumbnails.set"
+        return None
+
+    def fail_next(self, count: int = 1, status: int = DEFAULT_INJECTED_ERROR_STATUS, api_method: Optional[str] = None) -> None:
+        """Fail the next count calls to api_method (e.g. "videos.insert.chunk" for upload chunks), or to any method if None."""
+        with self._lock:
+            self.injected_errors.extend([(api_method, status)] * count)
+
+    def take_injected_error(self, api_method: str) -> Optional[int]:
+        with self._lock:
+            for index, (injected_api_method, status) in enumerate(self.injected_errors):
+                if injected_api_method is None or injected_api_method == api_method:
+                    del self.injected_errors[index]
+                    return status
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.error_status
+        return None
+
+    def charge_quota(self, api_method: str) -> bool:
+        """Count the call and charge its quota cost, returning False (without charging) if the daily quota would be exceeded."""
+        cost = QUOTA_COSTS[api_method]
+        with self._lock:
+            if self.daily_quota is not None and self.quota_used + cost > self.daily_quota:
+                return False
+            self.quota_used += cost
+            self.api_calls[api_method] += 1
+            return True
+
+    def new_id(self, prefix: str) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"{prefix}{self._next_id:08d}"
+
+    def add_video(self, metadata: dict[str, Any], size: int = 0) -> dict[str, Any]:
+        """Add a video to the fake channel, e.g. to set up an existing video for duplicate checks. Returns the video resource."""
+        video = {
+            "kind": "youtube#video",
+            "id": self.new_id("fakevid"),
+            "snippet": dict(metadata.get("snippet", {}), channelId=FAKE_CHANNEL_ID),
+            "status": dict(metadata.get("status", {}), uploadStatus="uploaded"),
+            "fileDetails": {"fileSize": str(size)},
+        }
+        with self._lock:
+            self.videos[video["id"]] = video
+        return video
+
+    def start_upload_session(self, metadata: dict[str, Any], total_bytes: Optional[int]) -> UploadSession:
+        session = UploadSession(self.new_id("session"), metadata, total_bytes)
+        with self._lock:
+            self.upload_sessions[session.session_id] = session
+        return session
+
+    def finish_upload_session(self, session: UploadSession) -> dict[str, Any]:
+        with self._lock:
+            self.upload_sessions.pop(session.session_id, None)
+        return self.add_video(session.metadata, session.received_bytes)
+
+    def set_thumbnail(self, video_id: str, size: int) -> dict[str, Any]:
+        with self._lock:
+            video = self.videos.get(video_id)
+            if video is not None:
+                video["thumbnailSize"] = size
+        return {"kind": "youtube#thumbnailSetResponse", "items": [{"default": {"url": f"{self.url}vi/{video_id}/default.jpg"}}]}
+
+    def channels_list(self) -> dict[str, Any]:
+        channel = {
+            "kind": "youtube#channel",
+            "id": FAKE_CHANNEL_ID,
+            "snippet": {"title": "Fake Channel"},
+            "contentDetails": {"relatedPlaylists": {"uploads": FAKE_UPLOADS_PLAYLIST_ID}},
+        }
+        return {"kind": "youtube#channelListResponse", "items": [channel]}
+
+    def search_list(self, q: str, max_results: int) -> dict[str, Any]:
+        # Rough stand-in for YouTube's relevance search: channel videos sharing any word with the query, newest first
+        query_words = set(q.lower().split())
+        with self._lock:
+            videos = list(self.videos.values())
+        items = [
+            {"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": video["id"]}, "snippet": video["snippet"]}
+            for video in reversed(videos)
+            if query_words & set(video["snippet"].get("title", "").lower().split())
+        ]
+        return {"kind": "youtube#searchListResponse", "items": items[:max_results], "pageInfo": {"totalResults": len(items)}}
+
+    def playlist_items_list(self, playlist_id: str, max_results: int, page_token: Optional[str]) -> dict[str, Any]:
+        with self._lock:
+            videos = list(self.videos.values()) if playlist_id == FAKE_UPLOADS_PLAYLIST_ID else []
+        # Page tokens are just the offset of the page's first item
+        offset = int(page_token or 0)
+        page = videos[offset : offset + max_results]
+        response: dict[str, Any] = {
+            "kind": "youtube#playlistItemListResponse",
+            "items": [
+                {
+                    "kind": "youtube#playlistItem",
+                    "snippet": dict(video["snippet"], playlistId=playlist_id, resourceId={"kind": "youtube#video", "videoId": video["id"]}),
+                    "contentDetails": {"videoId": video["id"]},
+                }
+                for video in page
+            ],
+            "pageInfo": {"totalResults": len(videos), "resultsPerPage": max_results},
+        }
+        if offset + max_results < len(videos):
+            response["nextPageToken"] = str(offset + max_results)
+        return response
+
+    def start(self) -> "FakeYouTubeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeYouTubeServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
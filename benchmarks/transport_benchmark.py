@@ -0,0 +1,105 @@
+"""
+Compare the default httplib2 transport with PooledHttpTransport, making YouTube API metadata calls against a local fake server.
+
+    python -m benchmarks.transport_benchmark --requests 500 --threads 4 --services 3 --connect_latency_ms 100
+
+Each thread round-robins its calls over --services service objects, like uploads spread over credential profiles.
+"""
+
+import time
+import logging
+import argparse
+import threading
+from typing import Any, Callable
+
+from benchmarks.fake_server import FakeYouTubeServer
+from youtube_bulk_upload.discovery import load_discovery_document
+from youtube_bulk_upload.transport import PooledHttpTransport
+
+
+def build_fake_service(http: Any, server_url: str) -> Any:
+    from googleapiclient.discovery import build_from_document
+
+    # The api_endpoint option only moves the host of media upload URLs, not their https scheme, so the root URL is replaced too
+    document = dict(load_discovery_document(logging.getLogger(__name__)), rootUrl=server_url)
+    return build_from_document(document, http=http, client_options={"api_endpoint": server_url})
+
+
+def fake_credentials() -> Any:
+    from google.oauth2.credentials import Credentials
+
+    return Credentials(token="fake-access-token")
+
+
+def httplib2_http_factory() -> Callable[[], Any]:
+    import httplib2
+    import google_auth_httplib2
+
+    credentials = fake_credentials()
+    # httplib2.Http isn't thread-safe, so like the default transport each thread needs its own
+    return lambda: google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+
+
+def pooled_http_factory(transport: PooledHttpTransport) -> Callable[[], Any]:
+    credentials = fake_credentials()
+    return lambda: transport.authorize(credentials)
+
+
+def run_benchmark(
+    name: str, http_factory: Callable[[], Any], requests_total: int, threads: int, services: int = 1, connect_latency_seconds: float = 0
+) -> dict[str, Any]:
+    with FakeYouTubeServer(connect_latency_seconds=connect_latency_seconds) as server:
+        requests_per_thread = requests_total // threads
+
+        def worker() -> None:
+            thread_services = [build_fake_service(http_factory(), server.url) for _ in range(services)]
+            for i in range(requests_per_thread):
+                thread_services[i % services].channels().list(part="snippet", mine=True).execute()
+
+        worker_threads = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in worker_threads:
+            thread.start()
+        for thread in worker_threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "transport": name,
+            "requests": server.requests_handled,
+            "connections": server.connections_opened,
+            "seconds": elapsed,
+            "requests_per_second": server.requests_handled / elapsed,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark YouTube API HTTP transports against a local fake server.")
+    parser.add_argument("--requests", type=int, default=500, help="Total API calls per transport. Default: %(default)s")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent threads making calls. Default: %(default)s")
+    parser.add_argument(
+        "--services", type=int, default=1, help="Service objects per thread, e.g. credential profiles. Default: %(default)s"
+    )
+    parser.add_argument(
+        "--connect_latency_ms", type=float, default=0, help="Simulated handshake time for each new connection. Default: %(default)s"
+    )
+    args = parser.parse_args()
+
+    benchmark_options = {"services": args.services, "connect_latency_seconds": args.connect_latency_ms / 1000}
+    pooled_transport = PooledHttpTransport(pool_size=args.threads)
+    results = [
+        run_benchmark("httplib2", httplib2_http_factory(), args.requests, args.threads, **benchmark_options),
+        run_benchmark("pooled", pooled_http_factory(pooled_transport), args.requests, args.threads, **benchmark_options),
+    ]
+    pooled_transport.close()
+
+    print(f"{'transport':<10} {'requests':>9} {'connections':>12} {'seconds':>9} {'req/s':>9}")
+    for result in results:
+        print(
+            f"{result['transport']:<10} {result['requests']:>9} {result['connections']:>12} "
+            f"{result['seconds']:>9.3f} {result['requests_per_second']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Run YouTubeBulkUpload.process() end to end against a local fake YouTube API server with synthetic video files, and report
+throughput, API calls and wall time for each scenario.
+
+    python -m benchmarks.upload_benchmark --videos 20 --video_size_mb 16 --scenario baseline latency flaky
+
+Scenarios:
+    baseline   no added latency, bandwidth limit or errors
+    latency    50ms added to every request and 100ms to every new connection, like a distant API endpoint
+    bandwidth  uploads limited to --bandwidth_mbps over all connections
+    flaky      5% of API calls fail with a 503, retried within the run
+    quota      a daily quota which runs out part way through the batch
+"""
+
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+from typing import Any, Optional
+
+from benchmarks.fake_server import QUOTA_COSTS, FakeYouTubeServer
+from benchmarks.transport_benchmark import build_fake_service, fake_credentials
+from youtube_bulk_upload.bulk_upload import YouTubeBulkUpload
+from youtube_bulk_upload.metrics import UploadMetrics
+from youtube_bulk_upload.chunk_trace import ChunkTraceRecorder
+from youtube_bulk_upload.media_source import ReadAheadMediaSource
+from youtube_bulk_upload.retry_queue import ErrorClass, RetryPolicy
+from youtube_bulk_upload.transport import PooledHttpTransport
+
+MB = 1024 * 1024
+
+# Titles are made of random words, so the client's fuzzy duplicate check doesn't see the synthetic videos as copies of each other
+TITLE_WORDS = (
+    "amber anchor aurora basalt beacon birch cedar cinder cobalt comet coral delta dune ember falcon fern fjord flint garnet glacier "
+    "harbor hazel heron indigo iris jasper juniper kestrel lagoon lantern lichen linen maple marble meadow mist nectar nimbus oak "
+    "onyx opal orchid pebble pine prairie quartz quill raven reef ripple saffron sage sierra slate sparrow spruce summit thistle "
+    "tide timber topaz tundra umber valley velvet violet willow wren zenith zephyr"
+).split()
+
+SCENARIOS: dict[str, dict[str, Any]] = {
+    "baseline": {},
+    "latency": {"request_latency_seconds": 0.05, "connect_latency_seconds": 0.1},
+    "bandwidth": {},
+    "flaky": {"error_rate": 0.05},
+    "quota": {},
+}
+
+
+def create_video_files(directory: str, videos: int, video_size_bytes: int, seed: int = 0) -> list[str]:
+    """Write synthetic video files, each with a small PNG thumbnail beside it, and return the video file paths."""
+    word_random = random.Random(seed)
+    chunk = os.urandom(min(video_size_bytes, MB)) if video_size_bytes else b""
+    video_files = []
+    for _ in range(videos):
+        name = " ".join(word_random.sample(TITLE_WORDS, 4))
+        video_file = os.path.join(directory, f"{name}.mp4")
+        with open(video_file, "wb") as f:
+            remaining = video_size_bytes
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= len(chunk)
+        with open(os.path.join(directory, f"{name}.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + os.urandom(16 * 1024))
+        video_files.append(video_file)
+    return video_files
+
+
+def fake_server_uploader_class(server_url: str) -> type:
+    """A YouTubeBulkUpload which talks to the fake server, skipping the client secrets file and OAuth login."""
+
+    class FakeServerYouTubeBulkUpload(YouTubeBulkUpload):
+        @classmethod
+        def validate_secrets_file(cls, logger: logging.Logger, secrets_file: Optional[str]) -> None:
+            pass
+
+        @classmethod
+        def authenticate_youtube(cls, logger: logging.Logger, youtube_client_secrets_file: Optional[str], *args: Any, **kwargs: Any) -> Any:
+            http_transport = kwargs.get("http_transport") or PooledHttpTransport()
+            return build_fake_service(http_transport.authorize(fake_credentials()), server_url)
+
+    return FakeServerYouTubeBulkUpload
+
+
+def run_scenario(
+    name: str,
+    video_files: list[str],
+    work_directory: str,
+    bandwidth_bytes_per_second: float,
+    seed: int = 0,
+    metrics: Optional[UploadMetrics] = None,
+    chunk_trace: Optional[ChunkTraceRecorder] = None,
+    media_source: Optional[ReadAheadMediaSource] = None,
+) -> dict[str, Any]:
+    server_options = dict(SCENARIOS[name], seed=seed)
+    if name == "bandwidth":
+        server_options["bandwidth_bytes_per_second"] = bandwidth_bytes_per_second
+    if name == "quota":
+        # Room for the channel lookup, duplicate search and upload of about half the batch
+        per_video_cost = (
+            QUOTA_COSTS["channels.list"] + QUOTA_COSTS["search.list"] + QUOTA_COSTS["videos.insert"] + QUOTA_COSTS["thumbnails.set"]
+        )
+        server_options["daily_quota"] = per_video_cost * max(len(video_files) // 2, 1)
+
+    logger = logging.getLogger(f"upload_benchmark.{name}")
+    logger.setLevel(logging.WARNING)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    # Failed uploads are recorded in the current directory, so keep them out of the caller's
+    previous_directory = os.getcwd()
+    os.chdir(work_directory)
+    http_transport = PooledHttpTransport()
+    try:
+        with FakeYouTubeServer(**server_options) as server:
+            uploader = fake_server_uploader_class(server.url)(
+                youtube_client_secrets_file=None,
+                logger=logger,
+                interactive_prompt=False,
+                source_directory=os.path.dirname(video_files[0]),
+                upload_batch_limit=len(video_files),
+                # Titles are the file names, without the synthetic directory
+                youtube_title_replacements=[[r"^.*[\\/]", ""]],
+                thumbnail_filename_extensions=[".png"],
+                retry_queue_file=os.path.join(work_directory, f"{name}_retry_queue.json"),
+                retry_in_run_max_wait_seconds=60,
+                http_transport=http_transport,
+                metrics=metrics,
+                chunk_trace=chunk_trace,
+                media_source=media_source,
+            )
+            # Retry transient failures straight away, so the flaky scenario measures retries rather than backoff
+            uploader.retry_queue.policies[ErrorClass.TRANSIENT] = RetryPolicy(max_attempts=5, retry_in_run=True)
+
+            start = time.perf_counter()
+            uploaded_videos = uploader.process(input_files=video_files)
+            elapsed = time.perf_counter() - start
+
+            return {
+                "scenario": name,
+                "uploaded": len(uploaded_videos),
+                "videos": len(video_files),
+                "seconds": elapsed,
+                "megabytes_per_second": server.bytes_uploaded / MB / elapsed,
+                "requests": server.requests_handled,
+                "connections": server.connections_opened,
+                "upload_chunks": server.upload_chunks,
+                "quota_used": server.quota_used,
+                "api_calls": dict(server.api_calls),
+            }
+    finally:
+        http_transport.close()
+        os.chdir(previous_directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end bulk uploads against a local fake YouTube API server.")
+    parser.add_argument("--videos", type=int, default=10, help="Synthetic video files per scenario. Default: %(default)s")
+    parser.add_argument("--video_size_mb", type=float, default=8, help="Size of each synthetic video file. Default: %(default)s")
+    parser.add_argument(
+        "--bandwidth_mbps", type=float, default=200, help="Upload bandwidth for the bandwidth scenario. Default: %(default)s"
+    )
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS), help="Scenarios to run. Default: all")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for file names and injected errors. Default: %(default)s")
+    parser.add_argument("--stage_timings", action="store_true", help="Also print the client's per-stage timings for each scenario.")
+    parser.add_argument("--read_ahead_chunks", type=int, default=0, help="Upload chunks to read ahead of each upload. Default: %(default)s")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.scenario:
+        metrics = UploadMetrics() if args.stage_timings else None
+        media_source = ReadAheadMediaSource(read_ahead_chunks=args.read_ahead_chunks) if args.read_ahead_chunks > 0 else None
+        with tempfile.TemporaryDirectory() as directory:
+            video_directory = os.path.join(directory, "videos")
+            os.mkdir(video_directory)
+            video_files = create_video_files(video_directory, args.videos, int(args.video_size_mb * MB), seed=args.seed)
+            results.append(
+                run_scenario(
+                    name, video_files, directory, args.bandwidth_mbps * MB / 8, seed=args.seed, metrics=metrics, media_source=media_source
+                )
+            )
+        if media_source is not None:
+            media_source.close()
+        if metrics is not None:
+            print(f"Stage timings for scenario {name}:")
+            print("\n".join(metrics.summary_lines()) + "\n")
+
+    print(f"{'scenario':<10} {'uploaded':>9} {'seconds':>9} {'MB/s':>8} {'requests':>9} {'conns':>6} {'quota':>7}  api calls")
+    for result in results:
+        api_calls = ", ".join(f"{api_method}={count}" for api_method, count in sorted(result["api_calls"].items()))
+        print(
+            f"{result['scenario']:<10} {result['uploaded']:>4}/{result['videos']:<4} {result['seconds']:>9.3f} "
+            f"{result['megabytes_per_second']:>8.1f} {result['requests']:>9} {result['connections']:>6} {result['quota_used']:>7}  "
+            f"{api_calls}"
+        )
+
+
+if __name__ == "__main__":
+    main()
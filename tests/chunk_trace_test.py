@@ -0,0 +1,137 @@
+import os
+import csv
+import tempfile
+import unittest
+from unittest import TestCase
+from benchmarks.upload_benchmark import create_video_files, run_scenario
+from benchmarks.fake_server import FakeYouTubeServer
+from youtube_bulk_upload.chunk_trace import CHUNK_TRACE_COLUMNS, ChunkTraceAnalysis, ChunkTraceRecorder, analyze_chunk_trace
+from youtube_bulk_upload.transport import PooledHttpTransport
+
+MB = 1024 * 1024
+
+
+def read_trace_rows(trace_file: str) -> list[dict[str, str]]:
+    with open(trace_file, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def trace_row(timestamp: float, file: str, offset: int, duration_seconds: float, chunk_bytes: int = MB, status: str = "308") -> dict:
+    return {
+        "timestamp": timestamp,
+        "file": file,
+        "offset": offset,
+        "chunk_bytes": chunk_bytes,
+        "duration_seconds": duration_seconds,
+        "send_seconds": duration_seconds * 0.75,
+        "response_seconds": duration_seconds * 0.25,
+        "retries": 0,
+        "status": status,
+    }
+
+
+class PooledHttpRequestTimingTest(TestCase):
+    def test_body_send_is_timed_separately_from_the_response(self):
+        # Arrange
+        http_transport = PooledHttpTransport()
+        self.addCleanup(http_transport.close)
+        http_transport.request_timing_log.enabled = True
+        body = os.urandom(2 * MB)
+
+        with FakeYouTubeServer(request_latency_seconds=0.2) as server:
+            http = http_transport.authorize(None)
+            http.authorized_http.urlopen = http_transport.get_pool_manager().urlopen
+
+            # Act
+            response, _ = http.request(
+                f"{server.url}youtube/v3/thumbnails/set?videoId=abc", method="POST", body=body, headers={"Content-Length": str(len(body))}
+            )
+            [timing] = http_transport.request_timing_log.take()
+
+        # Assert
+        self.assertEqual(response.status, 404)
+        self.assertEqual(timing.status, 404)
+        self.assertGreaterEqual(timing.response_seconds, 0.2)
+        self.assertLess(timing.send_seconds, timing.response_seconds)
+        self.assertEqual(http_transport.request_timing_log.take(), [])
+
+
+class ChunkTraceRecorderTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.trace_file = os.path.join(self.temp_dir.name, "chunks.csv")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_failed_chunk_records_error_status_and_appends_to_existing_trace(self):
+        # Arrange
+        ChunkTraceRecorder(self.trace_file).close()
+        recorder = ChunkTraceRecorder(self.trace_file)
+
+        # Act
+        with self.assertRaises(ConnectionResetError):
+            with recorder.trace_chunk("/videos/song.mp4", 5 * MB):
+                raise ConnectionResetError("connection reset")
+        recorder.close()
+
+        # Assert
+        with open(self.trace_file, encoding="utf-8") as f:
+            self.assertEqual(f.readline().strip(), ",".join(CHUNK_TRACE_COLUMNS))
+        [row] = read_trace_rows(self.trace_file)
+        self.assertEqual((row["file"], row["offset"], row["chunk_bytes"]), ("/videos/song.mp4", str(5 * MB), "0"))
+        self.assertEqual((row["send_seconds"], row["response_seconds"]), ("", ""))
+        self.assertEqual(row["status"], "ConnectionResetError")
+
+    def test_upload_against_fake_server_records_every_chunk(self):
+        # Arrange
+        recorder = ChunkTraceRecorder(self.trace_file)
+        video_directory = os.path.join(self.temp_dir.name, "videos")
+        os.mkdir(video_directory)
+        video_files = create_video_files(video_directory, 2, 6 * MB)
+
+        # Act
+        result = run_scenario("latency", video_files, self.temp_dir.name, 0, chunk_trace=recorder)
+        recorder.close()
+
+        # Assert
+        self.assertEqual(result["uploaded"], 2)
+        rows = read_trace_rows(self.trace_file)
+        expected_chunks = [
+            (video_file, offset, chunk_bytes) for video_file in video_files for offset, chunk_bytes in [(0, 5 * MB), (5 * MB, MB)]
+        ]
+        self.assertEqual(sorted((row["file"], int(row["offset"]), int(row["chunk_bytes"])) for row in rows), sorted(expected_chunks))
+        self.assertEqual(sorted(row["status"] for row in rows), ["200", "200", "308", "308"])
+        for row in rows:
+            self.assertGreaterEqual(float(row["response_seconds"]), 0.05)
+            self.assertGreaterEqual(float(row["duration_seconds"]), float(row["send_seconds"]) + float(row["response_seconds"]))
+        self.assertTrue(analyze_chunk_trace(self.trace_file).summary_lines()[0].startswith("chunks: 4 over 2 file(s), 12.0 MB"))
+
+
+class ChunkTraceAnalysisTest(TestCase):
+    def test_stalls_throughput_and_concurrency(self):
+        # Arrange
+        rows = [trace_row(100 + i, "/videos/a.mp4", i * MB, 1) for i in range(5)]
+        rows.append(trace_row(105, "/videos/a.mp4", 5 * MB, 10, status="500"))
+        rows.append(trace_row(130, "/videos/a.mp4", 6 * MB, 1, chunk_bytes=MB // 2, status="200"))
+        rows.append(trace_row(100.5, "/videos/b.mp4", 0, 1, status="200"))
+        analysis = ChunkTraceAnalysis(rows)
+
+        # Act
+        stalls = analysis.stalls()
+        lines = analysis.summary_lines()
+
+        # Assert
+        self.assertEqual(
+            [(stall["kind"], stall["offset"], stall["seconds"]) for stall in stalls], [("gap", 6 * MB, 15), ("slow chunk", 5 * MB, 10)]
+        )
+        self.assertEqual(analysis.max_concurrent_chunks(), 2)
+        self.assertEqual(len(analysis.error_rows), 1)
+        self.assertIn("chunk throughput: min 0.10 MB/s, p10 0.10 MB/s, p50 1.00 MB/s", lines[2])
+        self.assertIn("time sending: 12.8s, waiting for responses: 4.2s (25% waiting)", lines)
+        self.assertIn("stalls (over 5.00s, 5x the median chunk duration): 2", lines)
+        self.assertIn("      0.50 MB:      1 chunks, median 0.50 MB/s", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+from unittest import TestCase
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing the Google API client and auth stack alone takes longer than this, so any regression which pulls them
+# back into the startup path fails. Slow CI machines can raise it with this environment variable.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("YOUTUBE_BULK_UPLOAD_STARTUP_BUDGET_SECONDS", "0.5"))
+HEAVY_MODULES = ["googleapiclient", "google_auth_oauthlib", "google", "thefuzz", "PIL", "pkg_resources", "tkinter"]
+
+MEASURE_STARTUP_SCRIPT = """
+import sys, json, time, runpy, contextlib, io
+sys.argv = ["youtube-bulk-upload", "--help"]
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        runpy.run_module("youtube_bulk_upload.cli", run_name="__main__")
+    except SystemExit:
+        pass
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted({name.split(".")[0] for name in sys.modules})}))
+"""
+
+
+def measure_cli_help_startup() -> dict:
+    output = subprocess.run([sys.executable, "-c", MEASURE_STARTUP_SCRIPT], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+class CLIStartupTest(TestCase):
+    def test_help_does_not_import_heavy_dependencies(self):
+        # Act
+        result = measure_cli_help_startup()
+
+        # Assert
+        self.assertEqual([module for module in HEAVY_MODULES if module in result["modules"]], [])
+
+    def test_help_startup_time_within_budget(self):
+        # Act (best of a few runs, to ignore one-off stalls on a busy machine)
+        elapsed = min(measure_cli_help_startup()["elapsed"] for _ in range(3))
+
+        # Assert
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS, f"youtube-bulk-upload --help took {elapsed:.3f}s to start")
+
+
+if __name__ == "__main__":
+    unittest.main()
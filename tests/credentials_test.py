@@ -0,0 +1,130 @@
+import os
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import patch
+import test_data as td
+from youtube_bulk_upload.credentials import (
+    CredentialManager,
+    forget_managed_credentials,
+    get_managed_credentials,
+    manage_credentials,
+    stop_credential_managers,
+)
+from youtube_bulk_upload.token_store import save_token_file
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FakeCredentials:
+    def __init__(self, expires_in_seconds, token="token-1"):
+        self.token = token
+        self.refresh_token = "refresh-token"
+        self.expiry = utcnow() + timedelta(seconds=expires_in_seconds)
+        self.refresh_count = 0
+
+    @property
+    def valid(self):
+        return self.expiry > utcnow()
+
+    def refresh(self, request):
+        self.refresh_count += 1
+        self.token = f"token-{self.refresh_count + 1}"
+        self.expiry = utcnow() + timedelta(hours=1)
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "token": self.token,
+                "refresh_token": self.refresh_token,
+                "client_id": "client-id",
+                "client_secret": "client-secret",
+                "expiry": self.expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+
+
+class CredentialManagerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.token_file = os.path.join(self.temp_dir.name, "token.json")
+
+    def tearDown(self):
+        stop_credential_managers()
+        self.temp_dir.cleanup()
+
+    def test_refreshes_ahead_of_expiry_and_persists_token(self):
+        # Arrange
+        credentials = FakeCredentials(expires_in_seconds=300)
+        manager = CredentialManager(td.mock_logger, self.token_file, credentials, refresh_margin_seconds=600)
+
+        # Act
+        refreshed = manager.refresh_if_needed()
+
+        # Assert
+        self.assertTrue(refreshed)
+        self.assertEqual(credentials.token, "token-2")
+        with open(self.token_file) as f:
+            self.assertEqual(json.load(f)["token"], "token-2")
+
+    def test_adopts_token_already_refreshed_by_another_process(self):
+        # Arrange
+        credentials = FakeCredentials(expires_in_seconds=300)
+        save_token_file(self.token_file, FakeCredentials(expires_in_seconds=3600, token="refreshed-elsewhere"))
+        manager = CredentialManager(td.mock_logger, self.token_file, credentials, refresh_margin_seconds=600)
+
+        # Act
+        manager.refresh_if_needed()
+
+        # Assert
+        self.assertEqual(credentials.refresh_count, 0)
+        self.assertEqual(credentials.token, "refreshed-elsewhere")
+        self.assertFalse(manager.needs_refresh())
+
+    def test_does_not_refresh_token_with_plenty_of_time_left(self):
+        # Arrange
+        credentials = FakeCredentials(expires_in_seconds=3600)
+        manager = CredentialManager(td.mock_logger, self.token_file, credentials, refresh_margin_seconds=600)
+
+        # Act & Assert
+        self.assertFalse(manager.refresh_if_needed())
+        self.assertEqual(credentials.refresh_count, 0)
+
+    def test_background_thread_refreshes_shared_credentials(self):
+        # Arrange
+        credentials = FakeCredentials(expires_in_seconds=60)
+        manager = CredentialManager(td.mock_logger, self.token_file, credentials, check_interval_seconds=0.01)
+
+        # Act
+        with patch("google.auth.transport.requests.Request"):
+            manager.start()
+            for _ in range(100):
+                if credentials.refresh_count:
+                    break
+                manager._stopped.wait(0.01)
+            manager.stop()
+
+        # Assert
+        self.assertEqual(credentials.refresh_count, 1)
+
+    def test_services_for_same_token_file_share_credentials(self):
+        # Arrange
+        credentials = FakeCredentials(expires_in_seconds=3600)
+
+        # Act
+        manage_credentials(td.mock_logger, self.token_file, credentials)
+
+        # Assert
+        self.assertIs(get_managed_credentials(self.token_file), credentials)
+        self.assertIsNone(get_managed_credentials(os.path.join(self.temp_dir.name, "other.json")))
+
+        forget_managed_credentials(self.token_file)
+        self.assertIsNone(get_managed_credentials(self.token_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
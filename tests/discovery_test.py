@@ -0,0 +1,82 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import test_data as td
+from youtube_bulk_upload import discovery
+from youtube_bulk_upload.discovery import build_youtube_service, load_discovery_document, write_discovery_cache_file
+
+
+class DiscoveryDocumentCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, "discovery.json")
+        self.document = {"rootUrl": "https://youtube.googleapis.com/", "servicePath": "", "revision": "20240101"}
+        discovery._discovery_documents.clear()
+
+    def tearDown(self):
+        discovery._discovery_documents.clear()
+        self.temp_dir.cleanup()
+
+    def test_bundled_document_is_cached_and_parsed_once(self):
+        # Arrange
+        with patch("youtube_bulk_upload.discovery.load_bundled_discovery_document", return_value=self.document) as mock_bundled:
+            # Act
+            first = load_discovery_document(td.mock_logger, self.cache_file)
+            second = load_discovery_document(td.mock_logger, self.cache_file)
+
+        # Assert
+        self.assertIs(first, second)
+        mock_bundled.assert_called_once()
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f)["document"], self.document)
+
+    def test_cache_file_is_used_offline_when_client_version_matches(self):
+        # Arrange
+        write_discovery_cache_file(self.cache_file, "1.0", self.document)
+
+        # Act
+        with (
+            patch("youtube_bulk_upload.discovery.get_api_client_version", return_value="1.0"),
+            patch("youtube_bulk_upload.discovery.load_bundled_discovery_document") as mock_bundled,
+            patch("youtube_bulk_upload.discovery.fetch_discovery_document") as mock_fetch,
+        ):
+            document = load_discovery_document(td.mock_logger, self.cache_file)
+
+        # Assert
+        self.assertEqual(document, self.document)
+        mock_bundled.assert_not_called()
+        mock_fetch.assert_not_called()
+
+    def test_cache_file_from_other_client_version_is_refreshed(self):
+        # Arrange
+        write_discovery_cache_file(self.cache_file, "1.0", {**self.document, "revision": "old"})
+
+        # Act
+        with (
+            patch("youtube_bulk_upload.discovery.get_api_client_version", return_value="2.0"),
+            patch("youtube_bulk_upload.discovery.load_bundled_discovery_document", return_value=None),
+            patch("youtube_bulk_upload.discovery.fetch_discovery_document", return_value=self.document),
+        ):
+            document = load_discovery_document(td.mock_logger, self.cache_file)
+
+        # Assert
+        self.assertEqual(document["revision"], "20240101")
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f)["client_version"], "2.0")
+
+    def test_services_are_built_from_the_shared_document(self):
+        # Act
+        first = build_youtube_service(td.mock_logger, MagicMock(), self.cache_file)
+        second = build_youtube_service(td.mock_logger, MagicMock(), self.cache_file)
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertIs(first._rootDesc, second._rootDesc)
+        self.assertTrue(hasattr(second, "videos"))
+
+
+if __name__ == "__main__":
+    unittest.main()
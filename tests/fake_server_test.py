@@ -0,0 +1,155 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+from benchmarks.fake_server import FAKE_UPLOADS_PLAYLIST_ID, QUOTA_COSTS, FakeYouTubeServer
+from benchmarks.transport_benchmark import build_fake_service, fake_credentials
+from benchmarks.upload_benchmark import create_video_files, run_scenario
+from youtube_bulk_upload.bulk_upload import MediaFileUpload
+from youtube_bulk_upload.retry_queue import ErrorClass, classify_upload_error
+from youtube_bulk_upload.transport import PooledHttpTransport
+
+MB = 1024 * 1024
+
+
+class FakeYouTubeServerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.video_file = os.path.join(self.temp_dir.name, "video.mp4")
+        with open(self.video_file, "wb") as f:
+            f.write(os.urandom(3 * MB))
+        self.transport = PooledHttpTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.temp_dir.cleanup()
+
+    def start_server(self, **kwargs):
+        server = FakeYouTubeServer(**kwargs).start()
+        self.addCleanup(server.stop)
+        service = build_fake_service(self.transport.authorize(fake_credentials()), server.url)
+        return server, service
+
+    def upload(self, service, title):
+        media_file = MediaFileUpload(self.video_file, resumable=True, chunksize=MB)
+        request = service.videos().insert(part="snippet,status", body={"snippet": {"title": title}}, media_body=media_file)
+        progress = []
+        response = None
+        while response is None:
+            status, response = request.next_chunk()
+            if status:
+                progress.append(status.resumable_progress)
+        return response, progress
+
+    def test_resumable_upload_in_chunks(self):
+        # Arrange
+        server, service = self.start_server()
+
+        # Act
+        response, progress = self.upload(service, "amber falcon")
+
+        # Assert
+        self.assertEqual(progress, [MB, 2 * MB])
+        self.assertEqual(response["snippet"]["title"], "amber falcon")
+        self.assertEqual(server.videos[response["id"]]["fileDetails"]["fileSize"], str(3 * MB))
+        self.assertEqual((server.upload_chunks, server.bytes_uploaded), (3, 3 * MB))
+        self.assertEqual(server.api_calls["videos.insert"], 1)
+        self.assertEqual(server.upload_sessions, {})
+
+    def test_search_and_playlist_items_list_uploaded_videos(self):
+        # Arrange
+        server, service = self.start_server()
+        for title in ["amber falcon", "cedar reef", "amber tide"]:
+            server.add_video({"snippet": {"title": title}})
+
+        # Act
+        search_response = service.search().list(part="snippet", q="Amber", type="video", maxResults=10).execute()
+        uploads_playlist_id = (
+            service.channels().list(part="contentDetails", mine=True).execute()["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        )
+        first_page = service.playlistItems().list(part="snippet", playlistId=uploads_playlist_id, maxResults=2).execute()
+        second_page = (
+            service.playlistItems()
+            .list(part="snippet", playlistId=uploads_playlist_id, maxResults=2, pageToken=first_page["nextPageToken"])
+            .execute()
+        )
+
+        # Assert
+        self.assertEqual([item["snippet"]["title"] for item in search_response["items"]], ["amber tide", "amber falcon"])
+        self.assertEqual(uploads_playlist_id, FAKE_UPLOADS_PLAYLIST_ID)
+        self.assertEqual(
+            [item["snippet"]["title"] for item in first_page["items"] + second_page["items"]], ["amber falcon", "cedar reef", "amber tide"]
+        )
+        self.assertNotIn("nextPageToken", second_page)
+        self.assertEqual(
+            server.quota_used, QUOTA_COSTS["search.list"] + QUOTA_COSTS["channels.list"] + 2 * QUOTA_COSTS["playlistItems.list"]
+        )
+
+    def test_quota_exceeded_error_is_classified_as_quota(self):
+        # Arrange
+        server, service = self.start_server(daily_quota=QUOTA_COSTS["search.list"])
+        service.search().list(part="snippet", q="amber").execute()
+
+        # Act
+        with self.assertRaises(Exception) as context:
+            service.channels().list(part="snippet", mine=True).execute()
+
+        # Assert
+        self.assertEqual(classify_upload_error(context.exception), ErrorClass.QUOTA)
+        self.assertEqual(server.quota_used, QUOTA_COSTS["search.list"])
+
+    def test_injected_chunk_error_fails_the_upload_with_a_transient_error(self):
+        # Arrange
+        server, service = self.start_server()
+        server.fail_next(api_method="videos.insert.chunk")
+
+        # Act
+        with self.assertRaises(Exception) as context:
+            self.upload(service, "amber falcon")
+
+        # Assert
+        self.assertEqual(classify_upload_error(context.exception), ErrorClass.TRANSIENT)
+        self.assertEqual(server.videos, {})
+
+    def test_bandwidth_limit_slows_uploads(self):
+        # Arrange
+        server, service = self.start_server(bandwidth_bytes_per_second=12 * MB)
+
+        # Act
+        start = time.perf_counter()
+        self.upload(service, "amber falcon")
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertGreaterEqual(elapsed, 0.2)
+
+
+class UploadBenchmarkTest(TestCase):
+    def run_scenario(self, name, videos):
+        with tempfile.TemporaryDirectory() as directory:
+            video_directory = os.path.join(directory, "videos")
+            os.mkdir(video_directory)
+            video_files = create_video_files(video_directory, videos, MB)
+            return run_scenario(name, video_files, directory, bandwidth_bytes_per_second=0)
+
+    def test_process_uploads_synthetic_videos_end_to_end(self):
+        # Arrange, Act
+        result = self.run_scenario("baseline", 3)
+
+        # Assert
+        self.assertEqual(result["uploaded"], 3)
+        self.assertEqual(result["api_calls"], {"channels.list": 3, "search.list": 3, "videos.insert": 3, "thumbnails.set": 3})
+        self.assertEqual(result["connections"], 1)
+
+    def test_process_stops_when_the_quota_runs_out(self):
+        # Arrange, Act
+        result = self.run_scenario("quota", 4)
+
+        # Assert
+        self.assertEqual(result["uploaded"], 2)
+        self.assertEqual(result["api_calls"]["videos.insert"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,363 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock
+import test_data as td
+from youtube_bulk_upload.job_queue import JOB_STATUS_DONE, JOB_STATUS_FAILED, JobQueue, RedisJobQueue, SQLiteJobQueue, open_job_queue
+from youtube_bulk_upload.worker import UploadWorker
+
+
+class WatchedKeyChanged(Exception):
+    pass
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of redis-py commands RedisJobQueue uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+        self.lists = {}
+        self.hashes = {}
+        self.sorted_sets = {}
+        # Bumped whenever a key changes, so transactions can tell whether a watched key changed under them
+        self.versions = {}
+        # Called once just before the next transaction executes, to simulate another worker getting in first
+        self.before_execute = None
+
+    def changed(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def version(self, key):
+        self.expire_keys()
+        return self.versions.get(key, 0)
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        while True:
+            pipe = FakePipeline(self)
+            pipe.watch(*watches)
+            value = func(pipe)
+            try:
+                results = pipe.execute()
+            except WatchedKeyChanged:
+                continue
+            return value if value_from_callable else results
+
+    def expire_keys(self):
+        now = time.time()
+        for key, expires_at in list(self.expiry.items()):
+            if expires_at <= now:
+                self.values.pop(key, None)
+                del self.expiry[key]
+                self.changed(key)
+
+    def set(self, key, value, nx=False, px=None):
+        self.expire_keys()
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.expiry.pop(key, None)
+        if px is not None:
+            self.expiry[key] = time.time() + px / 1000
+        self.changed(key)
+        return True
+
+    def get(self, key):
+        self.expire_keys()
+        return self.values.get(key)
+
+    def exists(self, key):
+        self.expire_keys()
+        return int(key in self.values)
+
+    def delete(self, key):
+        self.expiry.pop(key, None)
+        self.changed(key)
+        return int(self.values.pop(key, None) is not None)
+
+    def pexpire(self, key, px):
+        self.expire_keys()
+        if key not in self.values:
+            return False
+        self.expiry[key] = time.time() + px / 1000
+        self.changed(key)
+        return True
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+        self.changed(key)
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        self.changed(key)
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lindex(self, key, index):
+        items = self.lists.get(key, [])
+        return items[index] if -len(items) <= index < len(items) else None
+
+    def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        for i in range(len(items) - 1, -1, -1):
+            if items[i] == value:
+                del items[i]
+                self.changed(key)
+                return 1
+        return 0
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+        self.changed(key)
+
+    def hsetnx(self, key, field, value):
+        if field in self.hashes.get(key, {}):
+            return False
+        self.hset(key, field, value)
+        return True
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+        self.changed(key)
+
+    def zrem(self, key, member):
+        self.changed(key)
+        return int(self.sorted_sets.get(key, {}).pop(member, None) is not None)
+
+    def zrangebyscore(self, key, min_score, max_score, start=None, num=None):
+        members = sorted(
+            (score, member) for member, score in self.sorted_sets.get(key, {}).items() if float(min_score) <= score <= float(max_score)
+        )
+        members = [member for _, member in members]
+        return members[start : start + num] if start is not None else members
+
+
+class FakePipeline:
+    """Like a redis-py transaction pipeline: commands run immediately until multi(), then are queued until execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.watched = {}
+        self.queued = None
+
+    def watch(self, *keys):
+        for key in keys:
+            self.watched[key] = self.redis.version(key)
+
+    def multi(self):
+        self.queued = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        if self.queued is None:
+            return command
+        return lambda *args, **kwargs: self.queued.append((command, args, kwargs))
+
+    def execute(self):
+        before_execute, self.redis.before_execute = self.redis.before_execute, None
+        if before_execute is not None:
+            before_execute()
+        if any(self.redis.version(key) != version for key, version in self.watched.items()):
+            raise WatchedKeyChanged()
+        return [command(*args, **kwargs) for command, args, kwargs in self.queued or []]
+
+
+class JobQueueTestMixin:
+    def test_each_job_is_claimed_by_only_one_worker(self):
+        # Arrange
+        self.assertEqual(self.job_queue.enqueue(["video1.mp4", "video2.mp4"]), 2)
+        self.assertEqual(self.job_queue.enqueue(["video1.mp4"]), 0)
+
+        # Act
+        claims = [self.job_queue.claim(f"worker{i}", lease_seconds=60) for i in range(3)]
+
+        # Assert
+        self.assertEqual(sorted(claims[:2]), ["video1.mp4", "video2.mp4"])
+        self.assertIsNone(claims[2])
+        self.assertFalse(self.job_queue.is_drained())
+
+    def test_expired_lease_is_reclaimed_by_another_worker(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("crashed-worker", lease_seconds=0.05)
+
+        # Act
+        time.sleep(0.1)
+        claimed = self.job_queue.claim("worker2", lease_seconds=60)
+
+        # Assert
+        self.assertEqual(claimed, "video1.mp4")
+        self.assertFalse(self.job_queue.heartbeat("video1.mp4", "crashed-worker", 60))
+        self.assertTrue(self.job_queue.heartbeat("video1.mp4", "worker2", 60))
+
+    def test_heartbeat_keeps_lease_alive(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("worker1", lease_seconds=0.2)
+
+        # Act
+        time.sleep(0.1)
+        self.assertTrue(self.job_queue.heartbeat("video1.mp4", "worker1", 60))
+        time.sleep(0.15)
+
+        # Assert
+        self.assertIsNone(self.job_queue.claim("worker2", lease_seconds=60))
+
+    def test_released_job_waits_out_its_delay(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("worker1", lease_seconds=60)
+
+        # Act
+        self.job_queue.release("video1.mp4", "worker1", delay_seconds=0.1, error="Server error")
+
+        # Assert
+        self.assertIsNone(self.job_queue.claim("worker2", lease_seconds=60))
+        time.sleep(0.15)
+        self.assertEqual(self.job_queue.claim("worker2", lease_seconds=60), "video1.mp4")
+
+    def test_completed_and_failed_jobs_drain_the_queue(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4", "video2.mp4"])
+
+        # Act
+        for worker_id in ["worker1", "worker2"]:
+            video_file = self.job_queue.claim(worker_id, lease_seconds=60)
+            if video_file == "video1.mp4":
+                self.job_queue.complete(video_file, worker_id, {"input_filename": video_file, "youtube_id": td.sample_video_id})
+            else:
+                self.job_queue.fail(video_file, worker_id, "Invalid file")
+
+        # Assert
+        counts = self.job_queue.counts()
+        self.assertEqual(counts[JOB_STATUS_DONE], 1)
+        self.assertEqual(counts[JOB_STATUS_FAILED], 1)
+        self.assertTrue(self.job_queue.is_drained())
+
+
+class SQLiteJobQueueTest(JobQueueTestMixin, TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.job_queue = open_job_queue(f"sqlite:///{os.path.join(self.temp_dir.name, 'queue.db')}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+class RedisJobQueueTest(JobQueueTestMixin, TestCase):
+    def setUp(self):
+        self.job_queue = RedisJobQueue(FakeRedis())
+
+    def test_claim_only_checks_expired_leases(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4", "video2.mp4", "video3.mp4"])
+        self.job_queue.claim("worker1", lease_seconds=60)
+        self.job_queue.claim("worker2", lease_seconds=60)
+        self.job_queue.client.hgetall = MagicMock(side_effect=AssertionError("claim must not scan every job"))
+
+        # Act
+        claimed = self.job_queue.claim("worker3", lease_seconds=60)
+
+        # Assert
+        self.assertEqual(claimed, "video3.mp4")
+        self.assertEqual(len(self.job_queue.client.sorted_sets[self.job_queue.key("leases")]), 3)
+
+    def test_job_reclaimed_by_two_workers_at_once_is_only_requeued_once(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("crashed-worker", lease_seconds=0.05)
+        time.sleep(0.1)
+        other_worker_queue = RedisJobQueue(self.job_queue.client)
+        self.job_queue.client.before_execute = other_worker_queue.reclaim_expired
+
+        # Act
+        self.job_queue.reclaim_expired()
+
+        # Assert
+        self.assertEqual(self.job_queue.client.lists[self.job_queue.key("pending")], ["video1.mp4"])
+        self.assertEqual(self.job_queue.counts()["pending"], 1)
+
+    def test_release_after_lease_was_reclaimed_does_not_requeue_the_job(self):
+        # Arrange
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("slow-worker", lease_seconds=0.05)
+        time.sleep(0.1)
+        self.job_queue.claim("worker2", lease_seconds=60)
+
+        # Act
+        self.job_queue.release("video1.mp4", "slow-worker", error="Server error")
+
+        # Assert
+        self.assertEqual(self.job_queue.client.lists[self.job_queue.key("pending")], [])
+        self.assertIsNone(self.job_queue.claim("worker3", lease_seconds=60))
+        self.assertTrue(self.job_queue.heartbeat("video1.mp4", "worker2", 60))
+
+
+class JobQueueBaseTest(TestCase):
+    def test_backend_missing_a_method_cannot_be_created(self):
+        # Arrange
+        class IncompleteJobQueue(JobQueue):
+            def enqueue(self, video_files):
+                return 0
+
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            IncompleteJobQueue()
+
+
+class UploadWorkerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.job_queue = SQLiteJobQueue(os.path.join(self.temp_dir.name, "queue.db"))
+
+        self.uploader = MagicMock(logger=td.mock_logger, retry_queue=None, quota_exceeded=False)
+        self.uploader.deferred_video_files = set()
+        self.uploader.should_stop_processing.return_value = False
+        self.uploader.wait_or_stop.return_value = True
+        self.uploader.find_input_files.return_value = ["video1.mp4", "video2.mp4", "video3.mp4"]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_workers_share_the_queue_without_duplicate_uploads(self):
+        # Arrange
+        self.uploader.process_video_file.side_effect = lambda video_file: {"input_filename": video_file, "youtube_id": td.sample_video_id}
+        self.job_queue.enqueue(["video1.mp4"])
+        self.job_queue.claim("other-worker", lease_seconds=60)
+
+        # Act
+        result = UploadWorker(self.uploader, self.job_queue, worker_id="worker1", poll_interval_seconds=0).run()
+
+        # Assert
+        self.assertEqual([video["input_filename"] for video in result], ["video2.mp4", "video3.mp4"])
+        self.assertEqual(self.job_queue.counts()[JOB_STATUS_DONE], 2)
+
+    def test_worker_exits_when_only_deferred_jobs_remain(self):
+        # Arrange
+        def defer(video_file):
+            self.uploader.deferred_video_files.add(video_file)
+            return None
+
+        self.uploader.process_video_file.side_effect = defer
+        self.uploader.find_input_files.return_value = ["video1.mp4"]
+
+        # Act
+        result = UploadWorker(self.uploader, self.job_queue, worker_id="worker1", poll_interval_seconds=0).run()
+
+        # Assert
+        self.assertEqual(result, [])
+        self.uploader.process_video_file.assert_called_once_with("video1.mp4")
+        self.assertFalse(self.job_queue.is_drained())
+
+
+if __name__ == "__main__":
+    unittest.main()
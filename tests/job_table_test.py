@@ -0,0 +1,119 @@
+import time
+import unittest
+from unittest import TestCase
+import test_data as td
+from youtube_bulk_upload.progress import ProgressTracker
+from youtube_bulk_upload.job_table import (
+    JOB_STATUS_FAILED,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_SKIPPED,
+    JOB_STATUS_UPLOADED,
+    JOB_STATUS_UPLOADING,
+    JobTableModel,
+)
+
+MB = 1024 * 1024
+
+
+class JobTableModelTest(TestCase):
+    def setUp(self):
+        self.model = JobTableModel()
+        self.tracker = ProgressTracker(td.mock_logger, min_interval_seconds=0)
+        self.tracker.subscribe(self.model.handle_progress_event)
+        self.tracker.add_batch_listener(self.model.set_batch)
+
+    def start_batch(self, batch_job_bytes):
+        self.tracker.file_size = batch_job_bytes.get
+        self.tracker.start_batch(list(batch_job_bytes))
+
+    def test_rows_follow_job_progress_events(self):
+        # Arrange
+        self.start_batch({"/videos/a.mp4": 10 * MB, "/videos/b.mp4": 4 * MB, "/videos/c.mp4": 2 * MB, "/videos/d.mp4": 1 * MB})
+
+        # Act
+        self.tracker.start_job("/videos/a.mp4", total_bytes=10 * MB)
+        self.tracker.update_job("/videos/a.mp4", 5 * MB)
+        self.tracker.start_job("/videos/b.mp4", total_bytes=4 * MB)
+        self.tracker.finish_job("/videos/b.mp4", youtube_id="abc123")
+        self.tracker.finish_job("/videos/c.mp4", succeeded=False, error="No valid thumbnail file found")
+        self.tracker.skip_job("/videos/d.mp4")
+
+        # Assert
+        self.assertEqual(self.model.row_values("/videos/a.mp4"), ("a.mp4", "10.0 MB", JOB_STATUS_UPLOADING, "50%", "", ""))
+        self.assertEqual(self.model.row_values("/videos/b.mp4"), ("b.mp4", "4.0 MB", JOB_STATUS_UPLOADED, "100%", "abc123", ""))
+        self.assertEqual(self.model.rows["/videos/c.mp4"].status, JOB_STATUS_FAILED)
+        self.assertEqual(self.model.rows["/videos/c.mp4"].error, "No valid thumbnail file found")
+        self.assertEqual(self.model.rows["/videos/d.mp4"].status, JOB_STATUS_SKIPPED)
+
+    def test_take_changes_returns_changes_since_last_call(self):
+        # Arrange
+        self.start_batch({"a.mp4": MB, "b.mp4": MB})
+
+        # Act
+        first_changes = self.model.take_changes()
+        self.tracker.start_job("b.mp4", total_bytes=MB)
+        second_changes = self.model.take_changes()
+        third_changes = self.model.take_changes()
+
+        # Assert
+        self.assertEqual(first_changes, (set(), True))
+        self.assertEqual(second_changes, ({"b.mp4"}, False))
+        self.assertEqual(third_changes, (set(), False))
+
+    def test_jobs_outside_a_batch_get_a_row(self):
+        # Arrange, Act
+        self.tracker.start_job("claimed.mp4", total_bytes=MB)
+
+        # Assert
+        self.assertEqual(self.model.take_changes(), ({"claimed.mp4"}, True))
+        self.assertEqual(self.model.rows["claimed.mp4"].status, JOB_STATUS_UPLOADING)
+
+    def test_new_batch_requeues_unfinished_rows_but_not_uploaded_ones(self):
+        # Arrange
+        self.start_batch({"a.mp4": MB, "b.mp4": MB})
+        self.tracker.finish_job("a.mp4", youtube_id="abc123")
+        self.tracker.finish_job("b.mp4", succeeded=False, error="Quota exceeded")
+
+        # Act
+        self.start_batch({"a.mp4": MB, "b.mp4": MB})
+
+        # Assert
+        self.assertEqual(self.model.rows["a.mp4"].status, JOB_STATUS_UPLOADED)
+        self.assertEqual(self.model.rows["b.mp4"].status, JOB_STATUS_QUEUED)
+        self.assertEqual(self.model.rows["b.mp4"].error, "")
+
+    def test_visible_job_ids_filters_and_sorts(self):
+        # Arrange
+        self.start_batch({"c_song.mp4": 3 * MB, "a_song.mp4": 1 * MB, "b_talk.mp4": 2 * MB})
+        self.tracker.finish_job("b_talk.mp4", succeeded=False, error="Upload limit exceeded")
+
+        # Act & Assert
+        self.assertEqual(self.model.visible_job_ids(), ["c_song.mp4", "a_song.mp4", "b_talk.mp4"])
+        self.assertEqual(self.model.visible_job_ids(sort_column="file"), ["a_song.mp4", "b_talk.mp4", "c_song.mp4"])
+        self.assertEqual(self.model.visible_job_ids(sort_column="size", descending=True), ["c_song.mp4", "b_talk.mp4", "a_song.mp4"])
+        self.assertEqual(self.model.visible_job_ids(filter_text="SONG"), ["c_song.mp4", "a_song.mp4"])
+        self.assertEqual(self.model.visible_job_ids(filter_text="limit"), ["b_talk.mp4"])
+        self.assertEqual(self.model.visible_job_ids(status=JOB_STATUS_QUEUED, sort_column="file"), ["a_song.mp4", "c_song.mp4"])
+
+    def test_large_batch_is_filtered_and_sorted_quickly(self):
+        # Arrange
+        self.start_batch({f"/videos/video_{i:05d}.mp4": i * 1000 for i in range(50000)})
+        for i in range(0, 50000, 7):
+            self.tracker.skip_job(f"/videos/video_{i:05d}.mp4")
+
+        # Act
+        start = time.perf_counter()
+        sorted_job_ids = self.model.visible_job_ids(sort_column="size", descending=True)
+        filtered_job_ids = self.model.visible_job_ids(filter_text="video_4", status=JOB_STATUS_SKIPPED, sort_column="file")
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertEqual(len(sorted_job_ids), 50000)
+        self.assertEqual(sorted_job_ids[0], "/videos/video_49999.mp4")
+        self.assertEqual(len(filtered_job_ids), 1428)
+        self.assertEqual(self.model.status_counts()[JOB_STATUS_SKIPPED], 7143)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+import io
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import unittest
+from unittest import TestCase
+from youtube_bulk_upload.log_handlers import (
+    JOB_LOG_FIELDS,
+    BufferedLogWriter,
+    JsonLinesFormatter,
+    QueueLogHandler,
+    TeeStream,
+    job_log_fields,
+)
+
+
+class QueueLogHandlerTest(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.handlers.clear()
+
+    def test_drain_returns_records_in_batches_oldest_first(self):
+        # Arrange
+        handler = QueueLogHandler()
+        self.logger.addHandler(handler)
+        for i in range(5):
+            self.logger.info(f"message {i}")
+
+        # Act
+        first_batch = handler.drain(3)
+        second_batch = handler.drain(3)
+
+        # Assert
+        self.assertEqual([message for _, message in first_batch], ["message 0", "message 1", "message 2"])
+        self.assertEqual([message for _, message in second_batch], ["message 3", "message 4"])
+        self.assertEqual(handler.drain(3), [])
+
+    def test_records_below_handler_level_are_not_queued(self):
+        # Arrange
+        handler = QueueLogHandler(level=logging.INFO)
+        self.logger.addHandler(handler)
+
+        # Act
+        self.logger.debug("hidden")
+        self.logger.warning("shown")
+
+        # Assert
+        self.assertEqual(handler.drain(10), [(logging.WARNING, "shown")])
+
+    def test_queue_is_bounded_and_reports_dropped_records(self):
+        # Arrange
+        handler = QueueLogHandler(max_queued_records=3)
+        self.logger.addHandler(handler)
+
+        # Act
+        for i in range(5):
+            self.logger.info(f"message {i}")
+        batch = handler.drain(10)
+
+        # Assert
+        self.assertIn("2 log messages not shown", batch[0][1])
+        self.assertEqual([message for _, message in batch[1:]], ["message 2", "message 3", "message 4"])
+
+    def test_concurrent_logging_threads_lose_no_records(self):
+        # Arrange
+        handler = QueueLogHandler()
+        self.logger.addHandler(handler)
+
+        def log_messages():
+            for i in range(500):
+                self.logger.debug(f"message {i}")
+
+        # Act
+        threads = [threading.Thread(target=log_messages) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(len(handler.drain(10000)), 2000)
+
+
+class BufferedLogWriterTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "youtube_bulk_upload.log")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_log_file(self, path=None):
+        with open(path or self.log_file, encoding="utf-8") as f:
+            return f.read()
+
+    def test_close_writes_all_queued_messages_from_every_thread(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, flush_interval_seconds=60)
+
+        def write_lines(thread_number):
+            for i in range(500):
+                writer.write(f"thread {thread_number} line {i}\n")
+
+        threads = [threading.Thread(target=write_lines, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Act
+        writer.close()
+
+        # Assert
+        lines = self.read_log_file().splitlines()
+        self.assertEqual(len(lines), 2000)
+        self.assertIn("thread 3 line 499", lines)
+
+    def test_messages_are_buffered_until_the_flush_interval(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, flush_interval_seconds=0.2)
+
+        # Act
+        writer.write("first message\n")
+        before_interval = self.read_log_file()
+        time.sleep(0.5)
+        after_interval = self.read_log_file()
+        writer.close()
+
+        # Assert
+        self.assertEqual(before_interval, "")
+        self.assertEqual(after_interval, "first message\n")
+
+    def test_messages_are_written_once_flush_size_is_reached(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, flush_interval_seconds=60, flush_size_bytes=100)
+
+        # Act
+        for i in range(20):
+            writer.write(f"message {i}\n")
+        time.sleep(0.2)
+        contents = self.read_log_file()
+        writer.close()
+
+        # Assert
+        self.assertIn("message 0\n", contents)
+
+    def test_flush_waits_for_messages_to_reach_the_file(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, flush_interval_seconds=60)
+        writer.write("flushed message\n")
+
+        # Act
+        writer.flush()
+
+        # Assert
+        self.assertEqual(self.read_log_file(), "flushed message\n")
+        writer.close()
+
+    def test_log_file_is_rotated_when_it_reaches_max_bytes(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, max_bytes=100, backup_count=2, flush_interval_seconds=60)
+
+        # Act
+        for i in range(4):
+            writer.write(f"batch {i} " + "x" * 100 + "\n")
+            writer.flush()
+        writer.close()
+
+        # Assert
+        self.assertIn("batch 3", self.read_log_file(f"{self.log_file}.1"))
+        self.assertIn("batch 2", self.read_log_file(f"{self.log_file}.2"))
+        self.assertFalse(os.path.exists(f"{self.log_file}.3"))
+        self.assertEqual(self.read_log_file(), "")
+
+    def test_tee_stream_writes_to_stream_and_log_file(self):
+        # Arrange
+        writer = BufferedLogWriter(self.log_file, flush_interval_seconds=60)
+        stream = io.StringIO()
+        tee = TeeStream(stream, writer)
+
+        # Act
+        print("hello", file=tee, flush=True)
+        console_output = stream.getvalue()
+        file_before_close = self.read_log_file()
+        writer.close()
+
+        # Assert
+        self.assertEqual(console_output, "hello\n")
+        self.assertEqual(file_before_close, "")
+        self.assertEqual(self.read_log_file(), "hello\n")
+
+
+class JsonLinesFormatterTest(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.stream = io.StringIO()
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(JsonLinesFormatter())
+        self.logger.addHandler(handler)
+
+    def tearDown(self):
+        self.logger.handlers.clear()
+
+    def log_entries(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_job_fields_are_included(self):
+        # Act
+        self.logger.info(
+            "Uploaded video to YouTube: %s",
+            "https://www.youtube.com/watch?v=abc123",
+            extra=job_log_fields("/videos/song.mp4", "upload", duration_seconds=1.5, bytes=2048, youtube_id="abc123"),
+        )
+
+        # Assert
+        [entry] = self.log_entries()
+        self.assertEqual(entry["message"], "Uploaded video to YouTube: https://www.youtube.com/watch?v=abc123")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(
+            {field: entry[field] for field in JOB_LOG_FIELDS},
+            {
+                "job_id": "/videos/song.mp4",
+                "file": "song.mp4",
+                "stage": "upload",
+                "duration_seconds": 1.5,
+                "bytes": 2048,
+                "youtube_id": "abc123",
+            },
+        )
+        self.assertRegex(entry["time"], r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$")
+
+    def test_other_messages_have_null_job_fields_and_exceptions(self):
+        # Act
+        try:
+            raise ValueError("bad chunk")
+        except ValueError:
+            self.logger.exception("Upload failed")
+
+        # Assert
+        [entry] = self.log_entries()
+        self.assertEqual([entry[field] for field in JOB_LOG_FIELDS], [None] * len(JOB_LOG_FIELDS))
+        self.assertIn("ValueError: bad chunk", entry["exception"])
+
+
+if __name__ == "__main__":
+    unittest.main()
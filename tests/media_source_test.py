@@ -0,0 +1,195 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import call, patch
+from benchmarks.upload_benchmark import create_video_files, run_scenario
+from youtube_bulk_upload.media_source import FADVISE_SUPPORTED, ReadAheadMediaSource
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReadAheadFileTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.video_file = os.path.join(self.temp_dir.name, "video.mp4")
+        self.data = os.urandom(5 * CHUNK_SIZE + 123)
+        with open(self.video_file, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_next_chunks_are_read_ahead_while_the_current_one_is_read(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE, read_ahead_chunks=2)
+        self.addCleanup(source.close)
+        media_file = source.open(self.video_file)
+
+        # Act
+        first_block = media_file.read(8192)
+        read_ahead = dict(media_file._read_ahead)
+        blocks = [first_block] + list(iter(lambda: media_file.read(8192), b""))
+        media_file.close()
+
+        # Assert
+        self.assertEqual(sorted(read_ahead), [1, 2])
+        self.assertEqual(read_ahead[1].result(timeout=10), self.data[CHUNK_SIZE : 2 * CHUNK_SIZE])
+        self.assertEqual(b"".join(blocks), self.data)
+        self.assertEqual(source.buffered_bytes, 0)
+
+    def test_seeking_back_to_resume_an_upload_rereads_from_the_file(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE)
+        self.addCleanup(source.close)
+        media_file = source.open(self.video_file)
+        media_file.read(3 * CHUNK_SIZE)
+
+        # Act
+        size = media_file.seek(0, io.SEEK_END)
+        media_file.seek(CHUNK_SIZE + 10)
+        resumed = media_file.read(2 * CHUNK_SIZE)
+        media_file.close()
+
+        # Assert
+        self.assertEqual(size, len(self.data))
+        self.assertEqual(resumed, self.data[CHUNK_SIZE + 10 : 3 * CHUNK_SIZE + 10])
+        self.assertEqual(source.buffered_bytes, 0)
+
+    def test_read_ahead_over_all_open_files_is_capped(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE, read_ahead_chunks=4, max_buffer_bytes=3 * CHUNK_SIZE)
+        self.addCleanup(source.close)
+        media_files = [source.open(self.video_file) for _ in range(2)]
+
+        # Act
+        contents = [media_file.read(100) for media_file in media_files]
+        buffered_bytes = source.buffered_bytes
+        read_ahead_counts = [len(media_file._read_ahead) for media_file in media_files]
+        contents = [content + media_file.read() for content, media_file in zip(contents, media_files)]
+
+        # Assert
+        self.assertEqual(buffered_bytes, 3 * CHUNK_SIZE)
+        self.assertEqual(read_ahead_counts, [3, 0])
+        self.assertEqual(contents, [self.data, self.data])
+
+    def test_chunk_discarded_while_being_read_keeps_its_buffer_until_the_read_finishes(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE, read_ahead_chunks=1, max_workers=1)
+        self.addCleanup(source.close)
+        media_file = source.open(self.video_file)
+        read_chunk = media_file.read_chunk
+        read_ahead_started, finish_read_ahead = threading.Event(), threading.Event()
+
+        def slow_read_ahead(index):
+            if threading.current_thread() is not threading.main_thread():
+                read_ahead_started.set()
+                finish_read_ahead.wait(timeout=10)
+            return read_chunk(index)
+
+        media_file.read_chunk = slow_read_ahead
+        media_file.read(100)
+        read_ahead_started.wait(timeout=10)
+
+        # Act
+        media_file.seek(4 * CHUNK_SIZE)
+        media_file.read(100)
+        buffered_bytes_while_reading = source.buffered_bytes
+        finish_read_ahead.set()
+        media_file.close()
+        source.close()
+
+        # Assert
+        self.assertEqual(buffered_bytes_while_reading, 2 * CHUNK_SIZE)
+        self.assertEqual(source.buffered_bytes, 0)
+
+    def test_file_still_open_when_source_is_closed_reads_cancelled_chunks_itself(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE, read_ahead_chunks=2, max_workers=1)
+        self.addCleanup(source.close)
+        media_file = source.open(self.video_file)
+        read_chunk = media_file.read_chunk
+        read_ahead_started, finish_read_ahead = threading.Event(), threading.Event()
+
+        def slow_read_ahead(index):
+            if threading.current_thread() is not threading.main_thread():
+                read_ahead_started.set()
+                finish_read_ahead.wait(timeout=10)
+            return read_chunk(index)
+
+        media_file.read_chunk = slow_read_ahead
+        first_block = media_file.read(100)
+        read_ahead_started.wait(timeout=10)
+        queued_read_ahead = media_file._read_ahead[2]
+
+        # Act
+        close_thread = threading.Thread(target=source.close)
+        close_thread.start()
+        while not queued_read_ahead.cancelled():
+            time.sleep(0.01)
+        finish_read_ahead.set()
+        close_thread.join(timeout=10)
+        content = first_block + media_file.read()
+        media_file.close()
+        source.close()
+
+        # Assert
+        self.assertTrue(queued_read_ahead.cancelled())
+        self.assertEqual(content, self.data)
+        self.assertEqual(source.buffered_bytes, 0)
+
+    @unittest.skipUnless(FADVISE_SUPPORTED, "posix_fadvise isn't available on this platform")
+    def test_drop_page_cache_drops_each_chunk_once_the_upload_moves_past_it(self):
+        # Arrange
+        source = ReadAheadMediaSource(chunk_size=CHUNK_SIZE, read_ahead_chunks=0, drop_page_cache=True)
+        self.addCleanup(source.close)
+
+        # Act
+        with patch("youtube_bulk_upload.media_source.os.posix_fadvise") as mock_fadvise:
+            media_file = source.open(self.video_file)
+            first_chunks = media_file.read(2 * CHUNK_SIZE)
+            resumed = [media_file.seek(CHUNK_SIZE), media_file.read(CHUNK_SIZE)]
+            media_file.seek(4 * CHUNK_SIZE)
+            last_chunks = media_file.read()
+            media_file.close()
+
+        # Assert
+        self.assertEqual(first_chunks + last_chunks, self.data[: 2 * CHUNK_SIZE] + self.data[4 * CHUNK_SIZE :])
+        self.assertEqual(resumed[1], self.data[CHUNK_SIZE : 2 * CHUNK_SIZE])
+        fileno = mock_fadvise.call_args_list[0].args[0]
+        self.assertEqual(
+            mock_fadvise.call_args_list,
+            [
+                call(fileno, 0, 0, os.POSIX_FADV_SEQUENTIAL),
+                call(fileno, 0, CHUNK_SIZE, os.POSIX_FADV_DONTNEED),
+                call(fileno, CHUNK_SIZE, 3 * CHUNK_SIZE, os.POSIX_FADV_DONTNEED),
+                call(fileno, 4 * CHUNK_SIZE, CHUNK_SIZE, os.POSIX_FADV_DONTNEED),
+                call(fileno, 0, 0, os.POSIX_FADV_DONTNEED),
+            ],
+        )
+
+
+class ReadAheadUploadTest(TestCase):
+    def test_uploads_against_fake_server_with_read_ahead(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Arrange
+            source = ReadAheadMediaSource(read_ahead_chunks=2)
+            self.addCleanup(source.close)
+            video_directory = os.path.join(temp_dir, "videos")
+            os.mkdir(video_directory)
+            video_files = create_video_files(video_directory, 2, 12 * 1024 * 1024)
+
+            # Act
+            result = run_scenario("baseline", video_files, temp_dir, 0, media_source=source)
+
+        # Assert
+        self.assertEqual(result["uploaded"], 2)
+        self.assertEqual(result["upload_chunks"], 6)
+        self.assertEqual(source.buffered_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import time
+import unittest
+import urllib.request
+from unittest import TestCase
+from benchmarks.upload_benchmark import create_video_files, run_scenario
+from benchmarks.fake_server import QUOTA_COSTS
+from youtube_bulk_upload.metrics import OPENMETRICS_CONTENT_TYPE, Metric, NullUploadMetrics, UploadMetrics
+
+MB = 1024 * 1024
+
+
+class UploadMetricsTest(TestCase):
+    def test_render_openmetrics_histograms_and_counters(self):
+        # Arrange
+        metrics = UploadMetrics(buckets=(0.1, 1))
+        metrics.stage_seconds.observe(0.05, stage="title")
+        metrics.stage_seconds.observe(0.5, stage="title")
+        metrics.stage_seconds.observe(5, stage="title")
+        metrics.record_uploaded_bytes(1024)
+        metrics.record_video("uploaded")
+
+        # Act
+        text = metrics.render_openmetrics()
+
+        # Assert
+        lines = text.splitlines()
+        self.assertIn("# TYPE youtube_bulk_upload_stage_duration_seconds histogram", lines)
+        self.assertIn('youtube_bulk_upload_stage_duration_seconds_bucket{stage="title",le="0.1"} 1', lines)
+        self.assertIn('youtube_bulk_upload_stage_duration_seconds_bucket{stage="title",le="1.0"} 2', lines)
+        self.assertIn('youtube_bulk_upload_stage_duration_seconds_bucket{stage="title",le="+Inf"} 3', lines)
+        self.assertIn('youtube_bulk_upload_stage_duration_seconds_count{stage="title"} 3', lines)
+        self.assertIn('youtube_bulk_upload_stage_duration_seconds_sum{stage="title"} 5.55', lines)
+        self.assertIn("youtube_bulk_upload_uploaded_bytes_total 1024", lines)
+        self.assertIn('youtube_bulk_upload_videos_total{outcome="uploaded"} 1', lines)
+        self.assertIn("youtube_bulk_upload_uploads_in_flight 0", lines)
+        self.assertEqual(lines[-1], "# EOF")
+
+    def test_api_call_counts_outcome_and_quota_even_when_it_fails(self):
+        # Arrange
+        metrics = UploadMetrics()
+
+        # Act
+        with metrics.api_call("search.list"):
+            pass
+        with self.assertRaises(ValueError):
+            with metrics.api_call("videos.insert"):
+                raise ValueError("upload failed")
+
+        # Assert
+        self.assertEqual(metrics.api_calls.value(method="search.list", outcome="success"), 1)
+        self.assertEqual(metrics.api_calls.value(method="videos.insert", outcome="error"), 1)
+        self.assertEqual(metrics.quota_units.value(method="search.list"), QUOTA_COSTS["search.list"])
+        self.assertEqual(metrics.quota_units.value(method="videos.insert"), QUOTA_COSTS["videos.insert"])
+
+    def test_label_values_are_escaped(self):
+        # Arrange
+        metrics = UploadMetrics()
+        metrics.record_video('say "hi"\\now')
+
+        # Act
+        text = metrics.render_openmetrics()
+
+        # Assert
+        self.assertIn('youtube_bulk_upload_videos_total{outcome="say \\"hi\\"\\\\now"} 1', text)
+
+    def test_write_openmetrics_file_and_summary(self):
+        # Arrange
+        metrics = UploadMetrics()
+        with metrics.stage("duplicate_search"):
+            pass
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics_file = os.path.join(temp_dir, "youtube_bulk_upload.prom")
+
+            # Act
+            metrics.write_openmetrics_file(metrics_file)
+
+            # Assert
+            with open(metrics_file, encoding="utf-8") as f:
+                self.assertEqual(f.read(), metrics.render_openmetrics())
+            self.assertEqual(os.listdir(temp_dir), ["youtube_bulk_upload.prom"])
+        summary = metrics.summary_lines()
+        self.assertTrue(summary[1].startswith("duplicate_search"))
+        self.assertIn("videos: none", summary)
+
+    def test_serve_metrics_endpoint(self):
+        # Arrange
+        metrics = UploadMetrics()
+        metrics.record_retry()
+        server = metrics.serve(0)
+        self.addCleanup(server.stop)
+
+        # Act
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            body = response.read().decode("utf-8")
+
+        # Assert
+        self.assertEqual(content_type, OPENMETRICS_CONTENT_TYPE)
+        self.assertIn("youtube_bulk_upload_retries_total 1", body.splitlines())
+
+    def test_null_metrics_are_cheap_no_ops(self):
+        # Arrange
+        metrics = NullUploadMetrics()
+        iterations = 100000
+
+        # Act
+        start = time.perf_counter()
+        for _ in range(iterations):
+            with metrics.stage("upload_chunk"):
+                metrics.record_uploaded_bytes(1)
+        elapsed = time.perf_counter() - start
+
+        # Assert (a generous bound, it's well under a microsecond per chunk on a typical machine)
+        self.assertFalse(metrics.enabled)
+        self.assertLess(elapsed / iterations, 20e-6)
+
+    def test_metric_without_render_cannot_be_created(self):
+        # Arrange
+        class UnrenderableMetric(Metric):
+            pass
+
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            UnrenderableMetric("unrenderable", "Has no render method")
+
+
+class UploadMetricsInstrumentationTest(TestCase):
+    def test_run_against_fake_server_matches_server_counts(self):
+        # Arrange
+        metrics = UploadMetrics()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            video_directory = os.path.join(temp_dir, "videos")
+            os.mkdir(video_directory)
+            video_files = create_video_files(video_directory, 2, 6 * MB)
+
+            # Act
+            result = run_scenario("baseline", video_files, temp_dir, 0, metrics=metrics)
+
+        # Assert
+        self.assertEqual(result["uploaded"], 2)
+        self.assertEqual(metrics.uploaded_bytes.value(), 12 * MB)
+        self.assertEqual(sum(metrics.quota_units.values.values()), result["quota_used"])
+        for api_method, count in result["api_calls"].items():
+            self.assertEqual(metrics.api_calls.value(method=api_method, outcome="success"), count)
+        stage_counts = {dict(labels)["stage"]: count for labels, count, _, _ in metrics.stage_seconds.snapshot()}
+        self.assertEqual(
+            stage_counts,
+            {"title": 2, "description": 2, "thumbnail_lookup": 2, "duplicate_search": 2, "upload_chunk": 4, "thumbnail_set": 2},
+        )
+        self.assertEqual(metrics.videos.value(outcome="uploaded"), 2)
+        self.assertEqual(metrics.uploads_in_flight.current, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
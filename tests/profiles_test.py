@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import test_data as td
+from youtube_bulk_upload.bulk_upload import YouTubeBulkUpload
+from youtube_bulk_upload.profiles import (
+    ROUTING_RULE,
+    CredentialProfile,
+    CredentialProfileRouter,
+    load_credential_profiles,
+)
+
+
+class CredentialProfileRouterTest(TestCase):
+    def setUp(self):
+        self.first = CredentialProfile("first", "first.json", upload_batch_limit=1)
+        self.second = CredentialProfile("second", "second.json", upload_batch_limit=1)
+
+    def test_round_robin_alternates_and_skips_profiles_without_budget(self):
+        # Arrange
+        router = CredentialProfileRouter([self.first, self.second])
+
+        # Act
+        first_choice = router.select("video1.mp4")
+        first_choice.uploaded_count += 1
+        second_choice = router.select("video2.mp4")
+        second_choice.uploaded_count += 1
+
+        # Assert
+        self.assertIs(first_choice, self.first)
+        self.assertIs(second_choice, self.second)
+        self.assertIsNone(router.select("video3.mp4"))
+        self.assertFalse(router.any_available())
+
+    def test_rule_routing_never_falls_back_to_other_profiles(self):
+        # Arrange
+        shorts = CredentialProfile("shorts", "shorts.json", match=r"_short\.mp4$")
+        shorts.quota_exceeded = True
+        router = CredentialProfileRouter([shorts, self.first], routing=ROUTING_RULE)
+
+        # Act & Assert
+        self.assertIsNone(router.select("clip_short.mp4"))
+        self.assertIs(router.select("video.mp4"), self.first)
+
+    def test_invalid_routing_raises_exception(self):
+        with self.assertRaises(Exception):
+            CredentialProfileRouter([self.first], routing="random")
+
+    def test_load_credential_profiles_rejects_duplicate_names(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profiles_file = os.path.join(temp_dir, "profiles.json")
+            with open(profiles_file, "w") as f:
+                json.dump([{"name": "a", "client_secrets_file": "a.json"}, {"name": "a", "client_secrets_file": "b.json"}], f)
+
+            # Act & Assert
+            with self.assertRaises(Exception):
+                load_credential_profiles(profiles_file)
+
+    def test_profiles_sharing_a_client_secrets_file_get_their_own_token_files(self):
+        # Arrange
+        first = CredentialProfile("first", "client_secret.json")
+        second = CredentialProfile("second", "client_secret.json")
+        explicit = CredentialProfile("explicit", "client_secret.json", token_file="explicit-token.json")
+
+        # Act & Assert
+        self.assertNotEqual(first.resolve_token_file(), second.resolve_token_file())
+        self.assertEqual(explicit.resolve_token_file(), "explicit-token.json")
+
+
+class YouTubeBulkUploadProfilesTest(TestCase):
+    def setUp(self):
+        self.first = CredentialProfile("first", "first.json", upload_batch_limit=1)
+        self.second = CredentialProfile("second", "second.json", upload_batch_limit=5)
+
+        with (
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.validate_secrets_file"),
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.authenticate_youtube", side_effect=lambda *a, **k: MagicMock()),
+        ):
+            self.sample_uploader = YouTubeBulkUpload(
+                youtube_client_secrets_file=None,
+                logger=td.mock_logger,
+                interactive_prompt=False,
+                check_for_duplicate_titles=False,
+                retry_queue_file=None,
+                credential_profiles=[self.first, self.second],
+            )
+
+    def test_each_profile_gets_its_own_service_and_budgets_are_combined(self):
+        self.assertIsNot(self.first.youtube, self.second.youtube)
+        self.assertEqual(self.sample_uploader.upload_batch_limit, 6)
+
+    def test_each_profile_authenticates_with_its_own_token_file(self):
+        # Act
+        with (
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.validate_secrets_file"),
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.authenticate_youtube") as mock_authenticate,
+        ):
+            self.sample_uploader.authenticate_credential_profiles()
+
+        # Assert
+        token_files = [call.kwargs["token_file"] for call in mock_authenticate.call_args_list]
+        self.assertEqual(token_files, [self.first.resolve_token_file(), self.second.resolve_token_file()])
+        self.assertEqual(len(set(token_files)), 2)
+
+    def test_process_spreads_uploads_over_profiles_and_reports_per_profile(self):
+        # Arrange
+        used_services = []
+
+        def upload(*args):
+            used_services.append(self.sample_uploader.youtube)
+            return td.sample_video_id
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=None),
+            patch.object(self.sample_uploader, "upload_video_to_youtube_with_title_thumbnail", side_effect=upload),
+        ):
+            result = self.sample_uploader.process(input_files=["video1.mp4", "video2.mp4", "video3.mp4"])
+
+        # Assert
+        self.assertEqual([video["profile"] for video in result], ["first", "second", "second"])
+        self.assertEqual(used_services, [self.first.youtube, self.second.youtube, self.second.youtube])
+        self.assertEqual(self.sample_uploader.profile_report()["first"]["uploaded"], 1)
+        self.assertEqual(self.sample_uploader.profile_report()["second"]["uploaded"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import pstats
+import tempfile
+import threading
+import unittest
+from unittest import TestCase
+import test_data as td
+from youtube_bulk_upload.profiling import RunProfiler
+from youtube_bulk_upload.progress import ProgressTracker
+
+
+def busy_work(iterations: int) -> int:
+    return sum(i * i for i in range(iterations))
+
+
+def profiled_function_names(stats_file: str) -> set[str]:
+    return {function_name for _, _, function_name in pstats.Stats(stats_file).stats}
+
+
+class RunProfilerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_profile_includes_work_done_in_other_threads(self):
+        # Arrange
+        profiler = RunProfiler(self.temp_dir.name, td.mock_logger, run_name="run")
+
+        # Act
+        with profiler:
+            worker = threading.Thread(target=busy_work, args=(10000,), name="upload-worker")
+            worker.start()
+            worker.join()
+        artifacts = profiler.artifacts
+
+        # Assert
+        combined_stats_file = os.path.join(self.temp_dir.name, "run.prof")
+        summary_file = os.path.join(self.temp_dir.name, "run-summary.txt")
+        self.assertEqual(artifacts[:2], [combined_stats_file, summary_file])
+        self.assertIn("busy_work", profiled_function_names(combined_stats_file))
+        with open(summary_file, encoding="utf-8") as f:
+            self.assertIn("All threads, by cumulative time", f.read())
+        if sys.version_info < (3, 12):
+            [thread_stats_file] = [artifact for artifact in artifacts if "-thread-upload-worker-" in artifact]
+            self.assertIn("busy_work", profiled_function_names(thread_stats_file))
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "Python 3.12+ only has the combined profiler")
+    def test_thread_still_running_at_stop_turns_its_profiler_off_and_is_left_out(self):
+        # Arrange
+        profiler = RunProfiler(self.temp_dir.name, td.mock_logger, run_name="run")
+        work_started, finish_work = threading.Event(), threading.Event()
+        profiles_after_target = []
+
+        def slow_work():
+            work_started.set()
+            finish_work.wait(timeout=10)
+
+        class RecordingThread(threading.Thread):
+            def run(self):
+                super().run()
+                profiles_after_target.append(sys.getprofile())
+
+        # Act
+        with profiler:
+            worker = RecordingThread(target=slow_work, name="slow-worker")
+            worker.start()
+            work_started.wait(timeout=10)
+        running_at_stop = list(profiler.running_thread_profiles)
+        finish_work.set()
+        worker.join()
+
+        # Assert
+        self.assertEqual(running_at_stop, [f"slow-worker-{worker.ident}"])
+        self.assertEqual(profiles_after_target, [None])
+        self.assertEqual(profiler.running_thread_profiles, {})
+        self.assertEqual(profiler.thread_profiles, {})
+        self.assertFalse(any("-thread-slow-worker-" in artifact for artifact in profiler.artifacts))
+
+    def test_memory_snapshots_at_upload_boundaries(self):
+        # Arrange
+        profiler = RunProfiler(self.temp_dir.name, td.mock_logger, trace_memory=True, run_name="run")
+        progress_tracker = ProgressTracker(td.mock_logger)
+        progress_tracker.subscribe(profiler.on_progress_event)
+
+        # Act
+        with profiler:
+            progress_tracker.start_job("/videos/song.mp4", total_bytes=100)
+            kept = [bytearray(1024) for _ in range(100)]
+            progress_tracker.finish_job("/videos/song.mp4", youtube_id="abc123")
+
+        # Assert
+        with open(os.path.join(self.temp_dir.name, "run-memory.txt"), encoding="utf-8") as f:
+            memory_report = f.read()
+        labels = ["run start", "started song.mp4", "completed song.mp4", "run end"]
+        positions = [memory_report.find(f"] {label}: current") for label in labels]
+        self.assertNotIn(-1, positions)
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn("profiling_test.py", memory_report)
+        self.assertEqual(len(kept), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
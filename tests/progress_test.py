@@ -0,0 +1,209 @@
+import unittest
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+import test_data as td
+from youtube_bulk_upload.progress import (
+    PROGRESS_COMPLETED,
+    PROGRESS_FAILED,
+    PROGRESS_SKIPPED,
+    PROGRESS_STARTED,
+    PROGRESS_UPLOADING,
+    ProgressTracker,
+    format_bytes,
+    format_duration,
+)
+
+MB = 1024 * 1024
+
+
+class ProgressTrackerTest(TestCase):
+    def setUp(self):
+        self.tracker = ProgressTracker(td.mock_logger, min_interval_seconds=0, rate_smoothing=0.5)
+        self.events = []
+        self.tracker.subscribe(self.events.append)
+
+    def start_batch(self, batch_job_bytes):
+        with patch.object(self.tracker, "file_size", side_effect=batch_job_bytes.get):
+            self.tracker.start_batch(list(batch_job_bytes))
+
+    def test_job_events_carry_bytes_and_rates(self):
+        # Arrange
+        self.tracker.start_job("a.mp4", total_bytes=10 * MB, now=100)
+
+        # Act
+        self.tracker.update_job("a.mp4", 2 * MB, now=101)
+        self.tracker.update_job("a.mp4", 6 * MB, now=102)
+        self.tracker.finish_job("a.mp4", youtube_id="abc123", now=103)
+
+        # Assert
+        self.assertEqual(
+            [event.state for event in self.events], [PROGRESS_STARTED, PROGRESS_UPLOADING, PROGRESS_UPLOADING, PROGRESS_COMPLETED]
+        )
+        event = self.events[2]
+        self.assertEqual(event.bytes_sent, 6 * MB)
+        self.assertEqual(event.rate_bytes_per_second, 4 * MB)
+        self.assertEqual(event.smoothed_rate_bytes_per_second, 3 * MB)
+        self.assertAlmostEqual(event.fraction, 0.6)
+        self.assertAlmostEqual(event.eta_seconds, 4 / 3)
+        self.assertEqual(self.events[3].fraction, 1.0)
+        self.assertEqual(self.events[3].jobs_finished, 1)
+        self.assertEqual(self.events[3].youtube_id, "abc123")
+
+    def test_batch_progress_covers_unstarted_and_skipped_files(self):
+        # Arrange
+        self.start_batch({"a.mp4": 4 * MB, "b.mp4": 4 * MB, "c.mp4": 2 * MB})
+        self.tracker.skip_job("a.mp4")
+        self.tracker.start_job("b.mp4", total_bytes=4 * MB, now=100)
+
+        # Act
+        self.tracker.update_job("b.mp4", 2 * MB, now=101)
+
+        # Assert
+        self.assertEqual(self.events[0].state, PROGRESS_SKIPPED)
+        event = self.events[-1]
+        self.assertEqual(event.batch_total_bytes, 10 * MB)
+        self.assertEqual(event.batch_bytes_sent, 6 * MB)
+        self.assertAlmostEqual(event.batch_fraction, 0.6)
+        self.assertEqual(event.batch_eta_seconds, 2)
+        self.assertEqual((event.jobs_finished, event.jobs_total), (1, 3))
+
+    def test_failed_job_counts_as_finished_for_the_batch(self):
+        # Arrange
+        self.start_batch({"a.mp4": 4 * MB, "b.mp4": 4 * MB})
+        self.tracker.start_job("a.mp4", total_bytes=4 * MB, now=100)
+
+        # Act
+        self.tracker.finish_job("a.mp4", succeeded=False, error="upload failed", now=101)
+        self.tracker.finish_job("a.mp4", succeeded=False, error="reported again", now=102)
+        self.tracker.finish_job("b.mp4", succeeded=False, error="no thumbnail", now=103)
+
+        # Assert
+        self.assertEqual(
+            [(event.job_id, event.state, event.error) for event in self.events[1:]],
+            [("a.mp4", PROGRESS_FAILED, "upload failed"), ("b.mp4", PROGRESS_FAILED, "no thumbnail")],
+        )
+        self.assertEqual(self.events[-1].fraction, 0.0)
+        self.assertEqual(self.events[-1].batch_fraction, 1.0)
+
+    def test_retried_job_counts_towards_the_batch_again(self):
+        # Arrange
+        self.start_batch({"a.mp4": 4 * MB, "b.mp4": 4 * MB})
+        self.tracker.start_job("a.mp4", total_bytes=4 * MB, now=100)
+        self.tracker.finish_job("a.mp4", succeeded=False, now=101)
+
+        # Act
+        self.tracker.start_job("a.mp4", total_bytes=4 * MB, now=102)
+
+        # Assert
+        self.assertEqual(self.events[-1].batch_bytes_sent, 0)
+        self.assertEqual(self.events[-1].jobs_finished, 0)
+        self.assertEqual(self.events[-1].batch_total_bytes, 8 * MB)
+
+    def test_batch_listeners_receive_every_file_in_the_batch(self):
+        # Arrange
+        batches = []
+        self.tracker.add_batch_listener(batches.append)
+
+        # Act
+        self.start_batch({"a.mp4": 4 * MB, "b.mp4": 2 * MB})
+
+        # Assert
+        self.assertEqual(batches, [{"a.mp4": 4 * MB, "b.mp4": 2 * MB}])
+
+    def test_concurrent_jobs_add_up_to_the_batch_rate(self):
+        # Arrange
+        self.tracker.start_job("a.mp4", total_bytes=10 * MB, now=100)
+        self.tracker.start_job("b.mp4", total_bytes=10 * MB, now=100)
+
+        # Act
+        self.tracker.update_job("a.mp4", 1 * MB, now=101)
+        self.tracker.update_job("b.mp4", 3 * MB, now=101)
+
+        # Assert
+        event = self.events[-1]
+        self.assertEqual(event.job_id, "b.mp4")
+        self.assertEqual(event.batch_rate_bytes_per_second, 4 * MB)
+        self.assertEqual(event.batch_bytes_sent, 4 * MB)
+        self.assertEqual(event.batch_eta_seconds, 4)
+
+    def test_uploading_events_are_rate_limited_per_subscriber(self):
+        # Arrange
+        slow_events = []
+        self.tracker.subscribe(slow_events.append, min_interval_seconds=10)
+        self.tracker.start_job("a.mp4", total_bytes=10 * MB, now=100)
+
+        # Act
+        for second in range(1, 6):
+            self.tracker.update_job("a.mp4", second * MB, now=100 + second)
+        self.tracker.finish_job("a.mp4", now=106)
+
+        # Assert
+        self.assertEqual(len(self.events), 7)
+        self.assertEqual([event.state for event in slow_events], [PROGRESS_STARTED, PROGRESS_COMPLETED])
+
+    def test_failing_subscriber_does_not_stop_others(self):
+        # Arrange
+        def failing_subscriber(event):
+            raise Exception("subscriber failed")
+
+        tracker = ProgressTracker(td.mock_logger, min_interval_seconds=0)
+        events = []
+        tracker.subscribe(failing_subscriber)
+        tracker.subscribe(events.append)
+
+        # Act
+        tracker.start_job("a.mp4", total_bytes=MB, now=100)
+
+        # Assert
+        self.assertEqual(len(events), 1)
+
+    def test_updates_from_many_threads_are_all_counted(self):
+        # Arrange
+        tracker = ProgressTracker(td.mock_logger, min_interval_seconds=0)
+        events = []
+        tracker.subscribe(events.append)
+        job_ids = [f"{n}.mp4" for n in range(4)]
+        tracker.start_batch(job_ids)
+
+        def upload(job_id):
+            tracker.start_job(job_id, total_bytes=100 * MB)
+            for i in range(1, 101):
+                tracker.update_job(job_id, i * MB)
+            tracker.finish_job(job_id)
+
+        # Act
+        threads = [threading.Thread(target=upload, args=(job_id,)) for job_id in job_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(len(events), 4 * 102)
+        self.assertEqual(tracker.finished_jobs, {job_id: 100 * MB for job_id in job_ids})
+
+    def test_describe_and_to_dict(self):
+        # Arrange
+        self.tracker.start_job("/videos/a.mp4", total_bytes=10 * MB, now=100)
+
+        # Act
+        self.tracker.update_job("/videos/a.mp4", 5 * MB, now=105)
+
+        # Assert
+        event = self.events[-1]
+        self.assertEqual(event.describe(), "a.mp4: 50.0% of 10.0 MB at 1.0 MB/s, ETA 5s | batch: 0/1 files, 50.0%, ETA 5s")
+        self.assertEqual(event.to_dict()["eta_seconds"], 5)
+        self.assertEqual(event.to_dict()["state"], PROGRESS_UPLOADING)
+
+    def test_format_helpers(self):
+        # Arrange, Act & Assert
+        self.assertEqual(format_bytes(512), "512.0 B")
+        self.assertEqual(format_bytes(1536 * MB), "1.5 GB")
+        self.assertEqual(format_duration(None), "unknown")
+        self.assertEqual(format_duration(75), "1m15s")
+        self.assertEqual(format_duration(7260), "2h01m")
+
+
+if __name__ == "__main__":
+    unittest.main()
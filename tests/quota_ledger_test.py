@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import test_data as td
+from youtube_bulk_upload.bulk_upload import YouTubeBulkUpload
+from youtube_bulk_upload.quota import get_quota_reset_timezone
+from youtube_bulk_upload.quota_ledger import QuotaLedger, forecast_uploads, quota_report_lines, upload_quota_cost
+
+
+class QuotaLedgerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ledger_file = os.path.join(self.temp_dir.name, "ledger", "quota_ledger.json")
+        self.now = datetime(2026, 10, 19, 12, 0, tzinfo=get_quota_reset_timezone())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_records_persist_per_day_and_pool(self):
+        # Arrange
+        ledger = QuotaLedger(self.ledger_file)
+
+        # Act
+        ledger.record("search.list", "client-a", now=self.now)
+        ledger.record("channels.list", "client-a", now=self.now)
+        QuotaLedger(self.ledger_file).record("videos.insert", "client-a", now=self.now)
+        ledger.record("videos.insert", "client-b", now=self.now - timedelta(days=1))
+
+        # Assert
+        reloaded = QuotaLedger(self.ledger_file)
+        self.assertEqual(
+            reloaded.usage("client-a", "2026-10-19"),
+            {"units": 1701, "calls": {"search.list": 1, "channels.list": 1, "videos.insert": 1}, "quota_exceeded": False},
+        )
+        self.assertEqual(reloaded.remaining_units("client-a", "2026-10-19"), 8299)
+        self.assertEqual(reloaded.pools("2026-10-19"), ["client-a"])
+        self.assertEqual(reloaded.usage("client-b", "2026-10-18")["units"], 1600)
+
+    def test_warns_once_when_crossing_threshold_and_quota_exceeded_leaves_nothing(self):
+        # Arrange
+        ledger = QuotaLedger(self.ledger_file, daily_quota=4000)
+
+        # Act
+        warnings = [ledger.record("videos.insert", now=self.now) for _ in range(3)]
+        ledger.record_quota_exceeded(now=self.now)
+
+        # Assert
+        self.assertEqual(warnings, [False, True, False])
+        self.assertEqual(ledger.remaining_units("default", "2026-10-19"), 0)
+
+    def test_old_days_are_pruned(self):
+        # Arrange
+        ledger = QuotaLedger(self.ledger_file, retention_days=7)
+        ledger.record("search.list", now=self.now - timedelta(days=8))
+
+        # Act
+        ledger.record("search.list", now=self.now)
+
+        # Assert
+        with open(self.ledger_file, encoding="utf-8") as f:
+            self.assertEqual(list(json.load(f)["days"]), ["2026-10-19"])
+
+
+class QuotaForecastTest(TestCase):
+    def test_upload_quota_cost_follows_dedup_and_thumbnail_settings(self):
+        self.assertEqual(upload_quota_cost(check_for_duplicate_titles=True, has_thumbnail=True), 1751)
+        self.assertEqual(upload_quota_cost(check_for_duplicate_titles=False, has_thumbnail=False), 1600)
+
+    def test_forecast_fills_pools_in_order(self):
+        self.assertEqual(forecast_uploads([3500, 1700], [1750, 1600, 1650, 1600]), 3)
+        self.assertEqual(forecast_uploads([], [1600]), 0)
+
+    def test_report_lines(self):
+        # Arrange
+        now = datetime(2026, 10, 19, 12, 0, tzinfo=get_quota_reset_timezone())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = QuotaLedger(os.path.join(temp_dir, "quota_ledger.json"))
+            for _ in range(4):
+                ledger.record("videos.insert", "client-a", now=now)
+            ledger.record("search.list", "client-other", now=now)
+
+            # Act
+            lines = quota_report_lines(ledger, {"client-a": "client_secret.json"}, [1751] * 5, now=now)
+
+        # Assert
+        self.assertTrue(lines[0].startswith("Quota day 2026-10-19, resets at 2026-10-20 00:00"))
+        self.assertTrue(lines[0].endswith("(in 12h 00m)"))
+        self.assertEqual(
+            lines[1:],
+            [
+                "client_secret.json: 6,400 of 10,000 units used, 3,600 remaining",
+                "  videos.insert: 4 calls, 6,400 units",
+                "client-other: 100 of 10,000 units used, 9,900 remaining",
+                "  search.list: 1 calls, 100 units",
+                "Pending files: 5, needing 8,755 units (1,751 to 1,751 units each)",
+                "Forecast: 5 of 5 pending files fit in the 13,500 units remaining today",
+            ],
+        )
+
+
+class YouTubeBulkUploadQuotaLedgerTest(TestCase):
+    def test_api_calls_are_charged_to_the_client_pool_even_when_they_fail(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Arrange
+            secrets_file = os.path.join(temp_dir, "client_secret.json")
+            with open(secrets_file, "w", encoding="utf-8") as f:
+                json.dump({"installed": {"client_id": "1234.apps.googleusercontent.com"}}, f)
+            ledger = QuotaLedger(os.path.join(temp_dir, "quota_ledger.json"))
+            with (
+                patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.validate_secrets_file"),
+                patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.authenticate_youtube", return_value=MagicMock()),
+            ):
+                uploader = YouTubeBulkUpload(
+                    youtube_client_secrets_file=secrets_file, logger=td.mock_logger, retry_queue_file=None, quota_ledger=ledger
+                )
+            uploader.youtube.search.return_value.list.return_value.execute.side_effect = ConnectionResetError("connection reset")
+
+            # Act
+            with self.assertRaises(ConnectionResetError):
+                uploader.check_if_video_title_exists_on_youtube_channel("Some Title")
+
+            # Assert
+            self.assertEqual(
+                ledger.usage("1234.apps.googleusercontent.com"),
+                {"units": 101, "calls": {"channels.list": 1, "search.list": 1}, "quota_exceeded": False},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import unittest
+from unittest import TestCase
+from youtube_bulk_upload.records import YOUTUBE_URL_PREFIX, UploadedVideo, split_path
+
+
+class UploadedVideoTest(TestCase):
+    def test_reads_like_the_uploaded_video_dict(self):
+        # Arrange
+        video_file = os.path.join("videos", "album", "track 01.mp4")
+
+        # Act
+        uploaded_video = UploadedVideo(video_file, "Track 01", "abc123")
+
+        # Assert
+        expected = {
+            "input_filename": video_file,
+            "youtube_title": "Track 01",
+            "youtube_id": "abc123",
+            "youtube_url": f"{YOUTUBE_URL_PREFIX}abc123",
+        }
+        self.assertEqual(uploaded_video, expected)
+        self.assertEqual(uploaded_video["youtube_url"], expected["youtube_url"])
+        self.assertEqual(json.loads(json.dumps(uploaded_video.to_dict())), expected)
+        self.assertNotIn("profile", uploaded_video)
+        self.assertIsNone(uploaded_video.get("profile"))
+        with self.assertRaises(KeyError):
+            uploaded_video["file_name"]
+
+    def test_profile_key_only_present_when_uploaded_by_a_profile(self):
+        # Arrange, Act
+        uploaded_video = UploadedVideo("video1.mp4", "Title", "abc123", profile="channel-a")
+
+        # Assert
+        self.assertEqual(uploaded_video["profile"], "channel-a")
+        self.assertEqual(len(uploaded_video), 5)
+        self.assertEqual(dict(uploaded_video, status="uploaded")["status"], "uploaded")
+
+    def test_records_are_compact_and_share_directories(self):
+        # Arrange
+        directory = os.path.join("archive", "2024") + os.sep
+
+        # Act
+        uploaded_videos = [UploadedVideo(f"{directory}video{i}.mp4", f"Title {i}", f"id{i}") for i in range(3)]
+
+        # Assert
+        self.assertFalse(hasattr(uploaded_videos[0], "__dict__"))
+        self.assertIs(uploaded_videos[0].directory, uploaded_videos[2].directory)
+        self.assertEqual(uploaded_videos[1].input_filename, f"{directory}video1.mp4")
+
+    def test_split_path_round_trips_exactly(self):
+        # Arrange
+        paths = ["video.mp4", os.sep + "video.mp4", os.path.join("a", "b") + os.sep + os.sep + "video.mp4", "trailing" + os.sep]
+
+        # Act & Assert
+        for path in paths:
+            directory, file_name = split_path(path)
+            self.assertEqual(directory + file_name, path)
+            self.assertNotIn(os.sep, file_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import errno
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock
+import test_data as td
+from youtube_bulk_upload.retry_queue import (
+    ErrorClass,
+    RetryQueue,
+    classify_upload_error,
+)
+from youtube_bulk_upload.thumbnails import ThumbnailError
+
+
+def make_http_error(status, reason=None):
+    error = Exception(f"HTTP {status}")
+    error.resp = MagicMock(status=status)
+    errors = [{"reason": reason}] if reason else []
+    error.content = json.dumps({"error": {"errors": errors}}).encode("utf-8")
+    return error
+
+
+class ClassifyUploadErrorTest(TestCase):
+    def test_quota_exceeded_is_quota(self):
+        self.assertEqual(classify_upload_error(make_http_error(403, "quotaExceeded")), ErrorClass.QUOTA)
+
+    def test_server_errors_and_rate_limits_are_transient(self):
+        self.assertEqual(classify_upload_error(make_http_error(503)), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(make_http_error(403, "rateLimitExceeded")), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(ConnectionResetError()), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(TimeoutError()), ErrorClass.TRANSIENT)
+
+    def test_urllib3_connection_errors_are_transient(self):
+        from urllib3.exceptions import NewConnectionError, ProtocolError, ReadTimeoutError, SSLError
+
+        self.assertEqual(classify_upload_error(ProtocolError("Connection aborted.", ConnectionResetError())), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(ReadTimeoutError(None, "/upload", "Read timed out.")), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(NewConnectionError(None, "Connection refused")), ErrorClass.TRANSIENT)
+        self.assertEqual(classify_upload_error(SSLError("EOF occurred in violation of protocol")), ErrorClass.TRANSIENT)
+
+    def test_rejected_requests_and_missing_files_are_invalid(self):
+        self.assertEqual(classify_upload_error(make_http_error(400, "invalidTitle")), ErrorClass.INVALID_FILE)
+        self.assertEqual(classify_upload_error(FileNotFoundError()), ErrorClass.INVALID_FILE)
+
+    def test_local_file_errors_are_not_transient(self):
+        self.assertEqual(classify_upload_error(FileNotFoundError(errno.ENOENT, "No such file", "video.mp4")), ErrorClass.INVALID_FILE)
+        self.assertEqual(classify_upload_error(OSError(errno.ENOSPC, "No space left on device")), ErrorClass.UNKNOWN)
+        self.assertEqual(classify_upload_error(OSError(errno.EIO, "Input/output error")), ErrorClass.UNKNOWN)
+
+    def test_thumbnail_errors_are_invalid_file(self):
+        self.assertEqual(classify_upload_error(ThumbnailError("Thumbnail thumb.png is not a valid image")), ErrorClass.INVALID_FILE)
+
+    def test_other_errors_are_unknown(self):
+        self.assertEqual(classify_upload_error(Exception(td.sample_exit_message)), ErrorClass.UNKNOWN)
+        self.assertEqual(classify_upload_error(make_http_error(401)), ErrorClass.UNKNOWN)
+
+
+class RetryQueueTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue_file = os.path.join(self.temp_dir.name, "failed_uploads.json")
+        self.retry_queue = RetryQueue(self.queue_file, td.mock_logger)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_transient_failure_backs_off_exponentially(self):
+        # Act
+        first = self.retry_queue.record_failure(td.sample_video_file, ConnectionResetError(), now=1000)
+        first_next_attempt_at = first.next_attempt_at
+        second = self.retry_queue.record_failure(td.sample_video_file, ConnectionResetError(), now=2000)
+
+        # Assert
+        self.assertEqual(first_next_attempt_at, 1030)
+        self.assertEqual(second.next_attempt_at, 2060)
+        self.assertEqual(second.attempts, 2)
+        self.assertEqual(self.retry_queue.due_entries(now=2059), [])
+        self.assertEqual(self.retry_queue.due_entries(now=2060), [second])
+
+    def test_invalid_file_is_never_retried(self):
+        # Act
+        entry = self.retry_queue.record_failure(td.sample_video_file, FileNotFoundError())
+
+        # Assert
+        self.assertTrue(entry.abandoned)
+        self.assertEqual(self.retry_queue.pending_entries(), [])
+        self.assertEqual(self.retry_queue.abandoned_entries(), [entry])
+
+    def test_quota_failure_waits_for_quota_reset(self):
+        # Act
+        entry = self.retry_queue.record_failure(td.sample_video_file, make_http_error(403, "quotaExceeded"), now=0)
+
+        # Assert
+        self.assertFalse(entry.abandoned)
+        self.assertEqual(self.retry_queue.due_entries(), [])
+
+    def test_queue_persists_across_instances_and_success_removes_entry(self):
+        # Arrange
+        self.retry_queue.record_failure(td.sample_video_file, ConnectionResetError(), now=0)
+
+        # Act
+        reloaded_queue = RetryQueue(self.queue_file, td.mock_logger)
+        reloaded_entries = reloaded_queue.due_entries(now=100)
+        reloaded_queue.record_success(td.sample_video_file)
+
+        # Assert
+        self.assertEqual([entry.video_file for entry in reloaded_entries], [td.sample_video_file])
+        self.assertEqual(reloaded_entries[0].error_class, ErrorClass.TRANSIENT)
+        self.assertEqual(RetryQueue(self.queue_file, td.mock_logger).entries, {})
+
+    def test_changing_one_queues_policy_does_not_change_other_queues(self):
+        # Act
+        self.retry_queue.policies[ErrorClass.TRANSIENT].backoff_seconds = 0
+        other_queue = RetryQueue(self.queue_file, td.mock_logger)
+
+        # Assert
+        self.assertEqual(other_queue.policies[ErrorClass.TRANSIENT].backoff_seconds, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest import TestCase
+from youtube_bulk_upload.review import REVIEW_APPROVED, REVIEW_PENDING, REVIEW_REJECTED, REVIEW_UPLOADING, ReviewItem, ReviewQueue
+
+
+def make_review_item(video_file):
+    return ReviewItem(video_file, f"Title of {video_file}", "Description", None)
+
+
+class ReviewQueueTest(TestCase):
+    def setUp(self):
+        self.review_queue = ReviewQueue()
+        self.changes = []
+        self.review_queue.add_listener(lambda review_item: self.changes.append((review_item.video_file, review_item.status)))
+        self.review_queue.start_preparing()
+        for video_file in ["a.mp4", "b.mp4", "c.mp4"]:
+            self.review_queue.add(make_review_item(video_file))
+
+    def test_approved_items_are_taken_in_approval_order_with_edits(self):
+        # Arrange
+        self.review_queue.finish_preparing()
+
+        # Act
+        self.review_queue.approve("c.mp4", youtube_title="Edited title", youtube_description="Edited description")
+        self.review_queue.approve("a.mp4")
+        first_item = self.review_queue.next_approved(timeout=0)
+        second_item = self.review_queue.next_approved(timeout=0)
+        third_item = self.review_queue.next_approved(timeout=0)
+
+        # Assert
+        self.assertEqual(
+            (first_item.video_file, first_item.youtube_title, first_item.youtube_description),
+            ("c.mp4", "Edited title", "Edited description"),
+        )
+        self.assertEqual(second_item.youtube_title, "Title of a.mp4")
+        self.assertIsNone(third_item)
+        self.assertEqual(first_item.status, REVIEW_UPLOADING)
+        self.assertEqual(self.review_queue.pending_count(), 1)
+        self.assertIs(self.review_queue.approved_item("c.mp4"), first_item)
+        self.assertIsNone(self.review_queue.approved_item("b.mp4"))
+
+    def test_only_pending_items_can_be_decided(self):
+        # Arrange
+        self.review_queue.reject("a.mp4")
+
+        # Act
+        approved_rejected_item = self.review_queue.approve("a.mp4")
+        approved_unknown_item = self.review_queue.approve("unknown.mp4")
+        approved_count = self.review_queue.approve_all_pending()
+
+        # Assert
+        self.assertFalse(approved_rejected_item)
+        self.assertFalse(approved_unknown_item)
+        self.assertEqual(approved_count, 2)
+        self.assertEqual(self.review_queue.items["a.mp4"].status, REVIEW_REJECTED)
+        self.assertEqual(self.review_queue.items["b.mp4"].status, REVIEW_APPROVED)
+
+    def test_listeners_see_every_change(self):
+        # Arrange
+        self.review_queue.finish_preparing()
+
+        # Act
+        self.review_queue.approve("a.mp4")
+        self.review_queue.reject("b.mp4")
+        self.review_queue.next_approved(timeout=0)
+
+        # Assert
+        self.assertEqual(
+            self.changes,
+            [
+                ("a.mp4", REVIEW_PENDING),
+                ("b.mp4", REVIEW_PENDING),
+                ("c.mp4", REVIEW_PENDING),
+                ("a.mp4", REVIEW_APPROVED),
+                ("b.mp4", REVIEW_REJECTED),
+                ("a.mp4", REVIEW_UPLOADING),
+            ],
+        )
+
+    def test_is_done_only_once_preparation_finished_and_everything_decided_and_taken(self):
+        # Arrange
+        self.review_queue.approve("a.mp4")
+        self.review_queue.reject_all_pending()
+
+        # Act & Assert
+        self.assertFalse(self.review_queue.is_done())
+        self.review_queue.finish_preparing()
+        self.assertFalse(self.review_queue.is_done())
+        self.review_queue.next_approved(timeout=0)
+        self.assertTrue(self.review_queue.is_done())
+        self.assertIsNone(self.review_queue.next_approved())
+
+    def test_next_approved_wakes_up_when_another_thread_approves(self):
+        # Arrange
+        self.review_queue.finish_preparing()
+        approver = threading.Timer(0.05, self.review_queue.approve, args=("b.mp4",))
+
+        # Act
+        approver.start()
+        review_item = self.review_queue.next_approved(timeout=5)
+        approver.join()
+
+        # Assert
+        self.assertEqual(review_item.video_file, "b.mp4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import test_data as td
+from youtube_bulk_upload.scheduler import MultiDayScheduler, UploadCheckpoint
+
+
+class MultiDaySchedulerTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_file = os.path.join(self.temp_dir.name, "upload_checkpoint.json")
+
+        self.quota_day = "2024-01-01"
+        self.video_files = ["video1.mp4", "video2.mp4", "video3.mp4"]
+
+        self.uploader = MagicMock(logger=td.mock_logger, stop_event=None, retry_queue=None, quota_exceeded=False, upload_batch_limit=2)
+        self.uploader.deferred_video_files = set()
+        self.uploader.failed_video_files = set()
+        self.uploader.find_input_files.return_value = self.video_files
+        self.uploader.process_video_file.side_effect = lambda video_file: {
+            "input_filename": video_file,
+            "youtube_id": f"id-{video_file}",
+        }
+
+        def next_day(seconds):
+            self.quota_day = "2024-01-02"
+            return False
+
+        self.uploader.wait_or_stop.side_effect = next_day
+
+        self.quota_day_patch = patch("youtube_bulk_upload.scheduler.current_quota_day", side_effect=lambda: self.quota_day)
+        self.quota_day_patch.start()
+
+    def tearDown(self):
+        self.quota_day_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_run_sleeps_until_quota_reset_then_drains_backlog(self):
+        # Act
+        result = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file).run()
+
+        # Assert
+        self.assertEqual([video["input_filename"] for video in result], self.video_files)
+        self.uploader.wait_or_stop.assert_called_once()
+        self.uploader.reauthenticate.assert_called_once()
+
+        checkpoint = UploadCheckpoint(self.checkpoint_file)
+        self.assertEqual(set(checkpoint.completed), set(self.video_files))
+        self.assertEqual(checkpoint.uploads_by_day, {"2024-01-01": 2, "2024-01-02": 1})
+
+    def test_run_resumes_from_checkpoint_and_skips_completed_files(self):
+        # Arrange
+        checkpoint = UploadCheckpoint(self.checkpoint_file)
+        checkpoint.mark_skipped("video1.mp4")
+        checkpoint.mark_uploaded({"input_filename": "video2.mp4", "youtube_id": "id-video2.mp4"})
+
+        # Act
+        result = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file).run()
+
+        # Assert
+        self.assertEqual([video["input_filename"] for video in result], ["video3.mp4"])
+        self.uploader.process_video_file.assert_called_once_with("video3.mp4")
+        self.uploader.wait_or_stop.assert_not_called()
+
+    def test_run_cycle_limits_in_run_retries_to_the_remaining_daily_budget(self):
+        # Arrange
+        checkpoint = UploadCheckpoint(self.checkpoint_file)
+        checkpoint.mark_uploaded({"input_filename": "video1.mp4", "youtube_id": "id-video1.mp4"})
+        scheduler = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file)
+
+        def retry_uploads(video_files, uploaded_count):
+            if uploaded_count < self.uploader.upload_batch_limit:
+                yield {"input_filename": "video3.mp4", "youtube_id": "id-video3.mp4"}
+
+        self.uploader.iter_retry_failed_uploads_in_run.side_effect = retry_uploads
+
+        # Act
+        result = scheduler.run_cycle(["video2.mp4", "video3.mp4"])
+
+        # Assert
+        self.assertEqual([video["input_filename"] for video in result], ["video2.mp4"])
+        self.uploader.iter_retry_failed_uploads_in_run.assert_called_once_with(["video2.mp4", "video3.mp4"], 2)
+        self.assertEqual(UploadCheckpoint(self.checkpoint_file).uploads_by_day, {"2024-01-01": 2})
+
+    def test_run_leaves_failed_files_pending_without_a_retry_queue(self):
+        # Arrange
+        self.uploader.upload_batch_limit = 3
+
+        def process_video_file(video_file):
+            if video_file == "video2.mp4" and self.quota_day == "2024-01-01":
+                self.uploader.failed_video_files.add(video_file)
+                return None
+            return {"input_filename": video_file, "youtube_id": f"id-{video_file}"}
+
+        self.uploader.process_video_file.side_effect = process_video_file
+
+        # Act
+        result = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file).run()
+
+        # Assert
+        self.assertEqual([video["input_filename"] for video in result], ["video1.mp4", "video3.mp4", "video2.mp4"])
+        self.uploader.wait_or_stop.assert_called_once()
+
+        checkpoint = UploadCheckpoint(self.checkpoint_file)
+        self.assertEqual(checkpoint.completed["video2.mp4"]["status"], "uploaded")
+        self.assertEqual(checkpoint.uploads_by_day, {"2024-01-01": 2, "2024-01-02": 1})
+
+    def test_run_exits_cleanly_when_stopped_while_sleeping(self):
+        # Arrange
+        scheduler = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file)
+
+        def stop(seconds):
+            scheduler.stop_event.set()
+            return True
+
+        self.uploader.wait_or_stop.side_effect = stop
+
+        # Act
+        result = scheduler.run()
+
+        # Assert
+        self.assertEqual(len(result), 2)
+        self.uploader.reauthenticate.assert_not_called()
+        self.assertEqual(len(UploadCheckpoint(self.checkpoint_file).completed), 2)
+
+    def test_sigterm_handler_sets_stop_event(self):
+        # Arrange
+        scheduler = MultiDayScheduler(self.uploader, checkpoint_file=self.checkpoint_file)
+
+        # Act
+        scheduler.handle_sigterm(15, None)
+
+        # Assert
+        self.assertTrue(scheduler.is_stopped())
+
+
+if __name__ == "__main__":
+    unittest.main()
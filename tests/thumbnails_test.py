@@ -0,0 +1,356 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from PIL import Image
+import test_data as td
+from youtube_bulk_upload.bulk_upload import YouTubeBulkUpload
+from youtube_bulk_upload.thumbnails import (
+    THUMBNAIL_MAX_BYTES,
+    ThumbnailError,
+    ThumbnailPreprocessor,
+    ThumbnailSettings,
+    TitleCardGenerator,
+    TitleCardSettings,
+    prepare_thumbnail,
+    render_title_card,
+    thumbnail_cache_file,
+    title_card_text,
+)
+
+
+def write_noise_image(path: str, size: tuple[int, int], mode: str = "RGB", image_format: str = "PNG") -> str:
+    # Random pixels don't compress, so a large noise image is well over the API's size limit as a PNG
+    Image.frombytes(mode, size, os.urandom(size[0] * size[1] * len(mode))).save(path, format=image_format)
+    return path
+
+
+class PrepareThumbnailTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.temp_dir.name, "cache", "prepared.jpg")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_oversized_png_is_resized_and_reencoded_under_the_limit(self):
+        # Arrange
+        source_file = write_noise_image(os.path.join(self.temp_dir.name, "thumb.png"), (1920, 1080))
+        self.assertGreater(os.path.getsize(source_file), THUMBNAIL_MAX_BYTES)
+
+        # Act
+        prepare_thumbnail(source_file, self.output_file, ThumbnailSettings())
+
+        # Assert
+        self.assertLessEqual(os.path.getsize(self.output_file), THUMBNAIL_MAX_BYTES)
+        with Image.open(self.output_file) as prepared:
+            self.assertEqual((prepared.format, prepared.size), ("JPEG", (1280, 720)))
+
+    def test_transparent_portrait_image_is_padded_to_16_by_9(self):
+        # Arrange
+        source_file = os.path.join(self.temp_dir.name, "thumb.png")
+        Image.new("RGBA", (300, 600), (255, 0, 0, 128)).save(source_file)
+
+        # Act
+        prepare_thumbnail(source_file, self.output_file, ThumbnailSettings())
+
+        # Assert
+        with Image.open(self.output_file) as prepared:
+            self.assertEqual((prepared.mode, prepared.size), ("RGB", (1280, 720)))
+            self.assertEqual(prepared.getpixel((10, 360)), (0, 0, 0))
+            self.assertGreater(prepared.getpixel((640, 360))[0], 100)
+
+    def test_valid_jpeg_is_copied_unchanged(self):
+        # Arrange
+        source_file = os.path.join(self.temp_dir.name, "thumb.jpg")
+        Image.new("RGB", (1280, 720), (0, 128, 255)).save(source_file, format="JPEG")
+
+        # Act
+        prepare_thumbnail(source_file, self.output_file, ThumbnailSettings())
+
+        # Assert
+        with open(source_file, "rb") as source, open(self.output_file, "rb") as prepared:
+            self.assertEqual(source.read(), prepared.read())
+
+    def test_invalid_image_raises_exception(self):
+        # Arrange
+        source_file = os.path.join(self.temp_dir.name, "thumb.png")
+        with open(source_file, "w") as f:
+            f.write("not an image")
+
+        # Act & Assert
+        with self.assertRaisesRegex(ThumbnailError, "is not a valid image"):
+            prepare_thumbnail(source_file, self.output_file, ThumbnailSettings())
+        self.assertFalse(os.path.exists(self.output_file))
+
+
+class ThumbnailPreprocessorTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_prepares_in_worker_processes_and_reruns_use_the_cache(self):
+        # Arrange
+        source_files = [write_noise_image(os.path.join(self.temp_dir.name, f"thumb{i}.png"), (640, 480)) for i in range(2)]
+        preprocessor = ThumbnailPreprocessor(self.cache_dir, max_workers=2)
+        self.addCleanup(preprocessor.close)
+
+        # Act
+        futures = [preprocessor.submit(source_file) for source_file in source_files]
+        prepared_files = [future.result(timeout=60) for future in futures]
+        rerun_preprocessor = ThumbnailPreprocessor(self.cache_dir)
+        rerun_prepared_files = [rerun_preprocessor.prepare(source_file) for source_file in source_files]
+
+        # Assert
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted(os.path.basename(path) for path in prepared_files))
+        self.assertEqual(rerun_prepared_files, prepared_files)
+        self.assertIsNone(rerun_preprocessor._executor)
+
+    def test_failed_thumbnail_is_prepared_again_when_resubmitted(self):
+        # Arrange
+        source_file = os.path.join(self.temp_dir.name, "thumb.png")
+        with open(source_file, "wb") as f:
+            f.write(b"not an image")
+        preprocessor = ThumbnailPreprocessor(self.cache_dir, max_workers=1)
+        self.addCleanup(preprocessor.close)
+        with self.assertRaisesRegex(ThumbnailError, "is not a valid image"):
+            preprocessor.submit(source_file).result(timeout=60)
+
+        # Act
+        write_noise_image(source_file, (640, 480))
+        prepared_file = preprocessor.prepare(source_file)
+
+        # Assert
+        self.assertTrue(os.path.exists(prepared_file))
+
+    def test_broken_process_pool_is_replaced(self):
+        # Arrange
+        source_files = [write_noise_image(os.path.join(self.temp_dir.name, f"thumb{i}.png"), (640, 480)) for i in range(2)]
+        preprocessor = ThumbnailPreprocessor(self.cache_dir, max_workers=1)
+        self.addCleanup(preprocessor.close)
+        preprocessor.prepare(source_files[0])
+        broken_executor = preprocessor._executor
+        for process in list(broken_executor._processes.values()):
+            process.kill()
+        deadline = time.monotonic() + 30
+        while not broken_executor._broken and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        # Act
+        prepared_file = preprocessor.prepare(source_files[1])
+
+        # Assert
+        self.assertTrue(os.path.exists(prepared_file))
+        self.assertIsNot(preprocessor._executor, broken_executor)
+
+    def test_cache_key_covers_content_and_settings(self):
+        # Arrange
+        first_file, second_file = (os.path.join(self.temp_dir.name, name) for name in ["first.png", "second.png"])
+        for path in [first_file, second_file]:
+            Image.new("RGB", (1280, 720)).save(path)
+        with open(first_file, "ab") as f:
+            f.write(b"trailing bytes")
+
+        # Act
+        default_files = [thumbnail_cache_file(path, self.cache_dir, ThumbnailSettings()) for path in [first_file, second_file]]
+        smaller_file = thumbnail_cache_file(second_file, self.cache_dir, ThumbnailSettings(width=640, height=360))
+
+        # Assert
+        self.assertEqual(len({*default_files, smaller_file}), 3)
+        self.assertEqual(thumbnail_cache_file(second_file, self.cache_dir, ThumbnailSettings()), default_files[1])
+
+
+class YouTubeBulkUploadThumbnailPreprocessingTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with (
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.validate_secrets_file"),
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.authenticate_youtube", return_value=MagicMock()),
+        ):
+            self.uploader = YouTubeBulkUpload(
+                youtube_client_secrets_file=td.fake_secrets_file_path,
+                logger=td.mock_logger,
+                retry_queue_file=None,
+                thumbnail_preprocessor=MagicMock(spec=ThumbnailPreprocessor),
+            )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_thumbnails_are_submitted_for_videos_with_a_thumbnail_file(self):
+        # Arrange
+        video_files = [os.path.join(self.temp_dir.name, name) for name in ["first.mp4", "second.mp4"]]
+        with open(os.path.join(self.temp_dir.name, "second.png"), "wb"):
+            pass
+
+        # Act
+        self.uploader.submit_thumbnails(video_files)
+
+        # Assert
+        self.uploader.thumbnail_preprocessor.submit.assert_called_once_with(os.path.join(self.temp_dir.name, "second.png"))
+
+    def test_thumbnails_are_only_submitted_for_videos_the_run_can_upload(self):
+        # Arrange
+        video_files = [f"video{i}.mp4" for i in range(100)]
+        self.uploader.upload_batch_limit = 3
+        self.uploader.interactive_prompt = False
+        self.uploader.check_for_duplicate_titles = False
+
+        # Act
+        with (
+            patch.object(self.uploader, "validate_input_parameters"),
+            patch.object(self.uploader, "determine_thumbnail_filepath", return_value=None),
+            patch.object(self.uploader, "upload_video_to_youtube_with_title_thumbnail", return_value=td.sample_video_id),
+            patch.object(self.uploader, "submit_thumbnails") as mock_submit_thumbnails,
+        ):
+            result = self.uploader.process(input_files=video_files)
+
+        # Assert
+        self.assertEqual(len(result), 3)
+        submitted_files = [video_file for call in mock_submit_thumbnails.call_args_list for video_file in call.args[0]]
+        self.assertEqual(submitted_files, video_files[:3])
+
+    def test_invalid_thumbnail_fails_before_the_video_is_uploaded(self):
+        # Arrange
+        self.uploader.thumbnail_preprocessor.prepare.side_effect = ThumbnailError("Thumbnail thumb.png is not a valid image")
+
+        # Act
+        with (
+            patch("youtube_bulk_upload.bulk_upload.MediaFileUpload"),
+            self.assertRaisesRegex(ThumbnailError, "is not a valid image"),
+        ):
+            self.uploader.upload_video_to_youtube_with_title_thumbnail(td.valid_video_file_path, "Title", "Description", "thumb.png")
+
+        # Assert
+        self.uploader.youtube.videos.assert_not_called()
+
+    def test_prepared_thumbnail_is_uploaded(self):
+        # Arrange
+        self.uploader.thumbnail_preprocessor.prepare.return_value = "/cache/prepared.jpg"
+        self.uploader.youtube.videos.return_value.insert.return_value.next_chunk.return_value = (None, {"id": td.sample_video_id})
+
+        # Act
+        with (
+            patch("youtube_bulk_upload.bulk_upload.MediaFileUpload") as mock_media_file,
+            patch.object(self.uploader.progress_tracker, "file_size", return_value=0),
+        ):
+            self.uploader.upload_video_to_youtube_with_title_thumbnail(td.valid_video_file_path, "Title", "Description", "thumb.png")
+
+        # Assert
+        self.uploader.thumbnail_preprocessor.prepare.assert_called_once_with("thumb.png")
+        mock_media_file.assert_called_with("/cache/prepared.jpg")
+
+
+class TitleCardTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "title_cards")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_text_template_variables(self):
+        self.assertEqual(title_card_text("{{youtube_title}} ({{filename}})", "My Song", "/videos/my_song.mp4"), "My Song (my_song)")
+
+    def test_long_title_is_rendered_onto_background_image_within_limits(self):
+        # Arrange
+        background_file = os.path.join(self.temp_dir.name, "background.png")
+        Image.new("RGB", (400, 400), (200, 0, 0)).save(background_file)
+        output_file = os.path.join(self.cache_dir, "card.jpg")
+        settings = TitleCardSettings(background_image=background_file, text_color="#00ff00", font_size=400)
+
+        # Act
+        render_title_card("A very long title which could never fit on one line of the card at this size", output_file, settings)
+
+        # Assert
+        self.assertLessEqual(os.path.getsize(output_file), THUMBNAIL_MAX_BYTES)
+        with Image.open(output_file) as card:
+            self.assertEqual((card.format, card.size), ("JPEG", (1280, 720)))
+            self.assertGreater(card.getpixel((5, 5))[0], 150)
+            self.assertTrue(any(card.getpixel((x, y))[1] > 200 for x in range(0, 1280, 4) for y in range(0, 720, 4)))
+
+    def test_renders_in_worker_processes_and_reruns_use_the_cache(self):
+        # Arrange
+        generator = TitleCardGenerator(self.cache_dir, max_workers=2)
+        self.addCleanup(generator.close)
+
+        # Act
+        futures = [generator.submit(title, f"/videos/{title}.mp4") for title in ["First", "Second"]]
+        card_files = [future.result(timeout=60) for future in futures]
+        rerun_generator = TitleCardGenerator(self.cache_dir)
+        rerun_card_files = [rerun_generator.generate(title, f"/other/{title}.mkv") for title in ["First", "Second"]]
+
+        # Assert
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted(os.path.basename(path) for path in card_files))
+        self.assertEqual(rerun_card_files, card_files)
+        self.assertIsNone(rerun_generator._executor)
+        self.assertTrue(all(rerun_generator.is_title_card(path) for path in card_files))
+        self.assertNotEqual(TitleCardGenerator(self.cache_dir, TitleCardSettings(text_color="red")).title_card_file("First"), card_files[0])
+
+
+class YouTubeBulkUploadTitleCardTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with (
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.validate_secrets_file"),
+            patch("youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.authenticate_youtube", return_value=MagicMock()),
+        ):
+            self.uploader = YouTubeBulkUpload(
+                youtube_client_secrets_file=td.fake_secrets_file_path,
+                logger=td.mock_logger,
+                retry_queue_file=None,
+                interactive_prompt=False,
+                check_for_duplicate_titles=False,
+                youtube_title_prefix="Live: ",
+                thumbnail_preprocessor=MagicMock(spec=ThumbnailPreprocessor),
+                title_card_generator=TitleCardGenerator(os.path.join(self.temp_dir.name, "title_cards")),
+            )
+        self.addCleanup(self.uploader.title_card_generator.close)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_title_cards_are_submitted_for_videos_without_a_thumbnail_file(self):
+        # Arrange
+        video_files = [os.path.join(self.temp_dir.name, name) for name in ["first.mp4", "second.mp4"]]
+        with open(os.path.join(self.temp_dir.name, "second.png"), "wb"):
+            pass
+
+        # Act
+        with patch.object(self.uploader.title_card_generator, "submit") as mock_submit:
+            self.uploader.submit_thumbnails(video_files)
+
+        # Assert
+        mock_submit.assert_called_once_with(f"Live: {os.path.join(self.temp_dir.name, 'first')}", video_files[0])
+        self.uploader.thumbnail_preprocessor.submit.assert_called_once_with(os.path.join(self.temp_dir.name, "second.png"))
+
+    def test_review_item_and_upload_use_a_title_card_without_preprocessing_it(self):
+        # Arrange
+        video_file = os.path.join(self.temp_dir.name, "song.mp4")
+        self.uploader.youtube.videos.return_value.insert.return_value.next_chunk.return_value = (None, {"id": td.sample_video_id})
+
+        # Act
+        review_item = self.uploader.prepare_review_item(video_file)
+        with (
+            patch("youtube_bulk_upload.bulk_upload.MediaFileUpload") as mock_media_file,
+            patch.object(self.uploader.progress_tracker, "file_size", return_value=0),
+        ):
+            self.uploader.upload_video_to_youtube_with_title_thumbnail(
+                video_file, "Edited Title", "Description", review_item.thumbnail_filepath
+            )
+
+        # Assert
+        self.assertTrue(self.uploader.title_card_generator.is_title_card(review_item.thumbnail_filepath))
+        self.uploader.thumbnail_preprocessor.prepare.assert_not_called()
+        edited_card_file = self.uploader.title_card_generator.title_card_file("Edited Title")
+        mock_media_file.assert_called_with(edited_card_file)
+        self.assertTrue(os.path.exists(edited_card_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
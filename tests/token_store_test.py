@@ -0,0 +1,96 @@
+import os
+import json
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import TestCase
+from youtube_bulk_upload.token_store import TokenFileLock, default_token_file, delete_token_file, load_token_file, save_token_file
+
+
+class FakeCredentials:
+    def __init__(self, token):
+        self.token = token
+
+    def to_json(self):
+        return json.dumps({"token": self.token, "refresh_token": "refresh-token", "client_id": "client-id", "client_secret": "secret"})
+
+
+class TokenStoreTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.token_dir = os.path.join(self.temp_dir.name, "tokens")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_secrets_file(self, name, client_id):
+        secrets_file = os.path.join(self.temp_dir.name, name)
+        with open(secrets_file, "w") as f:
+            json.dump({"installed": {"client_id": client_id}}, f)
+        return secrets_file
+
+    def test_token_files_are_keyed_by_client_and_account(self):
+        # Arrange
+        first_secrets = self.write_secrets_file("first.json", "client-1")
+        copied_secrets = self.write_secrets_file("copy.json", "client-1")
+        second_secrets = self.write_secrets_file("second.json", "client-2")
+
+        # Act
+        default_file = default_token_file(first_secrets, token_dir=self.token_dir)
+
+        # Assert
+        self.assertEqual(default_file, default_token_file(copied_secrets, token_dir=self.token_dir))
+        self.assertNotEqual(default_file, default_token_file(second_secrets, token_dir=self.token_dir))
+        self.assertNotEqual(default_file, default_token_file(first_secrets, account="shorts", token_dir=self.token_dir))
+
+    def test_save_and_load_round_trip_with_private_permissions(self):
+        # Arrange
+        token_file = os.path.join(self.token_dir, "token.json")
+
+        # Act
+        save_token_file(token_file, FakeCredentials("first"))
+        save_token_file(token_file, FakeCredentials("second"))
+        credentials = load_token_file(token_file)
+
+        # Assert
+        self.assertEqual(credentials.token, "second")
+        self.assertEqual(os.listdir(self.token_dir), ["token.json"])
+        if os.name == "posix":
+            self.assertEqual(stat.S_IMODE(os.stat(token_file).st_mode), 0o600)
+
+        self.assertTrue(delete_token_file(token_file))
+        self.assertIsNone(load_token_file(token_file))
+
+    def test_unreadable_token_file_is_treated_as_missing(self):
+        # Arrange
+        token_file = os.path.join(self.temp_dir.name, "token.json")
+        with open(token_file, "w") as f:
+            f.write("not json")
+
+        # Act & Assert
+        self.assertIsNone(load_token_file(token_file))
+
+    def test_token_file_lock_is_exclusive(self):
+        # Arrange
+        token_file = os.path.join(self.token_dir, "token.json")
+        events = []
+
+        def hold_lock():
+            with TokenFileLock(token_file):
+                events.append("second acquired")
+
+        # Act
+        with TokenFileLock(token_file):
+            thread = threading.Thread(target=hold_lock)
+            thread.start()
+            thread.join(0.2)
+            events.append("first released")
+        thread.join()
+
+        # Assert
+        self.assertEqual(events, ["first released", "second acquired"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import socket
+import unittest
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+import urllib3
+from benchmarks.fake_server import FakeYouTubeServer
+from benchmarks.transport_benchmark import build_fake_service, fake_credentials
+from youtube_bulk_upload.transport import PooledHttpTransport
+
+
+class PooledHttpTransportTest(TestCase):
+    def setUp(self):
+        self.server = FakeYouTubeServer().start()
+        self.transport = PooledHttpTransport(pool_size=4)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_request_returns_httplib2_style_response(self):
+        # Arrange
+        http = self.transport.authorize(fake_credentials())
+
+        # Act
+        response, content = http.request(f"{self.server.url}youtube/v3/channels?part=snippet&mine=true")
+
+        # Assert
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response["status"], "200")
+        self.assertIn("application/json", response["content-type"])
+        self.assertIn(b"UCfakechannel", content)
+
+    def test_services_for_different_credentials_share_connections(self):
+        # Arrange
+        services = [build_fake_service(self.transport.authorize(fake_credentials()), self.server.url) for _ in range(3)]
+
+        # Act
+        for _ in range(5):
+            for service in services:
+                response = service.channels().list(part="snippet", mine=True).execute()
+
+        # Assert
+        self.assertEqual(response["items"][0]["id"], "UCfakechannel")
+        self.assertEqual(self.server.requests_handled, 15)
+        self.assertEqual(self.server.connections_opened, 1)
+
+    def test_one_service_can_be_shared_by_concurrent_threads(self):
+        # Arrange
+        service = build_fake_service(self.transport.authorize(fake_credentials()), self.server.url)
+        errors = []
+
+        def call_api():
+            try:
+                for _ in range(10):
+                    service.channels().list(part="snippet", mine=True).execute()
+            except Exception as e:
+                errors.append(e)
+
+        # Act
+        threads = [threading.Thread(target=call_api) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(errors, [])
+        self.assertEqual(self.server.requests_handled, 40)
+        self.assertLessEqual(self.server.connections_opened, 4)
+
+    def test_https_proxy_is_used_unless_no_proxy_covers_the_api_host(self):
+        # Arrange
+        proxy_environ = {"https_proxy": "http://proxy.example.com:3128"}
+
+        # Act
+        with patch.dict(os.environ, proxy_environ, clear=True):
+            proxied_pool_manager = PooledHttpTransport().get_pool_manager()
+        with patch.dict(os.environ, dict(proxy_environ, no_proxy="localhost,.googleapis.com"), clear=True):
+            direct_pool_manager = PooledHttpTransport().get_pool_manager()
+
+        # Assert
+        self.assertIsInstance(proxied_pool_manager, urllib3.ProxyManager)
+        self.assertEqual(proxied_pool_manager.proxy.host, "proxy.example.com")
+        self.assertNotIsInstance(direct_pool_manager, urllib3.ProxyManager)
+
+    def test_send_buffer_size_is_applied_to_sockets(self):
+        # Arrange
+        transport = PooledHttpTransport(send_buffer_size=262144)
+
+        # Act
+        options = transport.socket_options()
+
+        # Assert
+        self.assertIn((socket.SOL_SOCKET, socket.SO_SNDBUF, 262144), options)
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), options)
+
+
+if __name__ == "__main__":
+    unittest.main()
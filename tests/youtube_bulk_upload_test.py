@@ -1,9 +1,16 @@
+import json
 import logging
 import os
+import tempfile
+import threading
 from unittest import TestCase
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 import test_data as td
+from youtube_bulk_upload.retry_queue import ErrorClass, RetryPolicy, RetryQueue
+from youtube_bulk_upload.review import REVIEW_PENDING, ReviewQueue
+from youtube_bulk_upload.credentials import stop_credential_managers
+from youtube_bulk_upload.log_handlers import job_log_fields
 from youtube_bulk_upload.bulk_upload import (
     YouTubeBulkUpload,
     VideoPrivacyStatus,
@@ -18,6 +25,9 @@ class YouTubeBulkUploadAuthenticationTest(TestCase):
         self.valid_json_content = '{"key": "value"}'
         self.invalid_json_content = '{"key": "value"'
 
+    def tearDown(self):
+        stop_credential_managers()
+
     def test_validate_secrets_file_valid(self):
         # Arrange, Act & Assert
         with (
@@ -55,36 +65,46 @@ class YouTubeBulkUploadAuthenticationTest(TestCase):
     def test_authenticate_youtube_with_valid_token(self):
         # Arrange, Act & Assert
         with (
-            patch("os.path.exists", return_value=True),
-            patch("builtins.open", mock_open(read_data="mock_token_data")),
-            patch("pickle.load", return_value=MagicMock(valid=True)),
-            patch(
-                "youtube_bulk_upload.bulk_upload.build", return_value="YouTubeService"
-            ),
+            tempfile.TemporaryDirectory() as temp_dir,
+            patch("youtube_bulk_upload.bulk_upload.load_token_file", return_value=MagicMock(valid=True)),
+            patch("youtube_bulk_upload.bulk_upload.build_youtube_service", return_value="YouTubeService"),
         ):
-            result = YouTubeBulkUpload.authenticate_youtube(
-                self.logger, self.secrets_file
-            )
+            result = YouTubeBulkUpload.authenticate_youtube(self.logger, self.secrets_file, token_file=os.path.join(temp_dir, "token.json"))
             self.assertEqual(result, "YouTubeService")
 
     def test_authenticate_youtube_with_new_auth(self):
         # Arrange, Act & Assert
         with (
-            patch("os.path.exists", return_value=False),
+            tempfile.TemporaryDirectory() as temp_dir,
             patch(
                 "youtube_bulk_upload.bulk_upload.YouTubeBulkUpload.open_browser_to_authenticate",
-                return_value=MagicMock(),
-            ),
-            patch("pickle.dump"),
-            patch("builtins.open", mock_open()),
-            patch(
-                "youtube_bulk_upload.bulk_upload.build", return_value="YouTubeService"
+                return_value=MagicMock(to_json=MagicMock(return_value='{"token": "new"}')),
             ),
+            patch("youtube_bulk_upload.bulk_upload.build_youtube_service", return_value="YouTubeService"),
         ):
-            result = YouTubeBulkUpload.authenticate_youtube(
-                self.logger, self.secrets_file
-            )
+            token_file = os.path.join(temp_dir, "token.json")
+            result = YouTubeBulkUpload.authenticate_youtube(self.logger, self.secrets_file, token_file=token_file)
             self.assertEqual(result, "YouTubeService")
+            with open(token_file) as f:
+                self.assertEqual(json.load(f), {"token": "new"})
+
+    def test_authenticate_youtube_reuses_credentials_already_loaded_in_process(self):
+        # Arrange
+        credentials = MagicMock(valid=True)
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            patch("youtube_bulk_upload.bulk_upload.load_token_file", return_value=credentials) as mock_load,
+            patch("youtube_bulk_upload.bulk_upload.build_youtube_service") as mock_build,
+        ):
+            token_file = os.path.join(temp_dir, "token.json")
+
+            # Act
+            YouTubeBulkUpload.authenticate_youtube(self.logger, self.secrets_file, token_file=token_file)
+            YouTubeBulkUpload.authenticate_youtube(self.logger, self.secrets_file, token_file=token_file)
+
+        # Assert
+        mock_load.assert_called_once()
+        self.assertIs(mock_build.call_args_list[1].args[1], credentials)
 
 
 class YouTubeBulkUploadTest(TestCase):
@@ -325,7 +345,7 @@ class YouTubeBulkUploadTest(TestCase):
             mock_info.assert_any_call(
                 "Validating input parameters for enabled features..."
             )
-            mock_info.assert_any_call(f"Current directory to process: {os.getcwd()}")
+            mock_info.assert_any_call("Current directory to process: %s", os.getcwd())
             mock_warning.assert_called_once_with(
                 "No YouTube description template file provided. Description will be empty unless entered interactively."
             )
@@ -346,7 +366,7 @@ class YouTubeBulkUploadTest(TestCase):
 
             # Assert
             mock_isfile.assert_called_once_with(td.invalid_file_path)
-            mock_info.assert_any_call(f"Current directory to process: {os.getcwd()}")
+            mock_info.assert_any_call("Current directory to process: %s", os.getcwd())
             self.assertIn(
                 "YouTube description file does not exist", str(context.exception)
             )
@@ -366,9 +386,7 @@ class YouTubeBulkUploadTest(TestCase):
 
             # Assert
             mock_isfile.assert_called_once_with(td.valid_video_file_path)
-            mock_info.assert_any_call(
-                f"YouTube description template file exists: {td.valid_video_file_path}"
-            )
+            mock_info.assert_any_call("YouTube description template file exists: %s", td.valid_video_file_path)
 
     def test_validate_input_parameters_invalid_privacy_status_raises_exception(self):
         # Arrange
@@ -460,9 +478,7 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertEqual(result, td.sample_video_id)
             mock_get_channel_id.assert_called_once()
             mock_execute.assert_called_once()
-            mock_info.assert_any_call(
-                f"Searching YouTube channel {td.mock_channel_id} for title: {td.sample_video_title}"
-            )
+            mock_info.assert_any_call("Searching YouTube channel %s for title: %s", td.mock_channel_id, td.sample_video_title)
 
     def test_check_if_video_title_exists_on_youtube_channel_no_match(self):
         # Arrange
@@ -490,12 +506,8 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertIsNone(result)
             mock_get_channel_id.assert_called_once()
             mock_execute.assert_called_once()
-            mock_info.assert_any_call(
-                f"Searching YouTube channel {td.mock_channel_id} for title: Non-Existent Title"
-            )
-            mock_info.assert_any_call(
-                "No matching video found with title: Non-Existent Title, continuing with upload."
-            )
+            mock_info.assert_any_call("Searching YouTube channel %s for title: %s", td.mock_channel_id, "Non-Existent Title")
+            mock_info.assert_any_call("No matching video found with title: %s, continuing with upload.", "Non-Existent Title")
 
     def test_check_if_video_title_exists_on_youtube_channel_interactive_prompt_accepts(
         self,
@@ -531,9 +543,7 @@ class YouTubeBulkUploadTest(TestCase):
             mock_prompt.assert_called_once_with(
                 f"Is '{td.sample_video_title}' the same video as existing video on channel: '{td.sample_video_title}'? (y/n): "
             )
-            mock_info.assert_any_call(
-                f"Searching YouTube channel {td.mock_channel_id} for title: {td.sample_video_title}"
-            )
+            mock_info.assert_any_call("Searching YouTube channel %s for title: %s", td.mock_channel_id, td.sample_video_title)
 
     def test_check_if_video_title_exists_on_youtube_channel_interactive_prompt_rejects(
         self,
@@ -569,9 +579,7 @@ class YouTubeBulkUploadTest(TestCase):
             mock_prompt.assert_called_once_with(
                 f"Is '{td.sample_video_title}' the same video as existing video on channel: '{td.sample_video_title}'? (y/n): "
             )
-            mock_info.assert_any_call(
-                f"Searching YouTube channel {td.mock_channel_id} for title: {td.sample_video_title}"
-            )
+            mock_info.assert_any_call("Searching YouTube channel %s for title: %s", td.mock_channel_id, td.sample_video_title)
 
     def test_truncate_to_nearest_word_within_limit(self):
         # Arrange
@@ -585,7 +593,7 @@ class YouTubeBulkUploadTest(TestCase):
             # Assert
             self.assertEqual(result, title)
             mock_debug.assert_called_once_with(
-                f"Truncating title with length {len(title)} to nearest word with max length: {max_length}"
+                "Truncating title with length %s to nearest word with max length: %s", len(title), max_length
             )
 
     def test_truncate_to_nearest_word_exceeds_limit(self):
@@ -601,7 +609,7 @@ class YouTubeBulkUploadTest(TestCase):
             expected = "Sample Video ..."
             self.assertEqual(result, expected)
             mock_debug.assert_called_once_with(
-                f"Truncating title with length {len(title)} to nearest word with max length: {max_length}"
+                "Truncating title with length %s to nearest word with max length: %s", len(title), max_length
             )
 
     def test_truncate_to_nearest_word_exact_boundary(self):
@@ -616,7 +624,7 @@ class YouTubeBulkUploadTest(TestCase):
             # Assert
             self.assertEqual(result, title)
             mock_debug.assert_called_once_with(
-                f"Truncating title with length {len(title)} to nearest word with max length: {max_length}"
+                "Truncating title with length %s to nearest word with max length: %s", len(title), max_length
             )
 
     def test_upload_video_to_youtube_with_title_thumbnail_dry_run(self):
@@ -635,9 +643,12 @@ class YouTubeBulkUploadTest(TestCase):
             # Assert
             self.assertEqual(result, "dry-run-video-id")
             mock_info.assert_any_call(
-                f"DRY RUN: Would upload {td.valid_video_file_path} to YouTube with title: {td.sample_video_title}, "
-                f"description: {td.sample_description[:50]}... and thumbnail: {td.thumbnail_filepath} "
-                f"with Privacy Status: {self.sample_uploader.privacy_status}"
+                "DRY RUN: Would upload %s to YouTube with title: %s, description: %s... and thumbnail: %s with Privacy Status: %s",
+                td.valid_video_file_path,
+                td.sample_video_title,
+                td.sample_description[:50],
+                td.thumbnail_filepath,
+                self.sample_uploader.privacy_status,
             )
 
     def test_upload_video_to_youtube_with_title_thumbnail_actual_upload(self):
@@ -670,9 +681,7 @@ class YouTubeBulkUploadTest(TestCase):
                 td.valid_video_file_path, resumable=True, chunksize=td.sample_chunk_size
             )
             mock_next_chunk.assert_called_once()
-            mock_info.assert_any_call(
-                f"Uploaded video to YouTube: {YOUTUBE_URL_PREFIX}{td.sample_video_id}"
-            )
+            mock_info.assert_any_call("Uploaded video to YouTube: %s", f"{YOUTUBE_URL_PREFIX}{td.sample_video_id}", extra=ANY)
             mock_thumbnail_set.assert_called_once()
 
     def test_upload_video_to_youtube_with_title_thumbnail_no_thumbnail(self):
@@ -702,10 +711,39 @@ class YouTubeBulkUploadTest(TestCase):
                 td.valid_video_file_path, resumable=True, chunksize=td.sample_chunk_size
             )
             mock_next_chunk.assert_called_once()
-            mock_info.assert_any_call(
-                f"Uploaded video to YouTube: {YOUTUBE_URL_PREFIX}{td.sample_video_id}"
+            mock_info.assert_any_call("Uploaded video to YouTube: %s", f"{YOUTUBE_URL_PREFIX}{td.sample_video_id}", extra=ANY)
+
+    def test_upload_video_to_youtube_with_title_thumbnail_publishes_progress(self):
+        # Arrange
+        self.sample_uploader.dry_run = False
+        self.sample_uploader.progress_tracker.min_interval_seconds = 0
+        progress_fractions = []
+        self.sample_uploader.progress_callback_func = lambda progress: progress_fractions.append(progress)
+        self.sample_uploader.progress_tracker.subscribe(self.sample_uploader.publish_progress_fraction)
+        events = []
+        self.sample_uploader.progress_tracker.subscribe(events.append)
+        chunk_status = MagicMock(resumable_progress=5242880)
+
+        # Act
+        with (
+            patch("youtube_bulk_upload.bulk_upload.MediaFileUpload"),
+            patch("youtube_bulk_upload.progress.os.path.getsize", return_value=10485760),
+            patch.object(
+                self.sample_uploader.youtube.videos().insert(),
+                "next_chunk",
+                side_effect=[(chunk_status, None), (None, td.mock_mediaFileUpload_response)],
+            ),
+        ):
+            self.sample_uploader.upload_video_to_youtube_with_title_thumbnail(
+                td.valid_video_file_path, td.sample_video_title, td.sample_description, None
             )
 
+        # Assert
+        self.assertEqual([event.state for event in events], ["started", "uploading", "completed"])
+        self.assertEqual(events[1].bytes_sent, 5242880)
+        self.assertEqual(events[1].total_bytes, 10485760)
+        self.assertEqual(progress_fractions, [0, 0.5, 0])
+
     def test_determine_thumbnail_filepath_finds_existing_file(self):
         # Arrange
         expected_thumbnail = f"{td.valid_video_file_path}.png"
@@ -726,7 +764,9 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertEqual(result, expected_thumbnail)
             mock_exists.assert_any_call(expected_thumbnail)
             mock_info.assert_called_with(
-                f"Determining thumbnail filepath for video file: {td.valid_video_file_path}..."
+                "Determining thumbnail filepath for video file: %s...",
+                td.valid_video_file_path,
+                extra=job_log_fields(td.valid_video_file_path, "thumbnail_lookup"),
             )
 
     def test_determine_thumbnail_filepath_no_matching_file_prompts_user(self):
@@ -750,7 +790,9 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertIsNone(result)
             mock_exists.assert_called_once()
             mock_info.assert_called_with(
-                f"Determining thumbnail filepath for video file: {td.valid_video_file_path}..."
+                "Determining thumbnail filepath for video file: %s...",
+                td.valid_video_file_path,
+                extra=job_log_fields(td.valid_video_file_path, "thumbnail_lookup"),
             )
             mock_prompt.assert_called_once_with(
                 "No valid thumbnail file found. Do you want to continue without a thumbnail?",
@@ -780,11 +822,25 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertEqual(result, td.sample_video_title)
             mock_truncate.assert_called_once_with("Prefix: clip :Suffix", 95)
             mock_info.assert_any_call(
-                f"Crafting YouTube title for video file: {td.sample_video_file}..."
-            )
-            mock_debug.assert_any_call(
-                "Applying title replacement pattern: video -> clip"
+                "Crafting YouTube title for video file: %s...", td.sample_video_file, extra=job_log_fields(td.sample_video_file, "title")
             )
+            mock_debug.assert_any_call("Applying title replacement pattern: %s -> %s", "video", "clip")
+
+    def test_determine_youtube_title_skips_debug_logging_when_disabled(self):
+        # Arrange
+        self.sample_uploader.youtube_title_replacements = [(r"video", "clip"), (r"clip", "song")]
+        self.sample_uploader.interactive_prompt = False
+
+        # Act
+        with (
+            patch.object(self.sample_uploader.logger, "isEnabledFor", return_value=False),
+            patch.object(self.sample_uploader.logger, "debug") as mock_debug,
+        ):
+            result = self.sample_uploader.determine_youtube_title(td.sample_video_file)
+
+        # Assert
+        self.assertEqual(result, "song")
+        self.assertFalse([call for call in mock_debug.call_args_list if call.args[0].startswith("Applying title replacement pattern")])
 
     def test_determine_youtube_title_interactive_prompt_accepts_title(self):
         # Arrange
@@ -804,7 +860,7 @@ class YouTubeBulkUploadTest(TestCase):
             mock_prompt.assert_called_once_with(
                 "Are you happy with the generated title: video?"
             )
-            mock_debug.assert_called_with("Prompting user to confirm title: video")
+            mock_debug.assert_called_with("Prompting user to confirm title: %s", "video")
 
     def test_determine_youtube_description_applies_replacements(self):
         # Arrange
@@ -829,11 +885,9 @@ class YouTubeBulkUploadTest(TestCase):
             self.assertEqual(result, "This is the description with Replaced Title.")
             mock_file.assert_called_once_with("template.txt", "r", encoding="utf-8")
             mock_info.assert_any_call(
-                "Determining YouTube description for video file: video.mp4..."
-            )
-            mock_debug.assert_any_call(
-                "Applying description replacement pattern: {{youtube_title}} -> Replaced Title"
+                "Determining YouTube description for video file: %s...", "video.mp4", extra=job_log_fields("video.mp4", "description")
             )
+            mock_debug.assert_any_call("Applying description replacement pattern: %s -> %s", "{{youtube_title}}", "Replaced Title")
 
     def test_determine_youtube_description_prompts_user_when_no_template(self):
         # Arrange
@@ -855,9 +909,7 @@ class YouTubeBulkUploadTest(TestCase):
 
             # Assert
             self.assertEqual(result, td.sample_description)
-            mock_warning.assert_called_once_with(
-                f"Unable to load YouTube description from file for video file: {td.sample_video_file}..."
-            )
+            mock_warning.assert_called_once_with("Unable to load YouTube description from file for video file: %s...", td.sample_video_file)
             mock_prompt.assert_called_once_with(
                 "No description template file found. Please type the description you would like to use: ",
                 default_response="",
@@ -954,7 +1006,9 @@ class YouTubeBulkUploadTest(TestCase):
             mock_title.assert_called_once_with(td.sample_video_file)
             mock_check.assert_called_once_with(td.sample_video_title)
             mock_warning.assert_called_with(
-                f"Video already exists on YouTube, skipping upload: {YOUTUBE_URL_PREFIX}existing_video_id"
+                "Video already exists on YouTube, skipping upload: %s",
+                f"{YOUTUBE_URL_PREFIX}existing_video_id",
+                extra=job_log_fields(td.sample_video_file, "skipped", youtube_id="existing_video_id"),
             )
 
     def test_process_interactive_prompt_skips_video_on_rejection(self):
@@ -1063,6 +1117,167 @@ class YouTubeBulkUploadTest(TestCase):
                 td.sample_video_file, td.sample_video_title, td.sample_description, td.thumbnail_filepath
             )
 
+    def test_process_stops_after_quota_exceeded_failure(self):
+        # Arrange
+        self.sample_uploader.interactive_prompt = False
+        self.sample_uploader.check_for_duplicate_titles = False
+        self.sample_uploader.retry_queue = MagicMock()
+        self.sample_uploader.retry_queue.record_failure.return_value = MagicMock(error_class=ErrorClass.QUOTA)
+        self.sample_uploader.retry_queue.pending_entries.return_value = []
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=None),
+            patch.object(
+                self.sample_uploader,
+                "upload_video_to_youtube_with_title_thumbnail",
+                side_effect=Exception("quotaExceeded"),
+            ) as mock_upload,
+            patch("builtins.open", mock_open()),
+        ):
+            result = self.sample_uploader.process(input_files=["video1.mp4", "video2.mp4"])
+
+            # Assert
+            self.assertEqual(result, [])
+            mock_upload.assert_called_once()
+            self.sample_uploader.retry_queue.record_failure.assert_called_once()
+            self.assertTrue(self.sample_uploader.quota_exceeded)
+
+    def test_process_retries_transient_failure_in_same_run(self):
+        # Arrange
+        self.sample_uploader.interactive_prompt = False
+        self.sample_uploader.check_for_duplicate_titles = False
+        self.sample_uploader.retry_queue = RetryQueue("unused.json", td.mock_logger)
+        self.sample_uploader.retry_queue.policies[ErrorClass.TRANSIENT] = RetryPolicy(max_attempts=5, retry_in_run=True)
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=None),
+            patch.object(
+                self.sample_uploader,
+                "upload_video_to_youtube_with_title_thumbnail",
+                side_effect=[ConnectionResetError(), td.sample_video_id],
+            ) as mock_upload,
+            patch.object(self.sample_uploader.retry_queue, "save"),
+            patch("builtins.open", mock_open()),
+        ):
+            result = self.sample_uploader.process(input_files=[td.sample_video_file])
+
+            # Assert
+            self.assertEqual([video["youtube_id"] for video in result], [td.sample_video_id])
+            self.assertEqual(mock_upload.call_count, 2)
+            self.assertEqual(self.sample_uploader.retry_queue.entries, {})
+
+    def test_record_upload_failure_queues_urllib3_connection_reset_as_transient(self):
+        from urllib3.exceptions import ProtocolError
+
+        # Arrange
+        self.sample_uploader.retry_queue = RetryQueue("unused.json", td.mock_logger)
+        error = ProtocolError("Connection aborted.", ConnectionResetError(104, "Connection reset by peer"))
+
+        # Act
+        with patch.object(self.sample_uploader.retry_queue, "save"), patch("builtins.open", mock_open()):
+            self.sample_uploader.record_upload_failure(td.sample_video_file, error)
+
+        # Assert
+        entry = self.sample_uploader.retry_queue.entries[td.sample_video_file]
+        self.assertEqual(entry.error_class, ErrorClass.TRANSIENT)
+        self.assertFalse(entry.abandoned)
+        self.assertFalse(self.sample_uploader.quota_exceeded)
+
+    def test_process_does_not_keep_retrying_a_video_skipped_on_retry(self):
+        # Arrange
+        self.sample_uploader.interactive_prompt = False
+        self.sample_uploader.retry_queue = RetryQueue("unused.json", td.mock_logger)
+        self.sample_uploader.retry_queue.policies[ErrorClass.TRANSIENT] = RetryPolicy(max_attempts=5, retry_in_run=True)
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=None),
+            # The first attempt fails after the video was created on the channel, so the retry finds it as a duplicate
+            patch.object(
+                self.sample_uploader, "check_if_video_title_exists_on_youtube_channel", side_effect=[None, td.sample_video_id]
+            ) as mock_check,
+            patch.object(self.sample_uploader, "upload_video_to_youtube_with_title_thumbnail", side_effect=ConnectionResetError()),
+            patch.object(self.sample_uploader.retry_queue, "save"),
+            patch("builtins.open", mock_open()),
+        ):
+            result = self.sample_uploader.process(input_files=[td.sample_video_file])
+
+            # Assert
+            self.assertEqual(result, [])
+            self.assertEqual(mock_check.call_count, 2)
+            self.assertIn(td.sample_video_file, self.sample_uploader.retry_queue.entries)
+
+    def test_process_with_review_queue_uploads_approved_videos_with_edits(self):
+        # Arrange
+        self.sample_uploader.check_for_duplicate_titles = False
+        review_queue = ReviewQueue()
+        self.sample_uploader.review_queue = review_queue
+        self.sample_uploader.interactive_prompt = False
+
+        def review(review_item):
+            # Decide each video as soon as it appears in the review queue, as a user would in the review window
+            if review_item.status != REVIEW_PENDING:
+                return
+            if review_item.video_file == "video1.mp4":
+                threading.Thread(target=review_queue.approve, args=("video1.mp4", "Edited title")).start()
+            else:
+                threading.Thread(target=review_queue.reject, args=(review_item.video_file,)).start()
+
+        review_queue.add_listener(review)
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_youtube_title", side_effect=lambda video_file: f"Title of {video_file}"),
+            patch.object(self.sample_uploader, "determine_youtube_description", return_value=td.sample_description),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=td.thumbnail_filepath),
+            patch.object(self.sample_uploader, "prompt_user_bool") as mock_prompt,
+            patch.object(
+                self.sample_uploader,
+                "upload_video_to_youtube_with_title_thumbnail",
+                return_value=td.sample_video_id,
+            ) as mock_upload,
+        ):
+            result = self.sample_uploader.process(input_files=["video1.mp4", "video2.mp4"])
+
+            # Assert
+            self.assertEqual([(video["input_filename"], video["youtube_title"]) for video in result], [("video1.mp4", "Edited title")])
+            mock_upload.assert_called_once_with("video1.mp4", "Edited title", td.sample_description, td.thumbnail_filepath)
+            mock_prompt.assert_not_called()
+
+    def test_iter_process_streams_uploaded_videos_to_results_file(self):
+        # Arrange
+        self.sample_uploader.interactive_prompt = False
+        self.sample_uploader.check_for_duplicate_titles = False
+        self.sample_uploader.retry_queue = None
+        results_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(results_dir.cleanup)
+        results_file = os.path.join(results_dir.name, "results.jsonl")
+
+        # Act
+        with (
+            patch.object(self.sample_uploader, "validate_input_parameters"),
+            patch.object(self.sample_uploader, "determine_thumbnail_filepath", return_value=None),
+            patch.object(self.sample_uploader, "upload_video_to_youtube_with_title_thumbnail", side_effect=["id1", "id2"]) as mock_upload,
+        ):
+            uploaded_videos = self.sample_uploader.iter_process(input_files=["video1.mp4", "video2.mp4"], results_file=results_file)
+            first_video = next(uploaded_videos)
+            uploads_before_second_video = mock_upload.call_count
+            remaining_videos = list(uploaded_videos)
+
+        # Assert
+        self.assertEqual(first_video["youtube_id"], "id1")
+        self.assertEqual(uploads_before_second_video, 1)
+        self.assertEqual([video["youtube_id"] for video in remaining_videos], ["id2"])
+        with open(results_file) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual([result["youtube_url"] for result in results], [f"{YOUTUBE_URL_PREFIX}id1", f"{YOUTUBE_URL_PREFIX}id2"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,26 +1,137 @@
 import os
 import json
-import tempfile
 import logging
+import mimetypes
 import re
-import pickle
-from typing import Any, Iterable, Optional, Union
-from thefuzz import fuzz
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.http import MediaFileUpload
-from google.auth.exceptions import RefreshError
-from google.auth.external_account_authorized_user import Credentials as Creds
-from google.oauth2.credentials import Credentials
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
 from enum import Enum
+from youtube_bulk_upload.retry_queue import DEFAULT_RETRY_QUEUE_FILE, ErrorClass, RetryQueue
+from youtube_bulk_upload.profiles import ROUTING_ROUND_ROBIN, CredentialProfile, CredentialProfileRouter
+from youtube_bulk_upload.discovery import build_youtube_service
+from youtube_bulk_upload.transport import PooledHttpTransport
+from youtube_bulk_upload.progress import PROGRESS_UPLOADING, ProgressEvent, ProgressTracker
+from youtube_bulk_upload.review import REVIEW_REJECTED, ReviewItem, ReviewQueue
+from youtube_bulk_upload.records import YOUTUBE_URL_PREFIX, UploadedVideo
+from youtube_bulk_upload.log_handlers import job_log_fields
+from youtube_bulk_upload.metrics import (
+    VIDEO_OUTCOME_FAILED,
+    VIDEO_OUTCOME_SKIPPED,
+    VIDEO_OUTCOME_UPLOADED,
+    NullUploadMetrics,
+    UploadMetrics,
+)
+from youtube_bulk_upload.chunk_trace import ChunkTraceRecorder
+from youtube_bulk_upload.quota_ledger import DEFAULT_QUOTA_POOL, QUOTA_WARNING_FRACTION, QuotaLedger
+from youtube_bulk_upload.thumbnails import DEFAULT_THUMBNAIL_LOOKAHEAD, ThumbnailPreprocessor, TitleCardGenerator
+from youtube_bulk_upload.media_source import UPLOAD_CHUNK_SIZE, ReadAheadMediaSource
+from youtube_bulk_upload.credentials import get_managed_credentials, manage_credentials
+from youtube_bulk_upload.token_store import (
+    DEFAULT_TOKEN_ACCOUNT,
+    YOUTUBE_SCOPES,
+    TokenFileLock,
+    default_token_file,
+    get_client_id,
+    load_token_file,
+    save_token_file,
+)
+
+if TYPE_CHECKING:
+    from google.auth.external_account_authorized_user import Credentials as Creds
+    from google.oauth2.credentials import Credentials
 
 OPTIONAL_ANY = Optional[Any]
 OPTIONAL_STR = Optional[str]
 
-YOUTUBE_URL_PREFIX: str = "https://www.youtube.com/watch?v="
-DEFAULT_LOG_LEVEL: int = logging.DEBUG
+DEFAULT_LOG_LEVEL: int = logging.INFO
 DEFAULT_LOGGING_FORMATTER: logging.Formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(module)s - %(message)s")
+# Generated titles are truncated to this, leaving room under YouTube's 100 character limit for the ellipsis
+YOUTUBE_TITLE_MAX_LENGTH: int = 95
+
+
+# The Google API client, auth and fuzzy matching libraries take a long time to import, so they're only imported
+# by the code paths which use them. This wrapper keeps MediaFileUpload patchable as a module attribute.
+def MediaFileUpload(*args: Any, **kwargs: Any) -> Any:
+    from googleapiclient.http import MediaFileUpload
+
+    return MediaFileUpload(*args, **kwargs)
+
+
+def MediaIoBaseUpload(*args: Any, **kwargs: Any) -> Any:
+    from googleapiclient.http import MediaIoBaseUpload
+
+    return MediaIoBaseUpload(*args, **kwargs)
+
+
+def find_thumbnail_file(
+    video_file: str,
+    thumbnail_filename_prefix: OPTIONAL_STR,
+    thumbnail_filename_suffix: OPTIONAL_STR,
+    thumbnail_filename_replacements: Optional[Iterable[Iterable[str]]],
+    thumbnail_filename_extensions: Iterable[str],
+    logger: Optional[logging.Logger] = None,
+) -> OPTIONAL_STR:
+    """Return the thumbnail file for a video file with these filename settings, or None if there isn't one."""
+    modified_filename, _ = os.path.splitext(video_file)
+
+    # Apply thumbnail filename prefix if set
+    if thumbnail_filename_prefix is not None:
+        modified_filename = f"{thumbnail_filename_prefix}{modified_filename}"
+
+    # Apply thumbnail filename suffix if set
+    if thumbnail_filename_suffix is not None:
+        modified_filename = f"{modified_filename}{thumbnail_filename_suffix}"
+
+    # Apply thumbnail filename replacements if set
+    if thumbnail_filename_replacements is not None:
+        if logger is not None:
+            logger.info("Applying replacement patterns to thumbnail filename: %s", modified_filename)
+
+        debug_enabled = logger is not None and logger.isEnabledFor(logging.DEBUG)
+        for pattern, replacement in thumbnail_filename_replacements:
+            if debug_enabled:
+                logger.debug("Applying thumbnail replacement pattern: %s -> %s", pattern, replacement)
+            modified_filename = re.sub(pattern, replacement, modified_filename)
+
+    # Test each file extension until a file is found
+    for ext in thumbnail_filename_extensions:
+        potential_filename = f"{modified_filename}{ext}"
+        if os.path.exists(potential_filename):
+            return potential_filename
+    return None
+
+
+def format_youtube_title(
+    video_file: str,
+    youtube_title_prefix: OPTIONAL_STR,
+    youtube_title_suffix: OPTIONAL_STR,
+    youtube_title_replacements: Optional[Iterable[Iterable[str]]],
+    logger: Optional[logging.Logger] = None,
+) -> str:
+    """Return the YouTube title for a video file with these title settings, before it's truncated."""
+    video_title, _ = os.path.splitext(video_file)
+
+    # Apply YouTube title prefix if set
+    if youtube_title_prefix is not None:
+        video_title = f"{youtube_title_prefix}{video_title}"
+
+    # Apply YouTube title suffix if set
+    if youtube_title_suffix is not None:
+        video_title = f"{video_title}{youtube_title_suffix}"
+
+    # Apply YouTube title replacements if set
+    if youtube_title_replacements is not None:
+        if logger is not None:
+            logger.info("Applying replacement patterns to title: %s", video_title)
+
+        debug_enabled = logger is not None and logger.isEnabledFor(logging.DEBUG)
+        for pattern, replacement in youtube_title_replacements:
+            if debug_enabled:
+                logger.debug("Applying title replacement pattern: %s -> %s", pattern, replacement)
+            video_title = re.sub(pattern, replacement, video_title)
+
+    return video_title
 
 
 class VideoPrivacyStatus(Enum):
@@ -32,7 +143,7 @@ class VideoPrivacyStatus(Enum):
 class YouTubeBulkUpload:
     def __init__(
         self,
-        youtube_client_secrets_file: str,
+        youtube_client_secrets_file: OPTIONAL_STR,
         logger: Optional[logging.Logger] = None,
         dry_run: bool = False,
         interactive_prompt: bool = True,
@@ -67,8 +178,21 @@ class YouTubeBulkUpload:
         privacy_status: str = VideoPrivacyStatus.PRIVATE.value,
         check_for_duplicate_titles: bool = True,
         progress_callback_func: OPTIONAL_ANY = None,
+        retry_queue_file: OPTIONAL_STR = DEFAULT_RETRY_QUEUE_FILE,
+        retry_in_run_max_wait_seconds: float = 900,
+        credential_profiles: Optional[list[CredentialProfile]] = None,
+        profile_routing: str = ROUTING_ROUND_ROBIN,
+        http_transport: OPTIONAL_ANY = None,
+        progress_tracker: Optional[ProgressTracker] = None,
+        review_queue: Optional[ReviewQueue] = None,
+        metrics: Optional[UploadMetrics] = None,
+        chunk_trace: Optional[ChunkTraceRecorder] = None,
+        quota_ledger: Optional[QuotaLedger] = None,
+        thumbnail_preprocessor: Optional[ThumbnailPreprocessor] = None,
+        title_card_generator: Optional[TitleCardGenerator] = None,
+        media_source: Optional[ReadAheadMediaSource] = None,
     ) -> None:
-        
+
         if logger is None:
             self.logger = logging.getLogger(__name__)
             self.logger.setLevel(DEFAULT_LOG_LEVEL)
@@ -81,25 +205,52 @@ class YouTubeBulkUpload:
 
             _log_handler.setFormatter(DEFAULT_LOGGING_FORMATTER)
             self.logger.addHandler(_log_handler)
-        
-        self.validate_secrets_file(self.logger, youtube_client_secrets_file)
 
-        self.youtube: Any = self.authenticate_youtube(self.logger, youtube_client_secrets_file)
+        # Every service object (one per credential profile) sends its requests over this transport's shared connection pool
+        self.http_transport = http_transport or PooledHttpTransport()
+
+        # With multiple credential profiles, each profile has its own service object and upload budget,
+        # and the budgets of all the profiles together replace the overall upload_batch_limit
+        self.credential_profiles = credential_profiles or []
+        self.profile_router: Optional[CredentialProfileRouter] = None
+        self.active_profile: Optional[CredentialProfile] = None
+        if self.credential_profiles:
+            self.profile_router = CredentialProfileRouter(self.credential_profiles, profile_routing)
+            self.authenticate_credential_profiles()
+            self.youtube: Any = self.credential_profiles[0].youtube
+            upload_batch_limit = sum(profile.upload_batch_limit for profile in self.credential_profiles)
+        else:
+            self.validate_secrets_file(self.logger, youtube_client_secrets_file)
+
+            self.youtube = self.authenticate_youtube(self.logger, youtube_client_secrets_file, http_transport=self.http_transport)
 
         self.logger.info(
-            f"YouTubeBulkUpload instantiating, dry_run: {dry_run}, interactive_prompt: {interactive_prompt}, source_directory: {source_directory}, input_file_extensions: {input_file_extensions}"
+            "YouTubeBulkUpload instantiating, dry_run: %s, interactive_prompt: %s, source_directory: %s, input_file_extensions: %s",
+            dry_run,
+            interactive_prompt,
+            source_directory,
+            input_file_extensions,
+        )
+        self.logger.info("check_for_duplicate_titles: %s", check_for_duplicate_titles)
+        self.logger.info(
+            "youtube_client_secrets_file: %s, youtube_description_template_file: %s",
+            youtube_client_secrets_file,
+            youtube_description_template_file,
         )
-        self.logger.info(f"check_for_duplicate_titles: {check_for_duplicate_titles}")
+        self.logger.info("youtube_title_replacements: %s, youtube_title_prefix: %s", youtube_title_replacements, youtube_title_prefix)
+        self.logger.info("youtube_title_suffix: %s", youtube_title_suffix)
         self.logger.info(
-            f"youtube_client_secrets_file: {youtube_client_secrets_file}, youtube_description_template_file: {youtube_description_template_file}"
+            "thumbnail_filename_prefix: %s, thumbnail_filename_suffix: %s",
+            thumbnail_filename_prefix,
+            thumbnail_filename_suffix,
         )
-        self.logger.info(f"youtube_title_replacements: {youtube_title_replacements}, youtube_title_prefix: {youtube_title_prefix}")
-        self.logger.info(f"youtube_title_suffix: {youtube_title_suffix}")
-        self.logger.info(f"thumbnail_filename_prefix: {thumbnail_filename_prefix}, thumbnail_filename_suffix: {thumbnail_filename_suffix}")
         self.logger.info(
-            f"thumbnail_filename_replacements: {thumbnail_filename_replacements}, thumbnail_filename_extensions: {thumbnail_filename_extensions}"
+            "thumbnail_filename_replacements: %s, thumbnail_filename_extensions: %s",
+            thumbnail_filename_replacements,
+            thumbnail_filename_extensions,
         )
 
+        self.youtube_client_secrets_file = youtube_client_secrets_file
         self.gui = gui
         self.stop_event = stop_event
         self.dry_run = dry_run
@@ -124,12 +275,53 @@ class YouTubeBulkUpload:
 
         self.privacy_status = privacy_status
 
-        self.interactive_prompt = interactive_prompt
+        # With a review queue, every video is reviewed in one batch instead of prompting for each video while uploading
+        self.review_queue = review_queue
+        self.interactive_prompt = interactive_prompt and review_queue is None
         self.upload_batch_limit = upload_batch_limit
 
         self.check_for_duplicate_titles = check_for_duplicate_titles
 
+        # Upload progress is published as ProgressEvents; progress_callback_func is kept as a subscriber receiving the current
+        # file's fraction
+        self.progress_tracker = progress_tracker or ProgressTracker(self.logger)
         self.progress_callback_func = progress_callback_func
+        if progress_callback_func is not None:
+            self.progress_tracker.subscribe(self.publish_progress_fraction)
+
+        # Failed uploads are queued here to be re-attempted later in this run or by a later retry-failed run
+        self.retry_queue: Optional[RetryQueue] = None
+        if retry_queue_file is not None:
+            self.retry_queue = RetryQueue(retry_queue_file, self.logger)
+        self.retry_in_run_max_wait_seconds = retry_in_run_max_wait_seconds
+        self.quota_exceeded = False
+        self.deferred_video_files: set[str] = set()
+        self.failed_video_files: set[str] = set()
+
+        # Stage timings and API call counters; without metrics, the null implementation makes instrumentation free
+        self.metrics: Union[UploadMetrics, NullUploadMetrics] = metrics if metrics is not None else NullUploadMetrics()
+
+        # Optional per-chunk trace of uploads for diagnosing slow or stalling links
+        self.chunk_trace = chunk_trace
+        if self.chunk_trace is not None:
+            self.chunk_trace.attach_transport(self.http_transport)
+
+        # Optional persistent record of the quota units spent each day, per OAuth client
+        self.quota_ledger = quota_ledger
+        self.quota_pools: dict[str, str] = {}
+
+        # Optional resizing and re-encoding of thumbnails to the API's limits, and rendering of title cards for videos without
+        # a thumbnail file, both started for the whole batch before the uploads
+        self.thumbnail_preprocessor = thumbnail_preprocessor
+        self.title_card_generator = title_card_generator
+
+        # Optional reading of each video's next chunks in the background while the current one is sent
+        self.media_source = media_source
+
+    def publish_progress_fraction(self, event: ProgressEvent) -> None:
+        # Progress goes back to 0 when a file starts or finishes, ready for the next one
+        if self.progress_callback_func is not None:
+            self.progress_callback_func(progress=event.fraction if event.state == PROGRESS_UPLOADING else 0)
 
     def find_input_files(self) -> list[str]:
         self.logger.info("Finding input video files to upload...")
@@ -143,7 +335,7 @@ class YouTubeBulkUpload:
             self.logger.error("No video files found in current directory to upload.")
             raise Exception("No video files found in current directory to upload.")
 
-        self.logger.info(f"Found {len(video_files)} video files to upload.")
+        self.logger.info("Found %s video files to upload.", len(video_files))
 
         return video_files
 
@@ -192,7 +384,7 @@ class YouTubeBulkUpload:
         self.logger.info("Validating input parameters for enabled features...")
 
         current_directory = os.getcwd()
-        self.logger.info(f"Current directory to process: {current_directory}")
+        self.logger.info("Current directory to process: %s", current_directory)
 
         if self.youtube_description_template_file is None:
             self.logger.warning("No YouTube description template file provided. Description will be empty unless entered interactively.")
@@ -200,7 +392,7 @@ class YouTubeBulkUpload:
             if not os.path.isfile(self.youtube_description_template_file):
                 raise Exception(f"YouTube description file does not exist: {self.youtube_description_template_file}")
 
-            self.logger.info(f"YouTube description template file exists: {self.youtube_description_template_file}")
+            self.logger.info("YouTube description template file exists: %s", self.youtube_description_template_file)
 
         if self.privacy_status not in [status.value for status in VideoPrivacyStatus]:
             raise Exception(f'"{self.privacy_status}" is not a valid video privacy value. It must be private, public or unlisted')
@@ -217,61 +409,148 @@ class YouTubeBulkUpload:
         try:
             with open(secrets_file, "r", encoding="utf-8") as f:
                 json.load(f)
-                logger.info(f"YouTube client secrets file is valid JSON: {secrets_file}")
+                logger.info("YouTube client secrets file is valid JSON: %s", secrets_file)
         except json.JSONDecodeError as e:
             raise Exception(f"YouTube client secrets file is not valid JSON: {secrets_file}") from e
 
     @classmethod
-    def authenticate_youtube(cls, logger: logging.Logger, youtube_client_secrets_file: str) -> Any:
-        """Authenticate and return a YouTube service object. If the service is started for the first time or 
+    def authenticate_youtube(
+        cls,
+        logger: logging.Logger,
+        youtube_client_secrets_file: str,
+        token_file: OPTIONAL_STR = None,
+        account: str = DEFAULT_TOKEN_ACCOUNT,
+        http_transport: OPTIONAL_ANY = None,
+    ) -> Any:
+        """Authenticate and return a YouTube service object. If the service is started for the first time or
         the refresh token is expired or revoked, a browser window will open so the user can authenticate manually.
+        The credentials are then refreshed in the background ahead of expiry, and shared by every service built for the same token file.
         """
         logger.info("Authenticating with YouTube...")
 
-        credentials: Optional[Union[Credentials, Creds]] = None
-        pickle_file = os.path.join(tempfile.gettempdir(), "youtube-bulk-upload-token.pickle")
-
-        # Token file stores the user's access and refresh tokens.
-        if os.path.exists(pickle_file):
-            logger.info(f"Existing YouTube auth token file found: {pickle_file}")
-            with open(pickle_file, "rb") as token:
-                credentials = pickle.load(token)
-
-        # If there are no valid credentials, let the user log in.
-        if not credentials or not credentials.valid:
-            if credentials and credentials.expired and credentials.refresh_token:
-                try:
-                    credentials.refresh(Request())
-                except RefreshError:
-                    logger.info("Opening a browser for manual authentication with YouTube...")
-                    credentials = cls.open_browser_to_authenticate(youtube_client_secrets_file)
-            else:
-                logger.info("Opening a browser for manual authentication with YouTube...")
-                credentials = cls.open_browser_to_authenticate(youtube_client_secrets_file)
+        # Token file stores the user's access and refresh tokens, one per client secrets file and account.
+        token_file = token_file or default_token_file(youtube_client_secrets_file, account)
+        credentials: Optional[Union["Credentials", "Creds"]] = get_managed_credentials(token_file)
+
+        if credentials is None:
+            # Hold the token file lock while checking and renewing the token, so concurrent processes don't all refresh it
+            # or open a browser; whichever gets the lock second finds the token the first one saved.
+            with TokenFileLock(token_file):
+                credentials = load_token_file(token_file)
+                if credentials is not None:
+                    logger.info("Existing YouTube auth token file found: %s", token_file)
+
+                # If there are no valid credentials, let the user log in.
+                if not credentials or not credentials.valid:
+                    if credentials and credentials.expired and credentials.refresh_token:
+                        from google.auth.exceptions import RefreshError
+                        from google.auth.transport.requests import Request
+
+                        try:
+                            credentials.refresh(Request())
+                        except RefreshError:
+                            logger.info("Opening a browser for manual authentication with YouTube...")
+                            credentials = cls.open_browser_to_authenticate(youtube_client_secrets_file)
+                    else:
+                        logger.info("Opening a browser for manual authentication with YouTube...")
+                        credentials = cls.open_browser_to_authenticate(youtube_client_secrets_file)
 
-            # Save the credentials for the next run
-            with open(pickle_file, "wb") as token:
-                logger.info(f"Saving YouTube auth token to file: {pickle_file}")
-                pickle.dump(credentials, token)
+                    # Save the credentials for the next run
+                    logger.info("Saving YouTube auth token to file: %s", token_file)
+                    save_token_file(token_file, credentials)
 
-        return build("youtube", "v3", credentials=credentials)
+        manage_credentials(logger, token_file, credentials)
+        return build_youtube_service(logger, credentials, http_transport=http_transport)
 
     @classmethod
-    def open_browser_to_authenticate(cls, secrets_file: str) -> Union[Credentials, Creds]:
+    def open_browser_to_authenticate(cls, secrets_file: str) -> Union["Credentials", "Creds"]:
         """Trigger browser-based authentication and return new credentials."""
         try:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             flow = InstalledAppFlow.from_client_secrets_file(
                 secrets_file,
-                scopes=["https://www.googleapis.com/auth/youtube"],
+                scopes=YOUTUBE_SCOPES,
             )
             return flow.run_local_server(port=0)
         except Exception as e:
             raise RuntimeError("Re-authentication failed.") from e
-    
+
+    def authenticate_credential_profiles(self) -> None:
+        for profile in self.credential_profiles:
+            self.logger.info("Authenticating credential profile: %s", profile.name)
+            self.validate_secrets_file(self.logger, profile.client_secrets_file)
+            profile.youtube = self.authenticate_youtube(
+                self.logger,
+                profile.client_secrets_file,
+                token_file=profile.resolve_token_file(),
+                account=profile.name,
+                http_transport=self.http_transport,
+            )
+
+    def activate_credential_profile(self, profile: CredentialProfile) -> None:
+        if profile is not self.active_profile:
+            self.logger.info("Switching to credential profile: %s", profile.name)
+        self.active_profile = profile
+        self.youtube = profile.youtube
+
+    def reauthenticate(self) -> None:
+        """Re-validate credentials and rebuild the YouTube service, e.g. after sleeping for many hours."""
+        if self.credential_profiles:
+            self.authenticate_credential_profiles()
+            for profile in self.credential_profiles:
+                profile.reset_budget()
+            self.activate_credential_profile(self.credential_profiles[0])
+            return
+
+        self.validate_secrets_file(self.logger, self.youtube_client_secrets_file)
+        self.youtube = self.authenticate_youtube(self.logger, self.youtube_client_secrets_file, http_transport=self.http_transport)
+
+    def profile_report(self) -> dict[str, dict[str, Any]]:
+        """Summarise how much of each credential profile's upload budget was used."""
+        return {
+            profile.name: {
+                "uploaded": profile.uploaded_count,
+                "upload_batch_limit": profile.upload_batch_limit,
+                "quota_exceeded": profile.quota_exceeded,
+            }
+            for profile in self.credential_profiles
+        }
+
+    def quota_pool(self) -> str:
+        """The quota pool API calls are currently charged to, i.e. the OAuth client ID of the active credentials."""
+        client_secrets_file = (
+            self.active_profile.client_secrets_file if self.active_profile is not None else self.youtube_client_secrets_file
+        )
+        if client_secrets_file is None:
+            return DEFAULT_QUOTA_POOL
+        if client_secrets_file not in self.quota_pools:
+            self.quota_pools[client_secrets_file] = get_client_id(client_secrets_file)
+        return self.quota_pools[client_secrets_file]
+
+    @contextmanager
+    def api_call(self, api_method: str) -> Iterator[None]:
+        """Time and count an API call, and charge its quota cost to the ledger whether or not it succeeds, as YouTube does."""
+        with self.metrics.api_call(api_method):
+            try:
+                yield
+            finally:
+                if self.quota_ledger is not None:
+                    quota_pool = self.quota_pool()
+                    if self.quota_ledger.record(api_method, quota_pool):
+                        self.logger.warning(
+                            "Over %d%% of today's YouTube API quota for %s has been used (%s of %s units)",
+                            QUOTA_WARNING_FRACTION * 100,
+                            quota_pool,
+                            self.quota_ledger.usage(quota_pool)["units"],
+                            self.quota_ledger.daily_quota,
+                        )
+
     def get_channel_id(self) -> OPTIONAL_STR:
         # Get the authenticated user's channel
         request = self.youtube.channels().list(part="snippet", mine=True)
-        response = request.execute()
+        with self.api_call("channels.list"):
+            response = request.execute()
 
         # Extract the channel ID
         if "items" in response:
@@ -283,19 +562,25 @@ class YouTubeBulkUpload:
     def check_if_video_title_exists_on_youtube_channel(self, youtube_title: str) -> OPTIONAL_STR:
         channel_id = self.get_channel_id()
 
-        self.logger.info(f"Searching YouTube channel {channel_id} for title: {youtube_title}")
+        self.logger.info("Searching YouTube channel %s for title: %s", channel_id, youtube_title)
         request = self.youtube.search().list(part="snippet", channelId=channel_id, q=youtube_title, type="video", maxResults=10)
-        response = request.execute()
+        with self.api_call("search.list"):
+            response = request.execute()
 
         # Check if any videos were found
         if "items" in response and len(response["items"]) > 0:
+            from thefuzz import fuzz
+
             for item in response["items"]:
                 found_title = item["snippet"]["title"]
                 similarity_score = fuzz.ratio(youtube_title.lower(), found_title.lower())
                 if similarity_score >= 70:  # 70% similarity
                     found_id = item["id"]["videoId"]
                     self.logger.info(
-                        f"Potential match found on YouTube channel with ID: {found_id} and title: {found_title} (similarity: {similarity_score}%)"
+                        "Potential match found on YouTube channel with ID: %s and title: %s (similarity: %s%%)",
+                        found_id,
+                        found_title,
+                        similarity_score,
                     )
                     if self.interactive_prompt:
                         self.logger.debug("Prompting user to confirm whether video matches existing on channel")
@@ -305,11 +590,11 @@ class YouTubeBulkUpload:
                     else:
                         return found_id
 
-        self.logger.info(f"No matching video found with title: {youtube_title}, continuing with upload.")
+        self.logger.info("No matching video found with title: %s, continuing with upload.", youtube_title)
         return None
 
     def truncate_to_nearest_word(self, title: str, max_length: int) -> str:
-        self.logger.debug(f"Truncating title with length {len(title)} to nearest word with max length: {max_length}")
+        self.logger.debug("Truncating title with length %s to nearest word with max length: %s", len(title), max_length)
         if len(title) <= max_length:
             return title
         truncated_title = title[:max_length].rsplit(" ", 1)[0]
@@ -317,14 +602,45 @@ class YouTubeBulkUpload:
             truncated_title += " ..."
         return truncated_title
 
-    def upload_video_to_youtube_with_title_thumbnail(self, video_file: str, youtube_title: str, youtube_description: str, thumbnail_filepath: OPTIONAL_STR) -> str:
-        self.logger.info(f"Uploading video {video_file} to YouTube with title, description and thumbnail...")
+    def upload_video_to_youtube_with_title_thumbnail(
+        self, video_file: str, youtube_title: str, youtube_description: str, thumbnail_filepath: OPTIONAL_STR
+    ) -> str:
+        self.logger.info(
+            "Uploading video %s to YouTube with title, description and thumbnail...",
+            video_file,
+            extra=job_log_fields(video_file, "upload_start"),
+        )
         if self.dry_run:
             self.logger.info(
-                f"DRY RUN: Would upload {video_file} to YouTube with title: {youtube_title}, description: {youtube_description[:50]}... and thumbnail: {thumbnail_filepath} with Privacy Status: {self.privacy_status}"
+                "DRY RUN: Would upload %s to YouTube with title: %s, description: %s... and thumbnail: %s with Privacy Status: %s",
+                video_file,
+                youtube_title,
+                youtube_description[:50],
+                thumbnail_filepath,
+                self.privacy_status,
             )
             return "dry-run-video-id"
         else:
+            # Before the video is uploaded, so a thumbnail the API would reject fails the upload before it's spent any time or quota
+            if (
+                thumbnail_filepath is not None
+                and self.title_card_generator is not None
+                and self.title_card_generator.is_title_card(thumbnail_filepath)
+            ):
+                # Rendered within the API's limits already, but re-rendered if the title was edited since, e.g. in review
+                with self.metrics.stage("title_card"):
+                    thumbnail_filepath = self.title_card_generator.generate(youtube_title, video_file)
+            elif thumbnail_filepath is not None and self.thumbnail_preprocessor is not None:
+                with self.metrics.stage("thumbnail_prepare"):
+                    prepared_thumbnail_filepath = self.thumbnail_preprocessor.prepare(thumbnail_filepath)
+                self.logger.info(
+                    "Prepared thumbnail %s for upload as %s",
+                    thumbnail_filepath,
+                    prepared_thumbnail_filepath,
+                    extra=job_log_fields(video_file, "thumbnail_prepare"),
+                )
+                thumbnail_filepath = prepared_thumbnail_filepath
+
             body: dict[str, dict[str, Union[str, Iterable[str]]]] = {
                 "snippet": {
                     "title": youtube_title,
@@ -335,63 +651,106 @@ class YouTubeBulkUpload:
                 "status": {"privacyStatus": self.privacy_status},
             }
 
-            # Use MediaFileUpload to handle the video file
-            media_file = MediaFileUpload(video_file, resumable=True, chunksize=5242880)
+            # Use MediaFileUpload to handle the video file, or a file from the media source which reads ahead of the upload
+            media_stream = None
+            if self.media_source is None:
+                media_file = MediaFileUpload(video_file, resumable=True, chunksize=UPLOAD_CHUNK_SIZE)
+            else:
+                media_stream = self.media_source.open(video_file)
+                mimetype = mimetypes.guess_type(video_file)[0] or "application/octet-stream"
+                media_file = MediaIoBaseUpload(media_stream, mimetype, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
 
             # Call the API's videos.insert method to create and upload the video.
             self.logger.info("Uploading video to YouTube...")
             request = self.youtube.videos().insert(part="snippet,status", body=body, media_body=media_file)
 
             # Use chunked upload to get upload status
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status and self.progress_callback_func:
-                    self.progress_callback_func(progress=status.progress())
-
-            youtube_video_id = response.get("id")
-            youtube_url = f"{YOUTUBE_URL_PREFIX}{youtube_video_id}"
-            self.logger.info(f"Uploaded video to YouTube: {youtube_url}")
-
-            if thumbnail_filepath is not None:
-                media_thumbnail = MediaFileUpload(thumbnail_filepath)
-                self.youtube.thumbnails().set(videoId=youtube_video_id, media_body=media_thumbnail).execute()
-                self.logger.info(f"Uploaded thumbnail for video ID {youtube_video_id}")
+            self.progress_tracker.start_job(video_file)
+            upload_start = time.perf_counter()
+            try:
+                with self.metrics.upload_in_flight(), self.api_call("videos.insert"):
+                    response = None
+                    bytes_sent = 0
+                    while response is None:
+                        with self.metrics.stage("upload_chunk"):
+                            status, response = self.next_upload_chunk(request, video_file, bytes_sent)
+                        if status:
+                            self.progress_tracker.update_job(video_file, status.resumable_progress)
+                            self.metrics.record_uploaded_bytes(status.resumable_progress - bytes_sent)
+                            bytes_sent = status.resumable_progress
+                    # The final chunk returns the response rather than a status, so its bytes are whatever is left of the file
+                    if self.metrics.enabled:
+                        self.metrics.record_uploaded_bytes(self.progress_tracker.file_size(video_file) - bytes_sent)
+
+                youtube_video_id = response.get("id")
+                youtube_url = f"{YOUTUBE_URL_PREFIX}{youtube_video_id}"
+                self.logger.info(
+                    "Uploaded video to YouTube: %s",
+                    youtube_url,
+                    extra=job_log_fields(
+                        video_file,
+                        "upload",
+                        duration_seconds=round(time.perf_counter() - upload_start, 3),
+                        bytes=self.progress_tracker.file_size(video_file),
+                        youtube_id=youtube_video_id,
+                    ),
+                )
 
-            # Reset progress to 0 for next video
-            if self.progress_callback_func:
-                self.progress_callback_func(0)
+                if thumbnail_filepath is not None:
+                    media_thumbnail = MediaFileUpload(thumbnail_filepath)
+                    thumbnail_start = time.perf_counter()
+                    with self.metrics.stage("thumbnail_set"), self.api_call("thumbnails.set"):
+                        self.youtube.thumbnails().set(videoId=youtube_video_id, media_body=media_thumbnail).execute()
+                    self.logger.info(
+                        "Uploaded thumbnail for video ID %s",
+                        youtube_video_id,
+                        extra=job_log_fields(
+                            video_file,
+                            "thumbnail_set",
+                            duration_seconds=round(time.perf_counter() - thumbnail_start, 3),
+                            youtube_id=youtube_video_id,
+                        ),
+                    )
+            except Exception as e:
+                self.progress_tracker.finish_job(video_file, succeeded=False, error=str(e))
+                raise
+            finally:
+                if media_stream is not None:
+                    media_stream.close()
 
+            self.progress_tracker.finish_job(video_file, youtube_id=youtube_video_id)
             return youtube_video_id
 
-    def determine_thumbnail_filepath(self, video_file: str) -> OPTIONAL_STR:
-        self.logger.info(f"Determining thumbnail filepath for video file: {video_file}...")
-
-        modified_filename, _ = os.path.splitext(video_file)
-
-        # Apply thumbnail filename prefix if set
-        if self.thumbnail_filename_prefix is not None:
-            modified_filename = f"{self.thumbnail_filename_prefix}{modified_filename}"
+    def next_upload_chunk(self, request: Any, video_file: str, offset: int) -> tuple[Any, Any]:
+        if self.chunk_trace is None:
+            return request.next_chunk()
 
-        # Apply thumbnail filename suffix if set
-        if self.thumbnail_filename_suffix is not None:
-            modified_filename = f"{modified_filename}{self.thumbnail_filename_suffix}"
+        with self.chunk_trace.trace_chunk(video_file, offset) as chunk:
+            status, response = request.next_chunk()
+            # The final chunk returns the response rather than a status, so it ends at the end of the file
+            chunk.end_offset = status.resumable_progress if status else self.progress_tracker.file_size(video_file)
+        return status, response
 
-        # Apply thumbnail filename replacements if set
-        if self.thumbnail_filename_replacements is not None:
-            self.logger.info(f"Applying replacement patterns to thumbnail filename: {modified_filename}")
-
-            for pattern, replacement in self.thumbnail_filename_replacements:
-                self.logger.debug(f"Applying thumbnail replacement pattern: {pattern} -> {replacement}")
-                modified_filename = re.sub(pattern, replacement, modified_filename)
+    def determine_thumbnail_filepath(self, video_file: str) -> OPTIONAL_STR:
+        self.logger.info(
+            "Determining thumbnail filepath for video file: %s...",
+            video_file,
+            extra=job_log_fields(video_file, "thumbnail_lookup"),
+        )
 
-        # Test each file extension until a file is found
-        for ext in self.thumbnail_filename_extensions:
-            potential_filename = f"{modified_filename}{ext}"
-            if os.path.exists(potential_filename):
-                return potential_filename
+        thumbnail_filepath = find_thumbnail_file(
+            video_file,
+            self.thumbnail_filename_prefix,
+            self.thumbnail_filename_suffix,
+            self.thumbnail_filename_replacements,
+            self.thumbnail_filename_extensions,
+            self.logger,
+        )
+        if thumbnail_filepath is not None:
+            return thumbnail_filepath
 
-        if self.interactive_prompt:
+        # With title cards enabled, a video without a thumbnail file gets a generated one instead
+        if self.interactive_prompt and self.title_card_generator is None:
             self.logger.debug("Prompting user to confirm whether happy to proceed without thumbnail")
             self.prompt_user_confirmation_or_raise_exception(
                 "No valid thumbnail file found. Do you want to continue without a thumbnail?",
@@ -402,32 +761,17 @@ class YouTubeBulkUpload:
         return None
 
     def determine_youtube_title(self, video_file: str) -> str:
-        self.logger.info(f"Crafting YouTube title for video file: {video_file}...")
-
-        video_title, _ = os.path.splitext(video_file)
-
-        # Apply YouTube title prefix if set
-        if self.youtube_title_prefix is not None:
-            video_title = f"{self.youtube_title_prefix}{video_title}"
+        self.logger.info("Crafting YouTube title for video file: %s...", video_file, extra=job_log_fields(video_file, "title"))
 
-        # Apply YouTube title suffix if set
-        if self.youtube_title_suffix is not None:
-            video_title = f"{video_title}{self.youtube_title_suffix}"
-
-        # Apply YouTube title replacements if set
-        if self.youtube_title_replacements is not None:
-            self.logger.info(f"Applying replacement patterns to title: {video_title}")
-
-            for pattern, replacement in self.youtube_title_replacements:
-                self.logger.debug(f"Applying title replacement pattern: {pattern} -> {replacement}")
-                video_title = re.sub(pattern, replacement, video_title)
+        video_title = format_youtube_title(
+            video_file, self.youtube_title_prefix, self.youtube_title_suffix, self.youtube_title_replacements, self.logger
+        )
 
         # Truncate title to the nearest whole word and add ellipsis if needed
-        max_length = 95
-        video_title = self.truncate_to_nearest_word(video_title, max_length)
+        video_title = self.truncate_to_nearest_word(video_title, YOUTUBE_TITLE_MAX_LENGTH)
 
         if self.interactive_prompt:
-            self.logger.debug(f"Prompting user to confirm title: {video_title}")
+            self.logger.debug("Prompting user to confirm title: %s", video_title)
             if not self.prompt_user_bool(f"Are you happy with the generated title: {video_title}?"):
                 prompt_message = "Please type the title you would like to use (max 100 chars): "
                 video_title = self.prompt_user_text(prompt_message, default_response=video_title)
@@ -435,7 +779,11 @@ class YouTubeBulkUpload:
         return video_title
 
     def determine_youtube_description(self, video_file: str, youtube_title: str) -> str:
-        self.logger.info(f"Determining YouTube description for video file: {video_file}...")
+        self.logger.info(
+            "Determining YouTube description for video file: %s...",
+            video_file,
+            extra=job_log_fields(video_file, "description"),
+        )
 
         description = ""
         if self.youtube_description_template_file is not None:
@@ -443,26 +791,327 @@ class YouTubeBulkUpload:
                 description = file.read()
 
         if self.youtube_description_replacements is not None:
-            self.logger.info(f"Applying replacement patterns to description text with length: {len(description)}")
+            self.logger.info("Applying replacement patterns to description text with length: %s", len(description))
 
+            # Checked once rather than per pattern, these loops run for every pattern of every video
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
             for pattern, replacement in self.youtube_description_replacements:
 
                 # Allow the user to use the jinja-ish syntax to refer to the youtube title in the replacement string
                 if "{{youtube_title}}" in replacement:
-                    self.logger.debug(f"Replacing youtube title template with actual title: {youtube_title}")
+                    if debug_enabled:
+                        self.logger.debug("Replacing youtube title template with actual title: %s", youtube_title)
                     replacement = replacement.replace("{{youtube_title}}", youtube_title)
 
-                self.logger.debug(f"Applying description replacement pattern: {pattern} -> {replacement}")
+                if debug_enabled:
+                    self.logger.debug("Applying description replacement pattern: %s -> %s", pattern, replacement)
                 description = re.sub(pattern, replacement, description)
 
         if not description and self.interactive_prompt:
-            self.logger.warning(f"Unable to load YouTube description from file for video file: {video_file}...")
+            self.logger.warning("Unable to load YouTube description from file for video file: %s...", video_file)
             prompt_message = "No description template file found. Please type the description you would like to use: "
             description = self.prompt_user_text(prompt_message, default_response=description)
 
         return description
 
-    def process(self) -> list[dict[str, str]]:
+    def should_stop_processing(self, uploaded_count: int) -> bool:
+        # Check if stop_event is set before processing each video
+        self.logger.debug("Checking stop event before processing videos...")
+        if self.stop_event and self.stop_event.is_set():
+            self.logger.info("Stop event set, stopping the upload process.")
+            return True
+
+        if uploaded_count >= self.upload_batch_limit:
+            self.logger.warning(
+                "Reached the maximum upload limit of %s videos in a 24-hour period. Please wait until tomorrow to run again.",
+                self.upload_batch_limit,
+            )
+            return True
+
+        if self.quota_exceeded:
+            self.logger.warning("YouTube API quota exceeded, stopping the upload process until the quota resets.")
+            return True
+
+        if self.profile_router is not None and not self.profile_router.any_available():
+            self.logger.warning("All credential profiles have used up their upload budget or quota, stopping the upload process.")
+            return True
+
+        return False
+
+    def wait_or_stop(self, seconds: float) -> bool:
+        """Sleep for the given number of seconds, waking early if the stop event is set. Returns True if stopped."""
+        if self.stop_event is not None:
+            return bool(self.stop_event.wait(seconds))
+
+        time.sleep(seconds)
+        return False
+
+    def select_credential_profile(self, video_file: str) -> bool:
+        """Activate the credential profile to upload video_file with, returning False (and deferring the file) if none has budget left."""
+        if self.profile_router is None:
+            return True
+
+        profile = self.profile_router.select(video_file)
+        if profile is None:
+            self.logger.warning("No credential profile has upload budget left for %s, leaving it for a later run.", video_file)
+            self.deferred_video_files.add(video_file)
+            return False
+        self.activate_credential_profile(profile)
+        return True
+
+    def prepare_review_item(self, video_file: str) -> ReviewItem:
+        """Work out the title, description, thumbnail and any duplicate of a video, prompting only if interactive_prompt is enabled."""
+        with self.metrics.stage("title"):
+            youtube_title = self.determine_youtube_title(video_file)
+        with self.metrics.stage("description"):
+            youtube_description = self.determine_youtube_description(video_file, youtube_title)
+        with self.metrics.stage("thumbnail_lookup"):
+            thumbnail_filepath = self.determine_thumbnail_filepath(video_file)
+        if thumbnail_filepath is None and self.title_card_generator is not None:
+            with self.metrics.stage("title_card"):
+                thumbnail_filepath = self.title_card_generator.generate(youtube_title, video_file)
+            self.logger.info("Generated title card thumbnail %s", thumbnail_filepath, extra=job_log_fields(video_file, "title_card"))
+
+        duplicate_video_id = None
+        if self.check_for_duplicate_titles:
+            with self.metrics.stage("duplicate_search"):
+                duplicate_video_id = self.check_if_video_title_exists_on_youtube_channel(youtube_title)
+
+        return ReviewItem(video_file, youtube_title, youtube_description, thumbnail_filepath, duplicate_video_id, self.active_profile)
+
+    def confirm_review_item(self, review_item: ReviewItem) -> bool:
+        self.logger.info("Interactive prompt is enabled. Confirming upload details with user.")
+        confirmation_prompt = (
+            f"Confirm you are happy for video to be uploaded to your channel with details:\n\n"
+            f"Filename: {review_item.video_file}\n\n"
+            f"Title: {review_item.youtube_title}?\n\n"
+            f"Thumbnail filepath: {review_item.thumbnail_filepath}\n\n"
+            f"Description: {review_item.youtube_description}\n\n"
+            f"Privacy Status: {self.privacy_status}\n\n"
+            "Proceed with upload? (y/n): "
+        )
+        if self.prompt_user_bool(confirmation_prompt):
+            self.logger.info("User confirmed upload details. Proceeding with upload.")
+            return True
+
+        self.logger.info("User not happy with the upload details. Skipping upload for this video.")
+        return False
+
+    def record_upload_failure(self, video_file: str, error: Exception) -> None:
+        self.logger.error("Failed to upload video %s to YouTube: %s", video_file, error, extra=job_log_fields(video_file, "failed"))
+        self.progress_tracker.finish_job(video_file, succeeded=False, error=str(error))
+        self.metrics.record_video(VIDEO_OUTCOME_FAILED)
+        self.failed_video_files.add(video_file)
+        # Create a text file and write the video_file name inside it
+        with open("failed_uploads.txt", "a") as file:
+            file.write(f"{video_file}\n")
+
+        if self.retry_queue is not None:
+            retry_entry = self.retry_queue.record_failure(video_file, error)
+            if retry_entry.error_class == ErrorClass.QUOTA:
+                if self.quota_ledger is not None:
+                    self.quota_ledger.record_quota_exceeded(self.quota_pool())
+                if self.active_profile is not None:
+                    # Only this profile's quota pool is used up, carry on with the others
+                    self.active_profile.quota_exceeded = True
+                else:
+                    self.quota_exceeded = True
+
+    def upload_review_item(self, review_item: ReviewItem) -> Optional[UploadedVideo]:
+        """
+        Upload a video with its prepared (and possibly user-edited) details, returning the uploaded video details or None if it failed.
+        """
+        if review_item.profile is not None and review_item.profile.is_available():
+            self.activate_credential_profile(review_item.profile)
+        elif not self.select_credential_profile(review_item.video_file):
+            return None
+
+        video_file = review_item.video_file
+        try:
+            youtube_id = self.upload_video_to_youtube_with_title_thumbnail(
+                video_file, review_item.youtube_title, review_item.youtube_description, review_item.thumbnail_filepath
+            )
+        except Exception as e:
+            self.record_upload_failure(video_file, e)
+            return None
+
+        if self.retry_queue is not None:
+            self.retry_queue.record_success(video_file)
+        self.metrics.record_video(VIDEO_OUTCOME_UPLOADED)
+
+        if self.active_profile is None:
+            return UploadedVideo(video_file, review_item.youtube_title, youtube_id)
+
+        self.active_profile.uploaded_count += 1
+        return UploadedVideo(video_file, review_item.youtube_title, youtube_id, profile=self.active_profile.name)
+
+    def process_video_file(self, video_file: str) -> Optional[UploadedVideo]:
+        """Upload a single video file, returning the uploaded video details or None if it was skipped or failed."""
+        if not self.select_credential_profile(video_file):
+            return None
+
+        try:
+            review_item = self.prepare_review_item(video_file)
+
+            if review_item.duplicate_video_id is not None:
+                existing_video_matching_title_url = f"{YOUTUBE_URL_PREFIX}{review_item.duplicate_video_id}"
+                self.logger.warning(
+                    "Video already exists on YouTube, skipping upload: %s",
+                    existing_video_matching_title_url,
+                    extra=job_log_fields(video_file, "skipped", youtube_id=review_item.duplicate_video_id),
+                )
+                self.metrics.record_video(VIDEO_OUTCOME_SKIPPED)
+                return None
+
+            if self.interactive_prompt and not self.confirm_review_item(review_item):
+                self.metrics.record_video(VIDEO_OUTCOME_SKIPPED)
+                return None
+        except Exception as e:
+            self.record_upload_failure(video_file, e)
+            return None
+
+        return self.upload_review_item(review_item)
+
+    def retry_video_file(self, video_file: str) -> Optional[UploadedVideo]:
+        # Videos approved in a batch review are retried with their reviewed details, rather than prepared (and prompted for) again
+        review_item = self.review_queue.approved_item(video_file) if self.review_queue is not None else None
+        if review_item is not None:
+            return self.upload_review_item(review_item)
+        return self.process_video_file(video_file)
+
+    def review_and_upload(
+        self, review_queue: ReviewQueue, video_files: list[str], approved_video_files: list[str]
+    ) -> Iterator[UploadedVideo]:
+        """
+        Batch review: prepare every video up front without prompting and add it to the review queue, where the user edits and
+        approves or rejects them all in one place. Each video is uploaded as soon as it's approved, while the rest are still
+        under review. Yields each uploaded video as it completes, and adds every approved video file to approved_video_files.
+        """
+        self.logger.info("Preparing %s video files for batch review...", len(video_files))
+        review_queue.start_preparing()
+        thumbnails_submitted_until = 0
+        try:
+            for position, video_file in enumerate(video_files):
+                if self.stop_event is not None and self.stop_event.is_set():
+                    break
+                thumbnails_submitted_until = self.submit_thumbnails_ahead(video_files, position, 0, thumbnails_submitted_until)
+                if not self.select_credential_profile(video_file):
+                    continue
+                try:
+                    review_queue.add(self.prepare_review_item(video_file))
+                except Exception as e:
+                    self.record_upload_failure(video_file, e)
+        finally:
+            review_queue.finish_preparing()
+
+        uploaded_count = 0
+        while not self.should_stop_processing(uploaded_count):
+            review_item = review_queue.next_approved(timeout=1)
+            if review_item is None:
+                if review_queue.is_done():
+                    break
+                continue
+
+            approved_video_files.append(review_item.video_file)
+            uploaded_video = self.upload_review_item(review_item)
+            if uploaded_video is not None:
+                uploaded_count += 1
+                yield uploaded_video
+
+        for video_file, review_item in review_queue.items.items():
+            self.progress_tracker.skip_job(video_file)
+            if review_item.status == REVIEW_REJECTED:
+                self.metrics.record_video(VIDEO_OUTCOME_SKIPPED)
+
+    def iter_retry_failed_uploads_in_run(self, video_files: Iterable[str], uploaded_count: int) -> Iterator[UploadedVideo]:
+        """
+        Re-attempt transient failures among video_files once their backoff expires, as long as that is within the in-run wait
+        window, yielding each video as its retry succeeds. uploaded_count is the number already uploaded this run.
+        """
+        if self.retry_queue is None:
+            return
+
+        attempted_files = set(video_files)
+        while True:
+            pending_entries = [
+                entry
+                for entry in self.retry_queue.pending_entries()
+                if entry.video_file in attempted_files and self.retry_queue.policy_for(entry).retry_in_run
+            ]
+            if not pending_entries or self.should_stop_processing(uploaded_count):
+                return
+
+            wait_seconds = pending_entries[0].next_attempt_at - time.time()
+            if wait_seconds > self.retry_in_run_max_wait_seconds:
+                self.logger.info(
+                    "%s failed upload(s) left in retry queue %s, next retry at %s",
+                    len(pending_entries),
+                    self.retry_queue.queue_file,
+                    time.ctime(pending_entries[0].next_attempt_at),
+                )
+                return
+
+            if wait_seconds > 0:
+                self.logger.info("Waiting %.0f seconds before retrying %s failed upload(s)...", wait_seconds, len(pending_entries))
+                if self.wait_or_stop(wait_seconds):
+                    return
+
+            for entry in self.retry_queue.due_entries():
+                if entry.video_file not in attempted_files or not self.retry_queue.policy_for(entry).retry_in_run:
+                    continue
+                if self.should_stop_processing(uploaded_count):
+                    return
+
+                self.logger.info(
+                    "Retrying failed upload (attempt %s): %s",
+                    entry.attempts + 1,
+                    entry.video_file,
+                    extra=job_log_fields(entry.video_file, "retry"),
+                )
+                attempts_before_retry = entry.attempts
+                self.metrics.record_retry()
+                uploaded_video = self.retry_video_file(entry.video_file)
+                if uploaded_video is not None:
+                    uploaded_count += 1
+                    yield uploaded_video
+                elif entry.attempts == attempts_before_retry:
+                    # Skipped rather than failed again (e.g. it's now on the channel, or was declined), so its entry is still
+                    # due; leave it for the next retry-failed run instead of checking it over and over in this one
+                    attempted_files.discard(entry.video_file)
+
+    def retry_failed_uploads(self) -> list[UploadedVideo]:
+        """Process only the files in the retry queue which are due for another attempt."""
+        if self.retry_queue is None:
+            raise Exception("Retry queue is disabled, no retry queue file was provided.")
+
+        due_entries = self.retry_queue.due_entries()
+        waiting_entries = [entry for entry in self.retry_queue.pending_entries() if entry not in due_entries]
+        for entry in waiting_entries:
+            self.logger.info(
+                "Not retrying %s yet (%s error), next attempt at %s",
+                entry.video_file,
+                entry.error_class.value,
+                time.ctime(entry.next_attempt_at),
+            )
+        for entry in self.retry_queue.abandoned_entries():
+            self.logger.warning("Not retrying %s, it failed with %s error: %s", entry.video_file, entry.error_class.value, entry.last_error)
+
+        if not due_entries:
+            self.logger.info("No failed uploads are due for retry in retry queue: %s", self.retry_queue.queue_file)
+            return []
+
+        self.logger.info("Retrying %s failed upload(s) from retry queue: %s", len(due_entries), self.retry_queue.queue_file)
+        return self.process(input_files=[entry.video_file for entry in due_entries])
+
+    def process(self, input_files: Optional[list[str]] = None) -> list[UploadedVideo]:
+        return list(self.iter_process(input_files))
+
+    def iter_process(self, input_files: Optional[list[str]] = None, results_file: OPTIONAL_STR = None) -> Iterator[UploadedVideo]:
+        """
+        Upload the input files like process(), but yield each uploaded video as soon as it's uploaded rather than collecting them
+        all, so memory stays flat however many files a run uploads. With results_file, each uploaded video is also appended to
+        that file as a line of JSON as it completes.
+        """
         if self.dry_run:
             self.logger.warning("Dry run enabled. No actions will be performed.")
 
@@ -471,65 +1120,86 @@ class YouTubeBulkUpload:
         # Check required input files and parameters exist before proceeding
         self.validate_input_parameters()
 
-        video_files = self.find_input_files()
-        uploaded_videos: list[dict[str, str]] = []
-        for video_file in video_files:
-            # Check if stop_event is set before processing each video
-            self.logger.debug("Checking stop event before processing videos...")
-            if self.stop_event and self.stop_event.is_set():
-                self.logger.info("Stop event set, stopping the upload process.")
-                break
+        video_files = input_files if input_files is not None else self.find_input_files()
+        self.quota_exceeded = False
+        self.deferred_video_files = set()
+        self.failed_video_files = set()
+        self.progress_tracker.start_batch(video_files)
 
-            if len(uploaded_videos) >= self.upload_batch_limit:
-                self.logger.warning(
-                    f"Reached the maximum upload limit of {self.upload_batch_limit} videos in a 24-hour period. Please wait until tomorrow to run again."
-                )
-                break
-            try:
-                youtube_title = self.determine_youtube_title(video_file)
-                youtube_description = self.determine_youtube_description(video_file, youtube_title)
-                thumbnail_filepath = self.determine_thumbnail_filepath(video_file)
-
-                if self.check_for_duplicate_titles:
-                    existing_video_matching_title_id = self.check_if_video_title_exists_on_youtube_channel(youtube_title)
-                    if existing_video_matching_title_id is not None:
-                        existing_video_matching_title_url = f"{YOUTUBE_URL_PREFIX}{existing_video_matching_title_id}"
-                        self.logger.warning(f"Video already exists on YouTube, skipping upload: {existing_video_matching_title_url}")
-                        continue
-
-                if self.interactive_prompt:
-                    self.logger.info("Interactive prompt is enabled. Confirming upload details with user.")
-                    confirmation_prompt = (
-                        f"Confirm you are happy for video to be uploaded to your channel with details:\n\n"
-                        f"Filename: {video_file}\n\n"
-                        f"Title: {youtube_title}?\n\n"
-                        f"Thumbnail filepath: {thumbnail_filepath}\n\n"
-                        f"Description: {youtube_description}\n\n"
-                        f"Privacy Status: {self.privacy_status}\n\n"
-                        "Proceed with upload? (y/n): "
-                    )
-                    if self.prompt_user_bool(confirmation_prompt):
-                        self.logger.info("User confirmed upload details. Proceeding with upload.")
-                    else:
-                        self.logger.info("User not happy with the upload details. Skipping upload for this video.")
-                        continue
+        results = open(results_file, "a", encoding="utf-8") if results_file is not None else None
+        try:
+            for uploaded_video in self.iter_process_video_files(video_files):
+                if results is not None:
+                    results.write(json.dumps(uploaded_video.to_dict()) + "\n")
+                    results.flush()
+                yield uploaded_video
+        finally:
+            if results is not None:
+                results.close()
+
+        self.logger.debug("All videos processed")
+
+    def submit_thumbnails_ahead(self, video_files: list[str], position: int, uploaded_count: int, submitted_until: int) -> int:
+        """
+        Submit the thumbnails of the next few video files from position on, but no more than the uploads this run has left, so image
+        work is never done for videos this run won't reach. submitted_until is the end of the files already submitted, and the new
+        end is returned, so each file is only submitted once however often this is called.
+        """
+        lookahead = min(DEFAULT_THUMBNAIL_LOOKAHEAD, max(self.upload_batch_limit - uploaded_count, 0))
+        end = min(position + lookahead, len(video_files))
+        start = max(position, submitted_until)
+        if end > start:
+            self.submit_thumbnails(video_files[start:end])
+        return max(end, submitted_until)
+
+    def submit_thumbnails(self, video_files: list[str]) -> None:
+        """
+        Start preparing the thumbnails of these video files, and rendering title cards for those without a thumbnail file, so they're
+        ready by the time each video is uploaded. Title cards are rendered in a dry run too, so they can be checked before a real run.
+        """
+        preprocess_thumbnails = self.thumbnail_preprocessor is not None and not self.dry_run
+        if not preprocess_thumbnails and self.title_card_generator is None:
+            return
 
-                youtube_id = self.upload_video_to_youtube_with_title_thumbnail(
-                    video_file, youtube_title, youtube_description, thumbnail_filepath
-                )
-                uploaded_videos.append(
-                    {
-                        "input_filename": video_file,
-                        "youtube_title": youtube_title,
-                        "youtube_id": youtube_id,
-                        "youtube_url": f"{YOUTUBE_URL_PREFIX}{youtube_id}",
-                    }
+        for video_file in video_files:
+            thumbnail_filepath = find_thumbnail_file(
+                video_file,
+                self.thumbnail_filename_prefix,
+                self.thumbnail_filename_suffix,
+                self.thumbnail_filename_replacements,
+                self.thumbnail_filename_extensions,
+            )
+            if thumbnail_filepath is None and self.title_card_generator is not None:
+                # With the generated title, if it's edited when prompted the card for the edited title is rendered then instead
+                youtube_title = self.truncate_to_nearest_word(
+                    format_youtube_title(video_file, self.youtube_title_prefix, self.youtube_title_suffix, self.youtube_title_replacements),
+                    YOUTUBE_TITLE_MAX_LENGTH,
                 )
-            except Exception as e:
-                self.logger.error(f"Failed to upload video {video_file} to YouTube: {e}")
-                # Create a text file and write the video_file name inside it
-                with open('failed_uploads.txt', 'a') as file:
-                  file.write(f"{video_file}\n")
-
-        self.logger.debug("All videos processed, returning list of uploaded videos")
-        return uploaded_videos
+                self.title_card_generator.submit(youtube_title, video_file)
+            elif thumbnail_filepath is not None and preprocess_thumbnails:
+                self.thumbnail_preprocessor.submit(thumbnail_filepath)
+
+    def iter_process_video_files(self, video_files: list[str]) -> Iterator[UploadedVideo]:
+        uploaded_count = 0
+        if self.review_queue is not None:
+            # Only approved videos may be retried, as retries use their reviewed details
+            retry_video_files: list[str] = []
+            for uploaded_video in self.review_and_upload(self.review_queue, video_files, retry_video_files):
+                uploaded_count += 1
+                yield uploaded_video
+        else:
+            retry_video_files = video_files
+            thumbnails_submitted_until = 0
+            for position, video_file in enumerate(video_files):
+                if self.should_stop_processing(uploaded_count):
+                    break
+
+                thumbnails_submitted_until = self.submit_thumbnails_ahead(video_files, position, uploaded_count, thumbnails_submitted_until)
+                uploaded_video = self.process_video_file(video_file)
+                if uploaded_video is not None:
+                    uploaded_count += 1
+                    yield uploaded_video
+                else:
+                    self.progress_tracker.skip_job(video_file)
+
+        yield from self.iter_retry_failed_uploads_in_run(retry_video_files, uploaded_count)
@@ -1,8 +1,18 @@
 from enum import Enum
 from logging import Logger, Formatter
-from typing import Any, Iterable, Optional, Union
+from typing import Any, ContextManager, Iterable, Iterator, Optional, Union
 from google.auth.external_account_authorized_user import Credentials as Creds
 from google.oauth2.credentials import Credentials
+from youtube_bulk_upload.retry_queue import RetryQueue
+from youtube_bulk_upload.profiles import CredentialProfile, CredentialProfileRouter
+from youtube_bulk_upload.progress import ProgressEvent, ProgressTracker
+from youtube_bulk_upload.review import ReviewItem, ReviewQueue
+from youtube_bulk_upload.records import UploadedVideo
+from youtube_bulk_upload.metrics import NullUploadMetrics, UploadMetrics
+from youtube_bulk_upload.chunk_trace import ChunkTraceRecorder
+from youtube_bulk_upload.quota_ledger import QuotaLedger
+from youtube_bulk_upload.thumbnails import ThumbnailPreprocessor, TitleCardGenerator
+from youtube_bulk_upload.media_source import ReadAheadMediaSource
 
 OPTIONAL_ANY = Optional[Any]
 OPTIONAL_STR = Optional[str]
@@ -10,6 +20,25 @@ OPTIONAL_STR = Optional[str]
 YOUTUBE_URL_PREFIX: str
 DEFAULT_LOG_LEVEL: int
 DEFAULT_LOGGING_FORMATTER: Formatter
+YOUTUBE_TITLE_MAX_LENGTH: int
+
+def MediaFileUpload(*args: Any, **kwargs: Any) -> Any: ...
+def MediaIoBaseUpload(*args: Any, **kwargs: Any) -> Any: ...
+def find_thumbnail_file(
+    video_file: str,
+    thumbnail_filename_prefix: OPTIONAL_STR,
+    thumbnail_filename_suffix: OPTIONAL_STR,
+    thumbnail_filename_replacements: Optional[Iterable[Iterable[str]]],
+    thumbnail_filename_extensions: Iterable[str],
+    logger: Optional[Logger] = ...,
+) -> OPTIONAL_STR: ...
+def format_youtube_title(
+    video_file: str,
+    youtube_title_prefix: OPTIONAL_STR,
+    youtube_title_suffix: OPTIONAL_STR,
+    youtube_title_replacements: Optional[Iterable[Iterable[str]]],
+    logger: Optional[Logger] = ...,
+) -> str: ...
 
 class VideoPrivacyStatus(Enum):
     PUBLIC = "public"
@@ -19,6 +48,7 @@ class VideoPrivacyStatus(Enum):
 class YouTubeBulkUpload:
     logger: Optional[Logger]
     youtube: Any
+    youtube_client_secrets_file: OPTIONAL_STR
     gui: OPTIONAL_ANY
     stop_event: OPTIONAL_ANY
     dry_run: bool
@@ -40,9 +70,27 @@ class YouTubeBulkUpload:
     upload_batch_limit: int
     check_for_duplicate_titles: bool
     progress_callback_func: OPTIONAL_ANY
+    progress_tracker: ProgressTracker
+    review_queue: Optional[ReviewQueue]
+    retry_queue: Optional[RetryQueue]
+    retry_in_run_max_wait_seconds: float
+    quota_exceeded: bool
+    deferred_video_files: set[str]
+    failed_video_files: set[str]
+    credential_profiles: list[CredentialProfile]
+    profile_router: Optional[CredentialProfileRouter]
+    active_profile: Optional[CredentialProfile]
+    http_transport: Any
+    metrics: Union[UploadMetrics, NullUploadMetrics]
+    chunk_trace: Optional[ChunkTraceRecorder]
+    quota_ledger: Optional[QuotaLedger]
+    quota_pools: dict[str, str]
+    thumbnail_preprocessor: Optional[ThumbnailPreprocessor]
+    title_card_generator: Optional[TitleCardGenerator]
+    media_source: Optional[ReadAheadMediaSource]
     def __init__(
         self,
-        youtube_client_secrets_file: str,
+        youtube_client_secrets_file: OPTIONAL_STR,
         logger: Optional[Logger] = ...,
         dry_run: bool = ...,
         interactive_prompt: bool = ...,
@@ -65,7 +113,21 @@ class YouTubeBulkUpload:
         privacy_status: str = ...,
         check_for_duplicate_titles: bool = ...,
         progress_callback_func: OPTIONAL_ANY = ...,
+        retry_queue_file: OPTIONAL_STR = ...,
+        retry_in_run_max_wait_seconds: float = ...,
+        credential_profiles: Optional[list[CredentialProfile]] = ...,
+        profile_routing: str = ...,
+        http_transport: OPTIONAL_ANY = ...,
+        progress_tracker: Optional[ProgressTracker] = ...,
+        review_queue: Optional[ReviewQueue] = ...,
+        metrics: Optional[UploadMetrics] = ...,
+        chunk_trace: Optional[ChunkTraceRecorder] = ...,
+        quota_ledger: Optional[QuotaLedger] = ...,
+        thumbnail_preprocessor: Optional[ThumbnailPreprocessor] = ...,
+        title_card_generator: Optional[TitleCardGenerator] = ...,
+        media_source: Optional[ReadAheadMediaSource] = ...,
     ) -> None: ...
+    def publish_progress_fraction(self, event: ProgressEvent) -> None: ...
     def find_input_files(self) -> list[str]: ...
     def prompt_user_confirmation_or_raise_exception(
         self, prompt_message: str, exit_message: str, allow_empty: bool = ...
@@ -76,9 +138,22 @@ class YouTubeBulkUpload:
     @classmethod
     def validate_secrets_file(cls, logger: Logger, secrets_file: str) -> None: ...
     @classmethod
-    def authenticate_youtube(cls, logger: Logger, youtube_client_secrets_file: str) -> Any: ...
+    def authenticate_youtube(
+        cls,
+        logger: Logger,
+        youtube_client_secrets_file: str,
+        token_file: OPTIONAL_STR = ...,
+        account: str = ...,
+        http_transport: OPTIONAL_ANY = ...,
+    ) -> Any: ...
     @classmethod
     def open_browser_to_authenticate(cls, secrets_file: str) -> Union[Credentials, Creds]: ...
+    def authenticate_credential_profiles(self) -> None: ...
+    def activate_credential_profile(self, profile: CredentialProfile) -> None: ...
+    def reauthenticate(self) -> None: ...
+    def profile_report(self) -> dict[str, dict[str, Any]]: ...
+    def quota_pool(self) -> str: ...
+    def api_call(self, api_method: str) -> ContextManager[None]: ...
     def get_channel_id(self) -> OPTIONAL_STR: ...
     def check_if_video_title_exists_on_youtube_channel(
         self, youtube_title: str
@@ -87,7 +162,26 @@ class YouTubeBulkUpload:
     def upload_video_to_youtube_with_title_thumbnail(
         self, video_file: str, youtube_title: str, youtube_description: str, thumbnail_filepath: OPTIONAL_STR
     ) -> str: ...
+    def next_upload_chunk(self, request: Any, video_file: str, offset: int) -> tuple[Any, Any]: ...
     def determine_thumbnail_filepath(self, video_file: str) -> OPTIONAL_STR: ...
     def determine_youtube_title(self, video_file: str) -> str: ...
     def determine_youtube_description(self, video_file: str, youtube_title: str) -> str: ...
-    def process(self) -> list[dict[str, str]]: ...
+    def should_stop_processing(self, uploaded_count: int) -> bool: ...
+    def wait_or_stop(self, seconds: float) -> bool: ...
+    def select_credential_profile(self, video_file: str) -> bool: ...
+    def prepare_review_item(self, video_file: str) -> ReviewItem: ...
+    def confirm_review_item(self, review_item: ReviewItem) -> bool: ...
+    def record_upload_failure(self, video_file: str, error: Exception) -> None: ...
+    def upload_review_item(self, review_item: ReviewItem) -> Optional[UploadedVideo]: ...
+    def process_video_file(self, video_file: str) -> Optional[UploadedVideo]: ...
+    def retry_video_file(self, video_file: str) -> Optional[UploadedVideo]: ...
+    def review_and_upload(
+        self, review_queue: ReviewQueue, video_files: list[str], approved_video_files: list[str]
+    ) -> Iterator[UploadedVideo]: ...
+    def iter_retry_failed_uploads_in_run(self, video_files: Iterable[str], uploaded_count: int) -> Iterator[UploadedVideo]: ...
+    def retry_failed_uploads(self) -> list[UploadedVideo]: ...
+    def process(self, input_files: Optional[list[str]] = ...) -> list[UploadedVideo]: ...
+    def iter_process(self, input_files: Optional[list[str]] = ..., results_file: Optional[str] = ...) -> Iterator[UploadedVideo]: ...
+    def submit_thumbnails_ahead(self, video_files: list[str], position: int, uploaded_count: int, submitted_until: int) -> int: ...
+    def submit_thumbnails(self, video_files: list[str]) -> None: ...
+    def iter_process_video_files(self, video_files: list[str]) -> Iterator[UploadedVideo]: ...
@@ -0,0 +1,244 @@
+import os
+import csv
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+CHUNK_TRACE_COLUMNS: tuple[str, ...] = (
+    "timestamp",
+    "file",
+    "offset",
+    "chunk_bytes",
+    "duration_seconds",
+    "send_seconds",
+    "response_seconds",
+    "retries",
+    "status",
+)
+
+# A chunk taking this many times the median chunk duration, or a gap this long between two chunks of one file, is a stall
+DEFAULT_STALL_FACTOR: float = 5.0
+MB = 1024 * 1024
+
+
+class ChunkTrace:
+    """One upload chunk being traced; the uploader sets end_offset once it knows how far the upload got."""
+
+    __slots__ = ("file", "offset", "end_offset")
+
+    def __init__(self, file: str, offset: int) -> None:
+        self.file = file
+        self.offset = offset
+        self.end_offset: Optional[int] = None
+
+
+class ChunkTraceRecorder:
+    """
+    Opt-in trace of every resumable upload chunk, appended to a CSV file with one row per chunk: start time, file, offset,
+    chunk size, total duration, time spent sending the body and waiting for the server's response, failed HTTP requests
+    retried within the chunk and the final status. Send and response times need the PooledHttpTransport's request timing, which is
+    switched on by attach_transport(); with any other transport those two columns are left empty.
+    Summarise a trace with analyze_chunk_trace() or `youtube-bulk-upload analyze-trace`.
+    """
+
+    def __init__(self, trace_file: str) -> None:
+        self.trace_file = trace_file
+        self.request_timing_log: Any = None
+        self._lock = threading.Lock()
+        write_header = not os.path.exists(trace_file) or os.path.getsize(trace_file) == 0
+        self._file = open(trace_file, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(CHUNK_TRACE_COLUMNS)
+            self._file.flush()
+
+    def attach_transport(self, http_transport: Any) -> None:
+        self.request_timing_log = getattr(http_transport, "request_timing_log", None)
+        if self.request_timing_log is not None:
+            self.request_timing_log.enabled = True
+
+    @contextmanager
+    def trace_chunk(self, file: str, offset: int) -> Iterator[ChunkTrace]:
+        chunk = ChunkTrace(file, offset)
+        if self.request_timing_log is not None:
+            # Drop timings of requests made before this chunk, e.g. the metadata calls
+            self.request_timing_log.take()
+
+        timestamp = time.time()
+        started_at = time.perf_counter()
+        error_status = None
+        try:
+            yield chunk
+        except Exception as e:
+            response = getattr(e, "resp", None)
+            error_status = str(getattr(response, "status", None) or type(e).__name__)
+            raise
+        finally:
+            self.record(chunk, timestamp, time.perf_counter() - started_at, error_status)
+
+    def record(self, chunk: ChunkTrace, timestamp: float, duration_seconds: float, error_status: Optional[str]) -> None:
+        timings = self.request_timing_log.take() if self.request_timing_log is not None else []
+        send_times = [timing.send_seconds for timing in timings if timing.send_seconds is not None]
+        response_times = [timing.response_seconds for timing in timings if timing.response_seconds is not None]
+        status = error_status or (str(timings[-1].status) if timings and timings[-1].status is not None else "ok")
+
+        row = [
+            f"{timestamp:.6f}",
+            chunk.file,
+            chunk.offset,
+            chunk.end_offset - chunk.offset if chunk.end_offset is not None else 0,
+            f"{duration_seconds:.6f}",
+            f"{sum(send_times):.6f}" if send_times else "",
+            f"{sum(response_times):.6f}" if response_times else "",
+            sum(1 for timing in timings[:-1] if timing.status is None or timing.status >= 400),
+            status,
+        ]
+        with self._lock:
+            self._writer.writerow(row)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        if self.request_timing_log is not None:
+            self.request_timing_log.enabled = False
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = min(max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def format_distribution(sorted_values: list[float], unit: str, scale: float = 1) -> str:
+    points = [("min", 0.0), ("p10", 0.1), ("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)]
+    return ", ".join(f"{name} {percentile(sorted_values, fraction) * scale:.2f}{unit}" for name, fraction in points)
+
+
+class ChunkTraceAnalysis:
+    """Throughput distributions, send/response split, stalls and concurrency from a chunk trace file."""
+
+    def __init__(self, rows: list[dict[str, Any]], stall_factor: float = DEFAULT_STALL_FACTOR) -> None:
+        self.rows = sorted(rows, key=lambda row: row["timestamp"])
+        self.stall_factor = stall_factor
+        self.sent_rows = [row for row in self.rows if row["chunk_bytes"] > 0 and row["duration_seconds"] > 0]
+        self.error_rows = [row for row in self.rows if not row["status"].isdigit() or int(row["status"]) >= 400]
+
+    @classmethod
+    def from_file(cls, trace_file: str, stall_factor: float = DEFAULT_STALL_FACTOR) -> "ChunkTraceAnalysis":
+        with open(trace_file, newline="", encoding="utf-8") as f:
+            rows = [
+                {
+                    "timestamp": float(row["timestamp"]),
+                    "file": row["file"],
+                    "offset": int(row["offset"]),
+                    "chunk_bytes": int(row["chunk_bytes"]),
+                    "duration_seconds": float(row["duration_seconds"]),
+                    "send_seconds": float(row["send_seconds"]) if row["send_seconds"] else None,
+                    "response_seconds": float(row["response_seconds"]) if row["response_seconds"] else None,
+                    "retries": int(row["retries"]),
+                    "status": row["status"],
+                }
+                for row in csv.DictReader(f)
+            ]
+        return cls(rows, stall_factor)
+
+    def stall_threshold_seconds(self) -> float:
+        durations = sorted(row["duration_seconds"] for row in self.sent_rows)
+        return percentile(durations, 0.5) * self.stall_factor if durations else 0
+
+    def stalls(self) -> list[dict[str, Any]]:
+        """Chunks which took far longer than usual, and gaps far longer than usual between consecutive chunks of one file."""
+        threshold = self.stall_threshold_seconds()
+        if threshold <= 0:
+            return []
+
+        stalls = [
+            {
+                "timestamp": row["timestamp"],
+                "file": row["file"],
+                "offset": row["offset"],
+                "seconds": row["duration_seconds"],
+                "kind": "slow chunk",
+            }
+            for row in self.rows
+            if row["duration_seconds"] > threshold
+        ]
+        previous_by_file: dict[str, dict[str, Any]] = {}
+        for row in self.rows:
+            previous = previous_by_file.get(row["file"])
+            if previous is not None:
+                gap = row["timestamp"] - (previous["timestamp"] + previous["duration_seconds"])
+                if gap > threshold:
+                    stalls.append(
+                        {"timestamp": row["timestamp"] - gap, "file": row["file"], "offset": row["offset"], "seconds": gap, "kind": "gap"}
+                    )
+            previous_by_file[row["file"]] = row
+        return sorted(stalls, key=lambda stall: stall["seconds"], reverse=True)
+
+    def max_concurrent_chunks(self) -> int:
+        events = []
+        for row in self.rows:
+            events.append((row["timestamp"], 1))
+            events.append((row["timestamp"] + row["duration_seconds"], -1))
+        concurrent = max_concurrent = 0
+        # Ends sort before starts at the same moment, so back-to-back chunks don't count as overlapping
+        for _, change in sorted(events):
+            concurrent += change
+            max_concurrent = max(max_concurrent, concurrent)
+        return max_concurrent
+
+    def summary_lines(self, max_stalls: int = 10) -> list[str]:
+        if not self.rows:
+            return ["No chunks in trace."]
+
+        total_bytes = sum(row["chunk_bytes"] for row in self.rows)
+        wall_seconds = max(row["timestamp"] + row["duration_seconds"] for row in self.rows) - self.rows[0]["timestamp"]
+        lines = [
+            f"chunks: {len(self.rows)} over {len({row['file'] for row in self.rows})} file(s), "
+            f"{total_bytes / MB:.1f} MB in {wall_seconds:.1f}s "
+            f"({total_bytes / MB / wall_seconds if wall_seconds > 0 else 0:.2f} MB/s overall), "
+            f"max {self.max_concurrent_chunks()} chunk(s) in flight at once",
+            f"errors: {len(self.error_rows)}, HTTP retries within chunks: {sum(row['retries'] for row in self.rows)}",
+        ]
+
+        if self.sent_rows:
+            throughputs = sorted(row["chunk_bytes"] / row["duration_seconds"] for row in self.sent_rows)
+            durations = sorted(row["duration_seconds"] for row in self.sent_rows)
+            lines.append(f"chunk throughput: {format_distribution(throughputs, ' MB/s', 1 / MB)}")
+            lines.append(f"chunk duration: {format_distribution(durations, 's')}")
+
+            send_seconds = sum(row["send_seconds"] for row in self.sent_rows if row["send_seconds"] is not None)
+            response_seconds = sum(row["response_seconds"] for row in self.sent_rows if row["response_seconds"] is not None)
+            if send_seconds + response_seconds > 0:
+                lines.append(
+                    f"time sending: {send_seconds:.1f}s, waiting for responses: {response_seconds:.1f}s "
+                    f"({response_seconds / (send_seconds + response_seconds) * 100:.0f}% waiting)"
+                )
+
+            lines.append("by chunk size:")
+            by_size: dict[int, list[float]] = {}
+            for row in self.sent_rows:
+                by_size.setdefault(row["chunk_bytes"], []).append(row["chunk_bytes"] / row["duration_seconds"])
+            for chunk_bytes, size_throughputs in sorted(by_size.items()):
+                size_throughputs.sort()
+                lines.append(
+                    f"  {chunk_bytes / MB:8.2f} MB: {len(size_throughputs):>6} chunks, "
+                    f"median {percentile(size_throughputs, 0.5) / MB:.2f} MB/s"
+                )
+
+        stalls = self.stalls()
+        lines.append(
+            f"stalls (over {self.stall_threshold_seconds():.2f}s, {self.stall_factor:g}x the median chunk duration): {len(stalls)}"
+        )
+        for stall in stalls[:max_stalls]:
+            lines.append(
+                f"  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stall['timestamp']))} {stall['kind']} of {stall['seconds']:.2f}s "
+                f"at offset {stall['offset']} of {stall['file']}"
+            )
+        return lines
+
+
+def analyze_chunk_trace(trace_file: str, stall_factor: float = DEFAULT_STALL_FACTOR) -> ChunkTraceAnalysis:
+    return ChunkTraceAnalysis.from_file(trace_file, stall_factor)
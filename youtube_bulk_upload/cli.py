@@ -2,8 +2,20 @@
 import os
 import argparse
 import logging
-import pkg_resources
-from youtube_bulk_upload import YouTubeBulkUpload
+from importlib import metadata
+from youtube_bulk_upload.retry_queue import DEFAULT_RETRY_QUEUE_FILE
+from youtube_bulk_upload.scheduler import DEFAULT_CHECKPOINT_FILE
+from youtube_bulk_upload.worker import DEFAULT_LEASE_SECONDS
+from youtube_bulk_upload.quota_ledger import DEFAULT_DAILY_QUOTA, DEFAULT_QUOTA_LEDGER_FILE, QuotaLedger
+from youtube_bulk_upload.transport import (
+    DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT_SECONDS,
+    PooledHttpTransport,
+)
+from youtube_bulk_upload.media_source import DEFAULT_READ_AHEAD_CHUNKS, DEFAULT_READ_AHEAD_MAX_BYTES
+from youtube_bulk_upload.profiles import PROFILE_ROUTING_STRATEGIES, ROUTING_ROUND_ROBIN, load_credential_profiles
+from youtube_bulk_upload.log_handlers import LOG_FORMAT_JSON, LOG_FORMAT_TEXT, LOG_FORMATS, JsonLinesFormatter, job_log_fields
 
 
 def main():
@@ -13,17 +25,39 @@ def main():
     log_handler.setFormatter(log_formatter)
     logger.addHandler(log_handler)
 
-    package_version = pkg_resources.get_distribution("youtube-bulk-upload").version
+    package_version = metadata.version("youtube-bulk-upload")
     cli_description = "Upload all videos in a folder to youtube, e.g. to help re-populate an unfairly terminated channel."
 
     parser = argparse.ArgumentParser(
         description=cli_description, formatter_class=lambda prog: argparse.RawTextHelpFormatter(prog, max_help_position=85)
     )
 
+    command_help = (
+        "Optional: Command to run (default: %(default)s).\n"
+        "  upload: upload all videos found in the source directory\n"
+        "  retry-failed: re-attempt failed uploads from the retry queue which are due for retry\n"
+        "  worker: claim and upload videos from a job queue shared with other workers (see Worker Options)\n"
+        "  analyze-trace: summarise the --chunk_trace_file of an earlier run (throughput distribution, stalls) and exit\n"
+        "  quota: report the API quota used today and forecast how many pending videos fit in what's left, then exit"
+    )
+    parser.add_argument(
+        "command", nargs="?", choices=["upload", "retry-failed", "worker", "analyze-trace", "quota"], default="upload", help=command_help
+    )
+
     # General Options
     general_group = parser.add_argument_group("General Options")
 
     log_level_help = "Optional: logging level, e.g. info, debug, warning (default: %(default)s). Example: --log_level=debug"
+    log_format_help = (
+        "Optional: Log line format (default: %(default)s). json writes one JSON object per line with stable fields "
+        "(time, level, message, job_id, file, stage, duration_seconds, bytes, youtube_id) for log pipelines to index."
+    )
+    skip_duplicate_check_help = (
+        "Optional: Don't search the channel for an existing video with the same title before each upload, saving 101 quota units "
+        "per video. Default: %(default)s"
+    )
+    quota_ledger_file_help = "Optional: JSON file recording the API calls made and quota units used each day. Default: %(default)s"
+    daily_quota_help = "Optional: Daily YouTube API quota of each Google Cloud project, for the quota report. Default: %(default)s"
     dry_run_help = "Optional: Enable dry run mode to print actions without executing them (default: %(default)s). Example: -n or --dry_run"
     source_directory_help = "Optional: Directory to load video files from for upload. Default: current directory"
     input_file_extensions_help = "Optional: File extensions to include in the upload. Default: %(default)s"
@@ -31,14 +65,123 @@ def main():
         "Optional: Disable interactive prompt, will run fully automatically (will pring warning messages if needed). Default: %(default)s"
     )
     upload_batch_limit_help = "Optional: Limit for the number of videos to upload in a batch. Default: %(default)s"
+    retry_queue_file_help = "Optional: JSON file to store failed uploads in so they can be retried. Default: %(default)s"
+    scheduled_help = (
+        "Optional: Keep running until every video is uploaded, sleeping until the daily quota resets whenever the upload limit "
+        "or API quota is reached. Default: %(default)s"
+    )
+    checkpoint_file_help = "Optional: JSON file to record scheduled upload progress in, so it can be resumed. Default: %(default)s"
+    retry_in_run_max_wait_help = (
+        "Optional: Maximum seconds to wait before retrying transient failures again in the same run. Default: %(default)s"
+    )
+
+    progress_interval_help = "Optional: Seconds between upload progress log lines for each video, 0 to disable. Default: %(default)s"
+    results_file_help = "Optional: File to append a line of JSON to for each video as soon as it's uploaded. Default: %(default)s"
+    metrics_file_help = (
+        "Optional: File to write stage timings, API call counts, bytes uploaded and quota used to in the OpenMetrics text format "
+        "at the end of the run, e.g. for the node_exporter textfile collector. Also logs a summary table. Default: %(default)s"
+    )
+    metrics_port_help = (
+        "Optional: Port to serve the same metrics on at http://127.0.0.1:<port>/metrics during the run. Default: %(default)s"
+    )
+    profile_help = (
+        "Optional: Profile the run with cProfile, writing combined and per-thread .prof stats files and a text summary of the slowest "
+        "functions to --profile_dir, to see whether a slow run is CPU, disk or network bound. Default: %(default)s"
+    )
+    profile_dir_help = "Optional: Directory to write profiling output to. Default: current directory"
+    profile_memory_help = (
+        "Optional: With --profile, also take tracemalloc snapshots at the start and end of the run and of each upload. Default: %(default)s"
+    )
+    chunk_trace_file_help = (
+        "Optional: CSV file to append a row to for every upload chunk (time, file, offset, size, send and server response times, "
+        "retries, status), for diagnosing slow or stalling uploads with the analyze-trace command. Default: %(default)s"
+    )
+    stall_factor_help = (
+        "Optional: For analyze-trace, how many times the median chunk duration a chunk, or a gap between chunks, must take "
+        "to be reported as a stall. Default: %(default)s"
+    )
 
     general_group.add_argument("-v", "--version", action="version", version=f"%(prog)s {package_version}")
     general_group.add_argument("--log_level", default="info", help=log_level_help)
+    general_group.add_argument("--log_format", default=LOG_FORMAT_TEXT, choices=LOG_FORMATS, help=log_format_help)
     general_group.add_argument("--dry_run", "-n", action="store_true", help=dry_run_help)
+    general_group.add_argument("--skip_duplicate_check", default=False, action="store_true", help=skip_duplicate_check_help)
+    general_group.add_argument("--quota_ledger_file", default=DEFAULT_QUOTA_LEDGER_FILE, help=quota_ledger_file_help)
+    general_group.add_argument("--daily_quota", type=int, default=DEFAULT_DAILY_QUOTA, help=daily_quota_help)
     general_group.add_argument("--source_directory", default=os.getcwd(), help=source_directory_help)
-    general_group.add_argument("--input_file_extensions", nargs="+", default=[".mp4", ".mov", ".avi", ".mkv", ".mpg", ".mpeg", ".wmv", ".flv", ".webm", ".m4v", ".vob"], help=input_file_extensions_help)
+    general_group.add_argument(
+        "--input_file_extensions",
+        nargs="+",
+        default=[".mp4", ".mov", ".avi", ".mkv", ".mpg", ".mpeg", ".wmv", ".flv", ".webm", ".m4v", ".vob"],
+        help=input_file_extensions_help,
+    )
     general_group.add_argument("--noninteractive", default=False, action="store_true", help=noninteractive_help)
     general_group.add_argument("--upload_batch_limit", type=int, default=100, help=upload_batch_limit_help)
+    general_group.add_argument("--scheduled", default=False, action="store_true", help=scheduled_help)
+    general_group.add_argument("--checkpoint_file", default=DEFAULT_CHECKPOINT_FILE, help=checkpoint_file_help)
+    general_group.add_argument("--retry_queue_file", default=DEFAULT_RETRY_QUEUE_FILE, help=retry_queue_file_help)
+    general_group.add_argument("--retry_in_run_max_wait", type=float, default=900, help=retry_in_run_max_wait_help)
+    general_group.add_argument("--progress_interval", type=float, default=5, help=progress_interval_help)
+    general_group.add_argument("--results_file", default=None, help=results_file_help)
+    general_group.add_argument("--metrics_file", default=None, help=metrics_file_help)
+    general_group.add_argument("--metrics_port", type=int, default=None, help=metrics_port_help)
+    general_group.add_argument("--profile", default=False, action="store_true", help=profile_help)
+    general_group.add_argument("--profile_dir", default=os.getcwd(), help=profile_dir_help)
+    general_group.add_argument("--profile_memory", default=False, action="store_true", help=profile_memory_help)
+    general_group.add_argument("--chunk_trace_file", default=None, help=chunk_trace_file_help)
+    general_group.add_argument("--stall_factor", type=float, default=5.0, help=stall_factor_help)
+
+    # Worker Options
+    worker_group = parser.add_argument_group("Worker Options")
+
+    queue_url_help = (
+        "Optional: Job queue shared by all workers, either an SQLite file on shared storage or a Redis server. "
+        "Default: %(default)s. Example: --queue_url=sqlite:////mnt/videos/queue.db or --queue_url=redis://queue-host:6379/0"
+    )
+    worker_id_help = "Optional: Unique name for this worker. Default: <hostname>-<pid>"
+    lease_seconds_help = "Optional: Seconds a claimed job is reserved for before another worker may take it over. Default: %(default)s"
+
+    worker_group.add_argument("--queue_url", default="sqlite:///youtube_bulk_upload_queue.db", help=queue_url_help)
+    worker_group.add_argument("--worker_id", default=None, help=worker_id_help)
+    worker_group.add_argument("--lease_seconds", type=float, default=DEFAULT_LEASE_SECONDS, help=lease_seconds_help)
+
+    # Network Options
+    network_group = parser.add_argument_group("Network Options")
+
+    http_pool_size_help = "Optional: Maximum keep-alive connections to the YouTube API kept open for reuse. Default: %(default)s"
+    http_connect_timeout_help = "Optional: Seconds to wait when connecting to the YouTube API. Default: %(default)s"
+    http_read_timeout_help = "Optional: Seconds to wait for each read or write on a YouTube API connection. Default: %(default)s"
+    http_send_buffer_size_help = (
+        "Optional: Socket send buffer size in bytes for API connections, larger values can speed up uploads over high-latency links. "
+        "Default: operating system default. Example: --http_send_buffer_size=4194304"
+    )
+
+    network_group.add_argument("--http_pool_size", type=int, default=DEFAULT_POOL_SIZE, help=http_pool_size_help)
+    network_group.add_argument(
+        "--http_connect_timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT_SECONDS, help=http_connect_timeout_help
+    )
+    network_group.add_argument("--http_read_timeout", type=float, default=DEFAULT_READ_TIMEOUT_SECONDS, help=http_read_timeout_help)
+    network_group.add_argument("--http_send_buffer_size", type=int, default=None, help=http_send_buffer_size_help)
+
+    # Source File Options
+    source_group = parser.add_argument_group("Source File Options")
+
+    read_ahead_chunks_help = (
+        "Optional: Upload chunks (5 MB each) of a video to read ahead in the background while the current chunk is sent, so reads "
+        f"from slow storage like spinning disks or NFS overlap with the upload. Given without a number, {DEFAULT_READ_AHEAD_CHUNKS} chunks "
+        "are read ahead. Default: %(default)s (each chunk is read only when it's sent)"
+    )
+    read_ahead_max_bytes_help = "Optional: Most memory in bytes used by chunks read ahead, over all uploads at once. Default: %(default)s"
+    drop_page_cache_help = (
+        "Optional: Drop each part of a video from the operating system's page cache once it's uploaded, so uploading terabytes doesn't "
+        "evict other programs' cached files. Linux and other systems with posix_fadvise only. Default: %(default)s"
+    )
+
+    source_group.add_argument(
+        "--read_ahead_chunks", type=int, nargs="?", default=0, const=DEFAULT_READ_AHEAD_CHUNKS, help=read_ahead_chunks_help
+    )
+    source_group.add_argument("--read_ahead_max_bytes", type=int, default=DEFAULT_READ_AHEAD_MAX_BYTES, help=read_ahead_max_bytes_help)
+    source_group.add_argument("--drop_page_cache", default=False, action="store_true", help=drop_page_cache_help)
 
     # YouTube Options
     yt_group = parser.add_argument_group("YouTube Options")
@@ -46,6 +189,15 @@ def main():
     yt_client_secrets_file_help = (
         "Mandatory: File path to youtube client secrets file. Example: --yt_client_secrets_file='/path/to/client_secret.json'"
     )
+    yt_profiles_file_help = (
+        "Optional: JSON file listing multiple credential profiles to spread uploads over, each with its own client secrets file, "
+        "token file and upload_batch_limit. When set, --yt_client_secrets_file and --upload_batch_limit are ignored. "
+        "Example: --yt_profiles_file='/path/to/profiles.json'"
+    )
+    yt_profile_routing_help = (
+        "Optional: How to choose the credential profile for each video: round_robin, or rule to use each profile's 'match' regex. "
+        "Default: %(default)s"
+    )
     yt_category_id_help = "Optional: YouTube category ID for uploaded videos. Default: %(default)s (Music)"
     yt_keywords_help = (
         "Optional: Keywords for YouTube video, separated by spaces. Default: %(default)s. Example: --yt_keywords keyword1 keyword2 keyword3"
@@ -63,6 +215,10 @@ def main():
     yt_title_replacements_help = "Optional: Pairs for replacing text in the titles. Example: --yt_title_replacements find1 replace1"
 
     yt_group.add_argument("--yt_client_secrets_file", default="client_secret.json", help=yt_client_secrets_file_help)
+    yt_group.add_argument("--yt_profiles_file", default=None, help=yt_profiles_file_help)
+    yt_group.add_argument(
+        "--yt_profile_routing", default=ROUTING_ROUND_ROBIN, choices=PROFILE_ROUTING_STRATEGIES, help=yt_profile_routing_help
+    )
     yt_group.add_argument("--yt_category_id", default="10", help=yt_category_id_help)
     yt_group.add_argument("--yt_keywords", nargs="+", default=["music"], help=yt_keywords_help)
 
@@ -82,19 +238,150 @@ def main():
         "Optional: Pairs for replacing text in the thumbnail filenames. Example: --thumb_file_replacements find1 replace1"
     )
     thumb_file_extensions_help = "Optional: File extensions to include for thumbnails. Default: .png .jpg .jpeg"
+    thumb_preprocess_help = (
+        "Optional: Before uploading each video, check its thumbnail is a valid image and resize and re-encode it to a 1280x720 JPEG "
+        "under the API's 2 MB limit if need be, rather than uploading thumbnails as they are. Default: %(default)s"
+    )
+    thumb_cache_dir_help = "Optional: Directory to cache preprocessed thumbnails in. Default: ~/.youtube-bulk-upload/thumbnails"
+    thumb_title_card_help = (
+        "Optional: Generate a title card thumbnail, with the video's title over a background, for videos without a thumbnail file. "
+        "Cards are cached in the title_cards directory of the thumbnail cache directory. Default: %(default)s"
+    )
+    thumb_title_card_background_help = "Optional: Title card background, an image file or a colour name or hex code. Default: %(default)s"
+    thumb_title_card_font_help = "Optional: TrueType or OpenType font file for title card text. Default: Pillow's default font"
+    thumb_title_card_font_size_help = "Optional: Largest font size for title card text, shrunk to fit long titles. Default: %(default)s"
+    thumb_title_card_text_color_help = "Optional: Colour of title card text. Default: %(default)s"
+    thumb_title_card_stroke_color_help = "Optional: Colour of an outline around title card text. Default: no outline"
+    thumb_title_card_text_help = (
+        "Optional: Title card text, with {{youtube_title}} and {{filename}} replaced by the video's title and filename. "
+        "Default: %(default)s"
+    )
 
     thumbnail_group.add_argument("--thumb_file_prefix", default=None, help=thumb_file_prefix_help)
     thumbnail_group.add_argument("--thumb_file_suffix", default=None, help=thumb_file_suffix_help)
     thumbnail_group.add_argument("--thumb_file_replacements", nargs="+", action="append", help=thumb_file_replacements_help)
     thumbnail_group.add_argument("--thumb_file_extensions", nargs="+", default=[".png", ".jpg", ".jpeg"], help=thumb_file_extensions_help)
+    thumbnail_group.add_argument("--thumb_preprocess", default=False, action="store_true", help=thumb_preprocess_help)
+    thumbnail_group.add_argument("--thumb_cache_dir", default=None, help=thumb_cache_dir_help)
+    thumbnail_group.add_argument("--thumb_title_card", default=False, action="store_true", help=thumb_title_card_help)
+    thumbnail_group.add_argument("--thumb_title_card_background", default="#202020", help=thumb_title_card_background_help)
+    thumbnail_group.add_argument("--thumb_title_card_font", default=None, help=thumb_title_card_font_help)
+    thumbnail_group.add_argument("--thumb_title_card_font_size", type=int, default=96, help=thumb_title_card_font_size_help)
+    thumbnail_group.add_argument("--thumb_title_card_text_color", default="#ffffff", help=thumb_title_card_text_color_help)
+    thumbnail_group.add_argument("--thumb_title_card_stroke_color", default=None, help=thumb_title_card_stroke_color_help)
+    thumbnail_group.add_argument("--thumb_title_card_text", default="{{youtube_title}}", help=thumb_title_card_text_help)
 
     args = parser.parse_args()
 
     log_level = getattr(logging, args.log_level.upper())
     logger.setLevel(log_level)
+    if args.log_format == LOG_FORMAT_JSON:
+        log_handler.setFormatter(JsonLinesFormatter())
+
+    if args.command == "analyze-trace":
+        from youtube_bulk_upload.chunk_trace import analyze_chunk_trace
+
+        if args.chunk_trace_file is None:
+            parser.error("analyze-trace needs --chunk_trace_file")
+        print("\n".join(analyze_chunk_trace(args.chunk_trace_file, stall_factor=args.stall_factor).summary_lines()))
+        return
+
+    quota_ledger = QuotaLedger(args.quota_ledger_file, daily_quota=args.daily_quota)
+    if args.command == "quota":
+        from youtube_bulk_upload.bulk_upload import find_thumbnail_file
+        from youtube_bulk_upload.scheduler import UploadCheckpoint
+        from youtube_bulk_upload.quota_ledger import quota_report_lines, upload_quota_cost
+        from youtube_bulk_upload.token_store import get_client_id
+
+        # Quota belongs to the Google Cloud project of each OAuth client, so profiles sharing a client share a pool
+        pool_names: dict[str, str] = {}
+        if args.yt_profiles_file is not None:
+            for profile in load_credential_profiles(args.yt_profiles_file):
+                pool = get_client_id(profile.client_secrets_file)
+                pool_names[pool] = f"{pool_names[pool]}, {profile.name}" if pool in pool_names else profile.name
+        else:
+            pool_names[get_client_id(args.yt_client_secrets_file)] = os.path.basename(args.yt_client_secrets_file)
+
+        completed_files = UploadCheckpoint(args.checkpoint_file).completed
+        pending_files = sorted(
+            os.path.join(args.source_directory, f)
+            for f in os.listdir(args.source_directory)
+            if f.endswith(tuple(args.input_file_extensions))
+        )
+        pending_file_costs = [
+            upload_quota_cost(
+                not args.skip_duplicate_check,
+                # Every video has a thumbnail with title cards, generated if there's no thumbnail file
+                args.thumb_title_card
+                or find_thumbnail_file(
+                    video_file, args.thumb_file_prefix, args.thumb_file_suffix, args.thumb_file_replacements, args.thumb_file_extensions
+                )
+                is not None,
+            )
+            for video_file in pending_files
+            if video_file not in completed_files
+        ]
+        print("\n".join(quota_report_lines(quota_ledger, pool_names, pending_file_costs)))
+        return
 
     logger.info(f"YouTubeBulkUpload CLI beginning initialisation...")
 
+    # Imported only once arguments are parsed, so --help and --version return quickly
+    from youtube_bulk_upload.bulk_upload import YouTubeBulkUpload
+    from youtube_bulk_upload.scheduler import MultiDayScheduler
+    from youtube_bulk_upload.job_queue import open_job_queue
+    from youtube_bulk_upload.worker import UploadWorker
+    from youtube_bulk_upload.metrics import UploadMetrics
+    from youtube_bulk_upload.profiling import RunProfiler
+    from youtube_bulk_upload.chunk_trace import ChunkTraceRecorder
+    from youtube_bulk_upload.media_source import FADVISE_SUPPORTED, ReadAheadMediaSource
+    from youtube_bulk_upload.thumbnails import (
+        DEFAULT_THUMBNAIL_CACHE_DIR,
+        DEFAULT_TITLE_CARD_BACKGROUND_COLOR,
+        ThumbnailPreprocessor,
+        TitleCardGenerator,
+        TitleCardSettings,
+    )
+
+    # Metrics are only collected when they're exported, otherwise the instrumentation is a no-op
+    metrics = UploadMetrics() if args.metrics_file is not None or args.metrics_port is not None else None
+    metrics_server = None
+    if metrics is not None and args.metrics_port is not None:
+        metrics_server = metrics.serve(args.metrics_port)
+        logger.info(f"Serving metrics at {metrics_server.url}")
+    chunk_trace = ChunkTraceRecorder(args.chunk_trace_file) if args.chunk_trace_file is not None else None
+    thumbnail_preprocessor = None
+    if args.thumb_preprocess:
+        thumbnail_preprocessor = ThumbnailPreprocessor(args.thumb_cache_dir or DEFAULT_THUMBNAIL_CACHE_DIR)
+    title_card_generator = None
+    if args.thumb_title_card:
+        # The background is an image if there's a file by that name, otherwise a colour
+        background_is_image = os.path.isfile(args.thumb_title_card_background)
+        title_card_generator = TitleCardGenerator(
+            os.path.join(args.thumb_cache_dir or DEFAULT_THUMBNAIL_CACHE_DIR, "title_cards"),
+            TitleCardSettings(
+                background_image=args.thumb_title_card_background if background_is_image else None,
+                background_color=DEFAULT_TITLE_CARD_BACKGROUND_COLOR if background_is_image else args.thumb_title_card_background,
+                font_file=args.thumb_title_card_font,
+                font_size=args.thumb_title_card_font_size,
+                text_color=args.thumb_title_card_text_color,
+                stroke_color=args.thumb_title_card_stroke_color,
+                text_template=args.thumb_title_card_text,
+            ),
+        )
+
+    media_source = None
+    if args.drop_page_cache and not FADVISE_SUPPORTED:
+        logger.warning("--drop_page_cache isn't supported on this platform, uploaded files will stay in the page cache")
+    if args.read_ahead_chunks > 0 or args.drop_page_cache:
+        media_source = ReadAheadMediaSource(
+            read_ahead_chunks=args.read_ahead_chunks, max_buffer_bytes=args.read_ahead_max_bytes, drop_page_cache=args.drop_page_cache
+        )
+
+    credential_profiles = None
+    if args.yt_profiles_file is not None:
+        credential_profiles = load_credential_profiles(args.yt_profiles_file)
+
     youtube_bulk_upload = YouTubeBulkUpload(
         logger=logger,
         dry_run=args.dry_run,
@@ -103,6 +390,7 @@ def main():
         input_file_extensions=args.input_file_extensions,
         upload_batch_limit=args.upload_batch_limit,
         youtube_client_secrets_file=args.yt_client_secrets_file,
+        check_for_duplicate_titles=not args.skip_duplicate_check,
         youtube_category_id=args.yt_category_id,
         youtube_keywords=args.yt_keywords,
         youtube_description_template_file=args.yt_desc_template_file,
@@ -114,18 +402,92 @@ def main():
         thumbnail_filename_suffix=args.thumb_file_suffix,
         thumbnail_filename_replacements=args.thumb_file_replacements,
         thumbnail_filename_extensions=args.thumb_file_extensions,
+        retry_queue_file=args.retry_queue_file,
+        retry_in_run_max_wait_seconds=args.retry_in_run_max_wait,
+        credential_profiles=credential_profiles,
+        profile_routing=args.yt_profile_routing,
+        http_transport=PooledHttpTransport(
+            pool_size=args.http_pool_size,
+            connect_timeout_seconds=args.http_connect_timeout,
+            read_timeout_seconds=args.http_read_timeout,
+            send_buffer_size=args.http_send_buffer_size,
+        ),
+        metrics=metrics,
+        chunk_trace=chunk_trace,
+        quota_ledger=quota_ledger,
+        thumbnail_preprocessor=thumbnail_preprocessor,
+        title_card_generator=title_card_generator,
+        media_source=media_source,
     )
 
+    if args.progress_interval > 0:
+        youtube_bulk_upload.progress_tracker.subscribe(
+            lambda event: logger.info(event.describe()), min_interval_seconds=args.progress_interval
+        )
+
+    profiler = None
+    if args.profile:
+        profiler = RunProfiler(args.profile_dir, logger, trace_memory=args.profile_memory).start()
+        youtube_bulk_upload.progress_tracker.subscribe(profiler.on_progress_event)
+
     try:
-        uploaded_videos = youtube_bulk_upload.process()
+        if args.command == "retry-failed":
+            uploaded_videos = youtube_bulk_upload.retry_failed_uploads()
+        elif args.command == "worker":
+            job_queue = open_job_queue(args.queue_url)
+            upload_worker = UploadWorker(youtube_bulk_upload, job_queue, worker_id=args.worker_id, lease_seconds=args.lease_seconds)
+            uploaded_videos = upload_worker.run()
+        elif args.scheduled:
+            uploaded_videos = MultiDayScheduler(youtube_bulk_upload, checkpoint_file=args.checkpoint_file).run()
+        else:
+            # Streamed rather than collected, so a huge run doesn't hold every uploaded video in memory
+            uploaded_videos = youtube_bulk_upload.iter_process(results_file=args.results_file)
+
+        uploaded_count = 0
+        for video in uploaded_videos:
+            uploaded_count += 1
+            logger.info(
+                "Input Filename: %s - YouTube Title: %s - URL: %s",
+                video["input_filename"],
+                video["youtube_title"],
+                video["youtube_url"],
+                extra=job_log_fields(video["input_filename"], "complete", youtube_id=video["youtube_id"]),
+            )
     except Exception as e:
         logger.error(f"An error occurred during bulk upload, see stack trace below: {str(e)}")
         raise e
+    finally:
+        if profiler is not None:
+            logger.info("Wrote profiling output: %s", ", ".join(profiler.stop()))
+        if metrics is not None:
+            if args.metrics_file is not None:
+                metrics.write_openmetrics_file(args.metrics_file)
+                logger.info(f"Wrote metrics to {args.metrics_file}")
+            logger.info("Run metrics:\n" + "\n".join(metrics.summary_lines()))
+        if metrics_server is not None:
+            metrics_server.stop()
+        if chunk_trace is not None:
+            chunk_trace.close()
+            logger.info(f"Wrote upload chunk trace to {args.chunk_trace_file}")
+        if thumbnail_preprocessor is not None:
+            thumbnail_preprocessor.close()
+        if title_card_generator is not None:
+            title_card_generator.close()
+        if media_source is not None:
+            media_source.close()
+
+    logger.info(f"YouTube Bulk Upload processing complete! Videos uploaded to YouTube: {uploaded_count}")
 
-    logger.info(f"YouTube Bulk Upload processing complete! Videos uploaded to YouTube: {len(uploaded_videos)}")
+    for profile_name, profile_summary in youtube_bulk_upload.profile_report().items():
+        logger.info(
+            f"Credential profile {profile_name}: uploaded {profile_summary['uploaded']} of {profile_summary['upload_batch_limit']} videos, "
+            f"quota exceeded: {profile_summary['quota_exceeded']}"
+        )
 
-    for video in uploaded_videos:
-        logger.info(f"Input Filename: {video['input_filename']} - YouTube Title: {video['youtube_title']} - URL: {video['youtube_url']}")
+    for quota_pool in quota_ledger.pools():
+        logger.info(
+            f"YouTube API quota used today by {quota_pool}: {quota_ledger.usage(quota_pool)['units']} of {quota_ledger.daily_quota} units"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Optional
+from youtube_bulk_upload.token_store import TokenFileLock, load_token_file, save_token_file
+
+# Refresh access tokens this long before they expire, so uploads never have to refresh them mid-request
+DEFAULT_REFRESH_MARGIN_SECONDS: float = 600
+DEFAULT_REFRESH_CHECK_INTERVAL_SECONDS: float = 60
+
+
+class CredentialManager:
+    """
+    Keeps one set of OAuth credentials fresh for the whole life of a long upload run.
+    Every YouTube service object built for the same token file shares the one credentials object held here, so when the
+    background thread refreshes it ahead of expiry, all of them pick up the new access token without refreshing themselves.
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        token_file: str,
+        credentials: Any,
+        refresh_margin_seconds: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        check_interval_seconds: float = DEFAULT_REFRESH_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.logger = logger
+        self.token_file = token_file
+        self.credentials = credentials
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.check_interval_seconds = check_interval_seconds
+
+        self.lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def seconds_until_expiry(credentials: Any, now: Optional[datetime] = None) -> Optional[float]:
+        expiry = getattr(credentials, "expiry", None)
+        if not isinstance(expiry, datetime):
+            return None
+
+        # google-auth stores expiry as a naive UTC datetime
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds()
+
+    def needs_refresh(self, credentials: Any = None, now: Optional[datetime] = None) -> bool:
+        credentials = credentials or self.credentials
+        seconds_left = self.seconds_until_expiry(credentials, now)
+        return (
+            seconds_left is not None and seconds_left <= self.refresh_margin_seconds and bool(getattr(credentials, "refresh_token", None))
+        )
+
+    def refresh(self) -> None:
+        from google.auth.transport.requests import Request
+
+        with self.lock, TokenFileLock(self.token_file):
+            # Another process sharing the token file may have refreshed it already, in which case just adopt its token.
+            # The shared credentials object is updated in place, as every service holds a reference to it.
+            stored_credentials = load_token_file(self.token_file)
+            if (
+                stored_credentials is not None
+                and stored_credentials.token != self.credentials.token
+                and not self.needs_refresh(stored_credentials)
+            ):
+                self.logger.info(f"Using YouTube access token refreshed by another process from token file: {self.token_file}")
+                self.credentials.token = stored_credentials.token
+                self.credentials.expiry = stored_credentials.expiry
+                return
+
+            self.logger.info(f"Refreshing YouTube access token ahead of expiry for token file: {self.token_file}")
+            self.credentials.refresh(Request())
+            save_token_file(self.token_file, self.credentials)
+
+    def refresh_if_needed(self) -> bool:
+        with self.lock:
+            if not self.needs_refresh():
+                return False
+            self.refresh()
+            return True
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.check_interval_seconds):
+            try:
+                self.refresh_if_needed()
+            except Exception as e:
+                # Leave the token for google-auth to refresh on the next request, and try again on the next check
+                self.logger.warning(f"Background refresh of YouTube access token failed, will retry: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name=f"credential-refresh-{os.path.basename(self.token_file)}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# One manager per token file, so every service (and profile or worker thread) using the same token shares its credentials
+_credential_managers: dict[str, CredentialManager] = {}
+_credential_managers_lock = threading.Lock()
+
+
+def get_managed_credentials(token_file: str) -> Any:
+    """Return the credentials already being kept fresh for a token file in this process, if they are still valid."""
+    with _credential_managers_lock:
+        manager = _credential_managers.get(token_file)
+    if manager is None:
+        return None
+
+    with manager.lock:
+        return manager.credentials if getattr(manager.credentials, "valid", False) else None
+
+
+def manage_credentials(logger: Any, token_file: str, credentials: Any) -> CredentialManager:
+    """Register the credentials for a token file and start refreshing them in the background."""
+    with _credential_managers_lock:
+        manager = _credential_managers.get(token_file)
+        if manager is None:
+            manager = CredentialManager(logger, token_file, credentials)
+            _credential_managers[token_file] = manager
+        else:
+            with manager.lock:
+                manager.credentials = credentials
+
+        manager.start()
+        return manager
+
+
+def forget_managed_credentials(token_file: str) -> None:
+    """Stop refreshing and sharing the credentials for a token file, e.g. after the token is deleted to force re-authentication."""
+    with _credential_managers_lock:
+        manager = _credential_managers.pop(token_file, None)
+    if manager is not None:
+        manager.stop()
+
+
+def stop_credential_managers() -> None:
+    with _credential_managers_lock:
+        for manager in _credential_managers.values():
+            manager.stop()
+        _credential_managers.clear()
@@ -0,0 +1,109 @@
+import os
+import json
+import tempfile
+import threading
+import urllib.request
+from typing import Any, Optional
+
+YOUTUBE_API_NAME: str = "youtube"
+YOUTUBE_API_VERSION: str = "v3"
+YOUTUBE_DISCOVERY_URL: str = "https://youtube.googleapis.com/$discovery/rest?version=v3"
+DEFAULT_DISCOVERY_CACHE_FILE: str = os.path.join(tempfile.gettempdir(), "youtube-bulk-upload-discovery-youtube-v3.json")
+
+# One parsed discovery document per cache file, shared by every service object built in this process
+_discovery_documents: dict[str, dict[str, Any]] = {}
+_discovery_documents_lock = threading.Lock()
+
+
+def get_api_client_version() -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version("google-api-python-client")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def load_bundled_discovery_document() -> Optional[dict[str, Any]]:
+    """Return the YouTube discovery document shipped inside google-api-python-client, if this version bundles one."""
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+    except ImportError:
+        return None
+
+    content = get_static_doc(YOUTUBE_API_NAME, YOUTUBE_API_VERSION)
+    return json.loads(content) if content else None
+
+
+def fetch_discovery_document(url: str = YOUTUBE_DISCOVERY_URL, timeout: float = 30) -> dict[str, Any]:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def read_discovery_cache_file(cache_file: str, client_version: str) -> Optional[dict[str, Any]]:
+    """Return the cached document, or None if there isn't one or it was stored by a different API client version."""
+    if not os.path.exists(cache_file):
+        return None
+
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache_data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache_data.get("client_version") != client_version or "rootUrl" not in cache_data.get("document", {}):
+        return None
+    return cache_data["document"]
+
+
+def write_discovery_cache_file(cache_file: str, client_version: str, document: dict[str, Any]) -> None:
+    cache_data = {"client_version": client_version, "revision": document.get("revision"), "document": document}
+
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(cache_data, f)
+    os.replace(temp_file, cache_file)
+
+
+def load_discovery_document(logger: Any, cache_file: str = DEFAULT_DISCOVERY_CACHE_FILE) -> dict[str, Any]:
+    """
+    Load the YouTube Data API discovery document, in order of preference from: this process's in-memory copy,
+    the cache file (if written by the installed API client version), the document bundled with the API client,
+    or the network. Anything loaded from the bundle or network is stored in the cache file for later runs.
+    """
+    with _discovery_documents_lock:
+        if cache_file in _discovery_documents:
+            return _discovery_documents[cache_file]
+
+        client_version = get_api_client_version()
+        document = read_discovery_cache_file(cache_file, client_version)
+        if document is not None:
+            logger.debug(f"Loaded YouTube API discovery document revision {document.get('revision')} from cache: {cache_file}")
+        else:
+            document = load_bundled_discovery_document()
+            if document is None:
+                logger.info(f"Fetching YouTube API discovery document from: {YOUTUBE_DISCOVERY_URL}")
+                document = fetch_discovery_document()
+
+            try:
+                write_discovery_cache_file(cache_file, client_version, document)
+                logger.debug(f"Saved YouTube API discovery document revision {document.get('revision')} to cache: {cache_file}")
+            except OSError as e:
+                logger.warning(f"Failed to save YouTube API discovery document cache file {cache_file}: {e}")
+
+        _discovery_documents[cache_file] = document
+        return document
+
+
+def build_youtube_service(logger: Any, credentials: Any, cache_file: str = DEFAULT_DISCOVERY_CACHE_FILE, http_transport: Any = None) -> Any:
+    """
+    Build a YouTube API service object from the cached discovery document, without any network request.
+    If an http_transport (e.g. PooledHttpTransport) is given, the service sends its requests through it instead of its own
+    httplib2 connection.
+    """
+    from googleapiclient.discovery import build_from_document
+
+    document = load_discovery_document(logger, cache_file)
+    if http_transport is not None:
+        return build_from_document(document, http=http_transport.authorize(credentials))
+    return build_from_document(document, credentials=credentials)
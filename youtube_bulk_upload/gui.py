@@ -1,20 +1,29 @@
 import os
 import sys
+import atexit
 import logging
 import threading
 import json
-import pkg_resources
+from importlib import metadata
 from pathlib import Path
+from typing import Optional
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, simpledialog, ttk
 
 from youtube_bulk_upload import YouTubeBulkUpload
 from youtube_bulk_upload import VideoPrivacyStatus
+from youtube_bulk_upload.log_handlers import BufferedLogWriter, QueueLogHandler, TeeStream
+from youtube_bulk_upload.job_table import JOB_STATUSES, JOB_TABLE_COLUMNS, JobTableModel
+from youtube_bulk_upload.review import ReviewQueue
+from youtube_bulk_upload.profiling import RunProfiler
+from youtube_bulk_upload.quota_ledger import DEFAULT_QUOTA_LEDGER_FILE, QuotaLedger
 
 
 class YouTubeBulkUploaderGUI:
-    def __init__(self, gui_root: tk.Tk, logger: logging.Logger, bundle_dir: Path, running_in_pyinstaller: bool):
+    def __init__(
+        self, gui_root: tk.Tk, logger: logging.Logger, bundle_dir: Path, running_in_pyinstaller: bool, log_filepath: Optional[str] = None
+    ):
         self.logger = logger
         self.logger.debug(f"Initializing YouTubeBulkUploaderGUI, bundle_dir: {bundle_dir}")
 
@@ -23,7 +32,7 @@ class YouTubeBulkUploaderGUI:
         self.running_in_pyinstaller = running_in_pyinstaller
 
         # Define variables for inputs
-        self.log_level = logging.DEBUG
+        self.log_level = logging.INFO
         self.log_level_var = tk.StringVar(value="info")
         self.log_level_var.trace("w", self.on_log_level_change)
 
@@ -49,6 +58,11 @@ class YouTubeBulkUploaderGUI:
         self.privacy_status_var = tk.StringVar(value=VideoPrivacyStatus.PRIVATE.value)
         self.dont_show_welcome_message_var = tk.BooleanVar(value=False)
         self.check_duplicate_titles_var = tk.BooleanVar(value=True)
+        self.batch_review_var = tk.BooleanVar(value=True)
+        # Not saved with the other options, so a run is only profiled when asked for
+        self.profile_run_var = tk.BooleanVar(value=False)
+        self.log_filepath = log_filepath
+        self.review_window = None
 
         # Fire off our clean shutdown function when the user requests to close the window
         gui_root.wm_protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -166,6 +180,7 @@ Happy uploading!
                 self.privacy_status_var.set(config.get("privacy_status", VideoPrivacyStatus.PUBLIC.value))
                 self.dont_show_welcome_message_var = tk.BooleanVar(value=config.get("dont_show_welcome_message", False))
                 self.check_duplicate_titles_var.set(config.get("check_duplicate_titles", True))
+                self.batch_review_var.set(config.get("batch_review", True))
 
                 # Load replacement patterns
                 youtube_description_replacements = config.get("youtube_description_replacements", [])
@@ -213,6 +228,7 @@ Happy uploading!
             "thumbnail_filename_replacements": thumbnail_filename_replacements,
             "dont_show_welcome_message": self.dont_show_welcome_message_var.get(),
             "check_duplicate_titles": self.check_duplicate_titles_var.get(),
+            "batch_review": self.batch_review_var.get(),
         }
         with open(self.gui_config_filepath, "w") as f:
             json.dump(config, f, indent=4)
@@ -223,15 +239,17 @@ Happy uploading!
         # Get log level string value from GUI
         log_level_str = self.log_level_var.get()
         # Convert log level from string to logging module constant
-        self.log_level = getattr(logging, log_level_str.upper(), logging.DEBUG)
+        self.log_level = getattr(logging, log_level_str.upper(), logging.INFO)
 
         self.logger.setLevel(self.log_level)
+        if hasattr(self, "log_handler_textbox"):
+            self.log_handler_textbox.setLevel(self.log_level)
 
     def create_gui_frames_widgets(self):
         self.logger.debug("Setting up GUI frames and widgets")
         self.row = 0
         # Fetch the package version
-        package_version = pkg_resources.get_distribution("youtube-bulk-upload").version
+        package_version = metadata.version("youtube-bulk-upload")
         self.gui_root.title(f"YouTube Bulk Upload - v{package_version}")
 
         # Configure the grid layout to allow frames to resize properly
@@ -306,6 +324,17 @@ Happy uploading!
         # Progress bar spanning all three buttons
         self.progress_bar = ttk.Progressbar(button_frame, orient="horizontal", mode="determinate")
         self.progress_bar.grid(row=1, column=0, columnspan=3, pady=(10, 0), sticky="ew")
+        self.progress_label = tk.Label(button_frame, text="", anchor="w")
+        self.progress_label.grid(row=2, column=0, columnspan=4, sticky="ew")
+
+        self.row += 1
+
+        # Job table spanning both columns, showing the status of every file in the batch
+        job_table_frame = tk.LabelFrame(self.gui_root, text="Upload Jobs")
+        job_table_frame.grid(row=self.row, column=0, columnspan=2, padx=10, pady=5, sticky="nsew")
+        self.job_table_model = JobTableModel()
+        self.job_table_view = JobTableView(self.gui_root, job_table_frame, self.job_table_model)
+        self.job_table_view.start()
 
         self.row += 1
 
@@ -443,6 +472,23 @@ Happy uploading!
             "When enabled, checks for similar titles on your channel before uploading to prevent duplicates. Disable if you regularly upload videos with similar titles.",
         )
 
+        batch_review_checkbutton = tk.Checkbutton(self.general_frame, text="Batch Review", variable=self.batch_review_var)
+        batch_review_checkbutton.grid(row=frame.row, column=1, sticky="w")
+        Tooltip(
+            batch_review_checkbutton,
+            "When not running non-interactive, shows every video's title, description, thumbnail and possible duplicate in one "
+            "review window instead of a popup for each video. Each video starts uploading as soon as you approve it.",
+        )
+
+        frame.new_row()
+        profile_run_checkbutton = tk.Checkbutton(self.general_frame, text="Profile Run", variable=self.profile_run_var)
+        profile_run_checkbutton.grid(row=frame.row, column=0, sticky="w")
+        Tooltip(
+            profile_run_checkbutton,
+            "Profiles the next run's CPU time and memory use, to find out why a slow run is slow. "
+            "The profile files are written next to the log file.",
+        )
+
     def add_youtube_title_widgets(self):
         frame = self.youtube_title_frame
 
@@ -561,13 +607,17 @@ Happy uploading!
 
     def add_textbox_log_handler(self):
         self.logger.info("Adding textbox log handler to logger")
-        self.log_handler_textbox = TextHandler(self.logger, self.log_output)
+        # Upload threads only queue log records, the Tk main loop moves them into the text box in batches
+        self.log_handler_textbox = QueueLogHandler(level=self.log_level)
 
         log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(module)s - %(message)s")
         self.log_handler_textbox.setFormatter(log_formatter)
 
         self.logger.addHandler(self.log_handler_textbox)
 
+        self.log_text_view = TextLogView(self.gui_root, self.log_output, self.log_handler_textbox)
+        self.log_text_view.start()
+
     def prompt_user_bool(self, prompt_message, allow_empty=False):
         """
         Prompt the user for a boolean input via a GUI dialog in a thread-safe manner.
@@ -608,9 +658,13 @@ Happy uploading!
         self.logger.info("Stopping current operation")
         self.stop_event.set()
 
-    def update_progress(self, progress):
-        self.logger.info(f"Progress is: {progress}")
-        self.progress_bar["value"] = progress * 100
+    def update_progress(self, event):
+        # Called from the upload thread, so hand the event over to the GUI thread to render
+        self.gui_root.after(0, self.render_progress, event)
+
+    def render_progress(self, event):
+        self.progress_bar["value"] = event.batch_fraction * 100
+        self.progress_label.config(text=event.describe())
 
     def run_upload(self):
         self.logger.info("Initializing YouTubeBulkUpload class with parameters from GUI")
@@ -639,6 +693,8 @@ Happy uploading!
         # Split the file extensions string into a list
         input_file_extensions = self.input_file_extensions_var.get().split()
 
+        review_queue = ReviewQueue() if not noninteractive and self.batch_review_var.get() else None
+
         # Initialize YouTubeBulkUpload with collected parameters and replacements
         self.youtube_bulk_upload = YouTubeBulkUpload(
             logger=self.logger,
@@ -662,8 +718,20 @@ Happy uploading!
             youtube_title_replacements=youtube_title_replacements,
             thumbnail_filename_replacements=thumbnail_filename_replacements,
             check_for_duplicate_titles=self.check_duplicate_titles_var.get(),
-            progress_callback_func=self.update_progress,
+            review_queue=review_queue,
+            quota_ledger=QuotaLedger(DEFAULT_QUOTA_LEDGER_FILE),
         )
+        self.youtube_bulk_upload.progress_tracker.subscribe(self.update_progress, min_interval_seconds=0.25)
+
+        # The job table model only records changes from the upload thread, the job table view renders them on the GUI thread
+        self.job_table_model.clear()
+        self.youtube_bulk_upload.progress_tracker.subscribe(self.job_table_model.handle_progress_event, min_interval_seconds=0.25)
+        self.youtube_bulk_upload.progress_tracker.add_batch_listener(self.job_table_model.set_batch)
+
+        if review_queue is not None:
+            if self.review_window is not None:
+                self.review_window.close()
+            self.review_window = ReviewWindow(self.gui_root, review_queue, self.logger)
 
         self.logger.info("Beginning YouTubeBulkUpload process thread...")
 
@@ -676,6 +744,8 @@ Happy uploading!
 
         self.logger.debug("Setting stop_event to stop upload thread")
         self.stop_event.set()
+        if self.review_window is not None:
+            self.review_window.close()
 
         self.save_gui_config_options()
 
@@ -686,13 +756,26 @@ Happy uploading!
             self.upload_thread.join()
 
         self.logger.info("Upload thread shut down successfully, destroying GUI window. Goodbye for now!")
+        self.log_text_view.stop()
+        self.job_table_view.stop()
+        self.logger.removeHandler(self.log_handler_textbox)
         self.gui_root.destroy()
 
     def threaded_upload(self, youtube_bulk_upload):
         self.logger.debug("Starting threaded upload")
+        profiler = None
+        if self.profile_run_var.get():
+            profile_dir = os.path.dirname(self.log_filepath) if self.log_filepath else os.path.expanduser("~")
+            profiler = RunProfiler(profile_dir, self.logger, trace_memory=True)
+            youtube_bulk_upload.progress_tracker.subscribe(profiler.on_progress_event)
         try:
-            uploaded_videos = youtube_bulk_upload.process()
-            message = f"Upload complete! Videos uploaded: {len(uploaded_videos)}"
+            # Uploaded videos are already listed in the job table, so they're counted as they stream past rather than kept
+            if profiler is not None:
+                with profiler:
+                    uploaded_count = sum(1 for _ in youtube_bulk_upload.iter_process())
+            else:
+                uploaded_count = sum(1 for _ in youtube_bulk_upload.iter_process())
+            message = f"Upload complete! Videos uploaded: {uploaded_count}"
             self.gui_root.after(0, lambda: messagebox.showinfo("Success", message))
         except Exception as e:
             error_message = f"An error occurred during upload: {str(e)}"
@@ -725,15 +808,15 @@ Happy uploading!
         self.log_output.config(state=tk.DISABLED)  # Disable text widget after clearing
 
     def reset_youtube_auth(self):
-        """Delete the YouTube authentication token file."""
+        """Delete the YouTube authentication token file for the selected client secrets file."""
         self.logger.info("Resetting YouTube authentication...")
         try:
-            import tempfile
-            import os
+            from youtube_bulk_upload.credentials import forget_managed_credentials
+            from youtube_bulk_upload.token_store import default_token_file, delete_token_file
 
-            pickle_file = os.path.join(tempfile.gettempdir(), "youtube-bulk-upload-token.pickle")
-            if os.path.exists(pickle_file):
-                os.remove(pickle_file)
+            token_file = default_token_file(self.yt_client_secrets_file_var.get())
+            forget_managed_credentials(token_file)
+            if delete_token_file(token_file):
                 self.logger.info("YouTube authentication token deleted successfully")
                 messagebox.showinfo("Success", "YouTube authentication has been reset. You will need to re-authenticate on next upload.")
             else:
@@ -875,51 +958,323 @@ class Tooltip:
             self.tooltip_window = None
 
 
-class TextHandler(logging.Handler):
-    def __init__(self, logger, text_widget):
-        self.logger = logger
-        self.logger.debug("Initializing TextHandler")
-        super().__init__()
+class TextLogView:
+    """
+    Shows the log records queued by a QueueLogHandler in a Tk text widget. Runs entirely on the Tk main loop, draining the
+    queue in batches at a fixed frame rate with after(), so each frame does one insert however many records arrived.
+    Only the latest max_lines lines are kept, so a long run doesn't grow the text widget without bound.
+    """
+
+    def __init__(self, gui_root, text_widget, log_handler, max_lines=5000, refresh_interval_ms=100, max_records_per_refresh=1000):
+        self.gui_root = gui_root
         self.text_widget = text_widget
+        self.log_handler = log_handler
+        self.max_lines = max_lines
+        self.refresh_interval_ms = refresh_interval_ms
+        self.max_records_per_refresh = max_records_per_refresh
+        self.after_id = None
+
+    def start(self):
+        if self.after_id is None:
+            self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.gui_root.after_cancel(self.after_id)
+            self.after_id = None
 
-    def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.config(state=tk.NORMAL)  # Enable text widget for editing
-        self.text_widget.insert(tk.END, msg + "\n")
-        self.text_widget.see(tk.END)
-        self.text_widget.config(state=tk.DISABLED)  # Disable text widget after updating
+    def refresh(self):
+        records = self.log_handler.drain(self.max_records_per_refresh)
+        if records:
+            # Only scroll to the new lines if the user hasn't scrolled up to read older ones
+            scrolled_to_end = self.text_widget.yview()[1] >= 1.0
 
+            self.text_widget.config(state=tk.NORMAL)  # Enable text widget for editing
+            self.text_widget.insert(tk.END, "".join(f"{message}\n" for _, message in records))
 
-class DualLogger:
+            line_count = int(self.text_widget.index("end-1c").split(".")[0])
+            if line_count > self.max_lines:
+                self.text_widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+
+            if scrolled_to_end:
+                self.text_widget.see(tk.END)
+            self.text_widget.config(state=tk.DISABLED)  # Disable text widget after updating
+
+        self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+
+class JobTableView:
     """
-    A class that can be used to log to both a file and the console at the same time.
-    This is used to log to the GUI and to a file at the same time.
-    Multiple instances can be used pointing to the same file, and each instance will not overwrite one another.
+    Virtualized table of upload jobs: a ttk.Treeview with a fixed number of item rows, used as a window onto the filtered
+    and sorted list of job IDs from a JobTableModel. Scrolling only moves the window, and each refresh (run on the Tk main
+    loop with after()) only rewrites the visible rows whose jobs changed, so it stays responsive with tens of thousands of jobs.
     """
 
-    _lock = threading.Lock()  # Class-level lock shared by all instances
+    COLUMN_WIDTHS = {"file": 260, "size": 80, "status": 80, "progress": 70, "youtube_id": 110, "error": 260}
 
-    def __init__(self, file_path, stream):
-        try:
-            self.file = open(file_path, "a")  # Open in append mode
-        except Exception as e:
-            print(f"Failed to open log file {file_path}: {e}")
-            self.file = None
-        self.stream = stream
+    def __init__(self, gui_root, parent, model, visible_rows=12, refresh_interval_ms=250):
+        self.gui_root = gui_root
+        self.model = model
+        self.visible_rows = visible_rows
+        self.refresh_interval_ms = refresh_interval_ms
+        self.after_id = None
+
+        self.job_ids = []  # Filtered and sorted job IDs, of which visible_rows are shown from offset
+        self.offset = 0
+        self.displayed_job_ids = [None] * visible_rows
+        self.sort_column = None
+        self.sort_descending = False
+        self.view_changed = True
+
+        self.filter_var = tk.StringVar()
+        self.status_var = tk.StringVar(value="all")
+        self.filter_var.trace("w", self.on_view_change)
+        self.status_var.trace("w", self.on_view_change)
+
+        filter_frame = tk.Frame(parent)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+        tk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        Tooltip(filter_entry, "Only show jobs whose file name or error contains this text.")
+        tk.Label(filter_frame, text="Status:").pack(side=tk.LEFT)
+        status_combobox = ttk.Combobox(
+            filter_frame, textvariable=self.status_var, values=["all"] + JOB_STATUSES, state="readonly", width=10
+        )
+        status_combobox.pack(side=tk.LEFT)
+        self.summary_label = tk.Label(filter_frame, text="")
+        self.summary_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.tree = ttk.Treeview(parent, columns=JOB_TABLE_COLUMNS, show="headings", height=visible_rows, selectmode="browse")
+        for column in JOB_TABLE_COLUMNS:
+            self.tree.heading(column, text=self.heading_text(column), command=lambda column=column: self.sort_by(column))
+            self.tree.column(column, width=self.COLUMN_WIDTHS[column], stretch=column in ("file", "error"))
+        for i in range(visible_rows):
+            self.tree.insert("", tk.END, iid=f"row{i}", values=())
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        parent.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)
+
+    def heading_text(self, column):
+        text = column.replace("_", " ").title().replace("Youtube Id", "YouTube ID")
+        if column == self.sort_column:
+            text += " \u25bc" if self.sort_descending else " \u25b2"
+        return text
+
+    def start(self):
+        if self.after_id is None:
+            self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.gui_root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def on_view_change(self, *args):
+        self.offset = 0
+        self.view_changed = True
+
+    def sort_by(self, column):
+        self.sort_descending = not self.sort_descending if column == self.sort_column else False
+        self.sort_column = column
+        for heading_column in JOB_TABLE_COLUMNS:
+            self.tree.heading(heading_column, text=self.heading_text(heading_column))
+        self.view_changed = True
+        self.refresh_view()
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self.job_ids) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render(set())
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.job_ids))
+        elif action == "scroll":
+            step = self.visible_rows if args[1] == "pages" else 1
+            self.scroll_to(self.offset + int(args[0]) * step)
+
+    def on_mouse_wheel(self, event):
+        scroll_up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.offset + (-3 if scroll_up else 3))
+        return "break"
+
+    def refresh_view(self, changed_job_ids=frozenset()):
+        status = self.status_var.get()
+        self.job_ids = self.model.visible_job_ids(
+            self.filter_var.get(), None if status == "all" else status, self.sort_column, self.sort_descending
+        )
+        self.view_changed = False
+        self.offset = max(0, min(self.offset, len(self.job_ids) - self.visible_rows))
+        self.render(changed_job_ids, force=True)
+
+    def refresh(self):
+        changed_job_ids, rows_added = self.model.take_changes()
+
+        # Changed rows can only move in or out of view, or change position, if they're filtered or sorted on
+        view_depends_on_rows = self.filter_var.get() or self.status_var.get() != "all" or self.sort_column is not None
+        if self.view_changed or rows_added or (changed_job_ids and view_depends_on_rows):
+            self.refresh_view(changed_job_ids)
+        elif changed_job_ids:
+            self.render(changed_job_ids)
+
+        if self.view_changed or rows_added or changed_job_ids:
+            counts = self.model.status_counts()
+            self.summary_label.config(text=", ".join(f"{status}: {count}" for status, count in counts.items() if count))
+
+        self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+    def render(self, changed_job_ids, force=False):
+        for i in range(self.visible_rows):
+            index = self.offset + i
+            job_id = self.job_ids[index] if index < len(self.job_ids) else None
+            if force or job_id != self.displayed_job_ids[i] or job_id in changed_job_ids:
+                values = self.model.row_values(job_id) if job_id is not None else ()
+                self.tree.item(f"row{i}", values=values)
+                self.displayed_job_ids[i] = job_id
+
+        if self.job_ids:
+            self.scrollbar.set(self.offset / len(self.job_ids), min((self.offset + self.visible_rows) / len(self.job_ids), 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class ReviewWindow:
+    """
+    Batch review grid for a ReviewQueue: one row per prepared video, with the title and description of the selected
+    row editable below. Approving rows lets the upload thread start uploading them straight away, while the rest of the
+    batch is still being reviewed. Rows are added and updated from the upload thread's changes on the Tk main loop.
+    """
 
-    def write(self, message):
-        with self._lock:  # Ensure only one thread can enter this block at a time
-            if self.file is not None:
-                self.file.write(message)
-            if self.stream is not None:
-                self.stream.write(message)
-            self.flush()  # Ensure the message is written immediately
+    COLUMNS = ("file", "title", "thumbnail", "duplicate", "status")
+    COLUMN_WIDTHS = {"file": 220, "title": 300, "thumbnail": 160, "duplicate": 110, "status": 80}
+
+    def __init__(self, gui_root, review_queue, logger, refresh_interval_ms=250):
+        self.gui_root = gui_root
+        self.review_queue = review_queue
+        self.logger = logger
+        self.refresh_interval_ms = refresh_interval_ms
+
+        self.row_ids = {}  # video file -> Treeview item ID
+        self.video_files = {}  # Treeview item ID -> video file
+        self.changed_items = {}
+        self.changed_items_lock = threading.Lock()
+        self.review_queue.add_listener(self.on_review_item_changed)
+
+        self.window = tk.Toplevel(gui_root)
+        self.window.title("Review Uploads")
+        self.window.wm_protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.window.grid_rowconfigure(0, weight=1)
+        self.window.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, show="headings", height=15, selectmode="extended")
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column.title())
+            self.tree.column(column, width=self.COLUMN_WIDTHS[column], stretch=column in ("file", "title"))
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=(10, 0), pady=(10, 5))
+        scrollbar = ttk.Scrollbar(self.window, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=(10, 5))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+
+        edit_frame = tk.Frame(self.window)
+        edit_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10)
+        edit_frame.grid_columnconfigure(1, weight=1)
+        tk.Label(edit_frame, text="Title:").grid(row=0, column=0, sticky="w")
+        self.title_var = tk.StringVar()
+        tk.Entry(edit_frame, textvariable=self.title_var).grid(row=0, column=1, sticky="ew")
+        tk.Label(edit_frame, text="Description:").grid(row=1, column=0, sticky="nw")
+        self.description_text = scrolledtext.ScrolledText(edit_frame, height=5)
+        self.description_text.grid(row=1, column=1, sticky="ew")
+
+        button_frame = tk.Frame(self.window)
+        button_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(5, 10))
+        approve_button = tk.Button(button_frame, text="Approve Selected", command=self.approve_selected)
+        approve_button.pack(side=tk.LEFT)
+        Tooltip(approve_button, "Uploads the selected videos. With one video selected, the edited title and description are used.")
+        tk.Button(button_frame, text="Reject Selected", command=self.reject_selected).pack(side=tk.LEFT)
+        tk.Button(button_frame, text="Approve All Pending", command=self.approve_all_pending).pack(side=tk.LEFT)
+        self.summary_label = tk.Label(button_frame, text="")
+        self.summary_label.pack(side=tk.RIGHT)
+
+        self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+    def on_review_item_changed(self, review_item):
+        # Called from the upload thread (or Tk thread), so only record the change for the next refresh
+        with self.changed_items_lock:
+            self.changed_items[review_item.video_file] = review_item
+
+    def row_values(self, review_item):
+        thumbnail = os.path.basename(review_item.thumbnail_filepath) if review_item.thumbnail_filepath else "(none)"
+        duplicate = review_item.duplicate_video_id or ""
+        return (os.path.basename(review_item.video_file), review_item.youtube_title, thumbnail, duplicate, review_item.status)
+
+    def refresh(self):
+        with self.changed_items_lock:
+            changed_items, self.changed_items = self.changed_items, {}
+
+        for video_file, review_item in changed_items.items():
+            row_id = self.row_ids.get(video_file)
+            if row_id is None:
+                row_id = self.row_ids[video_file] = self.tree.insert("", tk.END, values=self.row_values(review_item))
+                self.video_files[row_id] = video_file
+            else:
+                self.tree.item(row_id, values=self.row_values(review_item))
+
+        if changed_items:
+            self.summary_label.config(text=f"{self.review_queue.pending_count()} of {len(self.row_ids)} videos awaiting review")
+        self.after_id = self.gui_root.after(self.refresh_interval_ms, self.refresh)
+
+    def selected_video_files(self):
+        return [self.video_files[row_id] for row_id in self.tree.selection()]
+
+    def on_select(self, event=None):
+        selected_video_files = self.selected_video_files()
+        if len(selected_video_files) != 1:
+            return
+        review_item = self.review_queue.items[selected_video_files[0]]
+        self.title_var.set(review_item.youtube_title)
+        self.description_text.delete("1.0", tk.END)
+        self.description_text.insert("1.0", review_item.youtube_description)
+
+    def approve_selected(self):
+        selected_video_files = self.selected_video_files()
+        if len(selected_video_files) == 1:
+            description = self.description_text.get("1.0", "end-1c")
+            self.review_queue.approve(selected_video_files[0], youtube_title=self.title_var.get(), youtube_description=description)
+        else:
+            for video_file in selected_video_files:
+                self.review_queue.approve(video_file)
+
+    def reject_selected(self):
+        for video_file in self.selected_video_files():
+            self.review_queue.reject(video_file)
+
+    def approve_all_pending(self):
+        self.logger.info(f"Approving all {self.review_queue.approve_all_pending()} videos awaiting review")
+
+    def on_closing(self):
+        if self.review_queue.pending_count() and not messagebox.askyesno(
+            "Close Review", "Videos not yet approved will not be uploaded. Close the review window?", parent=self.window
+        ):
+            return
+        self.close()
 
-    def flush(self):
-        if self.file is not None:
-            self.file.flush()
-        if self.stream is not None:
-            self.stream.flush()
+    def close(self):
+        rejected_count = self.review_queue.reject_all_pending()
+        if rejected_count:
+            self.logger.info(f"Review window closed, skipping {rejected_count} videos which weren't approved")
+        if self.after_id is not None:
+            self.gui_root.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.destroy()
 
 
 def main():
@@ -935,11 +1290,14 @@ def main():
         log_filepath = os.path.join(bundle_dir, "youtube_bulk_upload.log")
         running_in_pyinstaller = False
 
-    sys.stdout = DualLogger(log_filepath, sys.stdout)
-    sys.stderr = DualLogger(log_filepath, sys.stderr)
+    # Console output is copied to the log file by a background writer; atexit writes out anything still queued on exit or crash
+    log_writer = BufferedLogWriter(log_filepath)
+    atexit.register(log_writer.close)
+    sys.stdout = TeeStream(sys.stdout, log_writer)
+    sys.stderr = TeeStream(sys.stderr, log_writer)
 
     logger = logging.getLogger(__name__)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(logging.INFO)
 
     log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(module)s - %(message)s")
 
@@ -953,7 +1311,7 @@ def main():
     gui_root = tk.Tk()
 
     try:
-        app = YouTubeBulkUploaderGUI(gui_root, logger, bundle_dir, running_in_pyinstaller)
+        app = YouTubeBulkUploaderGUI(gui_root, logger, bundle_dir, running_in_pyinstaller, log_filepath)
 
         logger.debug("Starting main GUI loop")
 
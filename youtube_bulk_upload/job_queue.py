@@ -0,0 +1,340 @@
+import json
+import time
+import sqlite3
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Any, Callable, Iterable, Optional
+
+JOB_STATUS_PENDING: str = "pending"
+JOB_STATUS_CLAIMED: str = "claimed"
+JOB_STATUS_DONE: str = "done"
+JOB_STATUS_FAILED: str = "failed"
+JOB_STATUSES: list[str] = [JOB_STATUS_PENDING, JOB_STATUS_CLAIMED, JOB_STATUS_DONE, JOB_STATUS_FAILED]
+
+# Maximum number of expired leases a Redis worker reclaims per claim, so one claim never does unbounded work
+RECLAIM_BATCH_SIZE: int = 100
+
+
+class JobQueue(ABC):
+    """
+    Shared queue of video files to upload, which any number of worker processes (on any number of hosts) claim jobs from.
+    A claimed job is leased to one worker for lease_seconds; the worker must heartbeat to extend the lease while uploading,
+    and if it crashes the lease expires and the job is handed to another worker.
+    Jobs are identified by video file path, so every worker must see the shared storage at the same path.
+    """
+
+    @abstractmethod
+    def enqueue(self, video_files: Iterable[str]) -> int:
+        """Add video files to the queue, ignoring any already in it (in any state). Returns the number added."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[str]:
+        """Atomically claim the next available job, returning its video file or None if nothing is available."""
+
+    @abstractmethod
+    def heartbeat(self, video_file: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease on a claimed job. Returns False if the worker no longer holds the lease."""
+
+    @abstractmethod
+    def complete(self, video_file: str, worker_id: str, result: dict[str, str]) -> None:
+        """Mark a claimed job as uploaded, storing the uploaded video's details as its result."""
+
+    @abstractmethod
+    def release(self, video_file: str, worker_id: str, delay_seconds: float = 0, error: str = "") -> None:
+        """Give a claimed job back to the queue, so it can be claimed again (by any worker) after delay_seconds."""
+
+    @abstractmethod
+    def fail(self, video_file: str, worker_id: str, error: str) -> None:
+        """Mark a claimed job as permanently failed, it will not be claimed again."""
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in each state."""
+
+    def is_drained(self) -> bool:
+        counts = self.counts()
+        return counts[JOB_STATUS_PENDING] == 0 and counts[JOB_STATUS_CLAIMED] == 0
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue stored in an SQLite database file, suitable for workers sharing a filesystem with working file locks."""
+
+    def __init__(self, database_file: str, timeout: float = 60) -> None:
+        self.database_file = database_file
+        self.timeout = timeout
+
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "video_file TEXT PRIMARY KEY, status TEXT NOT NULL, worker_id TEXT, lease_expires_at REAL, "
+                "available_at REAL NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        # A new connection per operation keeps this safe to use from multiple threads, e.g. a worker and its heartbeat thread
+        connection = sqlite3.connect(self.database_file, timeout=self.timeout, isolation_level=None)
+        return ClosingConnection(connection)
+
+    def enqueue(self, video_files: Iterable[str]) -> int:
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO jobs (video_file, status) VALUES (?, ?)",
+                [(video_file, JOB_STATUS_PENDING) for video_file in video_files],
+            )
+            connection.execute("COMMIT")
+            return cursor.rowcount
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[str]:
+        now = time.time()
+        with self.connect() as connection:
+            # BEGIN IMMEDIATE takes the database write lock, so no other worker can claim the same row in between
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT video_file FROM jobs WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY rowid LIMIT 1",
+                (JOB_STATUS_PENDING, now, JOB_STATUS_CLAIMED, now),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, attempts = attempts + 1 WHERE video_file = ?",
+                (JOB_STATUS_CLAIMED, worker_id, now + lease_seconds, row[0]),
+            )
+            connection.execute("COMMIT")
+            return row[0]
+
+    def heartbeat(self, video_file: str, worker_id: str, lease_seconds: float) -> bool:
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE video_file = ? AND status = ? AND worker_id = ?",
+                (time.time() + lease_seconds, video_file, JOB_STATUS_CLAIMED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def finish(self, video_file: str, worker_id: str, status: str, available_at: float = 0, result: str = "", error: str = "") -> None:
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, lease_expires_at = NULL, available_at = ?, result = ?, error = ? "
+                "WHERE video_file = ? AND worker_id = ?",
+                (status, available_at, result, error, video_file, worker_id),
+            )
+
+    def complete(self, video_file: str, worker_id: str, result: dict[str, str]) -> None:
+        self.finish(video_file, worker_id, JOB_STATUS_DONE, result=json.dumps(result))
+
+    def release(self, video_file: str, worker_id: str, delay_seconds: float = 0, error: str = "") -> None:
+        self.finish(video_file, worker_id, JOB_STATUS_PENDING, available_at=time.time() + delay_seconds, error=error)
+
+    def fail(self, video_file: str, worker_id: str, error: str) -> None:
+        self.finish(video_file, worker_id, JOB_STATUS_FAILED, error=error)
+
+    def counts(self) -> dict[str, int]:
+        counts = {status: 0 for status in JOB_STATUSES}
+        with self.connect() as connection:
+            for status, count in connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                counts[status] = count
+        return counts
+
+
+class ClosingConnection:
+    """Context manager which closes the wrapped SQLite connection on exit (sqlite3.Connection's own context manager doesn't)."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.connection
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+        self.connection.close()
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue stored in a Redis-compatible server, for workers on hosts without a shared lock-capable filesystem.
+    Only a handful of basic commands are used, so any client object with the same methods as redis-py's Redis class works.
+    Every change of a job's state is a WATCH/MULTI/EXEC transaction (through the client's transaction method), so two workers
+    racing to reclaim or release the same job can't both put it back on the pending list.
+
+    Keys used (all prefixed with key_prefix):
+      pending: list of jobs waiting to be claimed, claimed from the right
+      status: hash of job -> status
+      lease:<job>: owning worker ID, expiring after the lease time
+      leases: sorted set of claimed job -> lease expiry time, so expired leases are found without scanning every job
+      delay:<job>: present while a released job is waiting to become available again
+      results / errors: hashes of job -> JSON result / last error message
+    """
+
+    def __init__(self, client: Any, key_prefix: str = "youtube-bulk-upload") -> None:
+        self.client = client
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url: str, key_prefix: str = "youtube-bulk-upload") -> "RedisJobQueue":
+        try:
+            import redis
+        except ImportError as e:
+            raise Exception("The redis package is required to use a redis:// job queue, install it with: pip install redis") from e
+
+        return cls(redis.Redis.from_url(url, decode_responses=True), key_prefix=key_prefix)
+
+    def key(self, *parts: str) -> str:
+        return ":".join([self.key_prefix, *parts])
+
+    @staticmethod
+    def decode(value: Any) -> Any:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def enqueue(self, video_files: Iterable[str]) -> int:
+        added = 0
+        for video_file in video_files:
+            # HSETNX only succeeds for jobs we haven't seen before, so concurrent producers can't enqueue a file twice
+            if self.client.hsetnx(self.key("status"), video_file, JOB_STATUS_PENDING):
+                self.client.lpush(self.key("pending"), video_file)
+                added += 1
+        return added
+
+    def transaction(self, func: Callable[[Any], Any], *watches: str) -> Any:
+        """
+        Run func(pipe) as a WATCH/MULTI/EXEC transaction, returning its result. func reads the watched keys then queues its
+        writes after pipe.multi(); if another client changes a watched key first, nothing is written and func is run again.
+        """
+        return self.client.transaction(func, *watches, value_from_callable=True)
+
+    def reclaim_expired(self) -> None:
+        """Put claimed jobs whose lease has expired (i.e. their worker has died) back on the pending list."""
+        # Only leases due to have expired are looked at, so this costs the same however many jobs are claimed
+        expired = self.client.zrangebyscore(self.key("leases"), "-inf", time.time(), start=0, num=RECLAIM_BATCH_SIZE)
+        for video_file in expired:
+            video_file = self.decode(video_file)
+            self.transaction(partial(self.reclaim_job, video_file), self.key("lease", video_file), self.key("status"))
+
+    def reclaim_job(self, video_file: str, pipe: Any) -> None:
+        # The lease key's own expiry (kept by the server) decides whether a lease is really gone, as workers' clocks may disagree slightly
+        if pipe.exists(self.key("lease", video_file)):
+            return
+
+        # Watching the status means that if two workers reclaim the job at once, only one of them puts it back on the pending list
+        status = self.decode(pipe.hget(self.key("status"), video_file))
+        pipe.multi()
+        if status == JOB_STATUS_CLAIMED:
+            pipe.hset(self.key("status"), video_file, JOB_STATUS_PENDING)
+            pipe.rpush(self.key("pending"), video_file)
+        pipe.zrem(self.key("leases"), video_file)
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[str]:
+        self.reclaim_expired()
+
+        pending_key = self.key("pending")
+        for _ in range(max(self.client.llen(pending_key), 1)):
+            video_file, claimed = self.transaction(
+                partial(self.claim_last_pending, worker_id, lease_seconds), pending_key, self.key("status")
+            )
+            if video_file is None:
+                return None
+            if claimed:
+                return video_file
+
+        return None
+
+    def claim_last_pending(self, worker_id: str, lease_seconds: float, pipe: Any) -> tuple[Optional[str], bool]:
+        """Take the job at the end of the pending list off it, returning the job and whether it was claimed (not rotated or dropped)."""
+        pending_key = self.key("pending")
+        video_file = self.decode(pipe.lindex(pending_key, -1))
+        if video_file is None:
+            return None, False
+
+        delay_key = self.key("delay", video_file)
+        pipe.watch(delay_key)
+        delayed = pipe.exists(delay_key)
+        status = self.decode(pipe.hget(self.key("status"), video_file))
+
+        # The pending list is watched, so the job is still at its end when the transaction runs and exactly one worker takes it
+        pipe.multi()
+        pipe.lrem(pending_key, -1, video_file)
+        if status != JOB_STATUS_PENDING:
+            # Finished by a worker whose lease had expired after the job was reclaimed, so it mustn't be uploaded again
+            return video_file, False
+        if delayed:
+            # Jobs released with a delay are rotated to the back of the list until they become available
+            pipe.lpush(pending_key, video_file)
+            return video_file, False
+
+        pipe.set(self.key("lease", video_file), worker_id, px=int(lease_seconds * 1000))
+        pipe.zadd(self.key("leases"), {video_file: time.time() + lease_seconds})
+        pipe.hset(self.key("status"), video_file, JOB_STATUS_CLAIMED)
+        return video_file, True
+
+    def owns_lease(self, pipe: Any, video_file: str, worker_id: str) -> bool:
+        return self.decode(pipe.get(self.key("lease", video_file))) == worker_id
+
+    def heartbeat(self, video_file: str, worker_id: str, lease_seconds: float) -> bool:
+        return bool(self.transaction(partial(self.extend_lease, video_file, worker_id, lease_seconds), self.key("lease", video_file)))
+
+    def extend_lease(self, video_file: str, worker_id: str, lease_seconds: float, pipe: Any) -> bool:
+        if not self.owns_lease(pipe, video_file, worker_id):
+            return False
+
+        pipe.multi()
+        pipe.pexpire(self.key("lease", video_file), int(lease_seconds * 1000))
+        pipe.zadd(self.key("leases"), {video_file: time.time() + lease_seconds})
+        return True
+
+    def finish(self, video_file: str, worker_id: str, status: str) -> None:
+        self.transaction(partial(self.finish_job, video_file, worker_id, status), self.key("lease", video_file))
+
+    def finish_job(self, video_file: str, worker_id: str, status: str, pipe: Any) -> None:
+        # If our lease expired and another worker reclaimed the job, leave its lease alone (whoever finishes last sets the status)
+        owns_lease = self.owns_lease(pipe, video_file, worker_id)
+        pipe.multi()
+        if owns_lease:
+            pipe.delete(self.key("lease", video_file))
+            pipe.zrem(self.key("leases"), video_file)
+        pipe.hset(self.key("status"), video_file, status)
+
+    def complete(self, video_file: str, worker_id: str, result: dict[str, str]) -> None:
+        self.client.hset(self.key("results"), video_file, json.dumps(result))
+        self.finish(video_file, worker_id, JOB_STATUS_DONE)
+
+    def release(self, video_file: str, worker_id: str, delay_seconds: float = 0, error: str = "") -> None:
+        self.transaction(partial(self.release_job, video_file, worker_id, delay_seconds, error), self.key("lease", video_file))
+
+    def release_job(self, video_file: str, worker_id: str, delay_seconds: float, error: str, pipe: Any) -> None:
+        # Once our lease has expired, the job is (or will be) put back on the pending list by whichever worker reclaims it
+        if not self.owns_lease(pipe, video_file, worker_id):
+            return
+
+        pipe.multi()
+        if error:
+            pipe.hset(self.key("errors"), video_file, error)
+        if delay_seconds > 0:
+            pipe.set(self.key("delay", video_file), "1", px=int(delay_seconds * 1000))
+        pipe.delete(self.key("lease", video_file))
+        pipe.zrem(self.key("leases"), video_file)
+        pipe.hset(self.key("status"), video_file, JOB_STATUS_PENDING)
+        pipe.lpush(self.key("pending"), video_file)
+
+    def fail(self, video_file: str, worker_id: str, error: str) -> None:
+        self.client.hset(self.key("errors"), video_file, error)
+        self.finish(video_file, worker_id, JOB_STATUS_FAILED)
+
+    def counts(self) -> dict[str, int]:
+        counts = {status: 0 for status in JOB_STATUSES}
+        for status in self.client.hgetall(self.key("status")).values():
+            counts[self.decode(status)] += 1
+        return counts
+
+
+def open_job_queue(queue_url: str) -> JobQueue:
+    """Open a job queue from a URL, either sqlite:///path/to/queue.db or redis://host:port/db"""
+    if queue_url.startswith("sqlite:///"):
+        return SQLiteJobQueue(queue_url[len("sqlite:///") :])
+    if queue_url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue.from_url(queue_url)
+
+    raise Exception(f"Unsupported job queue URL: {queue_url}, it must start with sqlite:/// or redis://")
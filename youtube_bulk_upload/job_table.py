@@ -0,0 +1,139 @@
+import os
+import threading
+from typing import Any, Optional
+
+from youtube_bulk_upload.progress import (
+    PROGRESS_COMPLETED,
+    PROGRESS_FAILED,
+    PROGRESS_SKIPPED,
+    PROGRESS_STARTED,
+    PROGRESS_UPLOADING,
+    ProgressEvent,
+    format_bytes,
+)
+
+JOB_STATUS_QUEUED: str = "queued"
+JOB_STATUS_UPLOADING: str = "uploading"
+JOB_STATUS_UPLOADED: str = "uploaded"
+JOB_STATUS_FAILED: str = "failed"
+JOB_STATUS_SKIPPED: str = "skipped"
+JOB_STATUSES: list[str] = [JOB_STATUS_QUEUED, JOB_STATUS_UPLOADING, JOB_STATUS_UPLOADED, JOB_STATUS_FAILED, JOB_STATUS_SKIPPED]
+
+JOB_TABLE_COLUMNS: tuple[str, ...] = ("file", "size", "status", "progress", "youtube_id", "error")
+
+EVENT_JOB_STATUSES: dict[str, str] = {
+    PROGRESS_STARTED: JOB_STATUS_UPLOADING,
+    PROGRESS_UPLOADING: JOB_STATUS_UPLOADING,
+    PROGRESS_COMPLETED: JOB_STATUS_UPLOADED,
+    PROGRESS_FAILED: JOB_STATUS_FAILED,
+    PROGRESS_SKIPPED: JOB_STATUS_SKIPPED,
+}
+
+
+class JobRow:
+    # A row is kept for every file in the batch for the whole run, so rows are kept small
+    __slots__ = ("job_id", "file", "size", "status", "progress", "youtube_id", "error")
+
+    def __init__(self, job_id: str, size: int) -> None:
+        self.job_id = job_id
+        self.file = os.path.basename(job_id)
+        self.size = size
+        self.status = JOB_STATUS_QUEUED
+        self.progress = 0.0
+        self.youtube_id = ""
+        self.error = ""
+
+    def sort_key(self, column: str) -> Any:
+        return getattr(self, column)
+
+    def values(self) -> tuple[str, ...]:
+        """Display values, in JOB_TABLE_COLUMNS order."""
+        return (self.file, format_bytes(self.size), self.status, f"{self.progress * 100:.0f}%", self.youtube_id, self.error)
+
+
+class JobTableModel:
+    """
+    State of every upload job for the GUI job table, independent of Tk.
+    The upload thread feeds it ProgressEvents and batch file lists, which only update rows and record which changed.
+    The GUI thread periodically collects the changed job IDs with take_changes(), and asks for the filtered, sorted
+    list of job IDs only when rows were added or the changes could affect the filter or sort order.
+    """
+
+    def __init__(self) -> None:
+        self.rows: dict[str, JobRow] = {}
+        self._changed_job_ids: set[str] = set()
+        self._rows_added = False
+        self._lock = threading.Lock()
+
+    def set_batch(self, batch_job_bytes: dict[str, int]) -> None:
+        """Add a row for every file in a new batch; files already in the table (e.g. being retried) keep their row, reset to queued."""
+        with self._lock:
+            for job_id, size in batch_job_bytes.items():
+                row = self.rows.get(job_id)
+                if row is None:
+                    self.rows[job_id] = JobRow(job_id, size)
+                    self._rows_added = True
+                elif row.status != JOB_STATUS_UPLOADED:
+                    row.size, row.status, row.progress, row.error = size, JOB_STATUS_QUEUED, 0.0, ""
+                    self._changed_job_ids.add(job_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.rows = {}
+            self._changed_job_ids = set()
+            self._rows_added = True
+
+    def handle_progress_event(self, event: ProgressEvent) -> None:
+        with self._lock:
+            row = self.rows.get(event.job_id)
+            if row is None:
+                # e.g. a job claimed from a shared job queue, which was never part of a batch
+                row = self.rows[event.job_id] = JobRow(event.job_id, event.total_bytes)
+                self._rows_added = True
+
+            row.size = event.total_bytes or row.size
+            row.status = EVENT_JOB_STATUSES.get(event.state, row.status)
+            row.progress = event.fraction
+            if event.state == PROGRESS_STARTED:
+                row.error = ""
+            if event.youtube_id:
+                row.youtube_id = event.youtube_id
+            if event.error:
+                row.error = event.error
+            self._changed_job_ids.add(event.job_id)
+
+    def take_changes(self) -> tuple[set[str], bool]:
+        """Return and reset the IDs of jobs changed since the last call, and whether any rows were added."""
+        with self._lock:
+            changed_job_ids, rows_added = self._changed_job_ids, self._rows_added
+            self._changed_job_ids, self._rows_added = set(), False
+        return changed_job_ids, rows_added
+
+    def row_values(self, job_id: str) -> tuple[str, ...]:
+        with self._lock:
+            return self.rows[job_id].values()
+
+    def status_counts(self) -> dict[str, int]:
+        with self._lock:
+            counts = {status: 0 for status in JOB_STATUSES}
+            for row in self.rows.values():
+                counts[row.status] += 1
+            return counts
+
+    def visible_job_ids(
+        self, filter_text: str = "", status: Optional[str] = None, sort_column: Optional[str] = None, descending: bool = False
+    ) -> list[str]:
+        """Job IDs of rows matching the filter text (in the file name or error) and status, sorted by a JOB_TABLE_COLUMNS column."""
+        filter_text = filter_text.lower()
+        with self._lock:
+            rows = [
+                row
+                for row in self.rows.values()
+                if (status is None or row.status == status)
+                and (not filter_text or filter_text in row.file.lower() or filter_text in row.error.lower())
+            ]
+            if sort_column is not None:
+                rows.sort(key=lambda row: row.sort_key(sort_column), reverse=descending)
+            elif descending:
+                rows.reverse()
+        return [row.job_id for row in rows]
@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Any, Optional, TextIO
+
+DEFAULT_MAX_QUEUED_RECORDS: int = 10000
+
+LOG_FORMAT_TEXT: str = "text"
+LOG_FORMAT_JSON: str = "json"
+LOG_FORMATS: list[str] = [LOG_FORMAT_TEXT, LOG_FORMAT_JSON]
+
+# Fields every JSON log line has, null unless the message is about an upload job, so runs can be indexed without parsing messages
+JOB_LOG_FIELDS: tuple[str, ...] = ("job_id", "file", "stage", "duration_seconds", "bytes", "youtube_id")
+
+
+def job_log_fields(job_id: str, stage: str, **fields: Any) -> dict[str, Any]:
+    """The extra= fields for a log message about an upload job, whose ID is the video file path as in progress events."""
+    return {"job_id": job_id, "file": os.path.basename(job_id), "stage": stage, **fields}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one line of JSON, with the time, level, logger, module and message plus the JOB_LOG_FIELDS."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for field in JOB_LOG_FIELDS:
+            entry[field] = getattr(record, field, None)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    Logging handler which only formats records and queues them, so any thread can log without touching the GUI.
+    The GUI drains the queue in batches from its own main loop. If the GUI falls behind, the oldest queued records are
+    dropped rather than letting the queue grow without bound, and the number dropped is reported with the next batch.
+    """
+
+    def __init__(self, max_queued_records: int = DEFAULT_MAX_QUEUED_RECORDS, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        # deque append and popleft are atomic, so no lock is needed between the logging threads and the GUI thread
+        self.records: deque[tuple[int, str]] = deque(maxlen=max_queued_records)
+        self.dropped_count = 0
+        self._dropped_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        if len(self.records) == self.records.maxlen:
+            with self._dropped_lock:
+                self.dropped_count += 1
+        self.records.append((record.levelno, message))
+
+    def drain(self, max_records: int) -> list[tuple[int, str]]:
+        """Remove and return up to max_records queued (level, message) pairs, oldest first."""
+        batch = []
+        with self._dropped_lock:
+            if self.dropped_count:
+                batch.append((logging.WARNING, f"... {self.dropped_count} log messages not shown, see the log file for the full log ..."))
+                self.dropped_count = 0
+
+        while len(batch) < max_records:
+            try:
+                batch.append(self.records.popleft())
+            except IndexError:
+                break
+        return batch
+
+
+DEFAULT_LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+DEFAULT_LOG_FILE_BACKUP_COUNT: int = 3
+
+# Queued by BufferedLogWriter.close to tell the writer thread to write out everything before it and exit
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """
+    Appends text to a log file from a background thread, so callers never wait for disk writes or flushes.
+    Queued text is written out once flush_size_bytes have built up, or at least every flush_interval_seconds, and everything
+    queued is written when close() is called (registered with atexit by the GUI, so it also happens on exit after a crash).
+    When the file grows past max_bytes it is rotated to file.1, file.2 ... keeping backup_count old files.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_bytes: int = DEFAULT_LOG_FILE_MAX_BYTES,
+        backup_count: int = DEFAULT_LOG_FILE_BACKUP_COUNT,
+        flush_interval_seconds: float = 1.0,
+        flush_size_bytes: int = 64 * 1024,
+        max_queued_messages: int = 10000,
+    ) -> None:
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_size_bytes = flush_size_bytes
+
+        # Bounded, so a stalled disk slows down logging threads rather than growing memory without limit
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queued_messages)
+        self.file = self.open_file()
+        self.closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def open_file(self) -> Optional[TextIO]:
+        try:
+            return open(self.file_path, "a", encoding="utf-8")
+        except Exception as e:
+            print(f"Failed to open log file {self.file_path}: {e}", file=sys.__stderr__)
+            return None
+
+    def write(self, message: str) -> None:
+        if message and not self.closed:
+            self.queue.put(message)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until everything written so far is on disk."""
+        if self.closed:
+            return
+        flushed = threading.Event()
+        self.queue.put(flushed)
+        flushed.wait(timeout)
+
+    def rotate(self) -> None:
+        if self.file is None:
+            return
+        self.file.close()
+
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.file_path}.{i}"):
+                os.replace(f"{self.file_path}.{i}", f"{self.file_path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
+
+        self.file = self.open_file()
+
+    def write_buffer(self, buffer: list[str]) -> None:
+        if self.file is None or not buffer:
+            return
+        try:
+            self.file.write("".join(buffer))
+            self.file.flush()
+            if self.max_bytes and self.file.tell() >= self.max_bytes:
+                self.rotate()
+        except Exception as e:
+            print(f"Failed to write to log file {self.file_path}: {e}", file=sys.__stderr__)
+
+    def run(self) -> None:
+        buffer: list[str] = []
+        buffer_size = 0
+        next_flush_at = time.monotonic() + self.flush_interval_seconds
+
+        while True:
+            try:
+                item = self.queue.get(timeout=max(next_flush_at - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                buffer.append(item)
+                buffer_size += len(item)
+
+            if item is None or not isinstance(item, str) or buffer_size >= self.flush_size_bytes or time.monotonic() >= next_flush_at:
+                self.write_buffer(buffer)
+                buffer, buffer_size = [], 0
+                next_flush_at = time.monotonic() + self.flush_interval_seconds
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self.closed:
+                return
+            self.closed = True
+
+        self.queue.put(_STOP)
+        self._thread.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class TeeStream:
+    """
+    Replacement for sys.stdout / sys.stderr which writes to the original stream and also queues the text for the log file.
+    flush() only flushes the original stream: logging handlers flush after every record, and the log file is flushed
+    by its BufferedLogWriter on its own schedule instead.
+    """
+
+    def __init__(self, stream: Optional[TextIO], log_writer: BufferedLogWriter) -> None:
+        self.stream = stream
+        self.log_writer = log_writer
+
+    def write(self, message: str) -> int:
+        if self.stream is not None:
+            self.stream.write(message)
+        self.log_writer.write(message)
+        return len(message)
+
+    def flush(self) -> None:
+        if self.stream is not None:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else, e.g. encoding, isatty or fileno, comes from the original stream
+        return getattr(self.stream, name)
@@ -0,0 +1,210 @@
+import io
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+# Size of each resumable upload request to videos.insert
+UPLOAD_CHUNK_SIZE: int = 5 * 1024 * 1024
+DEFAULT_READ_AHEAD_CHUNKS: int = 2
+# Cap on the chunks buffered ahead over every file open at once, e.g. with several uploads running in parallel
+DEFAULT_READ_AHEAD_MAX_BYTES: int = 64 * 1024 * 1024
+DEFAULT_READ_AHEAD_THREADS: int = 4
+# Whether this platform can advise the kernel how a file will be read, and to drop its cached pages
+FADVISE_SUPPORTED: bool = hasattr(os, "posix_fadvise")
+
+
+class ReadAheadMediaSource:
+    """
+    Opens video files for upload with their next chunks read on background threads while the current chunk is sent, so reading
+    from slow storage (spinning disks, NFS) overlaps with the network rather than adding to it. The chunks buffered ahead over all
+    the files open at once are capped at max_buffer_bytes; once that's reached, chunks are read when they're needed instead.
+    With drop_page_cache, the page cache is told to drop each chunk once the upload has moved past it, and the whole file once it's
+    closed, so uploading terabytes doesn't evict everything else from the cache. Only supported where os.posix_fadvise is.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        read_ahead_chunks: int = DEFAULT_READ_AHEAD_CHUNKS,
+        max_buffer_bytes: int = DEFAULT_READ_AHEAD_MAX_BYTES,
+        max_workers: int = DEFAULT_READ_AHEAD_THREADS,
+        drop_page_cache: bool = False,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.read_ahead_chunks = read_ahead_chunks
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_workers = max_workers
+        self.drop_page_cache = drop_page_cache and FADVISE_SUPPORTED
+
+        self.buffered_bytes = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="read-ahead")
+            return self._executor
+
+    def reserve(self, size: int) -> bool:
+        """Reserve buffer space for a chunk read ahead, returning False if it would take the buffers over max_buffer_bytes."""
+        with self._lock:
+            if self.buffered_bytes + size > self.max_buffer_bytes:
+                return False
+            self.buffered_bytes += size
+            return True
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.buffered_bytes -= size
+
+    def open(self, path: str) -> "ReadAheadFile":
+        return ReadAheadFile(path, self)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        # Outside the lock, as reads still running release their buffer space when they finish
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ReadAheadFile(io.RawIOBase):
+    """
+    Seekable, read-only file for MediaIoBaseUpload which reads in whole chunks, starting to read the next read_ahead_chunks
+    chunks in the background whenever the upload moves on to a new one. A seek elsewhere, e.g. to resume an upload from the
+    offset the server reports, just discards what was read ahead.
+    """
+
+    def __init__(self, path: str, source: ReadAheadMediaSource) -> None:
+        super().__init__()
+        self.name = path
+        self.source = source
+
+        self._file = open(path, "rb", buffering=0)
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._position = 0
+        # The chunk being read, and futures for the chunks read ahead, each holding a reservation of the source's buffer space
+        self._current_index = -1
+        self._current_chunk = memoryview(b"")
+        self._read_ahead: dict[int, Future] = {}
+        # Chunks are read with a seek then a read, which mustn't interleave between the upload and the background threads
+        self._file_lock = threading.Lock()
+
+        # Tells the kernel to read ahead further too, where it's supported
+        if FADVISE_SUPPORTED:
+            os.posix_fadvise(self._file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return self._position
+
+    def read_chunk(self, index: int) -> bytes:
+        chunks = []
+        with self._file_lock:
+            self._file.seek(index * self.source.chunk_size)
+            remaining = self.source.chunk_size
+            while remaining > 0:
+                data = self._file.read(remaining)
+                if not data:
+                    break
+                chunks.append(data)
+                remaining -= len(data)
+        return b"".join(chunks)
+
+    def drop_cached_pages(self, offset: int, length: int) -> None:
+        """Drop the page cache's copy of this range of the file (to the end if length is 0), which the upload has finished with."""
+        # The file is only ever read, so it has no dirty pages which would be left behind
+        os.posix_fadvise(self._file.fileno(), offset, length, os.POSIX_FADV_DONTNEED)
+
+    def discard_read_ahead(self, index: int) -> None:
+        future = self._read_ahead.pop(index)
+        if future.cancel():
+            self.source.release(self.source.chunk_size)
+        else:
+            # Already being read, so its buffer is only free once the read has finished
+            future.add_done_callback(lambda _: self.source.release(self.source.chunk_size))
+
+    def chunk(self, index: int) -> memoryview:
+        if index == self._current_index:
+            return self._current_chunk
+        if self.source.drop_page_cache and 0 <= self._current_index < index:
+            # The upload only moves on once the server has the chunks behind, a retry which goes back reads them from disk again
+            self.drop_cached_pages(self._current_index * self.source.chunk_size, (index - self._current_index) * self.source.chunk_size)
+
+        future = self._read_ahead.pop(index, None)
+        for stale_index in [i for i in self._read_ahead if i < index or i > index + self.source.read_ahead_chunks]:
+            self.discard_read_ahead(stale_index)
+
+        last_index = (self._size - 1) // self.source.chunk_size
+        for ahead_index in range(index + 1, min(index + self.source.read_ahead_chunks, last_index) + 1):
+            if ahead_index in self._read_ahead:
+                continue
+            if not self.source.reserve(self.source.chunk_size):
+                break
+            self._read_ahead[ahead_index] = self.source.get_executor().submit(self.read_chunk, ahead_index)
+
+        data = None
+        if future is not None:
+            try:
+                data = future.result()
+            except CancelledError:
+                # The source was closed while this file was still open, so read the chunk here instead
+                pass
+            finally:
+                # Only now is the chunk in hand rather than in the buffer it reserved
+                self.source.release(self.source.chunk_size)
+        if data is None:
+            data = self.read_chunk(index)
+        self._current_index, self._current_chunk = index, memoryview(data)
+        return self._current_chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if size is None or size < 0:
+            size = max(self._size - self._position, 0)
+
+        parts = []
+        while size > 0 and self._position < self._size:
+            index, start = divmod(self._position, self.source.chunk_size)
+            part = self.chunk(index)[start : start + size]
+            if not part:
+                break
+            parts.append(part)
+            self._position += len(part)
+            size -= len(part)
+        return b"".join(parts)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for index in list(self._read_ahead):
+            self.discard_read_ahead(index)
+        self._current_chunk = memoryview(b"")
+        with self._file_lock:
+            if self.source.drop_page_cache:
+                self.drop_cached_pages(0, 0)
+            self._file.close()
+        super().close()
@@ -0,0 +1,328 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, ContextManager, Iterator, Optional
+
+from youtube_bulk_upload.quota import API_QUOTA_COSTS
+
+METRICS_NAMESPACE: str = "youtube_bulk_upload"
+OPENMETRICS_CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# From quick metadata calls up to multi-minute uploads of large videos
+DEFAULT_DURATION_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+VIDEO_OUTCOME_UPLOADED: str = "uploaded"
+VIDEO_OUTCOME_FAILED: str = "failed"
+VIDEO_OUTCOME_SKIPPED: str = "skipped"
+
+LabelValues = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: LabelValues, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = labels + (extra,) if extra is not None else labels
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric(ABC):
+    metric_type = "unknown"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def render_header(self) -> list[str]:
+        return [f"# TYPE {self.name} {self.metric_type}", f"# HELP {self.name} {self.help_text}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Return this metric's lines in the OpenMetrics text format, starting with its TYPE and HELP lines."""
+
+
+class CounterMetric(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self.values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self.values.items())
+        return self.render_header() + [f"{self.name}_total{format_labels(labels)} {format_value(value)}" for labels, value in values]
+
+
+class GaugeMetric(Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self.current = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.current += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            current = self.current
+        return self.render_header() + [f"{self.name} {format_value(current)}"]
+
+
+class HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "total", "maximum")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+
+class HistogramMetric(Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_DURATION_BUCKETS) -> None:
+        super().__init__(name, help_text)
+        self.buckets = buckets
+        self.series: dict[LabelValues, HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = HistogramSeries(len(self.buckets))
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    series.bucket_counts[index] += 1
+                    break
+            series.count += 1
+            series.total += value
+            series.maximum = max(series.maximum, value)
+
+    def snapshot(self) -> list[tuple[LabelValues, int, float, float]]:
+        """(labels, count, sum, max) for every series, sorted by labels."""
+        with self._lock:
+            return [(labels, series.count, series.total, series.maximum) for labels, series in sorted(self.series.items())]
+
+    def render(self) -> list[str]:
+        lines = self.render_header()
+        with self._lock:
+            series_items = [
+                (labels, list(series.bucket_counts), series.count, series.total) for labels, series in sorted(self.series.items())
+            ]
+        for labels, bucket_counts, count, total in series_items:
+            # Buckets are stored per bucket, but exported cumulatively
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{format_labels(labels, ('le', repr(float(upper_bound))))} {cumulative}")
+            lines.append(f"{self.name}_bucket{format_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(total)}")
+        return lines
+
+
+class UploadMetrics:
+    """
+    Timings and counters for a run: how long each stage of processing a video takes (title, description, thumbnail lookup,
+    duplicate search, upload chunks, thumbnail set) and each API call, plus bytes uploaded, retries, quota units used
+    and uploads in flight. Exported in the OpenMetrics text format, to a file or a local /metrics endpoint, and as a
+    summary table at the end of a run. Safe to update from several upload threads at once.
+    """
+
+    enabled = True
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE, buckets: tuple[float, ...] = DEFAULT_DURATION_BUCKETS) -> None:
+        self.stage_seconds = HistogramMetric(
+            f"{namespace}_stage_duration_seconds", "Time spent in each stage of processing a video.", buckets
+        )
+        self.api_call_seconds = HistogramMetric(f"{namespace}_api_call_duration_seconds", "Time taken by each YouTube API call.", buckets)
+        self.api_calls = CounterMetric(f"{namespace}_api_calls", "YouTube API calls made, by method and outcome.")
+        self.quota_units = CounterMetric(f"{namespace}_quota_units", "Estimated YouTube API quota units used, by method.")
+        self.uploaded_bytes = CounterMetric(f"{namespace}_uploaded_bytes", "Video bytes sent to YouTube.")
+        self.retries = CounterMetric(f"{namespace}_retries", "Failed uploads retried within the run.")
+        self.videos = CounterMetric(f"{namespace}_videos", "Video files processed, by outcome.")
+        self.uploads_in_flight = GaugeMetric(f"{namespace}_uploads_in_flight", "Video uploads currently in progress.")
+        self.all_metrics: list[Metric] = [
+            self.stage_seconds,
+            self.api_call_seconds,
+            self.api_calls,
+            self.quota_units,
+            self.uploaded_bytes,
+            self.retries,
+            self.videos,
+            self.uploads_in_flight,
+        ]
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds.observe(time.perf_counter() - start, stage=stage)
+
+    @contextmanager
+    def api_call(self, api_method: str) -> Iterator[None]:
+        """Time an API call, and count it with its outcome and quota cost (charged even if it fails, as YouTube does)."""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        finally:
+            self.api_call_seconds.observe(time.perf_counter() - start, method=api_method)
+            self.api_calls.inc(method=api_method, outcome=outcome)
+            self.quota_units.inc(API_QUOTA_COSTS.get(api_method, 0), method=api_method)
+
+    @contextmanager
+    def upload_in_flight(self) -> Iterator[None]:
+        self.uploads_in_flight.inc()
+        try:
+            yield
+        finally:
+            self.uploads_in_flight.dec()
+
+    def record_uploaded_bytes(self, size: int) -> None:
+        if size > 0:
+            self.uploaded_bytes.inc(size)
+
+    def record_retry(self) -> None:
+        self.retries.inc()
+
+    def record_video(self, outcome: str) -> None:
+        self.videos.inc(outcome=outcome)
+
+    def render_openmetrics(self) -> str:
+        lines = []
+        for metric in self.all_metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics_file(self, metrics_file: str) -> None:
+        # Written to a temporary file and renamed, so a scraper (e.g. node_exporter's textfile collector) never reads half a file
+        temp_file = f"{metrics_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.write(self.render_openmetrics())
+        os.replace(temp_file, metrics_file)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> "MetricsServer":
+        return MetricsServer(self, host, port).start()
+
+    def summary_lines(self) -> list[str]:
+        """End of run summary: count, total and mean time of each stage and API call, then the counters."""
+        lines = [f"{'stage / API call':<28} {'count':>7} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        for prefix, histogram, label_name in (("", self.stage_seconds, "stage"), ("api ", self.api_call_seconds, "method")):
+            for labels, count, total, maximum in histogram.snapshot():
+                name = prefix + dict(labels)[label_name]
+                lines.append(f"{name:<28} {count:>7} {total:>10.3f} {total / count * 1000:>10.1f} {maximum * 1000:>10.1f}")
+
+        videos = ", ".join(f"{dict(labels)['outcome']}={format_value(value)}" for labels, value in sorted(self.videos.values.items()))
+        lines.append(f"videos: {videos or 'none'}")
+        lines.append(
+            f"uploaded bytes: {format_value(self.uploaded_bytes.value())}, retries: {format_value(self.retries.value())}, "
+            f"quota units: {format_value(sum(self.quota_units.values.values()))}"
+        )
+        return lines
+
+
+class NullUploadMetrics:
+    """Stands in for UploadMetrics when metrics are disabled, so instrumented code costs next to nothing."""
+
+    enabled = False
+
+    _null_context: ContextManager[None] = nullcontext()
+
+    def stage(self, stage: str) -> ContextManager[None]:
+        return self._null_context
+
+    def api_call(self, api_method: str) -> ContextManager[None]:
+        return self._null_context
+
+    def upload_in_flight(self) -> ContextManager[None]:
+        return self._null_context
+
+    def record_uploaded_bytes(self, size: int) -> None:
+        pass
+
+    def record_retry(self) -> None:
+        pass
+
+    def record_video(self, outcome: str) -> None:
+        pass
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    server: "MetricsHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.render_openmetrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, metrics: UploadMetrics, address: tuple[str, int]) -> None:
+        self.metrics = metrics
+        super().__init__(address, MetricsRequestHandler)
+
+
+class MetricsServer:
+    """Serves the current metrics at http://host:port/metrics from a background thread, for Prometheus to scrape during a run."""
+
+    def __init__(self, metrics: UploadMetrics, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.httpd = MetricsHTTPServer(metrics, (host, port))
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,118 @@
+import re
+import json
+from typing import Any, Optional
+
+from youtube_bulk_upload.token_store import default_token_file
+
+ROUTING_ROUND_ROBIN: str = "round_robin"
+ROUTING_RULE: str = "rule"
+PROFILE_ROUTING_STRATEGIES: list[str] = [ROUTING_ROUND_ROBIN, ROUTING_RULE]
+
+
+class CredentialProfile:
+    """
+    One set of YouTube credentials (OAuth client secrets + token file) with its own daily upload budget.
+    Each API project has its own quota pool, so spreading uploads over several profiles multiplies the daily throughput.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client_secrets_file: str,
+        token_file: Optional[str] = None,
+        upload_batch_limit: int = 100,
+        match: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.client_secrets_file = client_secrets_file
+        # Optional explicit token file, see resolve_token_file for where the token is stored without one
+        self.token_file = token_file
+        self.upload_batch_limit = upload_batch_limit
+        # Optional regex, when routing by rule only files whose path matches this are uploaded with this profile
+        self.match = match
+        self.match_pattern = re.compile(match) if match else None
+
+        self.youtube: Any = None
+        self.uploaded_count = 0
+        self.quota_exceeded = False
+
+    def is_available(self) -> bool:
+        return not self.quota_exceeded and self.uploaded_count < self.upload_batch_limit
+
+    def matches(self, video_file: str) -> bool:
+        return self.match_pattern is not None and self.match_pattern.search(video_file) is not None
+
+    def resolve_token_file(self) -> str:
+        """
+        Path of this profile's OAuth token file. Without an explicit token file, the token is stored under the profile's name,
+        so two profiles never overwrite each other's token, even when they share a client secrets file.
+        """
+        return self.token_file or default_token_file(self.client_secrets_file, self.name)
+
+    def reset_budget(self) -> None:
+        self.uploaded_count = 0
+        self.quota_exceeded = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CredentialProfile":
+        return cls(
+            name=data["name"],
+            client_secrets_file=data["client_secrets_file"],
+            token_file=data.get("token_file"),
+            upload_batch_limit=data.get("upload_batch_limit", 100),
+            match=data.get("match"),
+        )
+
+
+def load_credential_profiles(profiles_file: str) -> list[CredentialProfile]:
+    """Load credential profiles from a JSON file containing a list of objects with keys matching CredentialProfile's parameters."""
+    with open(profiles_file, "r", encoding="utf-8") as f:
+        profiles_data = json.load(f)
+
+    profiles = [CredentialProfile.from_dict(profile_data) for profile_data in profiles_data]
+    names = [profile.name for profile in profiles]
+    if not profiles:
+        raise Exception(f"No credential profiles found in file: {profiles_file}")
+    if len(set(names)) != len(names):
+        raise Exception(f"Credential profile names must be unique, found: {names}")
+
+    return profiles
+
+
+class CredentialProfileRouter:
+    """
+    Chooses which credential profile each video file is uploaded with.
+
+    round_robin: spread files evenly over every profile with budget remaining.
+    rule: files matching a profile's "match" regex always go to that profile (and wait for a later run if it has no budget left),
+          files matching no rule are spread round-robin over the profiles without a "match" regex.
+    """
+
+    def __init__(self, profiles: list[CredentialProfile], routing: str = ROUTING_ROUND_ROBIN) -> None:
+        if routing not in PROFILE_ROUTING_STRATEGIES:
+            raise Exception(f'"{routing}" is not a valid profile routing strategy. It must be one of: {PROFILE_ROUTING_STRATEGIES}')
+
+        self.profiles = profiles
+        self.routing = routing
+        self._next_index = 0
+
+    def next_round_robin(self, candidates: list[CredentialProfile]) -> Optional[CredentialProfile]:
+        for _ in range(len(self.profiles)):
+            profile = self.profiles[self._next_index % len(self.profiles)]
+            self._next_index += 1
+            if profile in candidates and profile.is_available():
+                return profile
+        return None
+
+    def select(self, video_file: str) -> Optional[CredentialProfile]:
+        if self.routing == ROUTING_RULE:
+            for profile in self.profiles:
+                if profile.matches(video_file):
+                    return profile if profile.is_available() else None
+
+            return self.next_round_robin([profile for profile in self.profiles if profile.match_pattern is None])
+
+        return self.next_round_robin(self.profiles)
+
+    def any_available(self) -> bool:
+        return any(profile.is_available() for profile in self.profiles)
@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+import pstats
+import marshal
+import cProfile
+import threading
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Optional
+
+from youtube_bulk_upload.progress import PROGRESS_FINISHED_STATES, PROGRESS_STARTED, ProgressEvent
+
+DEFAULT_SUMMARY_LINES: int = 40
+DEFAULT_MEMORY_TOP_LINES: int = 10
+DEFAULT_MEMORY_TRACEBACK_FRAMES: int = 1
+
+
+class RunProfiler:
+    """
+    Profiles a whole run to show whether time goes on CPU (fuzzy matching, regexes), disk reads or waiting on the network.
+    The thread which starts it and every thread started with a target while it's running get their own cProfile profiler,
+    saved as a combined <run_name>.prof plus one .prof per thread, with a text summary of the slowest functions (loadable
+    with pstats or snakeviz). A profiler can only be turned off by its own thread, so each thread turns its own off when its
+    target returns; threads still running when profiling stops are left out. On Python 3.12+ cProfile can only run one
+    profiler at a time, which then sees every thread, so only the combined stats are written.
+    With trace_memory, tracemalloc snapshots are also taken at stage boundaries (the start and end of the run and of each
+    video's upload), each compared against the first in <run_name>-memory.txt.
+    """
+
+    def __init__(
+        self,
+        output_directory: str,
+        logger: Any,
+        trace_memory: bool = False,
+        run_name: Optional[str] = None,
+        summary_lines: int = DEFAULT_SUMMARY_LINES,
+        memory_top_lines: int = DEFAULT_MEMORY_TOP_LINES,
+    ) -> None:
+        self.output_directory = output_directory
+        self.logger = logger
+        self.trace_memory = trace_memory
+        self.run_name = run_name or time.strftime("youtube_bulk_upload_profile_%Y%m%d-%H%M%S")
+        self.summary_lines = summary_lines
+        self.memory_top_lines = memory_top_lines
+
+        self.main_profile: Optional[cProfile.Profile] = None
+        # Profiles of threads whose target has returned, and of those still running
+        self.thread_profiles: dict[str, cProfile.Profile] = {}
+        self.running_thread_profiles: dict[str, cProfile.Profile] = {}
+        self.stopped = False
+        self.artifacts: list[str] = []
+        self._baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def artifact_path(self, suffix: str) -> str:
+        return os.path.join(self.output_directory, f"{self.run_name}{suffix}")
+
+    def start(self) -> "RunProfiler":
+        os.makedirs(self.output_directory, exist_ok=True)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(DEFAULT_MEMORY_TRACEBACK_FRAMES)
+                self._started_tracemalloc = True
+            with open(self.artifact_path("-memory.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Memory snapshots for {self.run_name}, allocation growth since the first snapshot\n")
+            self.artifacts.append(self.artifact_path("-memory.txt"))
+            self.memory_snapshot("run start")
+
+        threading.setprofile(self.start_thread_profile)
+        self.main_profile = cProfile.Profile()
+        self.main_profile.enable()
+        return self
+
+    def start_thread_profile(self, frame: Any, event: str, arg: Any) -> None:
+        """Installed with threading.setprofile, so it runs on the first call in each new thread and wraps its target to be profiled."""
+        sys.setprofile(None)
+        thread = threading.current_thread()
+        # Thread.run hasn't called the target yet; threads without one (subclasses overriding run) aren't profiled on their own
+        if getattr(thread, "_target", None) is None:
+            return
+        thread._target = partial(self.run_profiled_target, f"{thread.name}-{thread.ident}", thread._target)
+
+    def run_profiled_target(self, thread_name: str, target: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: the main profiler is already seeing this thread
+            return target(*args, **kwargs)
+
+        with self._lock:
+            self.running_thread_profiles[thread_name] = profile
+        try:
+            return target(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                del self.running_thread_profiles[thread_name]
+                # Once stop has written out the stats, a profile finishing late has nowhere to go
+                if not self.stopped:
+                    self.thread_profiles[thread_name] = profile
+
+    def on_progress_event(self, event: ProgressEvent) -> None:
+        if event.state == PROGRESS_STARTED or event.state in PROGRESS_FINISHED_STATES:
+            self.memory_snapshot(f"{event.state} {os.path.basename(event.job_id)}")
+
+    def memory_snapshot(self, label: str) -> None:
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        lines = [f"\n[{time.strftime('%H:%M:%S')}] {label}: current {current_bytes / 1024:.1f} KiB, peak {peak_bytes / 1024:.1f} KiB"]
+        with self._lock:
+            if self._baseline_snapshot is None:
+                self._baseline_snapshot = snapshot
+            else:
+                lines.extend(f"  {stat}" for stat in snapshot.compare_to(self._baseline_snapshot, "lineno")[: self.memory_top_lines])
+            with open(self.artifact_path("-memory.txt"), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def save_profile(profile: cProfile.Profile, stats_file: str) -> None:
+        # Same format as Profile.dump_stats, which would disable the profiler on the calling thread rather than the one it belongs to
+        profile.snapshot_stats()
+        with open(stats_file, "wb") as f:
+            marshal.dump(profile.stats, f)
+
+    def stop(self) -> list[str]:
+        """Stop profiling and write out every artifact, returning their paths."""
+        threading.setprofile(None)
+        if self.main_profile is None:
+            return self.artifacts
+        self.main_profile.disable()
+
+        with self._lock:
+            self.stopped = True
+            thread_profiles, self.thread_profiles = self.thread_profiles, {}
+            still_running = sorted(self.running_thread_profiles)
+        if still_running:
+            self.logger.warning("Threads still running aren't included in the profile: %s", ", ".join(still_running))
+
+        thread_stats_files = {}
+        for thread_name, profile in sorted(thread_profiles.items()):
+            thread_stats_files[thread_name] = self.artifact_path(f"-thread-{thread_name}.prof")
+            self.save_profile(profile, thread_stats_files[thread_name])
+
+        combined_stats_file = self.artifact_path(".prof")
+        combined_stats = pstats.Stats(self.main_profile)
+        for stats_file in thread_stats_files.values():
+            combined_stats.add(stats_file)
+        combined_stats.dump_stats(combined_stats_file)
+
+        summary_file = self.artifact_path("-summary.txt")
+        with open(summary_file, "w", encoding="utf-8") as f:
+            f.write("All threads, by cumulative time:\n")
+            pstats.Stats(combined_stats_file, stream=f).sort_stats("cumulative").print_stats(self.summary_lines)
+            f.write("All threads, by own time:\n")
+            pstats.Stats(combined_stats_file, stream=f).sort_stats("tottime").print_stats(self.summary_lines)
+            for thread_name, stats_file in thread_stats_files.items():
+                f.write(f"Thread {thread_name}, by cumulative time:\n")
+                pstats.Stats(stats_file, stream=f).sort_stats("cumulative").print_stats(self.summary_lines)
+
+        self.artifacts = [combined_stats_file, summary_file, *thread_stats_files.values(), *self.artifacts]
+
+        if self.trace_memory:
+            self.memory_snapshot("run end")
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        self.main_profile = None
+        return self.artifacts
+
+    def __enter__(self) -> "RunProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        artifacts = self.stop()
+        self.logger.info("Wrote profiling output: %s", ", ".join(artifacts))
@@ -0,0 +1,338 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+PROGRESS_STARTED: str = "started"
+PROGRESS_UPLOADING: str = "uploading"
+PROGRESS_COMPLETED: str = "completed"
+PROGRESS_FAILED: str = "failed"
+PROGRESS_SKIPPED: str = "skipped"
+PROGRESS_FINISHED_STATES: tuple[str, ...] = (PROGRESS_COMPLETED, PROGRESS_FAILED, PROGRESS_SKIPPED)
+
+DEFAULT_MIN_INTERVAL_SECONDS: float = 0.5
+# Weight of the newest rate sample in the smoothed rate; lower is smoother but slower to follow real changes
+DEFAULT_RATE_SMOOTHING: float = 0.3
+
+
+def format_bytes(num_bytes: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressEvent:
+    """Snapshot of one upload job's progress, and of the whole batch it belongs to, at the time of an update."""
+
+    def __init__(
+        self,
+        job_id: str,
+        state: str,
+        bytes_sent: int,
+        total_bytes: int,
+        rate_bytes_per_second: float,
+        smoothed_rate_bytes_per_second: float,
+        batch_bytes_sent: int,
+        batch_total_bytes: int,
+        batch_rate_bytes_per_second: float,
+        jobs_finished: int,
+        jobs_total: int,
+        timestamp: float,
+        youtube_id: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.job_id = job_id
+        self.state = state
+        self.bytes_sent = bytes_sent
+        self.total_bytes = total_bytes
+        self.rate_bytes_per_second = rate_bytes_per_second
+        self.smoothed_rate_bytes_per_second = smoothed_rate_bytes_per_second
+        self.batch_bytes_sent = batch_bytes_sent
+        self.batch_total_bytes = batch_total_bytes
+        self.batch_rate_bytes_per_second = batch_rate_bytes_per_second
+        self.jobs_finished = jobs_finished
+        self.jobs_total = jobs_total
+        self.timestamp = timestamp
+        self.youtube_id = youtube_id
+        self.error = error
+
+    @property
+    def fraction(self) -> float:
+        if self.state in PROGRESS_FINISHED_STATES or not self.total_bytes:
+            return 1.0 if self.state == PROGRESS_COMPLETED else 0.0
+        return min(self.bytes_sent / self.total_bytes, 1.0)
+
+    @property
+    def batch_fraction(self) -> float:
+        return min(self.batch_bytes_sent / self.batch_total_bytes, 1.0) if self.batch_total_bytes else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if self.smoothed_rate_bytes_per_second <= 0:
+            return None
+        return max(self.total_bytes - self.bytes_sent, 0) / self.smoothed_rate_bytes_per_second
+
+    @property
+    def batch_eta_seconds(self) -> Optional[float]:
+        if self.batch_rate_bytes_per_second <= 0:
+            return None
+        return max(self.batch_total_bytes - self.batch_bytes_sent, 0) / self.batch_rate_bytes_per_second
+
+    def describe(self) -> str:
+        job_name = os.path.basename(self.job_id)
+        if self.error:
+            description = f"{job_name}: {self.state} ({self.error})"
+        elif self.state != PROGRESS_UPLOADING:
+            description = f"{job_name}: {self.state}"
+        else:
+            description = (
+                f"{job_name}: {self.fraction * 100:.1f}% of {format_bytes(self.total_bytes)} "
+                f"at {format_bytes(self.smoothed_rate_bytes_per_second)}/s, ETA {format_duration(self.eta_seconds)}"
+            )
+        return (
+            f"{description} | batch: {self.jobs_finished}/{self.jobs_total} files, {self.batch_fraction * 100:.1f}%, "
+            f"ETA {format_duration(self.batch_eta_seconds)}"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict of the event including its derived values, e.g. to serialize as JSON for a monitoring system."""
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "bytes_sent": self.bytes_sent,
+            "total_bytes": self.total_bytes,
+            "fraction": self.fraction,
+            "rate_bytes_per_second": self.rate_bytes_per_second,
+            "smoothed_rate_bytes_per_second": self.smoothed_rate_bytes_per_second,
+            "eta_seconds": self.eta_seconds,
+            "batch_bytes_sent": self.batch_bytes_sent,
+            "batch_total_bytes": self.batch_total_bytes,
+            "batch_fraction": self.batch_fraction,
+            "batch_rate_bytes_per_second": self.batch_rate_bytes_per_second,
+            "batch_eta_seconds": self.batch_eta_seconds,
+            "jobs_finished": self.jobs_finished,
+            "jobs_total": self.jobs_total,
+            "timestamp": self.timestamp,
+            "youtube_id": self.youtube_id,
+            "error": self.error,
+        }
+
+
+class JobProgress:
+    __slots__ = ("total_bytes", "bytes_sent", "rate", "smoothed_rate", "last_update_at")
+
+    def __init__(self, total_bytes: int, now: float) -> None:
+        self.total_bytes = total_bytes
+        self.bytes_sent = 0
+        self.rate = 0.0
+        self.smoothed_rate = 0.0
+        self.last_update_at = now
+
+
+class ProgressSubscriber:
+    def __init__(self, callback: Callable[[ProgressEvent], Any], min_interval_seconds: float) -> None:
+        self.callback = callback
+        self.min_interval_seconds = min_interval_seconds
+        self.last_delivered_at: dict[str, float] = {}
+
+
+class ProgressTracker:
+    """
+    Tracks bytes sent by every upload job in a batch, and publishes ProgressEvents to subscribers.
+    Jobs are keyed by job ID (the video file path), so any number of jobs can be in progress at once from different threads.
+    Each subscriber gets every started, completed, failed and skipped event, but at most one uploading event per job every
+    min_interval_seconds, so a slow subscriber (e.g. a GUI or a monitoring push) isn't called for every chunk.
+    """
+
+    def __init__(
+        self, logger: Any, min_interval_seconds: float = DEFAULT_MIN_INTERVAL_SECONDS, rate_smoothing: float = DEFAULT_RATE_SMOOTHING
+    ) -> None:
+        self.logger = logger
+        self.min_interval_seconds = min_interval_seconds
+        self.rate_smoothing = rate_smoothing
+
+        self.subscribers: list[ProgressSubscriber] = []
+        self.batch_listeners: list[Callable[[dict[str, int]], Any]] = []
+
+        # Byte totals are kept up to date as jobs change, so building an event doesn't depend on the batch size
+        self.batch_job_bytes: dict[str, int] = {}
+        self.batch_total_bytes = 0
+        self.active_jobs: dict[str, JobProgress] = {}
+        self.finished_jobs: dict[str, int] = {}
+        self.finished_bytes = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ProgressEvent], Any], min_interval_seconds: Optional[float] = None) -> None:
+        if min_interval_seconds is None:
+            min_interval_seconds = self.min_interval_seconds
+        with self._lock:
+            self.subscribers.append(ProgressSubscriber(callback, min_interval_seconds))
+
+    def unsubscribe(self, callback: Callable[[ProgressEvent], Any]) -> None:
+        with self._lock:
+            self.subscribers = [subscriber for subscriber in self.subscribers if subscriber.callback != callback]
+
+    def add_batch_listener(self, callback: Callable[[dict[str, int]], Any]) -> None:
+        """Call callback with {job ID: total bytes} for every file in each new batch, before any of its jobs start."""
+        with self._lock:
+            self.batch_listeners.append(callback)
+
+    @staticmethod
+    def file_size(video_file: str) -> int:
+        try:
+            return os.path.getsize(video_file)
+        except OSError:
+            return 0
+
+    def start_batch(self, video_files: Iterable[str]) -> None:
+        """Reset the batch totals to these files, so batch progress and ETA cover files which haven't started yet."""
+        batch_job_bytes = {video_file: self.file_size(video_file) for video_file in video_files}
+        with self._lock:
+            self.batch_job_bytes = batch_job_bytes
+            self.batch_total_bytes = sum(batch_job_bytes.values())
+            self.active_jobs = {}
+            self.finished_jobs = {}
+            self.finished_bytes = 0
+            batch_listeners = list(self.batch_listeners)
+
+        for batch_listener in batch_listeners:
+            try:
+                batch_listener(dict(batch_job_bytes))
+            except Exception as e:
+                self.logger.warning(f"Progress batch listener {batch_listener} failed: {e}")
+
+    def set_job_bytes(self, job_id: str, total_bytes: int) -> None:
+        self.batch_total_bytes += total_bytes - self.batch_job_bytes.get(job_id, 0)
+        self.batch_job_bytes[job_id] = total_bytes
+
+    def start_job(self, job_id: str, total_bytes: Optional[int] = None, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        if total_bytes is None:
+            total_bytes = self.file_size(job_id)
+
+        with self._lock:
+            # A retried job counts towards the batch again from zero
+            if job_id in self.finished_jobs:
+                self.finished_bytes -= self.finished_jobs.pop(job_id)
+            self.set_job_bytes(job_id, total_bytes)
+            job = self.active_jobs[job_id] = JobProgress(total_bytes, now)
+            event = self.snapshot(job_id, PROGRESS_STARTED, job, now)
+        self.publish(event)
+
+    def update_job(self, job_id: str, bytes_sent: int, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            job = self.active_jobs.get(job_id)
+            if job is None:
+                return
+
+            elapsed = now - job.last_update_at
+            if elapsed > 0:
+                job.rate = (bytes_sent - job.bytes_sent) / elapsed
+                if job.smoothed_rate:
+                    job.smoothed_rate = self.rate_smoothing * job.rate + (1 - self.rate_smoothing) * job.smoothed_rate
+                else:
+                    job.smoothed_rate = job.rate
+                job.last_update_at = now
+            job.bytes_sent = bytes_sent
+            event = self.snapshot(job_id, PROGRESS_UPLOADING, job, now)
+        self.publish(event)
+
+    def finish_job(
+        self,
+        job_id: str,
+        succeeded: bool = True,
+        youtube_id: Optional[str] = None,
+        error: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Mark a job completed or failed. A job which already finished isn't reported again, so callers at each level can all call this."""
+        now = time.time() if now is None else now
+        with self._lock:
+            job = self.active_jobs.pop(job_id, None)
+            if job is None:
+                if job_id in self.finished_jobs:
+                    return
+                # Failed before its upload started, e.g. while preparing its title or thumbnail
+                job = JobProgress(self.batch_job_bytes.get(job_id, 0), now)
+                self.set_job_bytes(job_id, job.total_bytes)
+
+            event = self.finish_locked(job_id, job, PROGRESS_COMPLETED if succeeded else PROGRESS_FAILED, now, youtube_id, error)
+        self.publish(event)
+
+    def skip_job(self, job_id: str, now: Optional[float] = None) -> None:
+        """Mark a batch job which was never started (e.g. a duplicate) as skipped, so it counts as finished for batch progress."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if job_id not in self.batch_job_bytes or job_id in self.active_jobs or job_id in self.finished_jobs:
+                return
+            event = self.finish_locked(job_id, JobProgress(self.batch_job_bytes[job_id], now), PROGRESS_SKIPPED, now)
+        self.publish(event)
+
+    def finish_locked(
+        self, job_id: str, job: JobProgress, state: str, now: float, youtube_id: Optional[str] = None, error: Optional[str] = None
+    ) -> ProgressEvent:
+        # Whether it was uploaded or not, all of the job's bytes are done as far as the batch is concerned
+        self.finished_jobs[job_id] = job.total_bytes
+        self.finished_bytes += job.total_bytes
+        job.rate = job.smoothed_rate = 0.0
+        return self.snapshot(job_id, state, job, now, youtube_id, error)
+
+    def snapshot(
+        self, job_id: str, state: str, job: JobProgress, now: float, youtube_id: Optional[str] = None, error: Optional[str] = None
+    ) -> ProgressEvent:
+        # Concurrent jobs share the batch, so the batch rate is the sum of their rates
+        active_jobs = self.active_jobs.values()
+        return ProgressEvent(
+            job_id=job_id,
+            state=state,
+            bytes_sent=job.bytes_sent,
+            total_bytes=job.total_bytes,
+            rate_bytes_per_second=job.rate,
+            smoothed_rate_bytes_per_second=job.smoothed_rate,
+            batch_bytes_sent=self.finished_bytes + sum(active_job.bytes_sent for active_job in active_jobs),
+            batch_total_bytes=self.batch_total_bytes,
+            batch_rate_bytes_per_second=sum(active_job.smoothed_rate for active_job in active_jobs),
+            jobs_finished=len(self.finished_jobs),
+            jobs_total=len(self.batch_job_bytes),
+            timestamp=now,
+            youtube_id=youtube_id,
+            error=error,
+        )
+
+    def publish(self, event: ProgressEvent) -> None:
+        with self._lock:
+            recipients = []
+            for subscriber in self.subscribers:
+                last_delivered_at = subscriber.last_delivered_at.get(event.job_id)
+                if (
+                    event.state == PROGRESS_UPLOADING
+                    and last_delivered_at is not None
+                    and event.timestamp - last_delivered_at < subscriber.min_interval_seconds
+                ):
+                    continue
+                if event.state in PROGRESS_FINISHED_STATES:
+                    subscriber.last_delivered_at.pop(event.job_id, None)
+                else:
+                    subscriber.last_delivered_at[event.job_id] = event.timestamp
+                recipients.append(subscriber)
+
+        # Called without the lock held, so subscribers can take their time or call back into the tracker
+        for subscriber in recipients:
+            try:
+                subscriber.callback(event)
+            except Exception as e:
+                self.logger.warning(f"Progress subscriber {subscriber.callback} failed: {e}")
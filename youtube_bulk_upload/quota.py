@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+# The YouTube Data API daily quota resets at midnight Pacific Time
+QUOTA_RESET_TIMEZONE_NAME: str = "America/Los_Angeles"
+
+
+def get_quota_reset_timezone() -> Any:
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(QUOTA_RESET_TIMEZONE_NAME)
+    except Exception:
+        # zoneinfo has no tz database on some platforms (e.g. Windows without the tzdata package), fall back to PST
+        return timezone(timedelta(hours=-8), "PST")
+
+
+def next_quota_reset(now: Optional[datetime] = None) -> datetime:
+    """Return the next time the daily YouTube API quota resets, as a timezone-aware datetime."""
+    reset_timezone = get_quota_reset_timezone()
+    if now is None:
+        now = datetime.now(reset_timezone)
+    else:
+        now = now.astimezone(reset_timezone)
+
+    next_day = (now + timedelta(days=1)).date()
+    return datetime(next_day.year, next_day.month, next_day.day, tzinfo=reset_timezone)
+
+
+def current_quota_day(now: Optional[datetime] = None) -> str:
+    """Return the date (in Pacific Time) of the quota day containing the given time, e.g. "2024-01-31"."""
+    reset_timezone = get_quota_reset_timezone()
+    now = datetime.now(reset_timezone) if now is None else now.astimezone(reset_timezone)
+    return now.date().isoformat()
+
+
+# Quota units the YouTube Data API charges for each method we call
+API_QUOTA_COSTS: dict[str, int] = {
+    "videos.insert": 1600,
+    "thumbnails.set": 50,
+    "search.list": 100,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+}
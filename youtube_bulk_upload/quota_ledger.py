@@ -0,0 +1,171 @@
+import os
+import json
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from youtube_bulk_upload.quota import API_QUOTA_COSTS, current_quota_day, get_quota_reset_timezone, next_quota_reset
+from youtube_bulk_upload.token_store import TokenFileLock
+
+DEFAULT_QUOTA_LEDGER_FILE: str = os.path.join(os.path.expanduser("~"), ".youtube-bulk-upload", "quota_ledger.json")
+# Default daily quota of a Google Cloud project for the YouTube Data API, shared by every OAuth client in the project
+DEFAULT_DAILY_QUOTA: int = 10000
+# Name of the quota pool for calls made without a known OAuth client, e.g. with a pre-built service object
+DEFAULT_QUOTA_POOL: str = "default"
+DEFAULT_LEDGER_RETENTION_DAYS: int = 30
+# A warning is logged once a pool has used this much of its daily quota
+QUOTA_WARNING_FRACTION: float = 0.8
+
+
+def upload_quota_cost(check_for_duplicate_titles: bool, has_thumbnail: bool) -> int:
+    """
+    Quota units one video upload costs: the upload itself, plus the channel lookup and title search if checking for duplicates,
+    plus setting its thumbnail.
+    """
+    cost = API_QUOTA_COSTS["videos.insert"]
+    if check_for_duplicate_titles:
+        cost += API_QUOTA_COSTS["channels.list"] + API_QUOTA_COSTS["search.list"]
+    if has_thumbnail:
+        cost += API_QUOTA_COSTS["thumbnails.set"]
+    return cost
+
+
+def forecast_uploads(remaining_units: list[int], file_costs: list[int]) -> int:
+    """How many of the files, uploaded in order, fit in the remaining units of the quota pools, filling one pool before the next."""
+    budgets = list(remaining_units)
+    pool_index = 0
+    for fitted, cost in enumerate(file_costs):
+        while pool_index < len(budgets) and budgets[pool_index] < cost:
+            pool_index += 1
+        if pool_index == len(budgets):
+            return fitted
+        budgets[pool_index] -= cost
+    return len(file_costs)
+
+
+class QuotaLedger:
+    """
+    Persistent ledger of the YouTube API calls made each quota day (midnight to midnight Pacific Time) and the quota units they
+    cost, per quota pool, i.e. per OAuth client, as the quota belongs to the client's Google Cloud project. The ledger file is
+    locked and re-read for every update, so several processes uploading with the same clients can share it.
+    """
+
+    def __init__(
+        self, ledger_file: str, daily_quota: int = DEFAULT_DAILY_QUOTA, retention_days: int = DEFAULT_LEDGER_RETENTION_DAYS
+    ) -> None:
+        self.ledger_file = ledger_file
+        self.daily_quota = daily_quota
+        self.retention_days = retention_days
+
+        # {quota day: {pool: {"units": int, "calls": {api method: count}, "quota_exceeded": bool}}}
+        self.days: dict[str, dict[str, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.ledger_file):
+            return
+
+        with open(self.ledger_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.days = data.get("days", {})
+
+    def save(self, now: Optional[datetime] = None) -> None:
+        oldest_day = (date.fromisoformat(current_quota_day(now)) - timedelta(days=self.retention_days)).isoformat()
+        self.days = {day: pools for day, pools in self.days.items() if day >= oldest_day}
+        data = {"version": 1, "days": self.days}
+
+        # Write to a temporary file then rename it over the original, so a crash never leaves a half-written ledger
+        os.makedirs(os.path.dirname(os.path.abspath(self.ledger_file)), exist_ok=True)
+        temp_file = f"{self.ledger_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_file, self.ledger_file)
+
+    def pool_usage(self, day_usage: dict[str, dict[str, Any]], pool: str) -> dict[str, Any]:
+        return day_usage.setdefault(pool, {"units": 0, "calls": {}, "quota_exceeded": False})
+
+    def record(self, api_method: str, pool: str = DEFAULT_QUOTA_POOL, now: Optional[datetime] = None) -> bool:
+        """Record one API call, returning True if it took the pool past QUOTA_WARNING_FRACTION of its daily quota."""
+        warning_units = self.daily_quota * QUOTA_WARNING_FRACTION
+        with self._lock, TokenFileLock(self.ledger_file):
+            self.load()
+            usage = self.pool_usage(self.days.setdefault(current_quota_day(now), {}), pool)
+            units_before = usage["units"]
+            usage["units"] += API_QUOTA_COSTS.get(api_method, 1)
+            usage["calls"][api_method] = usage["calls"].get(api_method, 0) + 1
+            self.save(now)
+        return units_before < warning_units <= usage["units"]
+
+    def record_quota_exceeded(self, pool: str = DEFAULT_QUOTA_POOL, now: Optional[datetime] = None) -> None:
+        """Note that the API reported the pool's quota as used up, whatever the ledger's own count says."""
+        with self._lock, TokenFileLock(self.ledger_file):
+            self.load()
+            self.pool_usage(self.days.setdefault(current_quota_day(now), {}), pool)["quota_exceeded"] = True
+            self.save(now)
+
+    def usage(self, pool: str, day: Optional[str] = None) -> dict[str, Any]:
+        usage = self.days.get(day or current_quota_day(), {}).get(pool, {})
+        return {"units": usage.get("units", 0), "calls": dict(usage.get("calls", {})), "quota_exceeded": usage.get("quota_exceeded", False)}
+
+    def pools(self, day: Optional[str] = None) -> list[str]:
+        return sorted(self.days.get(day or current_quota_day(), {}))
+
+    def remaining_units(self, pool: str, day: Optional[str] = None) -> int:
+        usage = self.usage(pool, day)
+        if usage["quota_exceeded"]:
+            return 0
+        return max(self.daily_quota - usage["units"], 0)
+
+
+def quota_report_lines(
+    ledger: QuotaLedger, pool_names: dict[str, str], pending_file_costs: list[int], now: Optional[datetime] = None
+) -> list[str]:
+    """
+    Units used today and remaining for each quota pool (those configured in pool_names, mapping pool to a display name, and any
+    others with calls recorded today), and a forecast of how many of the pending files, with these upload costs, fit in what's left.
+    """
+    now = datetime.now(get_quota_reset_timezone()) if now is None else now
+    day = current_quota_day(now)
+    reset_at = next_quota_reset(now)
+    hours, minutes = divmod(int((reset_at - now).total_seconds()) // 60, 60)
+    lines = [f"Quota day {day}, resets at {reset_at.strftime('%Y-%m-%d %H:%M %Z')} (in {hours}h {minutes:02d}m)"]
+
+    pools = list(pool_names) + [pool for pool in ledger.pools(day) if pool not in pool_names]
+    remaining_units = []
+    for pool in pools:
+        usage = ledger.usage(pool, day)
+        remaining_units.append(ledger.remaining_units(pool, day))
+        exceeded = ", quota exceeded reported by the API" if usage["quota_exceeded"] else ""
+        lines.append(
+            f"{pool_names.get(pool, pool)}: {usage['units']:,} of {ledger.daily_quota:,} units used, "
+            f"{remaining_units[-1]:,} remaining{exceeded}"
+        )
+        for api_method, calls in sorted(usage["calls"].items()):
+            lines.append(f"  {api_method}: {calls:,} calls, {calls * API_QUOTA_COSTS.get(api_method, 1):,} units")
+
+    if not pending_file_costs:
+        lines.append("No pending files.")
+        return lines
+
+    fit_today = forecast_uploads(remaining_units, pending_file_costs)
+    lines.append(
+        f"Pending files: {len(pending_file_costs)}, needing {sum(pending_file_costs):,} units "
+        f"({min(pending_file_costs):,} to {max(pending_file_costs):,} units each)"
+    )
+    lines.append(
+        f"Forecast: {fit_today} of {len(pending_file_costs)} pending files fit in the {sum(remaining_units):,} units remaining today"
+    )
+
+    # Then a fresh quota in every pool each day
+    remaining_costs = pending_file_costs[fit_today:]
+    days = 0
+    while remaining_costs:
+        fit = forecast_uploads([ledger.daily_quota] * len(pools), remaining_costs)
+        if fit == 0:
+            break
+        remaining_costs = remaining_costs[fit:]
+        days += 1
+    if days:
+        lines.append(f"The rest need {days} more day(s) of quota at {ledger.daily_quota:,} units per pool per day")
+    return lines
@@ -0,0 +1,61 @@
+import os
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+YOUTUBE_URL_PREFIX: str = "https://www.youtube.com/watch?v="
+
+UPLOADED_VIDEO_KEYS: tuple[str, ...] = ("input_filename", "youtube_title", "youtube_id", "youtube_url")
+
+
+def split_path(path: str) -> tuple[str, str]:
+    """Split a path after its last separator, so directory + file_name gives back exactly the same path."""
+    separator_index = path.rfind(os.sep)
+    if os.altsep:
+        separator_index = max(separator_index, path.rfind(os.altsep))
+    return path[: separator_index + 1], path[separator_index + 1 :]
+
+
+class UploadedVideo(Mapping):
+    """
+    Details of one uploaded video, in place of a dict per upload so very large runs don't keep growing.
+    Records use __slots__, share one interned copy of each input directory and build the URL from the YouTube ID when asked.
+    It reads like the dict it replaces (video["youtube_url"], dict(video)), with the profile key only present if a
+    credential profile uploaded it.
+    """
+
+    __slots__ = ("directory", "file_name", "youtube_title", "youtube_id", "profile")
+
+    def __init__(self, input_filename: str, youtube_title: str, youtube_id: str, profile: Optional[str] = None) -> None:
+        directory, self.file_name = split_path(input_filename)
+        self.directory = sys.intern(directory)
+        self.youtube_title = youtube_title
+        self.youtube_id = youtube_id
+        self.profile = profile
+
+    @property
+    def input_filename(self) -> str:
+        return self.directory + self.file_name
+
+    @property
+    def youtube_url(self) -> str:
+        return f"{YOUTUBE_URL_PREFIX}{self.youtube_id}"
+
+    def __getitem__(self, key: str) -> Any:
+        if key in UPLOADED_VIDEO_KEYS or (key == "profile" and self.profile is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from UPLOADED_VIDEO_KEYS
+        if self.profile is not None:
+            yield "profile"
+
+    def __len__(self) -> int:
+        return len(UPLOADED_VIDEO_KEYS) + (self.profile is not None)
+
+    def __repr__(self) -> str:
+        return f"UploadedVideo({self.to_dict()!r})"
+
+    def to_dict(self) -> dict[str, str]:
+        return dict(self)
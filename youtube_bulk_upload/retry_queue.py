@@ -0,0 +1,257 @@
+import os
+import copy
+import json
+import time
+import socket
+import logging
+import threading
+from enum import Enum
+from typing import Any, Optional
+
+from youtube_bulk_upload.quota import next_quota_reset
+from youtube_bulk_upload.thumbnails import ThumbnailError
+
+DEFAULT_RETRY_QUEUE_FILE: str = "failed_uploads.json"
+
+# HTTP statuses which are worth retrying after a short backoff
+TRANSIENT_HTTP_STATUSES: set[int] = {408, 429, 500, 502, 503, 504}
+
+# HTTP statuses which mean the request itself (i.e. the file or its metadata) was rejected, so retrying won't help
+INVALID_FILE_HTTP_STATUSES: set[int] = {400, 413, 415}
+
+# YouTube Data API error reasons, see https://developers.google.com/youtube/v3/docs/errors
+QUOTA_ERROR_REASONS: set[str] = {"quotaExceeded", "dailyLimitExceeded", "uploadLimitExceeded"}
+RATE_LIMIT_ERROR_REASONS: set[str] = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+
+
+class ErrorClass(Enum):
+    TRANSIENT = "transient"
+    QUOTA = "quota"
+    INVALID_FILE = "invalid_file"
+    UNKNOWN = "unknown"
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int,
+        backoff_seconds: float = 0,
+        backoff_multiplier: float = 2,
+        max_backoff_seconds: float = 3600,
+        wait_for_quota_reset: bool = False,
+        retry_in_run: bool = False,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_multiplier = backoff_multiplier
+        self.max_backoff_seconds = max_backoff_seconds
+        self.wait_for_quota_reset = wait_for_quota_reset
+        self.retry_in_run = retry_in_run
+
+    def next_attempt_at(self, attempts: int, now: float) -> float:
+        if self.wait_for_quota_reset:
+            return next_quota_reset().timestamp()
+
+        backoff = self.backoff_seconds * (self.backoff_multiplier ** max(attempts - 1, 0))
+        return now + min(backoff, self.max_backoff_seconds)
+
+
+DEFAULT_RETRY_POLICIES: dict[ErrorClass, RetryPolicy] = {
+    # Network blips and 5xx responses: retry a few times later in the same run, backing off 30s, 60s, 120s...
+    ErrorClass.TRANSIENT: RetryPolicy(max_attempts=5, backoff_seconds=30, max_backoff_seconds=900, retry_in_run=True),
+    # Out of quota: nothing will succeed until the daily quota resets at midnight Pacific Time
+    ErrorClass.QUOTA: RetryPolicy(max_attempts=3, wait_for_quota_reset=True),
+    # The file or its metadata was rejected, retrying would just burn quota
+    ErrorClass.INVALID_FILE: RetryPolicy(max_attempts=0),
+    # Anything else (e.g. an interactive prompt was declined) is left for the next retry-failed run
+    ErrorClass.UNKNOWN: RetryPolicy(max_attempts=3),
+}
+
+
+def get_http_error_status_and_reasons(error: BaseException) -> tuple[Optional[int], set[str]]:
+    """Extract the HTTP status and YouTube API error reasons from a googleapiclient HttpError, without importing it."""
+    resp = getattr(error, "resp", None)
+    status = getattr(resp, "status", None)
+    if status is None:
+        return None, set()
+
+    reasons: set[str] = set()
+    content = getattr(error, "content", None)
+    try:
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        error_content = json.loads(content)["error"]
+        for error_detail in error_content.get("errors", []):
+            if "reason" in error_detail:
+                reasons.add(error_detail["reason"])
+    except Exception:
+        pass
+
+    return int(status), reasons
+
+
+def classify_upload_error(error: BaseException) -> ErrorClass:
+    if isinstance(error, (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError, ThumbnailError)):
+        return ErrorClass.INVALID_FILE
+
+    status, reasons = get_http_error_status_and_reasons(error)
+    if status is not None:
+        if reasons & QUOTA_ERROR_REASONS:
+            return ErrorClass.QUOTA
+        if status in TRANSIENT_HTTP_STATUSES or reasons & RATE_LIMIT_ERROR_REASONS:
+            return ErrorClass.TRANSIENT
+        if status in INVALID_FILE_HTTP_STATUSES:
+            return ErrorClass.INVALID_FILE
+        return ErrorClass.UNKNOWN
+
+    # Only network errors; other OSErrors are local (e.g. a full or failing disk), which backing off for a few minutes won't fix
+    if isinstance(error, (ConnectionError, TimeoutError, socket.timeout, socket.gaierror)):
+        return ErrorClass.TRANSIENT
+
+    # httplib2 and urllib3 (used by the pooled transport) raise their own exception types for connection resets, read timeouts,
+    # DNS and TLS failures etc.
+    if type(error).__module__.startswith(("httplib2", "urllib3")):
+        return ErrorClass.TRANSIENT
+
+    return ErrorClass.UNKNOWN
+
+
+class RetryEntry:
+    def __init__(
+        self,
+        video_file: str,
+        error_class: ErrorClass,
+        attempts: int = 0,
+        last_error: str = "",
+        last_failed_at: float = 0,
+        next_attempt_at: float = 0,
+        abandoned: bool = False,
+    ) -> None:
+        self.video_file = video_file
+        self.error_class = error_class
+        self.attempts = attempts
+        self.last_error = last_error
+        self.last_failed_at = last_failed_at
+        self.next_attempt_at = next_attempt_at
+        self.abandoned = abandoned
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "video_file": self.video_file,
+            "error_class": self.error_class.value,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "last_failed_at": self.last_failed_at,
+            "next_attempt_at": self.next_attempt_at,
+            "abandoned": self.abandoned,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RetryEntry":
+        return cls(
+            video_file=data["video_file"],
+            error_class=ErrorClass(data.get("error_class", ErrorClass.UNKNOWN.value)),
+            attempts=data.get("attempts", 0),
+            last_error=data.get("last_error", ""),
+            last_failed_at=data.get("last_failed_at", 0),
+            next_attempt_at=data.get("next_attempt_at", 0),
+            abandoned=data.get("abandoned", False),
+        )
+
+
+class RetryQueue:
+    """
+    Persistent queue of failed uploads, stored as JSON so failures can be retried later in the same run or in a later run.
+    Each failure is classified and scheduled for another attempt according to the retry policy for its error class.
+    """
+
+    def __init__(self, queue_file: str, logger: logging.Logger, policies: Optional[dict[ErrorClass, RetryPolicy]] = None) -> None:
+        self.queue_file = queue_file
+        self.logger = logger
+        # Deep copied, so changing one queue's policies never changes the module defaults shared by every other queue
+        self.policies = copy.deepcopy(DEFAULT_RETRY_POLICIES)
+        if policies is not None:
+            self.policies.update(policies)
+
+        self._lock = threading.Lock()
+        self._entries: Optional[dict[str, RetryEntry]] = None
+
+    @property
+    def entries(self) -> dict[str, RetryEntry]:
+        if self._entries is None:
+            self._entries = self.load()
+        return self._entries
+
+    def load(self) -> dict[str, RetryEntry]:
+        if not os.path.exists(self.queue_file):
+            return {}
+
+        self.logger.info(f"Loading retry queue from file: {self.queue_file}")
+        with open(self.queue_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        entries = [RetryEntry.from_dict(entry) for entry in data.get("entries", [])]
+        return {entry.video_file: entry for entry in entries}
+
+    def save(self) -> None:
+        data = {"version": 1, "entries": [entry.to_dict() for entry in self.entries.values()]}
+
+        # Write to a temporary file then rename it over the original, so a crash never leaves a half-written queue
+        temp_file = f"{self.queue_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_file, self.queue_file)
+
+    def policy_for(self, entry: RetryEntry) -> RetryPolicy:
+        return self.policies[entry.error_class]
+
+    def record_failure(self, video_file: str, error: BaseException, now: Optional[float] = None) -> RetryEntry:
+        now = time.time() if now is None else now
+        error_class = classify_upload_error(error)
+        policy = self.policies[error_class]
+
+        with self._lock:
+            entry = self.entries.get(video_file)
+            if entry is None:
+                entry = RetryEntry(video_file, error_class)
+                self.entries[video_file] = entry
+
+            entry.error_class = error_class
+            entry.attempts += 1
+            entry.last_error = str(error)
+            entry.last_failed_at = now
+
+            if entry.attempts >= policy.max_attempts:
+                entry.abandoned = True
+                self.logger.warning(
+                    f"Upload of {video_file} failed with {error_class.value} error after {entry.attempts} attempt(s), "
+                    "it will not be retried"
+                )
+            else:
+                entry.abandoned = False
+                entry.next_attempt_at = policy.next_attempt_at(entry.attempts, now)
+                self.logger.info(
+                    f"Upload of {video_file} failed with {error_class.value} error, queued for retry at {time.ctime(entry.next_attempt_at)}"
+                )
+
+            self.save()
+
+        return entry
+
+    def record_success(self, video_file: str) -> None:
+        with self._lock:
+            if video_file in self.entries:
+                del self.entries[video_file]
+                self.save()
+
+    def pending_entries(self) -> list[RetryEntry]:
+        """Return all entries which will be retried at some point, ordered by next attempt time."""
+        pending = [entry for entry in self.entries.values() if not entry.abandoned]
+        return sorted(pending, key=lambda entry: entry.next_attempt_at)
+
+    def due_entries(self, now: Optional[float] = None) -> list[RetryEntry]:
+        now = time.time() if now is None else now
+        return [entry for entry in self.pending_entries() if entry.next_attempt_at <= now]
+
+    def abandoned_entries(self) -> list[RetryEntry]:
+        return [entry for entry in self.entries.values() if entry.abandoned]
@@ -0,0 +1,141 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+REVIEW_PENDING: str = "pending"
+REVIEW_APPROVED: str = "approved"
+REVIEW_REJECTED: str = "rejected"
+REVIEW_UPLOADING: str = "uploading"
+
+
+class ReviewItem:
+    """Everything the user needs to decide about one video before it's uploaded, computed without prompting."""
+
+    __slots__ = ("video_file", "youtube_title", "youtube_description", "thumbnail_filepath", "duplicate_video_id", "profile", "status")
+
+    def __init__(
+        self,
+        video_file: str,
+        youtube_title: str,
+        youtube_description: str,
+        thumbnail_filepath: Optional[str],
+        duplicate_video_id: Optional[str] = None,
+        profile: Any = None,
+    ) -> None:
+        self.video_file = video_file
+        self.youtube_title = youtube_title
+        self.youtube_description = youtube_description
+        self.thumbnail_filepath = thumbnail_filepath
+        # ID of an existing video on the channel with a similar title, if any
+        self.duplicate_video_id = duplicate_video_id
+        # Credential profile the duplicate check ran against, which is also used for the upload if it still has budget
+        self.profile = profile
+        self.status = REVIEW_PENDING
+
+
+class ReviewQueue:
+    """
+    Batch review of a whole batch of uploads, replacing the per-video interactive prompts.
+    The upload thread adds a ReviewItem for each video as soon as it's prepared, while the user edits and approves or
+    rejects items from the GUI in any order. The upload thread takes approved items with next_approved() and uploads them
+    straight away, so uploading starts on the first approval while the rest of the batch is still being reviewed.
+    Listeners are called with each item when it is added or changes, on whichever thread made the change.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[str, ReviewItem] = {}
+        self.listeners: list[Callable[[ReviewItem], Any]] = []
+        self._approved: deque[ReviewItem] = deque()
+        self._preparing = False
+        self._condition = threading.Condition()
+
+    def add_listener(self, callback: Callable[[ReviewItem], Any]) -> None:
+        with self._condition:
+            self.listeners.append(callback)
+
+    def notify_listeners(self, review_item: ReviewItem) -> None:
+        for listener in list(self.listeners):
+            listener(review_item)
+
+    def start_preparing(self) -> None:
+        with self._condition:
+            self.items = {}
+            self._approved.clear()
+            self._preparing = True
+
+    def finish_preparing(self) -> None:
+        with self._condition:
+            self._preparing = False
+            self._condition.notify_all()
+
+    def add(self, review_item: ReviewItem) -> None:
+        with self._condition:
+            self.items[review_item.video_file] = review_item
+        self.notify_listeners(review_item)
+
+    def approve(self, video_file: str, youtube_title: Optional[str] = None, youtube_description: Optional[str] = None) -> bool:
+        """Approve a pending item for upload, optionally with an edited title and description. Returns False if it was already decided."""
+        with self._condition:
+            review_item = self.items.get(video_file)
+            if review_item is None or review_item.status != REVIEW_PENDING:
+                return False
+            if youtube_title is not None:
+                review_item.youtube_title = youtube_title
+            if youtube_description is not None:
+                review_item.youtube_description = youtube_description
+            review_item.status = REVIEW_APPROVED
+            self._approved.append(review_item)
+            self._condition.notify_all()
+        self.notify_listeners(review_item)
+        return True
+
+    def reject(self, video_file: str) -> bool:
+        with self._condition:
+            review_item = self.items.get(video_file)
+            if review_item is None or review_item.status != REVIEW_PENDING:
+                return False
+            review_item.status = REVIEW_REJECTED
+            self._condition.notify_all()
+        self.notify_listeners(review_item)
+        return True
+
+    def approve_all_pending(self) -> int:
+        with self._condition:
+            pending_video_files = [video_file for video_file, review_item in self.items.items() if review_item.status == REVIEW_PENDING]
+        return sum(self.approve(video_file) for video_file in pending_video_files)
+
+    def reject_all_pending(self) -> int:
+        with self._condition:
+            pending_video_files = [video_file for video_file, review_item in self.items.items() if review_item.status == REVIEW_PENDING]
+        return sum(self.reject(video_file) for video_file in pending_video_files)
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return sum(1 for review_item in self.items.values() if review_item.status == REVIEW_PENDING)
+
+    def is_done(self) -> bool:
+        """True once every item has been prepared and decided, and every approved item taken for upload."""
+        with self._condition:
+            return self._is_done()
+
+    def _is_done(self) -> bool:
+        return (
+            not self._preparing and not self._approved and all(review_item.status != REVIEW_PENDING for review_item in self.items.values())
+        )
+
+    def next_approved(self, timeout: Optional[float] = None) -> Optional[ReviewItem]:
+        """Wait up to timeout seconds for an approved item and take it for upload, or return None if there isn't one yet (or ever)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._approved or self._is_done(), timeout)
+            if not self._approved:
+                return None
+            review_item = self._approved.popleft()
+            review_item.status = REVIEW_UPLOADING
+        self.notify_listeners(review_item)
+        return review_item
+
+    def approved_item(self, video_file: str) -> Optional[ReviewItem]:
+        """The item for a video which was approved (and taken for upload), e.g. to retry its upload with the reviewed details."""
+        with self._condition:
+            review_item = self.items.get(video_file)
+            return review_item if review_item is not None and review_item.status == REVIEW_UPLOADING else None
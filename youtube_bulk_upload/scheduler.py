@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import signal
+import threading
+from typing import Any, Optional
+
+from youtube_bulk_upload.quota import current_quota_day, next_quota_reset
+from youtube_bulk_upload.records import UploadedVideo
+
+DEFAULT_CHECKPOINT_FILE: str = "upload_checkpoint.json"
+
+# Wait a little past midnight Pacific before resuming, in case our clock is slightly ahead of YouTube's
+QUOTA_RESET_MARGIN_SECONDS: float = 120
+
+
+class UploadCheckpoint:
+    """
+    Persistent record of which files a scheduled run has finished with (uploaded or skipped) and how many uploads
+    were made on each quota day, so a multi-day run can be stopped and resumed without repeating any work.
+    """
+
+    def __init__(self, checkpoint_file: str) -> None:
+        self.checkpoint_file = checkpoint_file
+        self.completed: dict[str, dict[str, str]] = {}
+        self.uploads_by_day: dict[str, int] = {}
+
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.completed = data.get("completed", {})
+            self.uploads_by_day = data.get("uploads_by_day", {})
+
+    def save(self) -> None:
+        data = {"version": 1, "completed": self.completed, "uploads_by_day": self.uploads_by_day}
+
+        # Write to a temporary file then rename it over the original, so a crash never leaves a half-written checkpoint
+        temp_file = f"{self.checkpoint_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_file, self.checkpoint_file)
+
+    def mark_uploaded(self, uploaded_video: UploadedVideo) -> None:
+        video_file = uploaded_video["input_filename"]
+        if video_file in self.completed:
+            return
+
+        self.completed[video_file] = dict(uploaded_video, status="uploaded")
+        quota_day = current_quota_day()
+        self.uploads_by_day[quota_day] = self.uploads_by_day.get(quota_day, 0) + 1
+        self.save()
+
+    def mark_skipped(self, video_file: str) -> None:
+        self.completed[video_file] = {"input_filename": video_file, "status": "skipped"}
+        self.save()
+
+    def uploads_today(self) -> int:
+        return self.uploads_by_day.get(current_quota_day(), 0)
+
+
+class MultiDayScheduler:
+    """
+    Runs a YouTubeBulkUpload over as many days as it takes to drain the backlog. Whenever the daily upload budget
+    (upload_batch_limit) is used up or the API quota is exceeded, progress is checkpointed and the scheduler sleeps
+    until the quota resets at midnight Pacific Time, re-validates credentials and carries on.
+    Setting the uploader's stop_event, or sending SIGTERM, stops the run cleanly after the current upload.
+    """
+
+    def __init__(self, youtube_bulk_upload: Any, checkpoint_file: str = DEFAULT_CHECKPOINT_FILE) -> None:
+        self.youtube_bulk_upload = youtube_bulk_upload
+        self.logger = youtube_bulk_upload.logger
+        self.checkpoint = UploadCheckpoint(checkpoint_file)
+
+        # We need a stop event to interrupt long sleeps, so create one if the caller didn't provide it
+        if youtube_bulk_upload.stop_event is None:
+            youtube_bulk_upload.stop_event = threading.Event()
+        self.stop_event = youtube_bulk_upload.stop_event
+
+    def is_stopped(self) -> bool:
+        return bool(self.stop_event.is_set())
+
+    def handle_sigterm(self, signum: int, frame: Any) -> None:
+        self.logger.warning("SIGTERM received, stopping after the current upload finishes...")
+        self.stop_event.set()
+
+    def is_waiting_for_retry(self, video_file: str, now: float) -> bool:
+        retry_queue = self.youtube_bulk_upload.retry_queue
+        if retry_queue is None or video_file not in retry_queue.entries:
+            return False
+
+        entry = retry_queue.entries[video_file]
+        return entry.abandoned or entry.next_attempt_at > now
+
+    def find_pending_files(self) -> list[str]:
+        now = time.time()
+        return [
+            video_file
+            for video_file in self.youtube_bulk_upload.find_input_files()
+            if video_file not in self.checkpoint.completed and not self.is_waiting_for_retry(video_file, now)
+        ]
+
+    def remaining_daily_budget(self) -> int:
+        return max(self.youtube_bulk_upload.upload_batch_limit - self.checkpoint.uploads_today(), 0)
+
+    def run_cycle(self, pending_files: list[str]) -> list[UploadedVideo]:
+        """Upload pending files until they run out, the daily budget is used up, the quota is exceeded or we're stopped."""
+        uploader = self.youtube_bulk_upload
+        uploader.quota_exceeded = False
+        uploader.deferred_video_files = set()
+        uploader.failed_video_files = set()
+        daily_budget = self.remaining_daily_budget()
+
+        uploaded_videos: list[UploadedVideo] = []
+        thumbnails_submitted_until = 0
+        for position, video_file in enumerate(pending_files):
+            if self.is_stopped() or uploader.quota_exceeded or len(uploaded_videos) >= daily_budget:
+                break
+
+            # Only a few files ahead, within what's left of today's budget, rather than the whole backlog
+            thumbnails_submitted_until = uploader.submit_thumbnails_ahead(
+                pending_files, position, self.checkpoint.uploads_today(), thumbnails_submitted_until
+            )
+            uploaded_video = uploader.process_video_file(video_file)
+            if uploaded_video is not None:
+                uploaded_videos.append(uploaded_video)
+                self.checkpoint.mark_uploaded(uploaded_video)
+            elif video_file in uploader.deferred_video_files:
+                # No credential profile had budget left for this file, leave it pending for tomorrow
+                continue
+            elif video_file in uploader.failed_video_files:
+                # Leave failed files pending, either for the retry queue or (without one) for the next cycle
+                continue
+            else:
+                # Neither uploaded nor failed, e.g. it already exists on the channel or the user declined it
+                self.checkpoint.mark_skipped(video_file)
+
+        # Count every upload made today (including those from earlier cycles or before a resume), so retries stay within the daily budget
+        for uploaded_video in uploader.iter_retry_failed_uploads_in_run(pending_files, self.checkpoint.uploads_today()):
+            uploaded_videos.append(uploaded_video)
+            self.checkpoint.mark_uploaded(uploaded_video)
+
+        return uploaded_videos
+
+    def sleep_until(self, wake_time: float, reason: str) -> bool:
+        """Sleep until the given time, returning False if the scheduler was stopped while sleeping."""
+        sleep_seconds = max(wake_time - time.time(), 0)
+        self.logger.info(f"{reason}, sleeping for {sleep_seconds / 3600:.1f} hours until {time.ctime(wake_time)}...")
+        return not self.youtube_bulk_upload.wait_or_stop(sleep_seconds)
+
+    def next_retry_time(self) -> Optional[float]:
+        retry_queue = self.youtube_bulk_upload.retry_queue
+        if retry_queue is None:
+            return None
+
+        input_files = set(self.youtube_bulk_upload.find_input_files())
+        retry_times = [
+            entry.next_attempt_at
+            for entry in retry_queue.pending_entries()
+            if entry.video_file in input_files and entry.video_file not in self.checkpoint.completed
+        ]
+        return min(retry_times) if retry_times else None
+
+    def run(self) -> list[UploadedVideo]:
+        uploader = self.youtube_bulk_upload
+        uploader.validate_input_parameters()
+
+        # Signal handlers can only be installed from the main thread, e.g. not when running from the GUI's upload thread
+        install_sigterm_handler = threading.current_thread() is threading.main_thread()
+        if install_sigterm_handler:
+            previous_sigterm_handler = signal.signal(signal.SIGTERM, self.handle_sigterm)
+
+        self.logger.info(f"Scheduled upload beginning, checkpointing progress to: {self.checkpoint.checkpoint_file}")
+        uploaded_videos: list[UploadedVideo] = []
+        all_pending_files_deferred = False
+        try:
+            while not self.is_stopped():
+                pending_files = self.find_pending_files()
+                if not pending_files:
+                    # Nothing is ready to upload right now, but some failed uploads may be waiting to be retried later
+                    next_retry_time = self.next_retry_time()
+                    if next_retry_time is None:
+                        self.logger.info("Backlog drained, all video files have been processed.")
+                        break
+                    if not self.sleep_until(next_retry_time, "Waiting for failed uploads to become due for retry"):
+                        break
+                    continue
+
+                if self.remaining_daily_budget() == 0 or uploader.quota_exceeded or all_pending_files_deferred:
+                    if not self.sleep_until(next_quota_reset().timestamp() + QUOTA_RESET_MARGIN_SECONDS, "Daily upload budget used up"):
+                        break
+                    uploader.reauthenticate()
+                    uploader.quota_exceeded = False
+                    all_pending_files_deferred = False
+                    continue
+
+                self.logger.info(f"{len(pending_files)} video files pending, {self.remaining_daily_budget()} uploads left today")
+                uploaded_videos.extend(self.run_cycle(pending_files))
+                # Without a retry queue, failed files stay pending, so wait for the quota reset before trying them again
+                waiting_files = uploader.deferred_video_files
+                if uploader.retry_queue is None:
+                    waiting_files = waiting_files | uploader.failed_video_files
+                all_pending_files_deferred = set(pending_files) <= waiting_files
+        finally:
+            if install_sigterm_handler:
+                signal.signal(signal.SIGTERM, previous_sigterm_handler)
+
+        if self.is_stopped():
+            self.logger.info("Stop event set, scheduled upload stopped. Run again to resume from the checkpoint.")
+
+        return uploaded_videos
@@ -0,0 +1,385 @@
+import io
+import os
+import shutil
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+DEFAULT_THUMBNAIL_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".youtube-bulk-upload", "thumbnails")
+# Limits of thumbnails.set, see https://developers.google.com/youtube/v3/docs/thumbnails/set
+THUMBNAIL_MAX_BYTES: int = 2 * 1024 * 1024
+THUMBNAIL_WIDTH: int = 1280
+THUMBNAIL_HEIGHT: int = 720
+DEFAULT_JPEG_QUALITY: int = 90
+MIN_JPEG_QUALITY: int = 40
+JPEG_QUALITY_STEP: int = 10
+DEFAULT_MAX_WORKERS: int = 4
+# How many video files ahead of the current upload have their thumbnails prepared, enough to keep the worker processes busy
+DEFAULT_THUMBNAIL_LOOKAHEAD: int = 2 * DEFAULT_MAX_WORKERS
+# Part of every cache key, bump it whenever prepare_thumbnail's output changes so stale cached thumbnails aren't reused
+THUMBNAIL_CACHE_VERSION: int = 1
+
+DEFAULT_TITLE_CARD_CACHE_DIR: str = os.path.join(DEFAULT_THUMBNAIL_CACHE_DIR, "title_cards")
+DEFAULT_TITLE_CARD_BACKGROUND_COLOR: str = "#202020"
+DEFAULT_TITLE_CARD_TEXT_COLOR: str = "#ffffff"
+DEFAULT_TITLE_CARD_FONT_SIZE: int = 96
+MIN_TITLE_CARD_FONT_SIZE: int = 24
+# Template variables available to the title card text, like {{youtube_title}} in description replacements
+DEFAULT_TITLE_CARD_TEXT_TEMPLATE: str = "{{youtube_title}}"
+# Part of every title card cache key, bump it whenever render_title_card's output changes
+TITLE_CARD_CACHE_VERSION: int = 1
+
+
+class ThumbnailError(ValueError):
+    """A thumbnail or title card can't be made from the given image, font or colours, so uploading it again won't help."""
+
+
+class ThumbnailSettings:
+    def __init__(
+        self,
+        width: int = THUMBNAIL_WIDTH,
+        height: int = THUMBNAIL_HEIGHT,
+        max_bytes: int = THUMBNAIL_MAX_BYTES,
+        quality: int = DEFAULT_JPEG_QUALITY,
+        min_quality: int = MIN_JPEG_QUALITY,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.min_quality = min_quality
+
+    def cache_key(self) -> str:
+        return f"v{THUMBNAIL_CACHE_VERSION}:{self.width}x{self.height}:{self.max_bytes}:{self.quality}:{self.min_quality}"
+
+
+class TitleCardSettings(ThumbnailSettings):
+    def __init__(
+        self,
+        background_image: Optional[str] = None,
+        background_color: str = DEFAULT_TITLE_CARD_BACKGROUND_COLOR,
+        font_file: Optional[str] = None,
+        font_size: int = DEFAULT_TITLE_CARD_FONT_SIZE,
+        text_color: str = DEFAULT_TITLE_CARD_TEXT_COLOR,
+        stroke_color: Optional[str] = None,
+        text_template: str = DEFAULT_TITLE_CARD_TEXT_TEMPLATE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.background_image = background_image
+        self.background_color = background_color
+        self.font_file = font_file
+        self.font_size = font_size
+        self.text_color = text_color
+        self.stroke_color = stroke_color
+        self.text_template = text_template
+
+    def cache_key(self) -> str:
+        # The background image and font are keyed by their content, see TitleCardGenerator
+        return (
+            f"{super().cache_key()}:card-v{TITLE_CARD_CACHE_VERSION}:{self.background_color}:{self.font_size}:{self.text_color}:"
+            f"{self.stroke_color}:{bool(self.background_image)}:{bool(self.font_file)}"
+        )
+
+
+def file_digest(path: str, digest: Optional[Any] = None) -> Any:
+    digest = hashlib.sha256() if digest is None else digest
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest
+
+
+def thumbnail_cache_file(source_file: str, cache_dir: str, settings: ThumbnailSettings) -> str:
+    """Where the prepared thumbnail for this source image content and these settings is cached."""
+    digest = file_digest(source_file)
+    digest.update(settings.cache_key().encode("utf-8"))
+    return os.path.join(cache_dir, f"{digest.hexdigest()[:32]}.jpg")
+
+
+def title_card_text(text_template: str, youtube_title: str, video_file: str) -> str:
+    """The text of a video's title card: the template with {{youtube_title}} and {{filename}} (without extension) filled in."""
+    filename, _ = os.path.splitext(os.path.basename(video_file))
+    return text_template.replace("{{youtube_title}}", youtube_title).replace("{{filename}}", filename)
+
+
+def encode_jpeg(image: Any, settings: ThumbnailSettings) -> bytes:
+    """Encode as JPEG at the highest quality (in steps down from settings.quality) which fits in settings.max_bytes."""
+    for quality in range(settings.quality, settings.min_quality - 1, -JPEG_QUALITY_STEP):
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=quality, optimize=True)
+        if output.tell() <= settings.max_bytes:
+            return output.getvalue()
+    raise ThumbnailError(f"Thumbnail is over {settings.max_bytes} bytes even as a JPEG at quality {settings.min_quality}")
+
+
+def prepare_thumbnail(source_file: str, output_file: str, settings: ThumbnailSettings) -> str:
+    """
+    Write a thumbnail thumbnails.set will accept to output_file: a settings.width x settings.height JPEG under settings.max_bytes,
+    the source image scaled to fit and padded with black. A source which already meets those limits is copied as it is.
+    Runs in ThumbnailPreprocessor's worker processes, so Pillow is only imported there.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source_file) as image:
+            image.verify()
+        with Image.open(source_file) as image:
+            image.load()
+    except Exception as e:
+        # Pillow raises all sorts for a broken image (OSError, SyntaxError, ...), so they're all reported as the file being invalid
+        raise ThumbnailError(f"Thumbnail {source_file} is not a valid image: {e}") from e
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    if image.format == "JPEG" and image.size == (settings.width, settings.height) and os.path.getsize(source_file) <= settings.max_bytes:
+        shutil.copyfile(source_file, temp_file)
+    else:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            # Transparent areas would turn an arbitrary colour as a JPEG, so flatten them onto the same black as the padding
+            image = image.convert("RGBA")
+            flattened = Image.new("RGB", image.size, (0, 0, 0))
+            flattened.paste(image, mask=image.getchannel("A"))
+            image = flattened
+        else:
+            image = image.convert("RGB")
+        image = ImageOps.pad(image, (settings.width, settings.height), method=Image.Resampling.LANCZOS, color=(0, 0, 0))
+        with open(temp_file, "wb") as f:
+            f.write(encode_jpeg(image, settings))
+
+    # Renamed into place, so another process preparing the same thumbnail never sees a half-written file
+    os.replace(temp_file, output_file)
+    return output_file
+
+
+def wrap_text(draw: Any, text: str, font: Any, max_width: float) -> str:
+    """Break text into lines at spaces, as many words to a line as fit in max_width. A word wider than that gets a line of its own."""
+    lines: list[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and draw.textlength(candidate, font=font) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_title_card_font(font_file: Optional[str], font_size: int) -> Any:
+    from PIL import ImageFont
+
+    if font_file is not None:
+        try:
+            return ImageFont.truetype(font_file, font_size)
+        except OSError as e:
+            raise ThumbnailError(f"Title card font {font_file} could not be loaded: {e}") from e
+    try:
+        return ImageFont.load_default(size=font_size)
+    except TypeError:
+        # Pillow before 10.1 only has a fixed size bitmap default font
+        return ImageFont.load_default()
+
+
+def render_title_card(text: str, output_file: str, settings: TitleCardSettings) -> str:
+    """
+    Write a settings.width x settings.height JPEG title card to output_file: the text wrapped and centered over the background image
+    (scaled and cropped to fill the card) or colour, in the largest font size up to settings.font_size it fits at.
+    Runs in TitleCardGenerator's worker processes, so Pillow is only imported there.
+    """
+    from PIL import Image, ImageColor, ImageDraw, ImageOps
+
+    size = (settings.width, settings.height)
+    try:
+        background_color, text_color = ImageColor.getrgb(settings.background_color), ImageColor.getrgb(settings.text_color)
+        stroke_color = ImageColor.getrgb(settings.stroke_color) if settings.stroke_color is not None else None
+    except ValueError as e:
+        raise ThumbnailError(f"Invalid title card colour: {e}") from e
+
+    if settings.background_image is not None:
+        try:
+            with Image.open(settings.background_image) as background:
+                card = ImageOps.fit(ImageOps.exif_transpose(background).convert("RGB"), size, method=Image.Resampling.LANCZOS)
+        except Exception as e:
+            # Pillow raises all sorts for a broken image (OSError, SyntaxError, ...), so they're all reported as the file being invalid
+            raise ThumbnailError(f"Title card background {settings.background_image} is not a valid image: {e}") from e
+    else:
+        card = Image.new("RGB", size, background_color)
+
+    draw = ImageDraw.Draw(card)
+    max_width, max_height = settings.width * 0.9, settings.height * 0.9
+    font_size = settings.font_size
+    while True:
+        font = load_title_card_font(settings.font_file, font_size)
+        stroke_width = max(font_size // 24, 1) if stroke_color is not None else 0
+        wrapped_text = wrap_text(draw, text, font, max_width - 2 * stroke_width)
+        left, top, right, bottom = draw.multiline_textbbox((0, 0), wrapped_text, font=font, stroke_width=stroke_width, align="center")
+        if (right - left <= max_width and bottom - top <= max_height) or font_size <= MIN_TITLE_CARD_FONT_SIZE:
+            break
+        font_size = max(int(font_size * 0.9), MIN_TITLE_CARD_FONT_SIZE)
+
+    draw.multiline_text(
+        (settings.width / 2, settings.height / 2),
+        wrapped_text,
+        font=font,
+        fill=text_color,
+        anchor="mm",
+        align="center",
+        stroke_width=stroke_width,
+        stroke_fill=stroke_color,
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as f:
+        f.write(encode_jpeg(card, settings))
+    os.replace(temp_file, output_file)
+    return output_file
+
+
+class ImageWorkerPool:
+    """
+    Pool of worker processes for image work, keeping a future per job so each job is only started once however often it's asked for.
+    A failed job is started afresh the next time it's asked for (e.g. when its upload is retried), and a pool broken by a worker
+    process dying is replaced, so one crash doesn't fail every later job.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: dict[str, Future] = {}
+        # Re-entrant, as a job which has already finished runs its done callback straight away, while submit_job holds the lock
+        self._lock = threading.RLock()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked, as the uploader has other threads running (e.g. refreshing credentials)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def submit_to_executor(self, fn: Callable[..., str], *args: Any) -> Future:
+        try:
+            return self.get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker process died, which leaves the pool unusable, so start a new one
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            return self.get_executor().submit(fn, *args)
+
+    def submit_job(self, source: str, output_file_for_job: Callable[[], str], fn: Callable[[str, str, Any], str], settings: Any) -> Future:
+        """
+        Return the future for the job fn(source, output_file, settings), starting it unless it's already running or has succeeded.
+        output_file_for_job() gives the file the job writes, so if that already exists (it's cached from an earlier run) nothing is done.
+        """
+        with self._lock:
+            if source in self._futures:
+                return self._futures[source]
+
+            future: Future = Future()
+            try:
+                output_file = output_file_for_job()
+            except OSError as e:
+                # Not kept, so it's tried again next time
+                future.set_exception(e)
+                return future
+
+            if os.path.exists(output_file):
+                future.set_result(output_file)
+                self._futures[source] = future
+            else:
+                future = self.submit_to_executor(fn, source, output_file, settings)
+                self._futures[source] = future
+                # Failed jobs are forgotten, so they're tried again (e.g. when the upload is retried) rather than failing straight away
+                future.add_done_callback(lambda done_future: self.forget_failed_job(source, done_future))
+            return future
+
+    def forget_failed_job(self, source: str, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                if self._futures.get(source) is future:
+                    del self._futures[source]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            self._futures.clear()
+
+
+class ThumbnailPreprocessor(ImageWorkerPool):
+    """
+    Prepares thumbnails for thumbnails.set in a pool of worker processes ahead of the uploads which need them, so an image the
+    API would reject (over 2 MB, the wrong size, not an image at all) fails before its video is uploaded rather than after.
+    Prepared thumbnails are cached by the source image's content and the settings, so reruns reuse them without any image work,
+    and the process pool is only started if a thumbnail isn't already cached.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_THUMBNAIL_CACHE_DIR,
+        settings: Optional[ThumbnailSettings] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        super().__init__(max_workers)
+        self.cache_dir = cache_dir
+        self.settings = settings or ThumbnailSettings()
+
+    def submit(self, source_file: str) -> Future:
+        """Start preparing a thumbnail if it isn't already cached or being prepared, returning a future for the prepared file."""
+        return self.submit_job(
+            source_file, lambda: thumbnail_cache_file(source_file, self.cache_dir, self.settings), prepare_thumbnail, self.settings
+        )
+
+    def prepare(self, source_file: str) -> str:
+        """Return the prepared thumbnail for source_file, waiting for it to be prepared if need be."""
+        return self.submit(source_file).result()
+
+
+class TitleCardGenerator(ImageWorkerPool):
+    """
+    Renders title card thumbnails for videos which have no thumbnail file of their own, in a pool of worker processes ahead of the
+    uploads which need them. Cards are cached by their text and settings (including the content of the background image and font),
+    so reruns reuse them without any image work, and the process pool is only started if a card isn't already cached.
+    Cards are rendered within the API's thumbnail limits, so they don't need preparing by ThumbnailPreprocessor.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_TITLE_CARD_CACHE_DIR,
+        settings: Optional[TitleCardSettings] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        super().__init__(max_workers)
+        self.cache_dir = cache_dir
+        self.settings = settings or TitleCardSettings()
+
+        # Hashed once here rather than for every card
+        key_digest = hashlib.sha256(self.settings.cache_key().encode("utf-8"))
+        for asset_file in [self.settings.background_image, self.settings.font_file]:
+            if asset_file is not None:
+                file_digest(asset_file, key_digest)
+        self.settings_digest = key_digest.hexdigest()
+
+    def title_card_file(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self.settings_digest}:{text}".encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()[:32]}.jpg")
+
+    def is_title_card(self, thumbnail_filepath: str) -> bool:
+        return os.path.dirname(os.path.abspath(thumbnail_filepath)) == os.path.abspath(self.cache_dir)
+
+    def submit(self, youtube_title: str, video_file: str) -> Future:
+        """Start rendering a video's title card if it isn't already cached or being rendered, returning a future for the card file."""
+        text = title_card_text(self.settings.text_template, youtube_title, video_file)
+        return self.submit_job(text, lambda: self.title_card_file(text), render_title_card, self.settings)
+
+    def generate(self, youtube_title: str, video_file: str) -> str:
+        """Return the title card for a video with this title, waiting for it to be rendered if need be."""
+        return self.submit(youtube_title, video_file).result()
@@ -0,0 +1,121 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Any
+
+DEFAULT_TOKEN_DIR: str = os.path.join(os.path.expanduser("~"), ".youtube-bulk-upload", "tokens")
+DEFAULT_TOKEN_ACCOUNT: str = "default"
+YOUTUBE_SCOPES: list[str] = ["https://www.googleapis.com/auth/youtube"]
+
+
+def get_client_id(client_secrets_file: str) -> str:
+    """Return the OAuth client ID from a client secrets file, or its absolute path if it doesn't contain one."""
+    try:
+        with open(client_secrets_file, "r", encoding="utf-8") as f:
+            secrets = json.load(f)
+        for client_type in ["installed", "web"]:
+            if client_type in secrets and "client_id" in secrets[client_type]:
+                return secrets[client_type]["client_id"]
+    except (OSError, ValueError):
+        pass
+    return os.path.abspath(client_secrets_file)
+
+
+def default_token_file(client_secrets_file: str, account: str = DEFAULT_TOKEN_ACCOUNT, token_dir: str = DEFAULT_TOKEN_DIR) -> str:
+    """
+    Token file path for one OAuth client and account, so different client secrets files or accounts (e.g. credential profiles)
+    never overwrite each other's tokens. The account is only a label chosen by the caller, as the real account isn't known
+    until after login.
+    """
+    key = hashlib.sha256(f"{get_client_id(client_secrets_file)}\n{account}".encode("utf-8")).hexdigest()[:16]
+    safe_account = re.sub(r"[^A-Za-z0-9_.-]", "_", account)
+    return os.path.join(token_dir, f"token-{safe_account}-{key}.json")
+
+
+def load_token_file(token_file: str) -> Any:
+    """Load OAuth credentials from a JSON token file, returning None if it doesn't exist or can't be parsed."""
+    if not os.path.exists(token_file):
+        return None
+
+    from google.oauth2.credentials import Credentials
+
+    try:
+        with open(token_file, "r", encoding="utf-8") as f:
+            return Credentials.from_authorized_user_info(json.load(f), scopes=YOUTUBE_SCOPES)
+    except (OSError, ValueError):
+        return None
+
+
+def save_token_file(token_file: str, credentials: Any) -> None:
+    """Write credentials to a JSON token file atomically, readable only by the current user."""
+    token_dir = os.path.dirname(os.path.abspath(token_file))
+    os.makedirs(token_dir, mode=0o700, exist_ok=True)
+
+    temp_file = f"{token_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    file_descriptor = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+        f.write(credentials.to_json())
+    os.replace(temp_file, token_file)
+
+
+def delete_token_file(token_file: str) -> bool:
+    if not os.path.exists(token_file):
+        return False
+    os.remove(token_file)
+    return True
+
+
+class TokenFileLock:
+    """
+    Exclusive lock on a token file, shared between threads and processes (including workers on other hosts, if the filesystem
+    supports locking). Held while checking, refreshing and rewriting a token, so only one of them refreshes it or opens a browser,
+    and the rest re-read the token it saved.
+    """
+
+    def __init__(self, token_file: str) -> None:
+        self.lock_file = f"{token_file}.lock"
+        self._file: Any = None
+
+    def acquire(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.lock_file)), mode=0o700, exist_ok=True)
+        self._file = open(self.lock_file, "a+")
+        try:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+
+            self._file.seek(0)
+            # LK_LOCK gives up after 10 seconds, so keep trying until the other process is done
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TokenFileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
@@ -0,0 +1,220 @@
+import time
+import socket
+import urllib.request
+import threading
+from typing import Any, Iterator, Optional
+
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_CONNECT_TIMEOUT_SECONDS: float = 10
+# Applies to each socket read or write, not the whole request, so large upload chunks on slow links don't time out
+DEFAULT_READ_TIMEOUT_SECONDS: float = 300
+# With request timing enabled, request bodies are handed to the connection in blocks of this size, so it's known when the last one was sent
+TIMED_BODY_BLOCK_SIZE: int = 256 * 1024
+# Host the YouTube Data API and its uploads are sent to, checked against NO_PROXY to decide whether to go through the HTTPS proxy
+GOOGLE_API_HOST: str = "www.googleapis.com"
+
+
+class RequestTiming:
+    """When one HTTP request started, finished sending its body and was answered, as time.perf_counter() values."""
+
+    __slots__ = ("started_at", "sent_at", "finished_at", "status")
+
+    def __init__(self, started_at: float) -> None:
+        self.started_at = started_at
+        # Only known for bytes or file-like bodies, which are sent as a TimedBody
+        self.sent_at: Optional[float] = None
+        self.finished_at = started_at
+        self.status: Optional[int] = None
+
+    @property
+    def send_seconds(self) -> Optional[float]:
+        return None if self.sent_at is None else self.sent_at - self.started_at
+
+    @property
+    def response_seconds(self) -> Optional[float]:
+        """Time from the last byte of the body being sent to the response arriving, i.e. the server's response time plus latency."""
+        return None if self.sent_at is None else self.finished_at - self.sent_at
+
+
+class TimedBody:
+    """
+    A request body (bytes, or a file-like object such as an upload chunk's stream slice) sent in blocks, which notes on its
+    RequestTiming when the last block has been written to the socket.
+    """
+
+    def __init__(self, body: Any, timing: RequestTiming) -> None:
+        self.body = body
+        self.timing = timing
+
+    def iter_blocks(self) -> Iterator[Any]:
+        if isinstance(self.body, bytes):
+            view = memoryview(self.body)
+            for start in range(0, len(view), TIMED_BODY_BLOCK_SIZE):
+                yield view[start : start + TIMED_BODY_BLOCK_SIZE]
+        else:
+            while True:
+                block = self.body.read(TIMED_BODY_BLOCK_SIZE)
+                if not block:
+                    break
+                yield block
+
+    def __iter__(self) -> Iterator[Any]:
+        # A fresh iterator each time, as a bytes body is sent again if the credentials need refreshing
+        yield from self.iter_blocks()
+        self.timing.sent_at = time.perf_counter()
+
+
+class RequestTimingLog:
+    """
+    Timings of the HTTP requests made through a PooledHttpTransport, kept per thread until taken, e.g. to trace each upload chunk.
+    Nothing is recorded (or changed about how requests are sent) unless enabled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._local = threading.local()
+
+    def record(self, timing: RequestTiming) -> None:
+        timings = getattr(self._local, "timings", None)
+        if timings is None:
+            timings = self._local.timings = []
+        timings.append(timing)
+
+    def take(self) -> list[RequestTiming]:
+        """Timings of the requests this thread made since it last called take()."""
+        timings = getattr(self._local, "timings", None) or []
+        self._local.timings = []
+        return timings
+
+
+class TransportResponse(dict):
+    """httplib2.Response-compatible view of a urllib3 response: a dict of lower-cased headers with status and reason attributes."""
+
+    def __init__(self, response: Any) -> None:
+        super().__init__((name.lower(), value) for name, value in response.headers.items())
+        self.status = response.status
+        self.reason = response.reason
+        self["status"] = str(response.status)
+
+
+class PooledHttp:
+    """
+    httplib2.Http-compatible object which googleapiclient can use as its http transport, sending every request through a
+    shared urllib3 connection pool, authorized with one set of credentials. Unlike httplib2.Http it is safe to share between threads.
+    """
+
+    def __init__(self, authorized_http: Any, credentials: Any, timeout: Any, request_timing_log: Optional[RequestTimingLog] = None) -> None:
+        self.authorized_http = authorized_http
+        self.credentials = credentials
+        self.timeout = timeout
+        self.request_timing_log = request_timing_log
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[dict[str, str]] = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> tuple[TransportResponse, bytes]:
+        if self.request_timing_log is not None and self.request_timing_log.enabled:
+            return self.timed_request(self.request_timing_log, uri, method, body, headers, redirections)
+
+        # Resumable uploads use 308 responses without a Location header, which urllib3 doesn't follow, same as httplib2
+        response = self.authorized_http.urlopen(
+            method, uri, body=body, headers=headers or {}, timeout=self.timeout, retries=False, redirect=redirections > 0
+        )
+        return TransportResponse(response), response.data
+
+    def timed_request(
+        self, request_timing_log: RequestTimingLog, uri: str, method: str, body: Any, headers: Optional[dict[str, str]], redirections: int
+    ) -> tuple[TransportResponse, bytes]:
+        timing = RequestTiming(time.perf_counter())
+        has_content_length = any(name.lower() == "content-length" for name in (headers or {}))
+        # Only bodies with a Content-Length are sent in blocks, as any other iterable body would be sent with chunked encoding
+        if (isinstance(body, bytes) or hasattr(body, "read")) and has_content_length:
+            body = TimedBody(body, timing)
+        try:
+            response = self.authorized_http.urlopen(
+                method, uri, body=body, headers=headers or {}, timeout=self.timeout, retries=False, redirect=redirections > 0
+            )
+            timing.status = response.status
+            return TransportResponse(response), response.data
+        finally:
+            timing.finished_at = time.perf_counter()
+            request_timing_log.record(timing)
+
+    def close(self) -> None:
+        # The connection pool is shared with other services, so it's closed by PooledHttpTransport.close
+        pass
+
+
+class PooledHttpTransport:
+    """
+    Keep-alive HTTP transport for all YouTube API calls, replacing the one httplib2 connection per service object that
+    googleapiclient uses by default. One pool of connections is shared by every service built from this transport
+    (across credential profiles and threads), so metadata calls and uploads reuse connections instead of paying a TLS handshake each.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS,
+        send_buffer_size: Optional[int] = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        # Optional SO_SNDBUF size in bytes; a larger send buffer keeps a high-latency upload link busy
+        self.send_buffer_size = send_buffer_size
+
+        self._pool_manager: Any = None
+        self._lock = threading.Lock()
+        # Shared by every service's http object, so request timing can be switched on after the services are built
+        self.request_timing_log = RequestTimingLog()
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        from urllib3.connection import HTTPConnection
+
+        options = list(HTTPConnection.default_socket_options)
+        if self.send_buffer_size:
+            options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size))
+        return options
+
+    def get_pool_manager(self) -> Any:
+        """The urllib3 pool manager, created once and shared by every service so they all draw from one set of connections."""
+        with self._lock:
+            if self._pool_manager is None:
+                import certifi
+                import urllib3
+
+                pool_options = {
+                    "num_pools": self.pool_size,
+                    "maxsize": self.pool_size,
+                    "socket_options": self.socket_options(),
+                    "cert_reqs": "CERT_REQUIRED",
+                    "ca_certs": certifi.where(),
+                }
+                proxy_url = urllib.request.getproxies().get("https")
+                if proxy_url and not urllib.request.proxy_bypass(GOOGLE_API_HOST):
+                    self._pool_manager = urllib3.ProxyManager(proxy_url, **pool_options)
+                else:
+                    self._pool_manager = urllib3.PoolManager(**pool_options)
+            return self._pool_manager
+
+    def authorize(self, credentials: Any) -> PooledHttp:
+        """Return an http object for googleapiclient which sends requests with these credentials over the shared connection pool."""
+        import urllib3
+        from google.auth.transport.urllib3 import AuthorizedHttp
+
+        authorized_http = AuthorizedHttp(credentials, http=self.get_pool_manager())
+        timeout = urllib3.Timeout(connect=self.connect_timeout_seconds, read=self.read_timeout_seconds)
+        return PooledHttp(authorized_http, credentials, timeout, self.request_timing_log)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool_manager is not None:
+                self._pool_manager.clear()
+                self._pool_manager = None
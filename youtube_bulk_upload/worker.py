@@ -0,0 +1,134 @@
+import os
+import time
+import socket
+import threading
+from typing import Any, Optional
+
+from youtube_bulk_upload.job_queue import JobQueue
+from youtube_bulk_upload.records import UploadedVideo
+
+DEFAULT_LEASE_SECONDS: float = 600
+DEFAULT_POLL_INTERVAL_SECONDS: float = 30
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseHeartbeat:
+    """Background thread which keeps extending the lease on a claimed job while it is being uploaded."""
+
+    def __init__(self, job_queue: JobQueue, video_file: str, worker_id: str, lease_seconds: float, logger: Any) -> None:
+        self.job_queue = job_queue
+        self.video_file = video_file
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.logger = logger
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self.run, name=f"lease-heartbeat-{worker_id}", daemon=True)
+
+    def run(self) -> None:
+        # Renew well before expiry, so one slow or failed heartbeat doesn't lose the lease
+        while not self._stopped.wait(self.lease_seconds / 3):
+            try:
+                if not self.job_queue.heartbeat(self.video_file, self.worker_id, self.lease_seconds):
+                    self.logger.warning(f"Lost lease on {self.video_file}, another worker may upload it too")
+                    return
+            except Exception as e:
+                self.logger.warning(f"Failed to send heartbeat for {self.video_file}: {e}")
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+class UploadWorker:
+    """
+    Runs a YouTubeBulkUpload as one of many workers sharing a JobQueue, so multiple processes or hosts can upload
+    from the same directory without uploading any file twice.
+    Each worker seeds the queue with the files it can see (already-queued files are ignored), then claims and uploads
+    jobs until the queue is drained, its upload budget or quota is used up, or its stop_event is set.
+    """
+
+    def __init__(
+        self,
+        youtube_bulk_upload: Any,
+        job_queue: JobQueue,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self.youtube_bulk_upload = youtube_bulk_upload
+        self.job_queue = job_queue
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.logger = youtube_bulk_upload.logger
+
+    def seed_queue(self) -> None:
+        added = self.job_queue.enqueue(self.youtube_bulk_upload.find_input_files())
+        self.logger.info(f"Worker {self.worker_id} added {added} new video files to the job queue, job counts: {self.job_queue.counts()}")
+
+    def handle_unfinished_job(self, video_file: str) -> None:
+        """Decide what to do with a job process_video_file didn't upload: retry it later, fail it, or mark it done as skipped."""
+        uploader = self.youtube_bulk_upload
+
+        if video_file in uploader.deferred_video_files:
+            # No profile of this worker can take it right now; hold it back briefly so other jobs are claimed first
+            self.job_queue.release(video_file, self.worker_id, delay_seconds=self.poll_interval_seconds)
+            return
+
+        retry_entry = uploader.retry_queue.entries.get(video_file) if uploader.retry_queue is not None else None
+        if retry_entry is None:
+            # Neither uploaded nor failed, e.g. it already exists on the channel
+            self.job_queue.complete(video_file, self.worker_id, {"input_filename": video_file, "status": "skipped"})
+        elif retry_entry.abandoned:
+            self.job_queue.fail(video_file, self.worker_id, retry_entry.last_error)
+        else:
+            # Let any worker retry it once the backoff for its error class has passed
+            delay_seconds = max(retry_entry.next_attempt_at - time.time(), 0)
+            self.job_queue.release(video_file, self.worker_id, delay_seconds=delay_seconds, error=retry_entry.last_error)
+
+    def run(self) -> list[UploadedVideo]:
+        uploader = self.youtube_bulk_upload
+        uploader.validate_input_parameters()
+        self.seed_queue()
+
+        uploaded_videos: list[UploadedVideo] = []
+        uploader.quota_exceeded = False
+        uploader.deferred_video_files = set()
+        while not uploader.should_stop_processing(len(uploaded_videos)):
+            video_file = self.job_queue.claim(self.worker_id, self.lease_seconds)
+            if video_file is None:
+                if self.job_queue.is_drained():
+                    self.logger.info(f"Worker {self.worker_id} found the job queue drained, exiting.")
+                    break
+
+                # Other workers still hold leases (or jobs are waiting out a retry delay), so wait in case they become available
+                self.logger.info(f"Worker {self.worker_id} waiting for jobs, job counts: {self.job_queue.counts()}")
+                if uploader.wait_or_stop(self.poll_interval_seconds):
+                    break
+                continue
+
+            if video_file in uploader.deferred_video_files:
+                # Budgets don't come back mid-run, so a job deferred once can't be uploaded by this worker until it restarts
+                self.logger.info(f"Worker {self.worker_id} has no credential profile able to upload the remaining jobs, exiting.")
+                self.job_queue.release(video_file, self.worker_id)
+                break
+
+            self.logger.info(f"Worker {self.worker_id} claimed job: {video_file}")
+            with LeaseHeartbeat(self.job_queue, video_file, self.worker_id, self.lease_seconds, self.logger):
+                uploaded_video = uploader.process_video_file(video_file)
+
+            if uploaded_video is not None:
+                uploaded_videos.append(uploaded_video)
+                self.job_queue.complete(video_file, self.worker_id, dict(uploaded_video))
+            else:
+                self.handle_unfinished_job(video_file)
+
+        return uploaded_videos